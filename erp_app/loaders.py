@@ -0,0 +1,28 @@
+"""
+Batch loaders for ERP lookups made while serializing, see ``util.batch_loader``.
+
+Each factory is also the loader's identity within a request, so serializers
+that use the same factory share one memoized lookup. Small master tables
+(Mpp, Mcc, Shift, Unit) are served by ``erp_app.reference_data`` instead.
+"""
+
+from util.batch_loader import BatchLoader
+
+from .models import MemberHierarchyView
+
+
+def member_loader():
+    return BatchLoader(MemberHierarchyView.objects.all(), "member_code")
+
+
+def default_member_loader():
+    return BatchLoader(
+        MemberHierarchyView.objects.filter(is_default=True), "member_code"
+    )
+
+
+def active_member_loader():
+    return BatchLoader(
+        MemberHierarchyView.objects.filter(is_active=True, is_default=True),
+        "member_code",
+    )
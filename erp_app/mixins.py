@@ -1,10 +1,17 @@
-from decimal import Decimal
 from django.db import connections
 
+from member.services.collection_rollup import (
+    CollectionRollupService,
+    format_collection_totals,
+)
+
 
 class FastTotalsMixin:
     """
-    Mixin to calculate totals (daily/fiscal) from MppCollection using raw SQL.
+    Mixin to calculate totals (daily/fiscal) for a member's MppCollection.
+
+    Totals are served from the local collection rollups when they are fresh,
+    falling back to raw SQL against the ERP database otherwise.
     """
 
     @staticmethod
@@ -19,6 +26,21 @@ class FastTotalsMixin:
             - weighted_snf
             - total_days
             - total_shift (distinct date + shift)
+        """
+        if CollectionRollupService.is_available():
+            return CollectionRollupService.get_member_totals(
+                member_code, start_date, end_date
+            )
+        return FastTotalsMixin.calculate_live_totals(
+            member_code, start_date, end_date, using=using
+        )
+
+    @staticmethod
+    def calculate_live_totals(
+        member_code, start_date=None, end_date=None, using="sarthak_kashee"
+    ):
+        """
+        Same totals as ``calculate_fast_totals``, read directly from the ERP.
         Uses raw SQL for maximum speed with existing indexes.
         """
         params = [member_code]
@@ -44,24 +66,4 @@ class FastTotalsMixin:
             cursor.execute(sql, params)
             row = cursor.fetchone()
 
-        total_qty = Decimal(row[0] or 0)
-        total_amount = Decimal(row[1] or 0)
-        qty_fat_sum = Decimal(row[2] or 0)
-        qty_snf_sum = Decimal(row[3] or 0)
-        total_days = row[4] or 0
-        total_shift = row[5] or 0
-
-        epsilon = Decimal("0.00001")
-        weighted_fat = float(qty_fat_sum / (total_qty + epsilon)) if total_qty else 0
-        weighted_snf = float(qty_snf_sum / (total_qty + epsilon)) if total_qty else 0
-
-        return {
-            "total_qty": round(float(total_qty), 2),
-            "total_amount": round(float(total_amount), 2),
-            "total_payment": round(float(total_amount), 2),
-            "avg_fat": round(weighted_fat, 2),
-            "avg_snf": round(weighted_snf, 2),
-            "total_days": total_days,
-            "total_shift": total_shift,
-        }
-
+        return format_collection_totals(*row)
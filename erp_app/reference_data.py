@@ -0,0 +1,231 @@
+"""
+Process-wide cache of the ERP master tables that change a few times a month.
+
+Each table is kept as a snapshot of compact row tuples in the shared cache,
+published under a version derived from a cheap probe of the table (row
+count and latest timestamp). ``refresh`` re-reads a table only when its
+probe changed. Every process holds the rows as dicts indexed by code and by
+the table's secondary codes, and re-checks the published version at most
+every ``REFERENCE_DATA_CHECK_SECONDS``, so lookups are dictionary reads:
+
+    reference_data.get("mpp", mpp_code)
+    reference_data.get_by("mpp", "ex_code", device.mpp_code)
+    reference_data.all("mcc")
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import BusinessHierarchySnapshot, Mcc, Mpp, Shift, Unit
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "reference_data"
+
+
+@dataclass(frozen=True)
+class ReferenceTable:
+    model: type
+    key: str
+    fields: tuple
+    # Secondary lookup name -> field, e.g. {"ex_code": "mpp_ex_code"}.
+    lookups: dict = field(default_factory=dict)
+    stamp_field: str = "updated_at"
+    # Row filter applied in SQL, e.g. {"is_default": True}.
+    filters: dict = field(default_factory=dict)
+
+    def queryset(self):
+        queryset = self.model.objects.order_by()
+        return queryset.filter(**self.filters) if self.filters else queryset
+
+
+TABLES = {
+    "mpp": ReferenceTable(
+        Mpp,
+        key="mpp_code",
+        fields=(
+            "mpp_code",
+            "mpp_ex_code",
+            "mpp_short_name",
+            "mpp_name",
+            "mpp_type",
+            "mpp_opening_date",
+        ),
+        lookups={"ex_code": "mpp_ex_code"},
+    ),
+    "mcc": ReferenceTable(
+        Mcc,
+        key="mcc_code",
+        fields=("mcc_code", "mcc_ex_code", "mcc_name", "is_active"),
+        lookups={"ex_code": "mcc_ex_code"},
+    ),
+    "shift": ReferenceTable(
+        Shift,
+        key="shift_code",
+        fields=("shift_code", "shift_name", "shift_short_name", "is_active"),
+        lookups={"short_name": "shift_short_name"},
+    ),
+    "unit": ReferenceTable(
+        Unit,
+        key="unit_code",
+        fields=("unit_code", "unit", "unit_short_name"),
+    ),
+    "hierarchy": ReferenceTable(
+        BusinessHierarchySnapshot,
+        key="mpp_code",
+        fields=(
+            "mpp_code",
+            "mpp_ex_code",
+            "mpp_tr_code",
+            "mpp_name",
+            "mpp_type",
+            "mcc_code",
+            "mcc_tr_code",
+            "mcc_name",
+            "bmc_code",
+            "bmc_tr_code",
+            "bmc_name",
+            "plant_code",
+            "plant_tr_code",
+            "plant_name",
+            "route_code",
+            "route_ex_code",
+            "route_name",
+            "is_default",
+        ),
+        lookups={"ex_code": "mpp_ex_code", "tr_code": "mpp_tr_code"},
+        stamp_field="created_at",
+        # One default row per MPP, so the code index is unambiguous.
+        filters={"is_default": True},
+    ),
+}
+
+
+def _data_key(name):
+    return f"{CACHE_PREFIX}_{name}"
+
+
+def _version_key(name):
+    return f"{CACHE_PREFIX}_{name}_version"
+
+
+def probe(name) -> str:
+    """Version of a table from one aggregate query: row count and latest stamp."""
+    table = TABLES[name]
+    stats = table.queryset().aggregate(count=Count("pk"), stamp=Max(table.stamp_field))
+    signature = f"{name}:{stats['count']}:{stats['stamp']}:{table.fields}"
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+
+
+def _rows(name):
+    table = TABLES[name]
+    return list(table.queryset().values_list(*table.fields))
+
+
+def _publish(name, version):
+    payload = {"version": version, "rows": _rows(name)}
+    cache.set_many(
+        {_data_key(name): payload, _version_key(name): version}, timeout=None
+    )
+    logger.info(
+        f"Reference data '{name}' refreshed: {len(payload['rows'])} rows ({version})"
+    )
+    return payload
+
+
+def refresh(name, force=False) -> bool:
+    """
+    Publish a new snapshot of ``name`` if its probe changed. Returns whether
+    the table was re-read.
+    """
+    version = probe(name)
+    if not force and cache.get(_version_key(name)) == version:
+        return False
+    _publish(name, version)
+    return True
+
+
+def refresh_all(force=False) -> dict:
+    return {name: refresh(name, force=force) for name in TABLES}
+
+
+def _schedule_publish(name):
+    """Queue a refresh of ``name`` once, after the current transaction commits."""
+    from .tasks import refresh_reference_data
+
+    if cache.add(f"{CACHE_PREFIX}_{name}_scheduled", True, timeout=60):
+        transaction.on_commit(lambda: refresh_reference_data.delay(names=[name]))
+
+
+class Snapshot:
+    """Read-only rows of one table, indexed by key and by each lookup."""
+
+    def __init__(self, table, version, rows):
+        self.version = version
+        records = [dict(zip(table.fields, row)) for row in rows]
+        self.rows = tuple(MappingProxyType(record) for record in records)
+        self.indexes = {
+            "code": {row[table.key]: row for row in self.rows},
+            **{
+                lookup: {row[attr]: row for row in self.rows if row[attr] is not None}
+                for lookup, attr in table.lookups.items()
+            },
+        }
+
+
+class ReferenceData:
+    def __init__(self):
+        self._snapshots = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, name) -> Snapshot:
+        now = time.monotonic()
+        interval = getattr(settings, "REFERENCE_DATA_CHECK_SECONDS", 60)
+        current = self._snapshots.get(name)
+        if current is not None and now - self._checked_at.get(name, 0) < interval:
+            return current
+
+        with self._lock:
+            current = self._snapshots.get(name)
+            if current is None or cache.get(_version_key(name)) != current.version:
+                payload = cache.get(_data_key(name))
+                if payload is None:
+                    # Cold cache: read the rows for this process only and let
+                    # the refresh task publish them, off the request thread.
+                    # The unversioned copy is swapped out once one is published.
+                    _schedule_publish(name)
+                    payload = {"version": None, "rows": _rows(name)}
+                current = Snapshot(TABLES[name], payload["version"], payload["rows"])
+                self._snapshots[name] = current
+            self._checked_at[name] = now
+            return current
+
+    def get(self, name, code, default=None):
+        return self.snapshot(name).indexes["code"].get(code, default)
+
+    def get_by(self, name, lookup, value, default=None):
+        return self.snapshot(name).indexes[lookup].get(value, default)
+
+    def index(self, name, lookup="code"):
+        return MappingProxyType(self.snapshot(name).indexes[lookup])
+
+    def all(self, name):
+        return self.snapshot(name).rows
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+            self._checked_at.clear()
+
+
+reference_data = ReferenceData()
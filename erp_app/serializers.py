@@ -28,6 +28,8 @@ from .models import (
 
 from rest_framework import serializers
 
+from .reference_data import reference_data
+
 
 class MemberMasterSerializer(serializers.ModelSerializer):
 
@@ -113,20 +115,20 @@ class MemberProfileSerializer(serializers.ModelSerializer):
         )
 
     def get_mcc_name(self, obj):
-        mcc = Mcc.objects.filter(mcc_code=obj.mcc_code).last()
-        return mcc.mcc_name if mcc else "-"
+        mcc = reference_data.get("mcc", obj.mcc_code)
+        return mcc["mcc_name"] if mcc else "-"
 
     def get_mcc_tr_code(self, obj):
-        mcc = Mcc.objects.filter(mcc_code=obj.mcc_code).last()
-        return mcc.mcc_ex_code if mcc else "-"
+        mcc = reference_data.get("mcc", obj.mcc_code)
+        return mcc["mcc_ex_code"] if mcc else "-"
 
     def get_mpp_name(self, obj):
-        mpp = Mpp.objects.filter(mpp_code=obj.mpp_code).last()
-        return mpp.mpp_name if mpp else "-"
+        mpp = reference_data.get("mpp", obj.mpp_code)
+        return mpp["mpp_name"] if mpp else "-"
 
     def get_mpp_tr_code(self, obj):
-        mpp = Mpp.objects.filter(mpp_code=obj.mpp_code).last()
-        return mpp.mpp_ex_code if mpp else "-"
+        mpp = reference_data.get("mpp", obj.mpp_code)
+        return mpp["mpp_ex_code"] if mpp else "-"
 
 class ShiftSerializer(serializers.ModelSerializer):
 
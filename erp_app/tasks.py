@@ -0,0 +1,22 @@
+import logging
+
+from celery import shared_task
+
+from .reference_data import refresh, refresh_all
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, name="erp_app.refresh_reference_data")
+def refresh_reference_data(self, force=False, names=None):
+    """
+    Re-publish the cached ERP master tables (or just ``names``) whose probe
+    changed.
+    """
+    try:
+        if names:
+            return {name: refresh(name, force=force) for name in names}
+        return refresh_all(force=force)
+    except Exception as exc:
+        logger.error(f"Error refreshing reference data: {exc}")
+        raise self.retry(exc=exc, countdown=60)
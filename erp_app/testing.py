@@ -0,0 +1,69 @@
+"""
+Test support for code reading the unmanaged ERP models.
+
+``ERPTablesMixin`` creates the tables of ``erp_models`` on the default test
+database (without their SQL Server collations and foreign-key constraints)
+and turns the ERP read router off, so routed reads and ``using("default")``
+both land on them.
+"""
+
+from django.db import connection
+from django.test import override_settings
+
+
+def _create_model(editor, model):
+    # The ERP columns carry SQL Server collations and point at ERP tables the
+    # test database does not have; create the bare columns only.
+    overrides = {"db_collation": None, "db_constraint": False}
+    saved = []
+    fields = list(model._meta.local_fields)
+    # Foreign keys take their column collation from the referenced field.
+    fields += [f.target_field for f in fields if f.is_relation]
+    for field in fields:
+        for attr, value in overrides.items():
+            if hasattr(field, attr):
+                saved.append((field, attr, getattr(field, attr)))
+                setattr(field, attr, value)
+    try:
+        editor.create_model(model)
+    finally:
+        for field, attr, value in reversed(saved):
+            setattr(field, attr, value)
+
+
+def create_erp_tables(models):
+    """Create the missing tables of ``models``; returns the models created."""
+    existing = set(connection.introspection.table_names())
+    created = [model for model in models if model._meta.db_table not in existing]
+    with connection.schema_editor() as editor:
+        for model in created:
+            _create_model(editor, model)
+    return created
+
+
+def drop_erp_tables(models):
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.delete_model(model)
+
+
+class ERPTablesMixin:
+    erp_models = ()
+
+    @classmethod
+    def setUpClass(cls):
+        cls._erp_routing = override_settings(DATABASE_ROUTERS=[])
+        cls._erp_routing.enable()
+        cls._erp_tables = create_erp_tables(cls.erp_models)
+        try:
+            super().setUpClass()
+        except Exception:
+            drop_erp_tables(cls._erp_tables)
+            cls._erp_routing.disable()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        drop_erp_tables(cls._erp_tables)
+        cls._erp_routing.disable()
@@ -1,3 +1,175 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from facilitator.serializers.serializers import (
+    LocalSaleSerializer as FacilitatorLocalSaleSerializer,
+)
+from member.serialzers import LocalSaleSerializer
+from util import batch_loader
+from util.batch_loader import BatchLoader
+
+from . import reference_data as reference_module
+from .models import LocalSale, MemberHierarchyView
+from .reference_data import ReferenceData
+from .tasks import refresh_reference_data
+from .testing import ERPTablesMixin
+
+
+class BatchLoaderTest(ERPTablesMixin, TestCase):
+    """Serializing a page must cost one query per loader, not one per row."""
+
+    erp_models = (LocalSale, MemberHierarchyView)
+
+    @classmethod
+    def setUpTestData(cls):
+        MemberHierarchyView.objects.bulk_create(
+            MemberHierarchyView(
+                member_code=f"M{i:03d}",
+                member_name=f"Member {i}",
+                # Every tenth member is inactive but still the default row.
+                is_active=i % 10 != 9,
+                is_default=True,
+                created_at=timezone.now(),
+            )
+            for i in range(50)
+        )
+        LocalSale.objects.bulk_create(
+            LocalSale(
+                local_sale_code=i + 1,
+                local_sale_date=date(2026, 1, 1),
+                module_code=f"M{i % 60:03d}",
+                net_amount=Decimal("100.00"),
+            )
+            for i in range(100)
+        )
+
+    def _sales(self, count=100):
+        return LocalSale.objects.order_by("local_sale_code")[:count]
+
+    def test_page_costs_one_query_per_loader(self):
+        sales = list(self._sales())
+
+        with self.assertNumQueries(1):
+            data = LocalSaleSerializer(sales, many=True).data
+        self.assertEqual(data[42]["member"]["member_name"], "Member 42")
+
+        with self.assertNumQueries(1):
+            data = FacilitatorLocalSaleSerializer(sales, many=True).data
+        # The facilitator view does not filter on is_active.
+        self.assertEqual(data[9]["member"]["member_name"], "Member 9")
+
+    def test_results_are_memoized_for_the_request(self):
+        request = RequestFactory().get("/")
+        LocalSaleSerializer(list(self._sales()), many=True, context={"request": request}).data
+
+        sales = list(self._sales(10))
+        with self.assertNumQueries(0):
+            data = LocalSaleSerializer(sales, many=True, context={"request": request}).data
+        self.assertEqual(data[8]["member"]["member_code"], "M008")
+
+    def test_missing_and_filtered_members_resolve_to_none_once(self):
+        sales = list(LocalSale.objects.filter(module_code__in=["M009", "M055"]))
+
+        with self.assertNumQueries(1):
+            data = LocalSaleSerializer(sales, many=True).data
+        # Inactive and unknown members both serialize as an empty member.
+        self.assertEqual({row["member"]["member_code"] for row in data}, {""})
+
+    def test_single_object_loads_lazily(self):
+        sale = LocalSale.objects.get(local_sale_code=8)
+
+        with self.assertNumQueries(1):
+            data = LocalSaleSerializer(sale).data
+        self.assertEqual(data["member"]["member_code"], "M007")
+
+    def test_keys_are_chunked_under_parameter_limit(self):
+        sales = list(self._sales())
+
+        # 60 distinct members in chunks of 25.
+        with mock.patch.object(batch_loader, "MAX_KEYS_PER_QUERY", 25):
+            with self.assertNumQueries(3):
+                LocalSaleSerializer(sales, many=True).data
+
+    def test_last_row_for_a_key_wins(self):
+        loader = BatchLoader(LocalSale.objects.all(), "module_code")
+
+        # M001 has sales 2 and 62; the higher primary key is returned.
+        self.assertEqual(loader.load("M001").local_sale_code, 62)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    REFERENCE_DATA_CHECK_SECONDS=0,
+)
+class ReferenceDataTest(SimpleTestCase):
+    """Master-table lookups come from the published snapshot, not the ERP."""
+
+    rows = [
+        ("0101", "1001", "MPP A", "Mpp A", "M", None),
+        ("0102", "1002", "MPP B", "Mpp B", "M", None),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.version = "v1"
+        self.reads = 0
+        patches = [
+            mock.patch.object(
+                reference_module, "probe", side_effect=lambda name: self.version
+            ),
+            mock.patch.object(
+                reference_module.Mpp.objects,
+                "order_by",
+                side_effect=self._queryset,
+            ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        schedule = mock.patch.object(reference_module, "_schedule_publish")
+        self.schedule = schedule.start()
+        self.addCleanup(schedule.stop)
+        self.data = ReferenceData()
+
+    def _queryset(self, *args):
+        self.reads += 1
+        queryset = mock.Mock()
+        queryset.values_list.return_value = list(self.rows)
+        return queryset
+
+    def test_lookups_by_code_and_ex_code(self):
+        self.assertEqual(self.data.get("mpp", "0101")["mpp_name"], "Mpp A")
+        self.assertEqual(self.data.get_by("mpp", "ex_code", "1002")["mpp_code"], "0102")
+        self.assertIsNone(self.data.get("mpp", "9999"))
+        self.assertEqual(self.reads, 1)
+
+    def test_cold_cache_is_published_off_the_request(self):
+        self.data.get("mpp", "0101")
+
+        # The request read the rows for itself and only queued the publish.
+        self.schedule.assert_called_once_with("mpp")
+        self.assertIsNone(cache.get(reference_module._data_key("mpp")))
+
+        refresh_reference_data(names=["mpp"])
+        self.assertEqual(self.data.get("mpp", "0102")["mpp_name"], "Mpp B")
+        self.data.get("mpp", "0101")
+        self.assertEqual(self.reads, 2)
+
+    def test_refresh_skips_unchanged_tables(self):
+        self.assertTrue(reference_module.refresh("mpp"))
+        self.assertFalse(reference_module.refresh("mpp"))
+        self.assertEqual(self.reads, 1)
+
+    def test_new_version_is_picked_up(self):
+        self.data.get("mpp", "0101")
+        self.rows = self.rows + [("0103", "1003", "MPP C", "Mpp C", "M", None)]
+        self.version = "v2"
+        reference_module.refresh("mpp")
+
+        self.assertEqual(self.data.get("mpp", "0103")["mpp_name"], "Mpp C")
+        self.assertEqual(self.reads, 2)
@@ -4,14 +4,19 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Sum, Count
+from django.db.models import Sum
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.dateparse import parse_datetime
 from django.core.cache import cache
 from .mixins import FastTotalsMixin
-from django.db import connections
+from member.services.collection_rollup import day_bounds
+from member.services.collection_series import (
+    CollectionSeriesService,
+    WINDOW_DAYS,
+    resolve_window,
+)
 
 
 # class MemberByPhoneNumberView(generics.RetrieveAPIView):
@@ -325,10 +330,9 @@ class BillingMemberDetailView(generics.RetrieveAPIView):
 #         )
 #         return start_date, end_date
 
-from django.db.models.functions import TruncDate
 
 
-class MppCollectionDetailView(generics.GenericAPIView):
+class MppCollectionDetailView(FastTotalsMixin, generics.GenericAPIView):
     """
     API endpoint for fetching other dashboard data.
     """
@@ -373,24 +377,19 @@ class MppCollectionDetailView(generics.GenericAPIView):
         cache_key_date = f"mpp_collection_{member_code}_{provided_date}"
         date_queryset = cache.get(cache_key_date)
         if date_queryset is None:
+            day_start, day_end = day_bounds(provided_date)
             date_queryset = list(
                 MppCollection.objects.filter(
-                    collection_date__date=provided_date, member_code=member_code
+                    collection_date__gte=day_start,
+                    collection_date__lt=day_end,
+                    member_code=member_code,
                 )
             )
             cache.set(cache_key_date, date_queryset, timeout=3600)
         cache_key_fy = f"mpp_collection_fy_{member_code}_{start_date}_{end_date}"
         fiscal_data = cache.get(cache_key_fy)
         if fiscal_data is None:
-            aggregated_data = MppCollection.objects.filter(
-                collection_date__range=(start_date, end_date), member_code=member_code
-            ).annotate(date_only=TruncDate("collection_date"))
-
-            fiscal_data = aggregated_data.aggregate(
-                total_days=Count("date_only", distinct=True),
-                total_qty=Sum("qty", default=0),
-                total_payment=Sum("amount", default=0),
-            )
+            fiscal_data = self.calculate_fast_totals(member_code, start_date, end_date)
             cache.set(cache_key_fy, fiscal_data, timeout=3600)
 
         date_serializer = self.get_serializer(date_queryset, many=True)
@@ -559,44 +558,25 @@ class TodayCollectionView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        today = timezone.now().date()
+        today = timezone.localdate()
         result = self.get_today_collection(member_code, today)
         return Response({"status": 200, "message": "success", "data": result})
 
     @staticmethod
-    def get_today_collection(member_code, collection_date, using="sarthak_kashee"):
+    def get_today_collection(member_code, collection_date):
         """
         Returns:
             {
+                "date": "2025-01-01",
                 "total_qty": 123.45,
                 "morning_shift_qty": 70.12,
-                "evening_shift_qty": 53.33
+                "evening_shift_qty": 53.33,
+                "total_amount": 4567.89
             }
         """
-        # Assuming: shift_code 1 = morning, 2 = evening
-        sql = """
-            SELECT
-                SUM(qty) AS total_qty,
-                SUM(CASE WHEN shift_code = 1 THEN qty ELSE 0 END) AS morning_shift_qty,
-                SUM(CASE WHEN shift_code = 2 THEN qty ELSE 0 END) AS evening_shift_qty
-            FROM mpp_collection
-            WHERE member_code = %s
-            AND CAST(collection_date AS DATE) = %s;
-        """
-
-        with connections[using].cursor() as cursor:
-            cursor.execute(sql, [member_code, collection_date])
-            row = cursor.fetchone()
-
-        total_qty = float(row[0] or 0)
-        morning_qty = float(row[1] or 0)
-        evening_qty = float(row[2] or 0)
-
-        data = {
-            "total_qty": round(total_qty, 2),
-            "morning_shift_qty": round(morning_qty, 2),
-            "evening_shift_qty": round(evening_qty, 2),
-        }
+        [data] = CollectionSeriesService.member_series(
+            member_code, collection_date, collection_date
+        )
         return custom_response(
             status_text="success",
             data=data,
@@ -606,9 +586,6 @@ class TodayCollectionView(generics.GenericAPIView):
         )
 
 
-from datetime import timedelta
-
-
 class Last5DaysCollectionView(generics.GenericAPIView):
     """
     API to fetch total milk collection for last 5 days
@@ -636,14 +613,8 @@ class Last5DaysCollectionView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        today = timezone.now().date()
-        last_5_days = [today - timedelta(days=i) for i in range(5)]
-        last_5_days.sort()
-
-        results = []
-        for day in last_5_days:
-            totals = self.get_day_collection(member_code, day)
-            results.append({"date": str(day), **totals})
+        start_day, end_day = resolve_window(WINDOW_DAYS, days=5)
+        results = CollectionSeriesService.member_series(member_code, start_day, end_day)
 
         return custom_response(
             status_text="success",
@@ -653,36 +624,59 @@ class Last5DaysCollectionView(generics.GenericAPIView):
             errors={},
         )
 
-    @staticmethod
-    def get_day_collection(member_code, collection_date, using="sarthak_kashee"):
-        """
-        Returns totals for a single date:
-        {
-            "total_qty": 123.45,
-            "morning_shift_qty": 70.12,
-            "evening_shift_qty": 53.33
-        }
-        """
-        sql = """
-            SELECT
-                SUM(qty) AS total_qty,
-                SUM(CASE WHEN shift_code = 1 THEN qty ELSE 0 END) AS morning_shift_qty,
-                SUM(CASE WHEN shift_code = 2 THEN qty ELSE 0 END) AS evening_shift_qty
-            FROM mpp_collection
-            WHERE member_code = %s
-            AND CAST(collection_date AS DATE) = %s;
-        """
 
-        with connections[using].cursor() as cursor:
-            cursor.execute(sql, [member_code, collection_date])
-            row = cursor.fetchone()
+class CollectionSeriesView(generics.GenericAPIView):
+    """
+    Collection time series for the logged-in member, bucketed by day and shift.
 
-        total_qty = float(row[0] or 0)
-        morning_qty = float(row[1] or 0)
-        evening_qty = float(row[2] or 0)
+    Query params:
+        window: days | week | month | fy (default: days)
+        days:   window length when window=days (default: 5, max: 366)
+        date:   anchor date in YYYY-MM-DD (default: today)
+    """
 
-        return {
-            "total_qty": round(total_qty, 2),
-            "morning_shift_qty": round(morning_qty, 2),
-            "evening_shift_qty": round(evening_qty, 2),
-        }
+    permission_classes = [IsAuthenticated]
+    MAX_DAYS = 366
+
+    def get(self, request, *args, **kwargs):
+        member = (
+            MemberMaster.objects.filter(
+                mobile_no=request.user.username, is_active=True
+            )
+            .values("member_code")
+            .first()
+        )
+        if not member or not member["member_code"]:
+            return Response(
+                {"status": 400, "message": "no member found"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        window = request.query_params.get("window", WINDOW_DAYS)
+        try:
+            days = min(int(request.query_params.get("days", 5)), self.MAX_DAYS)
+            anchor = request.query_params.get("date")
+            if anchor:
+                anchor = timezone.datetime.strptime(anchor, "%Y-%m-%d").date()
+            start_day, end_day = resolve_window(window, anchor=anchor, days=days)
+        except ValueError as e:
+            return Response(
+                {"status": 400, "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = CollectionSeriesService.member_series(
+            member["member_code"], start_day, end_day
+        )
+        return custom_response(
+            status_text="success",
+            data={
+                "window": window,
+                "start_date": str(start_day),
+                "end_date": str(end_day),
+                "series": results,
+            },
+            message="Collection Series Fetched",
+            status_code=status.HTTP_200_OK,
+            errors={},
+        )
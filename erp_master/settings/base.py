@@ -456,8 +456,57 @@ CELERY_TASK_ROUTES = {
     "feedback.tasks.*": {"queue": "erp_master_queue", "routing_key": "erp_task"},
     "notifications.tasks.*": {"queue": "erp_master_queue", "routing_key": "erp_task"},
     "veterinary.tasks.*": {"queue": "erp_master_queue", "routing_key": "erp_task"},
+    "member.*": {"queue": "erp_master_queue", "routing_key": "erp_task"},
+    "erp_app.*": {"queue": "erp_master_queue", "routing_key": "erp_task"},
 }
 
+# FCM push transport (notifications.fcm.FCMTransport)
+FCM_POOL_SIZE = config("FCM_POOL_SIZE", default=50, cast=int)
+FCM_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+
+# SMS transport (notifications.sms): providers are tried in order; the
+# fallback is only used when SMS_FALLBACK_API_URL is set. Sends are queued to
+# Celery in "async" mode, or made in the request in "sync" mode.
+SMS_PROVIDERS = [
+    {
+        "name": "cbis",
+        "url": config("SMS_API_URL", default="https://alerts.cbis.in/SMSApi/send"),
+        "params": {
+            "userid": config("SMS_USERID", default=""),
+            "password": config("SMS_PASSWORD", default=""),
+            "output": "json",
+            "sendMethod": "quick",
+            "senderid": config("SMS_SENDERID", default="KMPCLV"),
+            "msgType": "unicode",
+            "dltEntityId": config("SMS_DLT_ENTITY_ID", default="1001453540000074525"),
+            "dltTemplateId": config("SMS_DLT_TEMPLATE_ID", default="1007171661975556092"),
+            "duplicatecheck": "true",
+        },
+    },
+    {
+        "name": "fallback",
+        "url": config("SMS_FALLBACK_API_URL", default=""),
+        "params": {
+            "userid": config("SMS_FALLBACK_USERID", default=""),
+            "password": config("SMS_FALLBACK_PASSWORD", default=""),
+            "output": "json",
+            "sendMethod": "quick",
+            "senderid": config("SMS_SENDERID", default="KMPCLV"),
+            "msgType": "unicode",
+            "dltEntityId": config("SMS_DLT_ENTITY_ID", default="1001453540000074525"),
+            "dltTemplateId": config("SMS_DLT_TEMPLATE_ID", default="1007171661975556092"),
+        },
+    },
+]
+SMS_SEND_MODE = config("SMS_SEND_MODE", default="async")
+SMS_POOL_SIZE = config("SMS_POOL_SIZE", default=20, cast=int)
+SMS_TIMEOUT = (2, 5)  # (connect, read) seconds
+SMS_CIRCUIT_THRESHOLD = 5  # failures within the window that open the circuit
+SMS_CIRCUIT_WINDOW = 60
+SMS_CIRCUIT_COOLDOWN = 30
+SMS_CIRCUIT_PROBE_TIMEOUT = 10  # half-open: other callers wait this long for the probe
+SMS_MAX_QUEUE_AGE = 300  # queued OTPs older than this are dropped, not sent
+
 DEEPLINK_RATE_LIMIT_ENABLED =config("DEEPLINK_RATE_LIMIT_ENABLED")
 DEEPLINK_MAX_LINKS_PER_USER_PER_DAY = config("DEEPLINK_MAX_LINKS_PER_USER_PER_DAY")
 
@@ -467,6 +516,18 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'deeplink.cleanup_expired',
         'schedule': 3600.0,
     },
+    'flush-deeplink-usage': {
+        'task': 'deeplink.flush_usage',
+        'schedule': 60.0,
+    },
+    'refresh-deeplink-counters': {
+        'task': 'deeplink.refresh_counters',
+        'schedule': 300.0,
+    },
+    'reconcile-deeplink-counters': {
+        'task': 'deeplink.reconcile_counters',
+        'schedule': 3600.0,
+    },
     'delete-old-links-daily': {
         'task': 'deeplink.delete_old_links',
         'schedule': 86400.0,
@@ -476,10 +537,98 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'deeplink.generate_analytics_report',
         'schedule': 86400.0,
     },
+    'refresh-collection-rollups': {
+        'task': 'member.refresh_collection_rollups',
+        'schedule': 300.0,
+    },
+    'reconcile-reward-balances': {
+        'task': 'member.reconcile_reward_balances',
+        'schedule': 86400.0,
+    },
+    'refresh-reference-data': {
+        'task': 'erp_app.refresh_reference_data',
+        'schedule': 900.0,
+    },
+    'reconcile-notification-counters': {
+        'task': 'notifications.tasks.reconcile_notification_counters',
+        'schedule': 600.0,
+    },
+    'relay-notification-outbox': {
+        'task': 'notifications.tasks.relay_notification_outbox',
+        'schedule': 60.0,
+    },
+    'purge-notification-outbox': {
+        'task': 'notifications.tasks.purge_notification_outbox',
+        'schedule': 86400.0,
+    },
 }
 
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Member collection rollups (member.services.collection_rollup)
+COLLECTION_ROLLUP_READS = config("COLLECTION_ROLLUP_READS", default=True, cast=bool)
+COLLECTION_ROLLUP_MAX_LAG_MINUTES = 30  # older than this -> live ERP reads
+COLLECTION_ROLLUP_OVERLAP_MINUTES = 10
+COLLECTION_ROLLUP_EDIT_WINDOW_DAYS = 45
+COLLECTION_ROLLUP_BACKFILL_DAYS = 400
+COLLECTION_SERIES_OPEN_DAY_TTL = 300  # today's buckets
+COLLECTION_SERIES_CLOSED_DAY_TTL = 3600
+
+# Collection push notifications (notifications.collection_notifications)
+COLLECTION_NOTIFICATION_CHUNK_SIZE = 500
+
+# Notification outbox (notifications.outbox): events per relay transaction,
+# attempts before an event is marked failed, and days a handled event is kept.
+NOTIFICATION_OUTBOX_BATCH_SIZE = 100
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+NOTIFICATION_OUTBOX_RETENTION_DAYS = 7
+
+# Recipients loaded, rendered and inserted per chunk by
+# NotificationServices.create_bulk_notifications.
+NOTIFICATION_BULK_CHUNK_SIZE = 1000
+
+# Deep-link redirect cache (notifications.deeplink_cache): snapshot lifetime,
+# lifetime of "unknown/unusable token" entries, links per usage flush, and
+# lifetime of the "already logged" flag (at most the flush interval).
+DEEPLINK_RESOLVE_CACHE_TTL = 3600
+DEEPLINK_INVALID_CACHE_TTL = 300
+DEEPLINK_USAGE_FLUSH_BATCH_SIZE = 1000
+DEEPLINK_USAGE_FLAG_TTL = 60
+
+# Deep-link lifecycle jobs (notifications.deeplink_lifecycle): rows per
+# expiry/delete batch, whether deleted links are kept in the archive table,
+# and how many recent days the created counts are reconciled over.
+DEEPLINK_LIFECYCLE_BATCH_SIZE = 5000
+DEEPLINK_ARCHIVE_OLD_LINKS = True
+DEEPLINK_COUNTER_RECONCILE_DAYS = 2
+
+# Badge counters (notifications.counters): key lifetime, and how far back
+# the periodic reconcile looks for users whose notifications changed. The
+# window is longer than the beat interval so consecutive runs overlap.
+NOTIFICATION_COUNTER_TTL = 24 * 3600
+NOTIFICATION_COUNTER_RECONCILE_MINUTES = 15
+NOTIFICATION_COUNTER_RECONCILE_CHUNK = 1000
+
+# OTP login eligibility index (member.services.login_index): entries written
+# per batch on refresh, whether unindexed or ineligible numbers are rechecked
+# in the ERP, and how long such a number is remembered before the next check.
+MEMBER_LOGIN_INDEX_BATCH_SIZE = 2000
+MEMBER_LOGIN_INDEX_ERP_FALLBACK = True
+MEMBER_LOGIN_INDEX_MISS_TTL = 300
+
+# Symptom recommendation index (veterinary.services.recommendation_index):
+# how often each process checks the shared version for catalogue changes.
+RECOMMENDATION_INDEX_CHECK_SECONDS = 5
+
+# Facilitator high-pourer dashboard (facilitator.services.high_pourer_service)
+HIGH_POURER_THRESHOLD_LITRES = 49
+HIGH_POURER_OPEN_DAY_TTL = 600
+HIGH_POURER_CLOSED_DAY_TTL = 3600
+
+# ERP reference data (erp_app.reference_data): how often each process checks
+# the published version of a cached master table.
+REFERENCE_DATA_CHECK_SECONDS = 60
+
 # Email Configuration
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from facilitator.models.user_profile_model import ReportingClosure, UserProfile
+
+
+class Command(BaseCommand):
+    help = "Check ReportingClosure against UserProfile.reports_to and rebuild it if it drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, do not rebuild",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild even when no drift is found",
+        )
+
+    def handle(self, *args, **options):
+        edges = list(UserProfile.objects.values_list("user_id", "reports_to__user_id"))
+        missing, extra = ReportingClosure.objects.drift(edges)
+        self.stdout.write(
+            f"{len(edges)} profiles, {len(missing)} closure rows missing, {len(extra)} stale"
+        )
+
+        if options["check"] or not (missing or extra or options["force"]):
+            return
+
+        ReportingClosure.objects.rebuild(edges)
+        self.stdout.write(self.style.SUCCESS("Reporting closure rebuilt"))
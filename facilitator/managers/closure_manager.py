@@ -0,0 +1,162 @@
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Q
+
+
+def closure_rows(edges):
+    """
+    Build ``(ancestor, descendant, depth)`` rows for a reporting forest.
+
+    ``edges`` is an iterable of ``(user_id, parent_user_id)`` pairs, with
+    ``parent_user_id`` ``None`` for roots. Every user gets a depth-0 self row.
+    Walks stop at the first repeated node, so a cycle in bad data never loops
+    forever.
+    """
+    children = defaultdict(list)
+    nodes = set()
+    for user_id, parent_id in edges:
+        nodes.add(user_id)
+        if parent_id is not None and parent_id != user_id:
+            nodes.add(parent_id)
+            children[parent_id].append(user_id)
+
+    rows = []
+    for ancestor in nodes:
+        # Walk the subtree below each node once; visited guards cycles.
+        stack, visited = [(ancestor, 0)], set()
+        while stack:
+            node, depth = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            rows.append((ancestor, node, depth))
+            stack.extend((child, depth + 1) for child in children[node])
+    return rows
+
+
+class ReportingClosureQuerySet(models.QuerySet):
+    def within(self, max_depth=None):
+        return self if max_depth is None else self.filter(depth__lte=max_depth)
+
+
+class ReportingClosureManager(models.Manager.from_queryset(ReportingClosureQuerySet)):
+    """
+    Maintains the transitive closure of ``UserProfile.reports_to`` keyed by
+    user id, so "everyone below X" is one indexed lookup instead of a walk up
+    the chain per user.
+    """
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    def descendant_ids(self, user_id, max_depth=None, include_self=False):
+        """User ids below ``user_id`` (a flat values queryset, usable as a subquery)."""
+        qs = self.filter(ancestor_id=user_id).within(max_depth)
+        if not include_self:
+            qs = qs.filter(depth__gt=0)
+        return qs.values_list("descendant_id", flat=True)
+
+    def is_ancestor(self, ancestor_id, descendant_id, max_depth=None):
+        return (
+            self.filter(
+                ancestor_id=ancestor_id, descendant_id=descendant_id, depth__gt=0
+            )
+            .within(max_depth)
+            .exists()
+        )
+
+    # ---------------------------
+    # Maintenance
+    # ---------------------------
+    def validate_move(self, user_id, parent_user_id):
+        """Raise ``ValueError`` if ``parent_user_id`` is ``user_id`` or below it."""
+        if parent_user_id is None:
+            return
+        if parent_user_id == user_id or self.is_ancestor(user_id, parent_user_id):
+            raise ValueError(
+                f"User {parent_user_id} reports to user {user_id}; "
+                f"cannot make it the supervisor."
+            )
+
+    def move(self, user_id, parent_user_id):
+        """
+        Re-attach ``user_id`` (and its whole subtree) under ``parent_user_id``,
+        or make it a root when ``parent_user_id`` is ``None``.
+
+        Raises ``ValueError`` if the new parent is inside the subtree.
+        """
+        with transaction.atomic():
+            self.get_or_create(
+                ancestor_id=user_id, descendant_id=user_id, defaults={"depth": 0}
+            )
+            subtree = list(
+                self.filter(ancestor_id=user_id).values_list("descendant_id", "depth")
+            )
+            subtree_ids = [descendant for descendant, _ in subtree]
+            if parent_user_id is not None and parent_user_id in subtree_ids:
+                raise ValueError(
+                    f"User {parent_user_id} reports to user {user_id}; "
+                    f"cannot make it the supervisor."
+                )
+
+            self.filter(descendant_id__in=subtree_ids).exclude(
+                ancestor_id__in=subtree_ids
+            ).delete()
+            if parent_user_id is None:
+                return
+
+            self.get_or_create(
+                ancestor_id=parent_user_id,
+                descendant_id=parent_user_id,
+                defaults={"depth": 0},
+            )
+            ancestors = self.filter(descendant_id=parent_user_id).values_list(
+                "ancestor_id", "depth"
+            )
+            self.bulk_create(
+                [
+                    self.model(
+                        ancestor_id=ancestor,
+                        descendant_id=descendant,
+                        depth=up + down + 1,
+                    )
+                    for ancestor, up in ancestors
+                    for descendant, down in subtree
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+
+    def detach(self, user_id):
+        """
+        Remove ``user_id`` from the graph. Its reportees become roots, which is
+        what ``reports_to``'s ``SET_NULL`` does to them.
+        """
+        with transaction.atomic():
+            subtree_ids = list(self.descendant_ids(user_id, include_self=True))
+            self.filter(descendant_id__in=subtree_ids).exclude(
+                ancestor_id__in=subtree_ids
+            ).delete()
+            self.filter(Q(ancestor_id=user_id) | Q(descendant_id=user_id)).delete()
+
+    def rebuild(self, edges):
+        """Replace the whole closure from ``(user_id, parent_user_id)`` pairs."""
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                [
+                    self.model(ancestor_id=a, descendant_id=d, depth=depth)
+                    for a, d, depth in closure_rows(edges)
+                ],
+                batch_size=1000,
+            )
+
+    def drift(self, edges):
+        """
+        Compare the stored closure with the one ``edges`` describe; returns
+        ``(missing, extra)`` sets of ``(ancestor, descendant, depth)`` rows.
+        """
+        expected = set(closure_rows(edges))
+        stored = set(self.values_list("ancestor_id", "descendant_id", "depth"))
+        return expected - stored, stored - expected
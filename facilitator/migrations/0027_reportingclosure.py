@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-17 10:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_closure(apps, schema_editor):
+    from facilitator.managers.closure_manager import closure_rows
+
+    UserProfile = apps.get_model("facilitator", "UserProfile")
+    ReportingClosure = apps.get_model("facilitator", "ReportingClosure")
+    edges = UserProfile.objects.values_list("user_id", "reports_to__user_id")
+    ReportingClosure.objects.bulk_create(
+        [
+            ReportingClosure(ancestor_id=a, descendant_id=d, depth=depth)
+            for a, d, depth in closure_rows(edges)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('facilitator', '0026_alter_userlocation_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportingClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField(help_text='Reporting levels between supervisor and reportee (0 = self).', verbose_name='Depth')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Supervisor')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Reportee')),
+            ],
+            options={
+                'verbose_name': 'Reporting Closure',
+                'verbose_name_plural': 'Reporting Closure',
+                'db_table': 'tbl_user_reporting_closure',
+                'indexes': [models.Index(fields=['ancestor', 'depth', 'descendant'], name='idx_closure_ancestor_depth'), models.Index(fields=['descendant', 'depth'], name='idx_closure_descendant')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reportingclosure',
+            constraint=models.UniqueConstraint(fields=('ancestor', 'descendant'), name='uniq_reporting_closure_pair'),
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
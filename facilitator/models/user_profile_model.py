@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from ..managers.route_manager import UserLocationManager
+from ..managers.closure_manager import ReportingClosureManager
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from ..choices import RouteLevelChoice
@@ -128,6 +129,53 @@ class UserProfile(models.Model):
         return self.department == self.Department.PIB
 
 
+class ReportingClosure(models.Model):
+    """
+    Transitive closure of ``UserProfile.reports_to`` by user: one row per
+    (supervisor, reportee) pair at any depth, plus a depth-0 row per user.
+    Maintained by the UserProfile signals.
+    """
+
+    ancestor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Supervisor"),
+    )
+    descendant = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Reportee"),
+    )
+    depth = models.PositiveSmallIntegerField(
+        verbose_name=_("Depth"),
+        help_text=_("Reporting levels between supervisor and reportee (0 = self)."),
+    )
+
+    objects = ReportingClosureManager()
+
+    class Meta:
+        db_table = "tbl_user_reporting_closure"
+        verbose_name = _("Reporting Closure")
+        verbose_name_plural = _("Reporting Closure")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"], name="uniq_reporting_closure_pair"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["ancestor", "depth", "descendant"],
+                name="idx_closure_ancestor_depth",
+            ),
+            models.Index(fields=["descendant", "depth"], name="idx_closure_descendant"),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.depth})"
+
+
 class UserLocation(models.Model):
     """
     Represents a hierarchical location assignment (MCC → Route → MPP) for a user.
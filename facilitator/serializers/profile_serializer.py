@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from ..models.user_profile_model import UserProfile,UserLocation
+from ..models.user_profile_model import ReportingClosure, UserProfile, UserLocation
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -132,10 +132,16 @@ class UserUpdateProfileSerializer(serializers.ModelSerializer):
         return value
 
     def validate_reports_to(self, value):
-        """Ensure user doesn't report to themselves."""
+        """Ensure user doesn't report to themselves or to their own reportees."""
         if value and hasattr(self, "instance") and self.instance:
             if value.user_id == self.instance.user_id:
                 raise serializers.ValidationError("A user cannot report to themselves.")
+            if ReportingClosure.objects.is_ancestor(
+                self.instance.user_id, value.user_id
+            ):
+                raise serializers.ValidationError(
+                    "A user cannot report to one of their own reportees."
+                )
         return value
 
 
@@ -23,7 +23,10 @@ from erp_app.serializers import (
     BrandSerializer,
     MemberHierarchyViewSerializer,
 )
+from erp_app.loaders import default_member_loader, member_loader
+from erp_app.reference_data import reference_data
 from member.models import OTP, SahayakIncentives
+from util.batch_loader import BatchListSerializer, BatchLoadMixin
 
 from rest_framework import serializers
 from ..models.facilitator_model import AssignedMppToFacilitator
@@ -109,7 +112,9 @@ class MemberMasterSerializer(serializers.ModelSerializer):
         ]
 
 
-class LocalSaleSerializer(serializers.ModelSerializer):
+class LocalSaleSerializer(BatchLoadMixin, serializers.ModelSerializer):
+    batch_keys = ((default_member_loader, "module_code"),)
+
     member = serializers.SerializerMethodField()
 
     class Meta:
@@ -127,16 +132,14 @@ class LocalSaleSerializer(serializers.ModelSerializer):
             "credit_limit",
             "member",
         ]
+        list_serializer_class = BatchListSerializer
 
     def get_member(self, obj):
         """
         Fetch the member data from MemberMaster using module_code.
         """
-        try:
-            member = MemberHierarchyView.objects.filter(member_code=obj.module_code,is_default=True).last()
-            return MemberHierarchyViewSerializer(member, context=self.context).data
-        except MemberHierarchyView.DoesNotExist:
-            return None
+        member = self.load(default_member_loader, obj.module_code)
+        return MemberHierarchyViewSerializer(member, context=self.context).data
 
 
 class DeductionSerializer(serializers.ModelSerializer):
@@ -176,11 +179,8 @@ class ERProductSerializer(serializers.ModelSerializer):
         ]
 
     def get_unit(self, obj):
-        try:
-            unit = Unit.objects.get(unit_code=obj.unit_code)
-            return UnitSerializer(unit).data
-        except:
-            None
+        unit = reference_data.get("unit", obj.unit_code)
+        return UnitSerializer(unit).data if unit else None
 
 
 class DeductionTxnSerializer(serializers.ModelSerializer):
@@ -206,6 +206,7 @@ class LocalSaleTxnSerializer(serializers.ModelSerializer):
             "amount",
             "product",
         ]
+        list_serializer_class = BatchListSerializer
 
 
 class CdaAggregationDaywiseMilktypeSerializer(serializers.ModelSerializer):
@@ -347,7 +348,9 @@ class MppSerializer(serializers.ModelSerializer):
         ]
 
 
-class BillingMemberDetailSerializer(serializers.ModelSerializer):
+class BillingMemberDetailSerializer(BatchLoadMixin, serializers.ModelSerializer):
+    batch_keys = ((member_loader, "member_code"),)
+
     member = serializers.SerializerMethodField()
 
     class Meta:
@@ -381,13 +384,13 @@ class BillingMemberDetailSerializer(serializers.ModelSerializer):
             "payment_mode",
             "status",
         ]
+        list_serializer_class = BatchListSerializer
 
     def get_member(self, obj):
-        try:
-            member = MemberHierarchyView.objects.get(member_code=obj.member_code)
-            return MemberHierarchyViewSerializer(member, context=self.context).data
-        except MemberHierarchyView.DoesNotExist:
+        member = self.load(member_loader, obj.member_code)
+        if member is None:
             return None
+        return MemberHierarchyViewSerializer(member, context=self.context).data
 
 
 class BillingMemberMasterSerializer(serializers.ModelSerializer):
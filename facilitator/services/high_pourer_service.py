@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from erp_app.models import MemberHierarchyView, MppCollection
+from erp_app.reference_data import reference_data
+from member.services.collection_rollup import as_date, day_bounds
+
+
+def high_pourer_threshold():
+    return getattr(settings, "HIGH_POURER_THRESHOLD_LITRES", 49)
+
+
+class HighPourerService:
+    """
+    Per-member daily pouring totals for a set of MPPs.
+
+    Each MPP/day is computed from one grouped ERP query over the day's
+    collections, joined in memory with the MPP's active members and its
+    details, and cached on its own as the full list of members who poured
+    (highest first). Facilitators sharing MPPs therefore share cache entries,
+    and any threshold is applied to the cached totals without a new query.
+    """
+
+    CACHE_PREFIX = "high_pourers"
+
+    def __init__(self, mpp_codes, day=None, threshold=None, using="sarthak_kashee"):
+        self.mpp_codes = sorted(set(mpp_codes))
+        self.day = as_date(day) or timezone.localdate()
+        self.threshold = high_pourer_threshold() if threshold is None else threshold
+        self.using = using
+        self._loaded = None
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def counts(self) -> dict:
+        """Number of members above and at-or-below the threshold."""
+        high = low = 0
+        for entry in self._entries().values():
+            for member in entry["members"]:
+                if member["qty"] > self.threshold:
+                    high += 1
+                else:
+                    low += 1
+        return {"high": high, "low": low}
+
+    def high_pourers(self) -> list:
+        """MPP details with the members above the threshold, per MPP that has any."""
+        result = []
+        for entry in self._entries().values():
+            members = [m for m in entry["members"] if m["qty"] > self.threshold]
+            if members:
+                result.append({**entry["details"], "members": members})
+        return result
+
+    # ---------------------------
+    # Cache layer
+    # ---------------------------
+    def _ttl(self):
+        if self.day >= timezone.localdate():
+            return getattr(settings, "HIGH_POURER_OPEN_DAY_TTL", 600)
+        return getattr(settings, "HIGH_POURER_CLOSED_DAY_TTL", 3600)
+
+    def _cache_key(self, mpp_code):
+        return f"{self.CACHE_PREFIX}_{mpp_code}_{self.day}"
+
+    def _entries(self):
+        if self._loaded is not None:
+            return self._loaded
+
+        keys = {self._cache_key(code): code for code in self.mpp_codes}
+        cached = cache.get_many(list(keys))
+        entries = {keys[key]: value for key, value in cached.items()}
+
+        missing = [code for code in self.mpp_codes if code not in entries]
+        if missing:
+            fetched = self._fetch(missing)
+            entries.update(fetched)
+            cache.set_many(
+                {self._cache_key(code): fetched[code] for code in missing},
+                timeout=self._ttl(),
+            )
+
+        self._loaded = {code: entries[code] for code in self.mpp_codes}
+        return self._loaded
+
+    # ---------------------------
+    # Source
+    # ---------------------------
+    @staticmethod
+    def _details(mpp, code):
+        if mpp is None:
+            return {"mpp_code": code}
+        return {
+            "mpp_code": mpp["mpp_code"],
+            "mpp_ex_code": mpp["mpp_ex_code"],
+            "mpp_name": mpp["mpp_name"] or mpp["mpp_short_name"],
+        }
+
+    def _fetch(self, mpp_codes):
+        start, end = day_bounds(self.day)
+        totals = (
+            MppCollection.objects.using(self.using)
+            .filter(
+                references__mpp_code__in=mpp_codes,
+                references__collection_date__gte=start,
+                references__collection_date__lt=end,
+            )
+            .values_list("references__mpp_code", "member_code")
+            .annotate(total_qty=Sum("qty"))
+            .order_by()
+        )
+        members = {
+            (row["mpp_code"], row["member_code"]): row
+            for row in MemberHierarchyView.objects.using(self.using)
+            .filter(mpp_code__in=mpp_codes, is_active=True, is_default=True)
+            .values("mpp_code", "member_code", "member_tr_code", "member_name", "mobile_no")
+        }
+        mpps = reference_data.index("mpp")
+
+        poured = defaultdict(list)
+        for mpp_code, member_code, total_qty in totals:
+            member = members.get((mpp_code, member_code))
+            if member is None:
+                continue
+            poured[mpp_code].append(
+                {
+                    "member_code": member["member_code"],
+                    "member_tr_code": member["member_tr_code"],
+                    "member_name": member["member_name"],
+                    "mobile_no": member["mobile_no"],
+                    "qty": float(total_qty or 0),
+                }
+            )
+
+        return {
+            code: {
+                "details": self._details(mpps.get(code), code),
+                "members": sorted(poured[code], key=lambda m: m["qty"], reverse=True),
+            }
+            for code in mpp_codes
+        }
@@ -1,8 +1,8 @@
 import logging
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models.user_profile_model import UserProfile
+from .models.user_profile_model import ReportingClosure, UserProfile
 from import_export.signals import post_import
 from .utils.import_flag import set_importing
 from facilitator.models.file_models import UploadedFile, FileActionLog
@@ -26,6 +26,39 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 
+@receiver(pre_save, sender=UserProfile)
+def remember_reports_to(sender, instance, **kwargs):
+    instance._previous_reports_to_id = (
+        UserProfile.objects.filter(pk=instance.pk)
+        .values_list("reports_to_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+    # Reject a cycle before the row is written, not after.
+    if instance.reports_to_id and instance.reports_to_id != instance._previous_reports_to_id:
+        ReportingClosure.objects.validate_move(
+            instance.user_id, instance.reports_to.user_id
+        )
+
+
+@receiver(post_save, sender=UserProfile)
+def update_reporting_closure(sender, instance, created, **kwargs):
+    """Keep ReportingClosure in step with reports_to."""
+    previous = getattr(instance, "_previous_reports_to_id", None)
+    if not created and previous == instance.reports_to_id:
+        return
+    parent_user_id = instance.reports_to.user_id if instance.reports_to_id else None
+    ReportingClosure.objects.move(instance.user_id, parent_user_id)
+
+
+@receiver(pre_delete, sender=UserProfile)
+def detach_from_reporting_closure(sender, instance, **kwargs):
+    # Before the cascade removes this user's rows, drop the links that ran
+    # through it so its reportees' supervisors stop seeing them.
+    ReportingClosure.objects.detach(instance.user_id)
+
+
 @receiver(post_import)
 def clear_import_flag(sender, **kwargs):
     set_importing(False)
@@ -1,3 +1,171 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .managers.closure_manager import closure_rows
+from .models.user_profile_model import ReportingClosure
+from .services.high_pourer_service import HighPourerService
+
+User = get_user_model()
+
+
+class ReportingClosureTest(TestCase):
+    """ReportingClosure must mirror UserProfile.reports_to at every depth."""
+
+    def setUp(self):
+        # head -> manager -> lead -> vet
+        self.users = {
+            name: User.objects.create_user(username=name)
+            for name in ("head", "manager", "lead", "vet", "other")
+        }
+        self._report("manager", "head")
+        self._report("lead", "manager")
+        self._report("vet", "lead")
+
+    def _report(self, name, supervisor):
+        profile = self.users[name].profile
+        profile.reports_to = self.users[supervisor].profile if supervisor else None
+        profile.save()
+
+    def _below(self, name, **kwargs):
+        return set(
+            User.objects.filter(
+                pk__in=ReportingClosure.objects.descendant_ids(
+                    self.users[name].pk, **kwargs
+                )
+            ).values_list("username", flat=True)
+        )
+
+    def test_descendants_at_every_depth(self):
+        self.assertEqual(self._below("head"), {"manager", "lead", "vet"})
+        self.assertEqual(self._below("head", max_depth=2), {"manager", "lead"})
+        self.assertTrue(
+            ReportingClosure.objects.is_ancestor(
+                self.users["head"].pk, self.users["vet"].pk
+            )
+        )
+
+    def test_moving_a_subtree(self):
+        self._report("lead", "other")
+
+        self.assertEqual(self._below("head"), {"manager"})
+        self.assertEqual(self._below("other"), {"lead", "vet"})
+        self.assertEqual(
+            ReportingClosure.objects.get(
+                ancestor=self.users["other"], descendant=self.users["vet"]
+            ).depth,
+            2,
+        )
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._report("head", "vet")
+
+        # The profile row is left as it was, not saved with the cycle.
+        self.users["head"].profile.refresh_from_db()
+        self.assertIsNone(self.users["head"].profile.reports_to_id)
+        self.assertEqual(self._below("head"), {"manager", "lead", "vet"})
+
+    def test_rebuild_command_repairs_drift(self):
+        ReportingClosure.objects.filter(
+            ancestor=self.users["head"], descendant=self.users["vet"]
+        ).delete()
+        ReportingClosure.objects.create(
+            ancestor=self.users["other"], descendant=self.users["vet"], depth=1
+        )
+
+        out = StringIO()
+        call_command("rebuild_reporting_closure", "--check", stdout=out)
+        self.assertIn("1 closure rows missing, 1 stale", out.getvalue())
+        self.assertEqual(self._below("other"), {"vet"})
+
+        call_command("rebuild_reporting_closure", stdout=StringIO())
+        self.assertEqual(self._below("head"), {"manager", "lead", "vet"})
+        self.assertEqual(self._below("other"), set())
+
+    def test_deleting_a_supervisor_detaches_reportees(self):
+        self.users["manager"].delete()
+
+        self.assertEqual(self._below("head"), set())
+        self.assertEqual(self._below("lead"), {"vet"})
+
+    def test_rebuild_matches_signals(self):
+        maintained = set(
+            ReportingClosure.objects.values_list("ancestor", "descendant", "depth")
+        )
+        ReportingClosure.objects.rebuild(
+            (user.pk, getattr(user.profile.reports_to, "user_id", None))
+            for user in User.objects.select_related("profile__reports_to")
+        )
+        rebuilt = set(
+            ReportingClosure.objects.values_list("ancestor", "descendant", "depth")
+        )
+        self.assertEqual(maintained, rebuilt)
+
+    def test_closure_rows_survive_cycles(self):
+        rows = closure_rows([(1, 2), (2, 1), (3, None)])
+        self.assertIn((3, 3, 0), rows)
+        self.assertEqual(len(rows), 5)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class HighPourerServiceTest(SimpleTestCase):
+    day = date(2025, 1, 15)
+
+    def setUp(self):
+        cache.clear()
+
+    def _entry(self, code, *quantities):
+        return {
+            "details": {"mpp_code": code},
+            "members": [
+                {"member_code": f"{code}-{i}", "qty": qty}
+                for i, qty in enumerate(sorted(quantities, reverse=True))
+            ],
+        }
+
+    def _fake_fetch(self, service, codes):
+        data = {
+            "A": self._entry("A", 60, 49, 10),
+            "B": self._entry("B", 80),
+            "C": self._entry("C", 5),
+        }
+        return {code: data[code] for code in codes}
+
+    def test_counts_and_members_split_on_threshold(self):
+        with mock.patch.object(
+            HighPourerService, "_fetch", autospec=True, side_effect=self._fake_fetch
+        ) as fetch:
+            service = HighPourerService(["A", "B", "C"], day=self.day)
+            self.assertEqual(service.counts(), {"high": 2, "low": 3})
+            self.assertEqual(
+                [(m["mpp_code"], len(m["members"])) for m in service.high_pourers()],
+                [("A", 1), ("B", 1)],
+            )
+        fetch.assert_called_once()
+
+    def test_mpp_entries_are_shared_between_facilitators(self):
+        with mock.patch.object(
+            HighPourerService, "_fetch", autospec=True, side_effect=self._fake_fetch
+        ) as fetch:
+            HighPourerService(["A", "B"], day=self.day).counts()
+            HighPourerService(["B", "C"], day=self.day).counts()
+
+        self.assertEqual(fetch.call_args_list[1].args[1], ["C"])
+
+    def test_threshold_is_applied_to_cached_totals(self):
+        with mock.patch.object(
+            HighPourerService, "_fetch", autospec=True, side_effect=self._fake_fetch
+        ) as fetch:
+            HighPourerService(["A"], day=self.day).counts()
+            counts = HighPourerService(["A"], day=self.day, threshold=5).counts()
+
+        self.assertEqual(counts, {"high": 3, "low": 0})
+        fetch.assert_called_once()
@@ -2,7 +2,7 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-import requests
+from notifications import sms
 from django.db.models import Q
 from member.serialzers import VerifyOTPSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -58,7 +58,11 @@ class GenerateOTPView(APIView):
             )
 
         return Response(
-            {"status": "success", "message": _("OTP sent successfully.")},
+            {
+                "status": "success",
+                "message": _("OTP sent successfully."),
+                "sms_id": info["sms_id"],
+            },
             status=status.HTTP_200_OK,
         )
 
@@ -131,29 +135,7 @@ class VerifyOTPView(generics.GenericAPIView):
 
 
 def send_sms_api(mobile, otp):
-    url = "https://alerts.cbis.in/SMSApi/send"
-    params = {
-        "userid": "kashee",
-        "output": "json",
-        "password": "Kash@12",
-        "sendMethod": "quick",
-        "mobile": mobile,
-        "msg": f"आपका काशी ई-डेयरी लॉगिन ओटीपी कोड {otp} है। किसी के साथ साझा न करें- काशी डेरी",
-        "senderid": "KMPCLV",
-        "msgType": "unicode",
-        "dltEntityId": "1001453540000074525",
-        "dltTemplateId": "1007171661975556092",
-        "duplicatecheck": "true",
-    }
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if response.status_code == 200:
-            return True, data
-        return False, data
-    except requests.RequestException as e:
-        return False, str(e)
+    return sms.send_otp(mobile, otp)
 
 
 class VerifySession(APIView):
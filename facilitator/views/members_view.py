@@ -183,7 +183,12 @@ class MonthlyDataView(APIView):
 
 
 class LocalSaleViewSet(viewsets.ModelViewSet):
-    queryset = LocalSaleTxn.objects.all()
+    queryset = LocalSaleTxn.objects.select_related(
+        "local_sale_code",
+        "binlocation_code",
+        "product_code__product_category_code",
+        "product_code__brand_code",
+    )
     serializer_class = LocalSaleTxnSerializer
     authentication_classes = [ApiKeyAuthentication]
     # permission_classes = [IsAuthenticated]
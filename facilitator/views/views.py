@@ -26,6 +26,9 @@ from django.utils.dateparse import parse_date
 from facilitator.db.erp_db_queries import (
     get_poured_mpp_data,
 )
+from member.services.collection_series import CollectionSeriesService
+from ..services.high_pourer_service import HighPourerService
+from erp_app.reference_data import reference_data
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -444,15 +447,19 @@ class DashboardNewDetailAPI(APIView):
         }
 
     def get_shifts(self):
-        shifts = Shift.objects.filter(shift_short_name__in=["M", "E"]).values_list(
-            "shift_short_name", "shift_code"
+        shifts = reference_data.index("shift", "short_name")
+        return tuple(
+            shifts[name]["shift_code"] if name in shifts else None for name in ("M", "E")
         )
-        shift_dict = dict(shifts)
-        return shift_dict.get("M"), shift_dict.get("E")
 
 
 class LocalSaleViewSet(viewsets.ModelViewSet):
-    queryset = LocalSaleTxn.objects.all()
+    queryset = LocalSaleTxn.objects.select_related(
+        "local_sale_code",
+        "binlocation_code",
+        "product_code__product_category_code",
+        "product_code__brand_code",
+    )
     authentication_classes = [JWTAuthentication]
     serializer_class = [LocalSaleTxnSerializer]
     permission_classes = [IsAuthenticated]
@@ -570,7 +577,12 @@ class LocalSaleViewSet(viewsets.ModelViewSet):
 
 
 class SaleToMembersViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = LocalSaleTxn.objects.all()
+    queryset = LocalSaleTxn.objects.select_related(
+        "local_sale_code",
+        "binlocation_code",
+        "product_code__product_category_code",
+        "product_code__brand_code",
+    )
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = LocalSaleTxnSerializer
@@ -953,18 +965,7 @@ class GetHighPourerData(APIView):
 
     def get(self, request):
         user = request.user
-        collection_date_str = request.GET.get("collection_date")
-        collection_date = (
-            timezone.now().date()
-            if collection_date_str is None
-            else collection_date_str
-        )
-
-        # Optional: Enable caching if needed
-        cache_key = f"high_pourer_counts_{user.id}_{collection_date}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
+        collection_date = request.GET.get("collection_date")
 
         # Get assigned MPP codes
         mpp_codes = list(self.get_mpps(user))
@@ -974,43 +975,23 @@ class GetHighPourerData(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Get active/default members under user's MPPs
-        member_codes = (
-            MemberHierarchyView.objects.filter(
-                mpp_code__in=mpp_codes, is_active=True, is_default=True
-            )
-            .only("member_code")
-            .values_list("member_code", flat=True)
-        )
+        service = HighPourerService(mpp_codes, day=collection_date)
+        counts = service.counts()
+        threshold = f"{service.threshold:g}"
 
-        # Aggregate total quantity per member for the given date
-        aggregated = (
-            MppCollection.objects.filter(
-                references__collection_date__date=collection_date,
-                member_code__in=member_codes,
-            )
-            .values("member_code")
-            .annotate(total_qty=Sum("qty"))
-        )
-
-        # Count high and low pourers
-        high_pourers_count = aggregated.filter(total_qty__gt=49).count()
-        low_pourers_count = aggregated.filter(total_qty__lte=49).count()
-
-        # Prepare the response data
         data = {
             "key": "high_pourers",
             "title": "High Pourers",
             "data": [
                 {
-                    "title": "> 49 L",
-                    "value": high_pourers_count,
+                    "title": f"> {threshold} L",
+                    "value": counts["high"],
                     "color": "#27ae60",
                     "text_color": "#0b2d36",
                 },
                 {
-                    "title": "<= 49 L",
-                    "value": low_pourers_count,
+                    "title": f"<= {threshold} L",
+                    "value": counts["low"],
                     "color": "#f39c12",
                     "text_color": "#ffffff",
                 },
@@ -1022,10 +1003,6 @@ class GetHighPourerData(APIView):
             "status": "success",
             "data": data,
         }
-
-        # Optional: Cache result
-        cache.set(cache_key, response_data, timeout=CACHE_TIMEOUT)
-
         return Response(response_data, status=status.HTTP_200_OK)
 
     def get_mpps(self, user):
@@ -1040,18 +1017,7 @@ class GetHighPourerMembers(APIView):
 
     def get(self, request):
         user = request.user
-        collection_date_str = request.GET.get("collection_date")
-        collection_date = (
-            timezone.now().date()
-            if collection_date_str is None
-            else collection_date_str
-        )
-
-        # Use caching
-        cache_key = f"high_pourers_{user.id}_{collection_date}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
+        collection_date = request.GET.get("collection_date")
 
         # Step 1: Get assigned MPP codes
         mpp_codes = list(self.get_mpps(user))
@@ -1061,62 +1027,18 @@ class GetHighPourerMembers(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        all_members = MemberHierarchyView.objects.filter(
-            mpp_code__in=mpp_codes, is_active=True, is_default=True
-        ).values("member_code", "member_tr_code", "member_name", "mobile_no")
-
-        member_codes = all_members.values_list("member_code", flat=True)
-        aggregated = (
-            MppCollection.objects.filter(
-                references__collection_date__date=collection_date,
-                member_code__in=member_codes,
-            )
-            .values("member_code", "references__mpp_code__mpp_code")
-            .annotate(total_qty=Sum("qty"))
-        )
-
-        mpp_codes_in_result = [m["references__mpp_code__mpp_code"] for m in aggregated]
-        mpp_queryset = Mpp.objects.only(
-            "mpp_code", "mpp_ex_code", "mpp_name", "mpp_short_name"
-        ).filter(mpp_code__in=mpp_codes_in_result)
-        mpp_map = {
-            mpp.mpp_code: {
-                "mpp_code": mpp.mpp_code,
-                "mpp_ex_code": mpp.mpp_ex_code,
-                "mpp_name": mpp.mpp_name or mpp.mpp_short_name,
-            }
-            for mpp in mpp_queryset
-        }
-        high_pourers = aggregated.filter(total_qty__gt=49)
-        from collections import defaultdict
-
-        mpp_data = defaultdict(lambda: {"details": {}, "members": []})
-        for entry in high_pourers:
-            mpp_code = entry["references__mpp_code__mpp_code"]
-            member_obj = all_members.filter(member_code=entry["member_code"]).last()
-            if member_obj:
-                member = {
-                    "member": {
-                        "member_code": member_obj["member_code"],
-                        "member_tr_code": member_obj["member_tr_code"],
-                        "member_name": member_obj["member_name"],
-                        "mobile_no": member_obj["mobile_no"],
-                        "qty": entry["total_qty"],
-                    }
-                }
-                if not mpp_data[mpp_code]["details"]:
-                    mpp_data[mpp_code]["details"] = mpp_map.get(mpp_code, {})
-                mpp_data[mpp_code]["members"].append(member)
         mpp_data = [
-            {**mpp["details"], "members": mpp["members"]}
-            for mpp_code, mpp in mpp_data.items()
+            {
+                **{key: value for key, value in mpp.items() if key != "members"},
+                "members": [{"member": member} for member in mpp["members"]],
+            }
+            for mpp in HighPourerService(mpp_codes, day=collection_date).high_pourers()
         ]
         response = {
             "status": "success",
             "message": "Highest pourer fetched successfully",
             "data": mpp_data,
         }
-        cache.set(cache_key, response, timeout=CACHE_TIMEOUT)
         return Response(response, status=status.HTTP_200_OK)
 
     def get_mpps(self, user):
@@ -1205,7 +1127,7 @@ class GetDailyMppCollections(APIView):
             return user.mpps.only("mpp_code").values_list("mpp_code", flat=True)
         return []
 
-from django.db.models import Sum, Case, When, FloatField, Value
+from django.db.models import Sum, FloatField
 
 
 class GetTotalQtyForToday(APIView):
@@ -1236,34 +1158,22 @@ class GetTotalQtyForToday(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        base_filter = {
-            "references__mpp_code__in": mpp_codes,
-            "references__collection_date__date": collection_date,
-        }
+        collection_day = parse_date(collection_date)
+        if collection_day is None:
+            return Response(
+                {"message": "collection_date must be YYYY-MM-DD", "status": "error"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # ⚡️ One single query
-        data = MppCollection.objects.filter(**base_filter).aggregate(
-            total_qty=Sum("qty", output_field=FloatField()),
-            qty_m=Sum(
-                Case(
-                    When(shift_code__shift_short_name="M", then="qty"),
-                    default=Value(0),
-                    output_field=FloatField(),
-                )
-            ),
-            qty_e=Sum(
-                Case(
-                    When(shift_code__shift_short_name="E", then="qty"),
-                    default=Value(0),
-                    output_field=FloatField(),
-                )
-            ),
+        # ⚡️ One grouped query, cached per MPP and day
+        [day] = CollectionSeriesService.mpp_series(
+            mpp_codes, collection_day, collection_day
         )
 
         response_data = {
-            "total_qty": float(data["total_qty"] or 0),
-            "qty_m": float(data["qty_m"] or 0),
-            "qty_e": float(data["qty_e"] or 0),
+            "total_qty": day["total_qty"],
+            "qty_m": day["morning_shift_qty"],
+            "qty_e": day["evening_shift_qty"],
         }
 
         cache.set(cache_key, response_data, timeout=CACHE_TIMEOUT)
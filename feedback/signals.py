@@ -5,10 +5,9 @@ from django.db.models.signals import pre_save, post_save
 from django.contrib.auth import get_user_model
 import logging
 
-from notifications.notification_service import NotificationServices
+from notifications.outbox import enqueue_notification
 
 User = get_user_model()
-notification_service = NotificationServices()
 
 logger = logging.getLogger(__name__)
 
@@ -56,9 +55,9 @@ def feedback_comment_post_save(sender, instance, created, **kwargs):
         "site_name": "Kashee E-Dairy",
     }
 
-    notification_service.create_notification(
-        template_name="feedback_update_hi",
-        recipient=recipient,
+    enqueue_notification(
+        "feedback_update_hi",
+        recipients=[recipient],
         sender=comment_user,
         context=context,
         related_object=feedback,
@@ -80,9 +79,9 @@ def feedback_post_save(sender, instance, created, **kwargs):
             "site_name": "Kashee E-Dairy",
         }
 
-        notification_service.create_notification(
-            template_name="feedback_update_hi",
-            recipient=instance.sender,
+        enqueue_notification(
+            "feedback_update_hi",
+            recipients=[instance.sender_id],
             context=context,
             related_object=instance,
             channels=["push"],
@@ -101,9 +100,9 @@ def feedback_post_save(sender, instance, created, **kwargs):
             "priority": instance.priority,
         }
 
-        notification_service.create_notification(
-            template_name="feedback_update_hi",
-            recipient=instance.assigned_to,
+        enqueue_notification(
+            "feedback_update_hi",
+            recipients=[instance.assigned_to],
             sender=instance.sender,
             context=context,
             related_object=instance,
@@ -129,10 +128,10 @@ def feedback_post_save(sender, instance, created, **kwargs):
             "status_label": status_label,
         }
 
-        notification_service.create_notification(
-            template_name="feedback_status_change_hi",
-            recipient=instance.sender,
-            sender=instance.assigned_to,
+        enqueue_notification(
+            "feedback_status_change_hi",
+            recipients=[instance.sender_id],
+            sender=instance.assigned_to_id,
             context=context,
             related_object=instance,
             channels=["push"],
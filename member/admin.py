@@ -9,7 +9,9 @@ from facilitator.models.user_profile_model import UserProfile
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from django.db import transaction as db_transaction
 from .filters import PublishedFilter, RecentNewsFilter
+from notifications.counters import forget_news
 
 
 User = get_user_model()
@@ -411,6 +413,7 @@ class NewsAdmin(admin.ModelAdmin):
     def make_published(self, request, queryset):
         """Bulk publish articles"""
         updated = queryset.update(is_published=True)
+        forget_news()
         self.message_user(
             request,
             _(f"{updated} article(s) successfully published."),
@@ -420,6 +423,7 @@ class NewsAdmin(admin.ModelAdmin):
     def make_draft(self, request, queryset):
         """Bulk unpublish articles"""
         updated = queryset.update(is_published=False)
+        forget_news()
         self.message_user(
             request,
             _(f"{updated} article(s) moved to draft."),
@@ -447,6 +451,7 @@ class NewsAdmin(admin.ModelAdmin):
     def mark_as_read(self, request, queryset):
         """Mark articles as read"""
         updated = queryset.update(is_read=True)
+        forget_news()
         self.message_user(
             request,
             _(f"{updated} article(s) marked as read."),
@@ -456,6 +461,7 @@ class NewsAdmin(admin.ModelAdmin):
     def mark_as_unread(self, request, queryset):
         """Mark articles as unread"""
         updated = queryset.update(is_read=False)
+        forget_news()
         self.message_user(
             request,
             _(f"{updated} article(s) marked as unread."),
@@ -554,6 +560,31 @@ class RewardLedgerAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     date_hierarchy = "created_at"
 
+    # Entries are final: editing or deleting one would leave the balance row
+    # out of step with the ledger. Corrections are new adjustment entries.
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def save_model(self, request, obj, form, change):
+        # Manual entries move the balance row like any other ledger entry.
+        with db_transaction.atomic():
+            balance = RewardBalance.lock([obj.user_id])[obj.user_id]
+            balance.apply(obj.transaction_type, obj.amount)
+            obj.balance_after = balance.balance
+            super().save_model(request, obj, form, change)
+            balance.save(update_fields=RewardBalance.TOTAL_FIELDS)
+
+
+@admin.register(RewardBalance)
+class RewardBalanceAdmin(admin.ModelAdmin):
+    list_display = ("user", "balance", "total_earned", "total_withdrawn", "updated_at")
+    search_fields = ("user__username",)
+    readonly_fields = ("user", "balance", "total_earned", "total_withdrawn", "updated_at")
+    ordering = ("-updated_at",)
+
 
 @admin.register(RewardWithdrawalRequest)
 class RewardWithdrawalRequestAdmin(admin.ModelAdmin):
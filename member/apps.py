@@ -6,3 +6,8 @@ class MemberConfig(AppConfig):
     name = 'member'
     label = 'member'
     verbose_name = _('Kashee Member')
+
+    def ready(self):
+        from . import menu_badges, menu_signals  # noqa: F401 (connects receivers)
+
+        menu_badges.autodiscover()
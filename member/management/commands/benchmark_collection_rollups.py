@@ -0,0 +1,106 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from erp_app.mixins import FastTotalsMixin
+from erp_app.models import MemberMaster
+from member.services.collection_rollup import CollectionRollupService
+from member.services.collection_series import (
+    CollectionSeriesService,
+    SOURCE_LIVE,
+    SOURCE_ROLLUP,
+    WINDOW_DAYS,
+    resolve_window,
+)
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare dashboard read latency between live ERP (MSSQL) aggregates "
+        "and the local collection rollups"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--members",
+            type=int,
+            default=20,
+            help="Number of active members to sample",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Reads per member per path",
+        )
+        parser.add_argument(
+            "--member-code",
+            action="append",
+            dest="member_codes",
+            help="Benchmark specific member codes (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        member_codes = options["member_codes"] or list(
+            MemberMaster.objects.filter(is_active=True)
+            .values_list("member_code", flat=True)[: options["members"]]
+        )
+        if not member_codes:
+            raise CommandError("No members to benchmark")
+
+        today = timezone.localdate()
+        fy_start_year = today.year - 1 if today.month < 4 else today.year
+        start_date = f"{fy_start_year}-04-01"
+        end_date = f"{fy_start_year + 1}-03-31"
+        last_5_days = resolve_window(WINDOW_DAYS, anchor=today, days=5)
+
+        scenarios = {
+            "fiscal-year totals": (
+                lambda code: FastTotalsMixin.calculate_live_totals(
+                    code, start_date, end_date
+                ),
+                lambda code: CollectionRollupService.get_member_totals(
+                    code, start_date, end_date
+                ),
+            ),
+            "last 5 days": (
+                lambda code: CollectionSeriesService.member_series(
+                    code, *last_5_days, source=SOURCE_LIVE, use_cache=False
+                ),
+                lambda code: CollectionSeriesService.member_series(
+                    code, *last_5_days, source=SOURCE_ROLLUP, use_cache=False
+                ),
+            ),
+        }
+
+        self.stdout.write(
+            self.style.WARNING(
+                f"Benchmarking {len(member_codes)} members x "
+                f"{options['iterations']} iterations"
+            )
+        )
+        for name, (live, rollup) in scenarios.items():
+            for label, fn in (("live", live), ("rollup", rollup)):
+                samples = []
+                for code in member_codes:
+                    for _ in range(options["iterations"]):
+                        started = time.perf_counter()
+                        fn(code)
+                        samples.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"{name:<20} {label:<7} "
+                    f"n={len(samples):<5} "
+                    f"p50={statistics.median(samples):8.2f}ms "
+                    f"p95={_percentile(samples, 95):8.2f}ms "
+                    f"max={max(samples):8.2f}ms"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,134 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from member.models import OTP, MemberLoginIndex
+from member.services.login_index import refresh_login_index
+from member.views.member import GenerateOTPView
+
+ERP_DB = "sarthak_kashee"
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test OTP generation against the member login index. SMS sending "
+        "is replaced by a dry run; run against staging, not production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Total OTP requests to send"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=20, help="Parallel request threads"
+        )
+        parser.add_argument(
+            "--numbers",
+            type=int,
+            default=200,
+            help="Number of indexed mobile numbers to sample",
+        )
+        parser.add_argument(
+            "--phone",
+            action="append",
+            dest="phones",
+            help="Use specific mobile numbers (repeatable)",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Rebuild the login index before the run",
+        )
+
+    def handle(self, *args, **options):
+        if options["refresh"]:
+            result = refresh_login_index()
+            self.stdout.write(f"Login index refreshed: {result}")
+
+        phones = options["phones"] or list(
+            MemberLoginIndex.objects.filter(eligible_count=1)
+            .values_list("mobile_no", flat=True)[: options["numbers"]]
+        )
+        if not phones:
+            raise CommandError("No indexed mobile numbers to test with")
+
+        factory = APIRequestFactory()
+        view = GenerateOTPView.as_view()
+        lock = threading.Lock()
+        latencies, statuses = [], {}
+        query_counts = {"default": 0, ERP_DB: 0}
+
+        def hit(i):
+            phone = phones[i % len(phones)]
+            request = factory.post(
+                "/api/otp/generate/", {"phone_number": phone}, format="json"
+            )
+            try:
+                with CaptureQueriesContext(connections["default"]) as local, \
+                        CaptureQueriesContext(connections[ERP_DB]) as erp:
+                    started = time.perf_counter()
+                    response = view(request)
+                    elapsed = (time.perf_counter() - started) * 1000
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                query_counts["default"] += len(local)
+                query_counts[ERP_DB] += len(erp)
+
+        self.stdout.write(
+            self.style.WARNING(
+                f"Sending {options['requests']} OTP requests over "
+                f"{len(phones)} numbers, concurrency={options['concurrency']}"
+            )
+        )
+        run_started = timezone.now()
+        with mock.patch(
+            "member.views.member.send_sms_api",
+            return_value=(True, {"sms_id": "dry-run"}),
+        ), mock.patch.object(GenerateOTPView, "throttle_classes", []), mock.patch.object(
+            GenerateOTPView, "authentication_classes", []
+        ):
+            wall = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                list(pool.map(hit, range(options["requests"])))
+            wall = time.perf_counter() - wall
+
+        # Drop the OTPs issued by the run so no test code stays valid.
+        OTP.objects.filter(phone_number__in=phones, created_at__gte=run_started).delete()
+
+        total = len(latencies)
+        self.stdout.write(
+            f"n={total} "
+            f"p50={statistics.median(latencies):8.2f}ms "
+            f"p95={_percentile(latencies, 95):8.2f}ms "
+            f"p99={_percentile(latencies, 99):8.2f}ms "
+            f"max={max(latencies):8.2f}ms "
+            f"throughput={total / wall:8.1f} req/s"
+        )
+        self.stdout.write(
+            f"statuses={dict(sorted(statuses.items()))} "
+            f"queries/request local={query_counts['default'] / total:.2f} "
+            f"erp={query_counts[ERP_DB] / total:.2f}"
+        )
+        if query_counts[ERP_DB]:
+            raise CommandError(
+                f"{query_counts[ERP_DB]} ERP queries issued during the run; "
+                "the login index is missing numbers"
+            )
+        self.stdout.write(self.style.SUCCESS("Load test complete"))
@@ -10,6 +10,7 @@ from django.contrib.auth import get_user_model
 from notifications.model import Notification, NotificationStatus, NotificationTemplate
 from member.models import SahayakIncentives
 from notifications.tasks import process_collections_batch
+from notifications import counters
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -151,6 +152,9 @@ class Command(BaseCommand):
             created_notifications = Notification.objects.bulk_create(
                 notifications_to_create, batch_size=500
             )
+            counters.notifications_created(
+                [n.recipient_id for n in created_notifications]
+            )
             # all_ids = [n.pk for n in created_notifications]
             # transaction.on_commit(lambda: process_collections_batch.delay(all_ids))
 
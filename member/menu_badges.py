@@ -0,0 +1,201 @@
+"""
+Badge engine for menu items.
+
+A badge is named by the dotted path stored in ``MenuItem.badge_resolver``.
+Apps register their resolvers in a ``badges`` module (imported once at
+startup by ``MemberConfig.ready``) and may give them batch forms:
+
+- ``group``: one callable computes every badge of the group for a user in a
+  single query (``register_group``);
+- ``for_users``: computes one badge for many users in a grouped query.
+
+Unregistered paths still work: they are imported on first use and then
+kept, like registered ones.
+
+Counts are cached per badge and user under ``menu:badge:<path>:<user_id>``
+with the badge's TTL. A menu reads all of a user's badges with one
+``get_many``; writers call ``invalidate(event, user_ids)`` so a badge that
+listens to the event is recomputed on the next read.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.module_loading import autodiscover_modules, import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300  # 5 minutes
+
+
+@dataclass
+class BadgeResolver:
+    path: str
+    func: Callable
+    for_users: Optional[Callable] = None
+    group: Optional[str] = None
+    ttl: int = DEFAULT_TTL
+    events: tuple = ()
+
+
+_registry: Dict[str, BadgeResolver] = {}
+_groups: Dict[str, Callable] = {}
+_failed = set()
+_lock = threading.Lock()
+
+
+def register(path=None, *, for_users=None, group=None, ttl=DEFAULT_TTL, events=()):
+    """
+    Decorator registering a single-user resolver ``func(user) -> count``.
+    ``path`` defaults to the function's dotted path.
+    """
+
+    def decorator(func):
+        name = path or f"{func.__module__}.{func.__qualname__}"
+        _registry[name] = BadgeResolver(
+            path=name,
+            func=func,
+            for_users=for_users,
+            group=group,
+            ttl=ttl,
+            events=tuple(events),
+        )
+        return func
+
+    return decorator
+
+
+def register_group(name, func):
+    """``func(user) -> {badge path: count}`` for every badge in group ``name``."""
+    _groups[name] = func
+
+
+def autodiscover():
+    autodiscover_modules("badges")
+
+
+def get_resolver(path) -> Optional[BadgeResolver]:
+    resolver = _registry.get(path)
+    if resolver is not None or path in _failed:
+        return resolver
+    with _lock:
+        if path in _registry:
+            return _registry[path]
+        try:
+            _registry[path] = BadgeResolver(path=path, func=import_string(path))
+        except ImportError as e:
+            logger.error(f"Badge resolver '{path}' cannot be imported: {e}")
+            _failed.add(path)
+            return None
+    return _registry[path]
+
+
+def cache_key(path, user_id) -> str:
+    return f"menu:badge:{path}:{user_id}"
+
+
+def _store(values: Dict[str, tuple]) -> None:
+    """``values``: key -> (count, ttl); written with one ``set_many`` per TTL."""
+    by_ttl = defaultdict(dict)
+    for key, (count, ttl) in values.items():
+        by_ttl[ttl][key] = count
+    for ttl, batch in by_ttl.items():
+        try:
+            cache.set_many(batch, ttl)
+        except Exception as e:
+            logger.warning(f"Could not cache menu badges: {e}")
+
+
+def _cached(keys) -> dict:
+    try:
+        return cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Menu badge cache unavailable: {e}")
+        return {}
+
+
+def resolve_for_user(user, paths: Iterable[str], use_cache=True) -> Dict[str, int]:
+    """
+    Counts of ``paths`` for one user. Badges of the same group are computed
+    by a single group call; failing resolvers are left out.
+    """
+    resolvers = {path: get_resolver(path) for path in set(paths)}
+    resolvers = {path: r for path, r in resolvers.items() if r is not None}
+    keys = {path: cache_key(path, user.id) for path in resolvers}
+    cached = _cached(keys.values()) if use_cache else {}
+
+    counts, fresh, groups_done = {}, {}, set()
+    for path, resolver in resolvers.items():
+        if keys[path] in cached:
+            counts[path] = cached[keys[path]]
+            continue
+        if path in counts:
+            continue
+
+        try:
+            if resolver.group in _groups:
+                if resolver.group in groups_done:
+                    continue
+                groups_done.add(resolver.group)
+                results = _groups[resolver.group](user)
+            else:
+                results = {path: resolver.func(user)}
+        except Exception as e:
+            logger.exception(f"Badge resolver error for '{path}': {e}")
+            continue
+
+        for result_path, count in results.items():
+            if result_path not in resolvers or keys[result_path] in cached:
+                continue
+            counts[result_path] = count or 0
+            fresh[keys[result_path]] = (count or 0, resolvers[result_path].ttl)
+
+    _store(fresh)
+    return counts
+
+
+def resolve_for_users(path, user_ids: Iterable[int], use_cache=True) -> Dict[int, int]:
+    """One badge for many users, through ``for_users`` when registered."""
+    resolver = get_resolver(path)
+    if resolver is None:
+        return {}
+    user_ids = list(set(user_ids))
+    keys = {user_id: cache_key(path, user_id) for user_id in user_ids}
+    cached = _cached(keys.values()) if use_cache else {}
+
+    counts = {uid: cached[keys[uid]] for uid in user_ids if keys[uid] in cached}
+    missing = [uid for uid in user_ids if uid not in counts]
+    if missing:
+        try:
+            if resolver.for_users:
+                computed = resolver.for_users(missing)
+            else:
+                users = get_user_model().objects.filter(pk__in=missing)
+                computed = {user.pk: resolver.func(user) for user in users}
+        except Exception as e:
+            logger.exception(f"Badge resolver error for '{path}': {e}")
+            computed = {}
+        fresh = {}
+        for uid in missing:
+            if uid in computed:
+                counts[uid] = computed[uid] or 0
+                fresh[keys[uid]] = (counts[uid], resolver.ttl)
+        _store(fresh)
+    return counts
+
+
+def invalidate(event, user_ids: Iterable[int]) -> None:
+    """Drop the cached badges listening to ``event`` for ``user_ids``."""
+    paths = [path for path, r in _registry.items() if event in r.events]
+    keys = [cache_key(path, uid) for path in paths for uid in set(user_ids)]
+    if not keys:
+        return
+    try:
+        cache.delete_many(keys)
+    except Exception as e:
+        logger.warning(f"Could not drop menu badges for {event}: {e}")
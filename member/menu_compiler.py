@@ -0,0 +1,235 @@
+"""
+Menu compilation shared across users.
+
+The active menu is compiled once per menu version and tenant into a flat
+list of nodes in tree order, each carrying its access rules (roles,
+permissions, feature flag, tenant). Users with the same roles, permissions,
+tenant and enabled feature flags see the same menu, so the filtered tree is
+cached per access signature instead of per user. Per-user data
+(preferences, badges) is applied on top by ``MenuFilterService``.
+
+Any change to the menu structure bumps the version (``bump_version``),
+which orphans every compiled menu and signature tree at once.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .menu_model import MenuItem
+
+VERSION_KEY = "menu:version"
+COMPILED_TIMEOUT = 3600
+SIGNATURE_TIMEOUT = 600
+
+NODE_FIELDS = (
+    "code",
+    "label",
+    "icon",
+    "path",
+    "is_external",
+    "opens_new_tab",
+    "css_class",
+    "badge_resolver",
+    "badge_color",
+)
+
+# Compiled menus of the current version, kept in-process so a warm worker
+# does not unpickle the whole menu for every signature miss.
+_local = {"version": None, "menus": {}}
+_local_lock = threading.Lock()
+
+
+def _initial_version() -> int:
+    # Time-based, so a version lost from the cache never repeats an old one.
+    return int(time.time() * 1000)
+
+
+def current_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _initial_version(), None)
+        version = cache.get(VERSION_KEY) or _initial_version()
+    return version
+
+
+def bump_version() -> int:
+    """Invalidate every compiled menu and signature tree."""
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, _initial_version(), None)
+        return current_version()
+
+
+def _tenant_part(tenant) -> str:
+    return str(tenant.pk) if tenant else "global"
+
+
+def compiled_key(version, tenant=None) -> str:
+    return f"menu:compiled:{version}:{_tenant_part(tenant)}"
+
+
+def signature_key(version, signature) -> str:
+    return f"menu:sig:{version}:{signature}"
+
+
+# ---------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------
+def _items_queryset(tenant=None):
+    queryset = MenuItem.objects.filter(is_active=True, is_visible=True)
+    if tenant:
+        return queryset.filter(Q(tenant=tenant) | Q(tenant__isnull=True))
+    return queryset.filter(tenant__isnull=True)
+
+
+def compile_menu(tenant=None) -> List[Dict[str, Any]]:
+    """
+    Active, visible menu items as plain dicts in tree order, with their
+    role codes and ``app_label.codename`` permissions. Three queries.
+    """
+    items = _items_queryset(tenant)
+    roles, permissions = {}, {}
+    for item_id, code in MenuItem.roles.through.objects.filter(
+        menuitem__in=items
+    ).values_list("menuitem_id", "role__code"):
+        roles.setdefault(item_id, []).append(code)
+    for item_id, app_label, codename in MenuItem.required_permissions.through.objects.filter(
+        menuitem__in=items
+    ).values_list(
+        "menuitem_id", "permission__content_type__app_label", "permission__codename"
+    ):
+        permissions.setdefault(item_id, []).append(f"{app_label}.{codename}")
+
+    nodes = []
+    for row in items.order_by("tree_id", "lft", "order").values(
+        "id", "parent_id", "tenant_id", "feature_flag", *NODE_FIELDS
+    ):
+        item_id = row.pop("id")
+        parent_id = row.pop("parent_id")
+        tenant_id = row.pop("tenant_id")
+        row.update(
+            pk=str(item_id),
+            parent=str(parent_id) if parent_id else None,
+            tenant=str(tenant_id) if tenant_id else None,
+            roles=sorted(roles.get(item_id, [])),
+            permissions=sorted(permissions.get(item_id, [])),
+        )
+        nodes.append(row)
+    return nodes
+
+
+def get_compiled_menu(version, tenant=None, use_cache=True) -> List[Dict[str, Any]]:
+    tenant_part = _tenant_part(tenant)
+    if use_cache:
+        if _local["version"] == version and tenant_part in _local["menus"]:
+            return _local["menus"][tenant_part]
+        nodes = cache.get(compiled_key(version, tenant))
+    else:
+        nodes = None
+
+    if nodes is None:
+        nodes = compile_menu(tenant)
+        cache.set(compiled_key(version, tenant), nodes, COMPILED_TIMEOUT)
+
+    with _local_lock:
+        if _local["version"] != version:
+            _local["version"], _local["menus"] = version, {}
+        _local["menus"][tenant_part] = nodes
+    return nodes
+
+
+# ---------------------------------------------------------
+# Access signatures
+# ---------------------------------------------------------
+def enabled_feature_flags() -> List[str]:
+    return sorted(
+        name for name, on in getattr(settings, "FEATURE_FLAGS", {}).items() if on
+    )
+
+
+def access_signature(user_context) -> str:
+    """
+    Hash of everything the filtered menu depends on. Superusers see every
+    item, so their roles and permissions are left out and they share one tree.
+    """
+    is_superuser = user_context.is_superuser
+    parts = {
+        "superuser": is_superuser,
+        "roles": [] if is_superuser else sorted(user_context.roles),
+        "permissions": [] if is_superuser else sorted(user_context.permissions),
+        "tenant": _tenant_part(user_context.tenant),
+        "flags": enabled_feature_flags(),
+    }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def node_visible(node, user_context, flags) -> bool:
+    """Same rules as ``MenuFilterService.has_item_access``, on a compiled node."""
+    if user_context.is_superuser:
+        return True
+    if node["feature_flag"] and node["feature_flag"] not in flags:
+        return False
+    if (
+        node["tenant"]
+        and user_context.tenant
+        and node["tenant"] != str(user_context.tenant.pk)
+    ):
+        return False
+    if node["roles"] and not user_context.has_any_role(set(node["roles"])):
+        return False
+    if node["permissions"] and not user_context.has_all_permissions(
+        set(node["permissions"])
+    ):
+        return False
+    return True
+
+
+def filter_tree(nodes, user_context) -> List[Dict[str, Any]]:
+    """
+    Nest the nodes visible to ``user_context``. A node is only kept when its
+    parent is, so hidden sections drop their whole subtree.
+    """
+    flags = set(enabled_feature_flags())
+    roots, placed = [], {}
+    for node in nodes:
+        parent = node["parent"]
+        if parent is not None and parent not in placed:
+            continue
+        if not node_visible(node, user_context, flags):
+            continue
+        out = {"pk": node["pk"], "children": []}
+        out.update((field, node[field]) for field in NODE_FIELDS)
+        placed[node["pk"]] = out
+        (roots if parent is None else placed[parent]["children"]).append(out)
+    return roots
+
+
+def get_signature_menu(
+    signature, user_context, version=None, use_cache=True
+) -> List[Dict[str, Any]]:
+    """
+    Filtered menu tree shared by every user with ``signature``.
+    ``user_context`` is only consulted when the tree has to be built.
+    """
+    version = version or current_version()
+    key = signature_key(version, signature)
+    tree = cache.get(key) if use_cache else None
+    if tree is None:
+        nodes = get_compiled_menu(version, user_context.tenant, use_cache=use_cache)
+        tree = filter_tree(nodes, user_context)
+        cache.set(key, tree, SIGNATURE_TIMEOUT)
+    return tree
+
+
+def iter_nodes(tree):
+    for node in tree:
+        yield node
+        yield from iter_nodes(node["children"])
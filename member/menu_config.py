@@ -8,11 +8,11 @@ from typing import List, Dict, Any, Optional, Set
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.db.models import Prefetch, Q
-from django.utils.module_loading import import_string
 from django.conf import settings
 import logging
 
 from .menu_model import MenuItem, Role, MenuAccessLog
+from . import menu_badges, menu_compiler
 
 logger = logging.getLogger(__name__)
 
@@ -95,11 +95,15 @@ class UserContext:
 class MenuFilterService:
     """
     Service for filtering menu items based on user permissions and roles.
-    Integrates with MenuItem model and provides optimized queries.
+
+    The filtered tree is shared by all users with the same access signature
+    (see ``menu_compiler``); each user's cache entry only records their
+    signature and preferences, which are applied on top together with
+    badges.
     """
 
     CACHE_TIMEOUT = 600  # 10 minutes
-    BADGE_CACHE_TIMEOUT = 300  # 5 minutes
+    BADGE_CACHE_TIMEOUT = menu_badges.DEFAULT_TTL
 
     @classmethod
     def get_cache_key(cls, user_id: int, tenant_id: Optional[int] = None) -> str:
@@ -116,7 +120,7 @@ class MenuFilterService:
     @classmethod
     def invalidate_all_caches(cls):
         """Invalidate all menu caches (use after menu structure changes)"""
-        cache.delete_pattern("menu_filtered_*")
+        menu_compiler.bump_version()
 
     @classmethod
     def get_menu_items_queryset(cls, tenant=None):
@@ -179,7 +183,7 @@ class MenuFilterService:
             return False, "Tenant mismatch"
 
         # Check roles (OR logic - user needs ANY of the roles)
-        item_roles = set(item.roles.values_list("code", flat=True))
+        item_roles = {role.code for role in item.roles.all()}
         if item_roles and not user_context.has_any_role(item_roles):
             return False, f"Missing required role(s): {', '.join(item_roles)}"
 
@@ -205,39 +209,36 @@ class MenuFilterService:
         """
         if not item.badge_resolver:
             return None
+        return cls.resolve_badges(
+            user, {item.code: (item.badge_resolver, item.badge_color)}
+        ).get(item.code)
 
-        cache_key = f"menu_badge_{item.code}_{user.id}"
-        cached_badge = cache.get(cache_key)
-
-        if cached_badge is not None:
-            return cached_badge
+    @classmethod
+    def resolve_badges(
+        cls, user: User, resolvers: Dict[str, tuple], use_cache: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve all badges of a menu in one pass through ``menu_badges``:
+        one cache read, then grouped resolvers for the misses.
 
-        try:
-            # Import and execute resolver function
-            resolver_func = import_string(item.badge_resolver)
-            count = resolver_func(user)
-
-            if count is not None and count > 0:
-                badge_data = {"count": count, "color": item.badge_color}
-                cache.set(cache_key, badge_data, cls.BADGE_CACHE_TIMEOUT)
-                return badge_data
-            else:
-                # Cache None result to avoid repeated calls
-                cache.set(cache_key, None, cls.BADGE_CACHE_TIMEOUT)
-                return None
+        Args:
+            resolvers: menu code -> (resolver path, badge color)
 
-        except (ImportError, AttributeError, TypeError) as e:
-            logger.error(f"Badge resolver error for '{item.code}': {e}")
-            return None
-        except Exception as e:
-            logger.exception(
-                f"Unexpected error in badge resolver for '{item.code}': {e}"
-            )
-            return None
+        Returns:
+            Dict mapping menu code to {'count', 'color'} for non-zero badges
+        """
+        counts = menu_badges.resolve_for_user(
+            user, {path for path, _ in resolvers.values()}, use_cache=use_cache
+        )
+        return {
+            code: {"count": counts[path], "color": color}
+            for code, (path, color) in resolvers.items()
+            if counts.get(path)
+        }
 
     @classmethod
     def get_user_preferences(
-        cls, user: User, menu_items: List[MenuItem]
+        cls, user: User, menu_items: Optional[List[MenuItem]] = None
     ) -> Dict[str, Dict]:
         """
         Get user preferences for menu items in bulk.
@@ -250,97 +251,45 @@ class MenuFilterService:
         if not user.is_authenticated:
             return {}
 
-        item_ids = [item.id for item in menu_items]
-
-        preferences = UserMenuPreference.objects.filter(
-            user=user, menu_item_id__in=item_ids
-        ).select_related("menu_item")
+        preferences = UserMenuPreference.objects.filter(user=user)
+        if menu_items is not None:
+            preferences = preferences.filter(
+                menu_item_id__in=[item.id for item in menu_items]
+            )
 
         return {
-            pref.menu_item.code: {
-                "is_pinned": pref.is_pinned,
-                "is_collapsed": pref.is_collapsed,
-                "is_hidden": pref.is_hidden,
-                "custom_order": pref.custom_order,
+            pref["menu_item__code"]: {
+                "is_pinned": pref["is_pinned"],
+                "is_collapsed": pref["is_collapsed"],
+                "is_hidden": pref["is_hidden"],
+                "custom_order": pref["custom_order"],
             }
-            for pref in preferences
+            for pref in preferences.values(
+                "menu_item__code",
+                "is_pinned",
+                "is_collapsed",
+                "is_hidden",
+                "custom_order",
+            )
         }
 
     @classmethod
-    def build_menu_item_dict(
-        cls, item: MenuItem, user: User, user_preferences: Dict[str, Dict]
-    ) -> Dict[str, Any]:
-        """
-        Convert MenuItem model to serializable dict with user-specific data.
-        """
-        pref = user_preferences.get(item.code, {})
-
-        item_dict = {
-            "id": item.code,  # Use code as frontend ID
-            "label": item.label,
-            "icon": item.icon,
-            "path": item.path,
-            "is_external": item.is_external,
-            "opens_new_tab": item.opens_new_tab,
-        }
-
-        # Add optional fields
-        if item.css_class:
-            item_dict["css_class"] = item.css_class
-
-        # Add badge if present
-        badge = cls.resolve_badge(item, user)
-        if badge:
-            item_dict["badge"] = badge
-
-        # Add user preferences
-        if pref:
-            item_dict["preferences"] = pref
-
-        return item_dict
-
-    @classmethod
-    def filter_menu_tree(
+    def render_menu(
         cls,
-        items: List[MenuItem],
-        user_context: UserContext,
+        tree: List[Dict[str, Any]],
         user_preferences: Dict[str, Dict],
+        badges: Dict[str, Dict],
     ) -> List[Dict[str, Any]]:
         """
-        Recursively filter menu tree based on access rights.
-        Builds tree structure from flat MPTT queryset.
+        Turn a shared signature tree into the user's menu: drop hidden
+        items, attach badges and preferences, and order by preference.
         """
         filtered_items = []
-        items_by_id = {item.id: item for item in items}
-        accessible_ids = set()
-
-        # First pass: determine accessible items
-        for item in items:
-            has_access, reason = cls.has_item_access(item, user_context)
-            if has_access:
-                accessible_ids.add(item.id)
-                # Check user preference to hide
-                pref = user_preferences.get(item.code, {})
-                if pref.get("is_hidden"):
-                    accessible_ids.discard(item.id)
-
-        # Second pass: build tree structure
-        root_items = [item for item in items if item.parent_id is None]
-
-        for root_item in root_items:
-            if root_item.id in accessible_ids:
-                item_dict = cls._build_tree_node(
-                    root_item,
-                    items_by_id,
-                    accessible_ids,
-                    user_context.user,
-                    user_preferences,
-                )
-
-                # Only include parent if it has children or a path
-                if item_dict:
-                    if "children" in item_dict or item_dict.get("path"):
-                        filtered_items.append(item_dict)
+        for node in tree:
+            item_dict = cls._render_node(node, user_preferences, badges)
+            # Only include parent if it has children or a path
+            if item_dict and ("children" in item_dict or item_dict.get("path")):
+                filtered_items.append(item_dict)
 
         # Sort by custom order if preferences exist
         def sort_key(item):
@@ -360,34 +309,41 @@ class MenuFilterService:
         return filtered_items
 
     @classmethod
-    def _build_tree_node(
+    def _render_node(
         cls,
-        item: MenuItem,
-        items_by_id: Dict,
-        accessible_ids: Set,
-        user: User,
+        node: Dict[str, Any],
         user_preferences: Dict[str, Dict],
+        badges: Dict[str, Dict],
     ) -> Optional[Dict[str, Any]]:
-        """
-        Recursively build a single tree node with its children.
-        """
-        if item.id not in accessible_ids:
+        pref = user_preferences.get(node["code"], {})
+        if pref.get("is_hidden"):
             return None
 
-        item_dict = cls.build_menu_item_dict(item, user, user_preferences)
-
-        # Build children recursively
-        children = []
-        for child in item.get_children():
-            if child.id in items_by_id and child.id in accessible_ids:
-                child_dict = cls._build_tree_node(
-                    child, items_by_id, accessible_ids, user, user_preferences
-                )
-                if child_dict:
-                    children.append(child_dict)
+        item_dict = {
+            "id": node["code"],  # Use code as frontend ID
+            "label": node["label"],
+            "icon": node["icon"],
+            "path": node["path"],
+            "is_external": node["is_external"],
+            "opens_new_tab": node["opens_new_tab"],
+        }
+        if node["css_class"]:
+            item_dict["css_class"] = node["css_class"]
+        if node["code"] in badges:
+            item_dict["badge"] = badges[node["code"]]
+        if pref:
+            item_dict["preferences"] = pref
 
+        children = [
+            child_dict
+            for child_dict in (
+                cls._render_node(child, user_preferences, badges)
+                for child in node["children"]
+            )
+            if child_dict
+        ]
         if children:
-            # Sort children
+
             def sort_key(child):
                 pref = user_preferences.get(child["id"], {})
                 custom_order = pref.get("custom_order")
@@ -401,6 +357,41 @@ class MenuFilterService:
 
         return item_dict
 
+    @classmethod
+    def get_menu_tree(cls, user: User, tenant=None, use_cache: bool = True):
+        """
+        The shared (signature) tree for ``user`` plus the user's cached entry
+        holding their signature and preferences.
+        """
+        version = menu_compiler.current_version()
+        flags = menu_compiler.enabled_feature_flags()
+        cache_key = cls.get_cache_key(user.id, tenant.id if tenant else None)
+        user_context = UserContext(user, tenant)
+
+        entry = cache.get(cache_key) if use_cache else None
+        # The signature covers the feature flags, which change on deploy.
+        if not entry or entry.get("version") != version or entry.get("flags") != flags:
+            entry = {
+                "version": version,
+                "flags": flags,
+                "signature": menu_compiler.access_signature(user_context),
+                "preferences": cls.get_user_preferences(user),
+            }
+            cache.set(cache_key, entry, cls.CACHE_TIMEOUT)
+
+        tree = menu_compiler.get_signature_menu(
+            entry["signature"], user_context, version=version, use_cache=use_cache
+        )
+        return tree, entry
+
+    @classmethod
+    def tree_badge_resolvers(cls, tree: List[Dict[str, Any]]) -> Dict[str, tuple]:
+        return {
+            node["code"]: (node["badge_resolver"], node["badge_color"])
+            for node in menu_compiler.iter_nodes(tree)
+            if node["badge_resolver"]
+        }
+
     @classmethod
     def get_filtered_menu(
         cls, user: User, tenant=None, use_cache: bool = True, log_access: bool = False
@@ -420,52 +411,26 @@ class MenuFilterService:
         if not user.is_authenticated:
             return []
 
-        # Check cache
-        if use_cache:
-            cache_key = cls.get_cache_key(user.id, tenant.id if tenant else None)
-            cached_menu = cache.get(cache_key)
-            if cached_menu is not None:
-                return cached_menu
-
-        # Build user context
-        user_context = UserContext(user, tenant)
-
-        # Get menu items with optimized query
-        items = list(cls.get_menu_items_queryset(tenant))
-
-        # Get user preferences in bulk
-        user_preferences = cls.get_user_preferences(user, items)
-
-        # Filter and build tree
-        filtered_menu = cls.filter_menu_tree(items, user_context, user_preferences)
-
-        # Cache results
-        if use_cache:
-            cache_key = cls.get_cache_key(user.id, tenant.id if tenant else None)
-            cache.set(cache_key, filtered_menu, cls.CACHE_TIMEOUT)
+        tree, entry = cls.get_menu_tree(user, tenant, use_cache=use_cache)
+        badges = cls.resolve_badges(
+            user, cls.tree_badge_resolvers(tree), use_cache=use_cache
+        )
+        filtered_menu = cls.render_menu(tree, entry["preferences"], badges)
 
         # Optional: Log access for analytics
         if log_access and filtered_menu:
-            cls._log_menu_access(user, items, user_context)
+            cls._log_menu_access(user, tree)
 
         return filtered_menu
 
     @classmethod
-    def _log_menu_access(
-        cls, user: User, items: List[MenuItem], user_context: UserContext
-    ):
+    def _log_menu_access(cls, user: User, tree: List[Dict[str, Any]]):
         """
         Log menu access for analytics (async task recommended).
         """
         try:
             # Only log root level items the user can access
-            root_items = [item for item in items if item.parent_id is None]
-            logs = []
-
-            for item in root_items:
-                has_access, _ = cls.has_item_access(item, user_context)
-                if has_access:
-                    logs.append(MenuAccessLog(user=user, menu_item=item))
+            logs = [MenuAccessLog(user=user, menu_item_id=node["pk"]) for node in tree]
 
             # Bulk create for efficiency
             if logs:
@@ -480,9 +445,15 @@ class MenuFilterService:
         Warm up badge cache for all menu items.
         Useful for initial page load optimization.
         """
-        for item in items:
-            if item.badge_resolver:
-                cls.resolve_badge(item, user)
+        cls.resolve_badges(
+            user,
+            {
+                item.code: (item.badge_resolver, item.badge_color)
+                for item in items
+                if item.badge_resolver
+            },
+            use_cache=False,
+        )
 
 
 # Convenience function for views
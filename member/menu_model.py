@@ -6,7 +6,6 @@ Supports: hierarchical menus, dynamic badges, caching, audit trails, multi-tenan
 
 from django.db import models
 from django.contrib.auth.models import Group, Permission
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from mptt.models import MPTTModel, TreeForeignKey
@@ -246,33 +245,14 @@ class MenuItem(MPTTModel, TimeStampedModel):
     def get_badge_count(self, user):
         """
         Execute badge resolver function and return count.
-        Cached for 5 minutes to avoid excessive database queries.
+        Cached per badge TTL (5 minutes by default) by ``menu_badges``.
         """
         if not self.badge_resolver:
             return None
 
-        cache_key = f"menu_badge_{self.code}_{user.id}"
-        cached_value = cache.get(cache_key)
+        from .menu_badges import resolve_for_user
 
-        if cached_value is not None:
-            return cached_value
-
-        try:
-            from django.utils.module_loading import import_string
-
-            resolver_func = import_string(self.badge_resolver)
-            count = resolver_func(user)
-
-            # Cache for 5 minutes
-            cache.set(cache_key, count, 300)
-            return count
-        except (ImportError, AttributeError, Exception) as e:
-            # Log error but don't break the menu
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error(f"Badge resolver error for {self.code}: {e}")
-            return None
+        return resolve_for_user(user, [self.badge_resolver]).get(self.badge_resolver)
 
     def user_has_access(self, user):
         """
@@ -319,71 +299,38 @@ class MenuItem(MPTTModel, TimeStampedModel):
     def get_menu_for_user(cls, user, tenant=None):
         """
         Get filtered menu tree for a specific user.
-        Returns only items the user has access to.
-        Uses MPTT for efficient tree queries.
+        Returns only items the user has access to. The tree is shared by all
+        users with the same roles, permissions and tenant; badges are
+        resolved per user in one batch.
         """
-        cache_key = f"menu_tree_{user.id}_{tenant.id if tenant else 'global'}"
-        cached_menu = cache.get(cache_key)
+        from .menu_config import MenuFilterService
 
-        if cached_menu is not None:
-            return cached_menu
-
-        # Get all active, visible menu items
-        queryset = cls.objects.filter(is_active=True, is_visible=True).prefetch_related(
-            "roles", "required_permissions", "children"
+        tree, _ = MenuFilterService.get_menu_tree(user, tenant)
+        badges = MenuFilterService.resolve_badges(
+            user, MenuFilterService.tree_badge_resolvers(tree)
         )
-
-        if tenant:
-            queryset = queryset.filter(
-                models.Q(tenant=tenant) | models.Q(tenant__isnull=True)
-            )
-        else:
-            queryset = queryset.filter(tenant__isnull=True)
-
-        # Filter based on user access
-        accessible_items = []
-        for item in queryset:
-            has_access, _ = item.user_has_access(user)
-            if has_access:
-                accessible_items.append(item)
-
-        # Build tree structure
-        menu_tree = []
-        for item in accessible_items:
-            if item.parent is None or item.parent not in accessible_items:
-                menu_tree.append(
-                    cls._build_menu_tree_node(item, accessible_items, user)
-                )
-
-        # Cache for 10 minutes
-        cache.set(cache_key, menu_tree, 600)
-        return menu_tree
+        return [cls._build_menu_tree_node(node, badges) for node in tree]
 
     @classmethod
-    def _build_menu_tree_node(cls, item, accessible_items, user):
+    def _build_menu_tree_node(cls, node, badges):
         """Recursively build menu tree node"""
-        node = {
-            "id": str(item.id),
-            "code": item.code,
-            "label": item.label,
-            "icon": item.icon,
-            "path": item.path,
-            "is_external": item.is_external,
-            "opens_new_tab": item.opens_new_tab,
-            "css_class": item.css_class,
-            "badge": item.get_badge_count(user),
-            "badge_color": item.badge_color,
-            "children": [],
+        badge = badges.get(node["code"])
+        return {
+            "id": node["pk"],
+            "code": node["code"],
+            "label": node["label"],
+            "icon": node["icon"],
+            "path": node["path"],
+            "is_external": node["is_external"],
+            "opens_new_tab": node["opens_new_tab"],
+            "css_class": node["css_class"],
+            "badge": badge["count"] if badge else None,
+            "badge_color": node["badge_color"],
+            "children": [
+                cls._build_menu_tree_node(child, badges) for child in node["children"]
+            ],
         }
 
-        for child in item.get_children():
-            if child in accessible_items:
-                node["children"].append(
-                    cls._build_menu_tree_node(child, accessible_items, user)
-                )
-
-        return node
-
 
 class MenuAccessLog(models.Model):
     """
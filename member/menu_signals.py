@@ -0,0 +1,137 @@
+"""
+Menu cache invalidation: structure and role edits bump the compiled menu
+version, user group, permission and preference edits drop that user's
+cached entry. Connected in ``MemberConfig.ready``.
+"""
+
+import logging
+
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .menu_config import MenuFilterService
+from .menu_model import MenuItem, Role, UserMenuPreference
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# User Role/Permission Changes
+# ============================================================================
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_menu_on_user_group_change(sender, instance, action, **kwargs):
+    """Invalidate user's menu cache when their groups change"""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        tenant_id = (
+            getattr(instance, "tenant_id", None)
+            if hasattr(instance, "tenant_id")
+            else None
+        )
+        MenuFilterService.invalidate_user_cache(instance.id, tenant_id)
+        logger.info(
+            f"Menu cache invalidated for user {instance.id} due to group change"
+        )
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_menu_on_user_permission_change(sender, instance, action, **kwargs):
+    """Invalidate user's menu cache when their permissions change"""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        tenant_id = (
+            getattr(instance, "tenant_id", None)
+            if hasattr(instance, "tenant_id")
+            else None
+        )
+        MenuFilterService.invalidate_user_cache(instance.id, tenant_id)
+        logger.info(
+            f"Menu cache invalidated for user {instance.id} due to permission change"
+        )
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_menu_on_group_permission_change(sender, instance, action, **kwargs):
+    """Invalidate menu cache for all users in a group when group permissions change"""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        user_ids = instance.user_set.values_list("id", flat=True)
+        for user_id in user_ids:
+            MenuFilterService.invalidate_user_cache(user_id)
+        logger.info(
+            f"Menu cache invalidated for {len(user_ids)} users in group {instance.name}"
+        )
+
+
+# ============================================================================
+# Menu Structure Changes
+# ============================================================================
+
+
+@receiver(post_save, sender=MenuItem)
+def invalidate_all_menus_on_item_save(sender, instance, created, **kwargs):
+    """Invalidate all menu caches when menu structure changes"""
+    MenuFilterService.invalidate_all_caches()
+    logger.info(
+        f"All menu caches invalidated due to MenuItem {'creation' if created else 'update'}: {instance.code}"
+    )
+
+
+@receiver(post_delete, sender=MenuItem)
+def invalidate_all_menus_on_item_delete(sender, instance, **kwargs):
+    """Invalidate all menu caches when menu item is deleted"""
+    MenuFilterService.invalidate_all_caches()
+    logger.info(
+        f"All menu caches invalidated due to MenuItem deletion: {instance.code}"
+    )
+
+
+@receiver(m2m_changed, sender=MenuItem.roles.through)
+def invalidate_all_menus_on_item_roles_change(sender, instance, action, **kwargs):
+    """Invalidate all menu caches when menu item roles change"""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        MenuFilterService.invalidate_all_caches()
+        logger.info(
+            f"All menu caches invalidated due to role change on MenuItem: {instance.code}"
+        )
+
+
+@receiver(m2m_changed, sender=MenuItem.required_permissions.through)
+def invalidate_all_menus_on_item_permissions_change(sender, instance, action, **kwargs):
+    """Invalidate all menu caches when menu item permissions change"""
+    if action in ["post_add", "post_remove", "post_clear"]:
+        MenuFilterService.invalidate_all_caches()
+        logger.info(
+            f"All menu caches invalidated due to permission change on MenuItem: {instance.code}"
+        )
+
+
+# ============================================================================
+# Role Changes
+# ============================================================================
+
+
+@receiver(post_save, sender=Role)
+def invalidate_menus_on_role_change(sender, instance, **kwargs):
+    """Invalidate menu caches when role is modified"""
+    # Users' cached signatures hold role codes, so any role edit (rename,
+    # deactivation) has to drop every signature.
+    MenuFilterService.invalidate_all_caches()
+    logger.info(f"All menu caches invalidated due to role change: {instance.code}")
+
+
+# ============================================================================
+# User Preference Changes
+# ============================================================================
+
+
+@receiver(post_save, sender=UserMenuPreference)
+@receiver(post_delete, sender=UserMenuPreference)
+def invalidate_menu_on_preference_change(sender, instance, **kwargs):
+    """Invalidate user's menu cache when their preferences change"""
+    tenant_id = (
+        getattr(instance.user, "tenant_id", None)
+        if hasattr(instance.user, "tenant_id")
+        else None
+    )
+    MenuFilterService.invalidate_user_cache(instance.user_id, tenant_id)
@@ -553,27 +553,15 @@ class MenuBadgeRefreshAPIView(APIView, ResponseMixin):
             user = request.user
             tenant = getattr(user, "tenant", None) if hasattr(user, "tenant") else None
 
-            # Get all menu items with badge resolvers
-            items = MenuItem.objects.filter(
-                is_active=True,
-                is_visible=True,
-                badge_resolver__isnull=False,
-            )
-
-            # Filter by tenant if applicable
-            if tenant:
-                from django.db.models import Q
-
-                items = items.filter(Q(tenant=tenant) | Q(tenant__isnull=True))
-
-            items_list = list(items)
-
-            # Refresh and prefetch badge cache
-            MenuFilterService.prefetch_badge_cache(user, items_list)
+            # Badges of the items this user can see, recomputed in one pass
+            tree, _ = MenuFilterService.get_menu_tree(user, tenant)
+            resolvers = MenuFilterService.tree_badge_resolvers(tree)
+            badges = MenuFilterService.resolve_badges(user, resolvers, use_cache=False)
 
             return self.success_response(
                 data={
-                    "items_refreshed": len(items_list),
+                    "items_refreshed": len(resolvers),
+                    "badges": badges,
                 },
                 message="Badge counts refreshed successfully",
             )
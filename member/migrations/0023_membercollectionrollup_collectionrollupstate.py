@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-17 09:00
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0022_menuitem_usermenupreference_tenant_role_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Feed Name')),
+                ('high_water_mark', models.DateTimeField(blank=True, help_text='Latest ERP created_at/updated_at already folded into the rollups.', null=True, verbose_name='High-Water Mark')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Run At')),
+                ('last_run_buckets', models.PositiveIntegerField(default=0, verbose_name='Buckets Rebuilt In Last Run')),
+            ],
+            options={
+                'verbose_name': 'Collection Rollup State',
+                'verbose_name_plural': 'Collection Rollup States',
+                'db_table': 'member_collection_rollup_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='MemberCollectionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('member_code', models.CharField(help_text='ERP member code the collection belongs to.', max_length=15, verbose_name='Member Code')),
+                ('collection_date', models.DateField(help_text='Calendar day of the collection.', verbose_name='Collection Date')),
+                ('shift_code', models.IntegerField(help_text='ERP shift code (1 = morning, 2 = evening).', verbose_name='Shift Code')),
+                ('qty', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Quantity')),
+                ('amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18, verbose_name='Amount')),
+                ('qty_fat', models.DecimalField(decimal_places=4, default=Decimal('0.0000'), help_text='Sum of qty * fat, used for weighted average fat.', max_digits=24, verbose_name='Quantity x Fat')),
+                ('qty_snf', models.DecimalField(decimal_places=4, default=Decimal('0.0000'), help_text='Sum of qty * snf, used for weighted average SNF.', max_digits=24, verbose_name='Quantity x SNF')),
+                ('entries', models.PositiveIntegerField(default=0, help_text='Number of ERP collection rows folded into this bucket.', verbose_name='Entries')),
+                ('synced_at', models.DateTimeField(auto_now=True, verbose_name='Synced At')),
+            ],
+            options={
+                'verbose_name': 'Member Collection Rollup',
+                'verbose_name_plural': 'Member Collection Rollups',
+                'db_table': 'member_collection_rollup',
+                'indexes': [models.Index(fields=['collection_date'], name='collection_rollup_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='membercollectionrollup',
+            constraint=models.UniqueConstraint(fields=('member_code', 'collection_date', 'shift_code'), name='uniq_collection_rollup_bucket'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-17 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0023_membercollectionrollup_collectionrollupstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberLoginIndex',
+            fields=[
+                ('mobile_no', models.CharField(max_length=15, primary_key=True, serialize=False, verbose_name='Mobile Number')),
+                ('member_count', models.PositiveSmallIntegerField(default=0, help_text='All members registered with this mobile number.', verbose_name='Members')),
+                ('eligible_count', models.PositiveSmallIntegerField(default=0, help_text='Members that are both active and default.', verbose_name='Eligible Members')),
+                ('is_active', models.BooleanField(default=False, verbose_name='Any Active')),
+                ('is_default', models.BooleanField(default=False, verbose_name='Any Default')),
+                ('member_code', models.CharField(blank=True, help_text='The eligible member when there is exactly one.', max_length=50, null=True, verbose_name='Member Code')),
+                ('mpp_code', models.CharField(blank=True, max_length=50, null=True, verbose_name='MPP Code')),
+                ('mcc_code', models.CharField(blank=True, max_length=50, null=True, verbose_name='MCC Code')),
+                ('sync_hash', models.CharField(blank=True, editable=False, max_length=40, null=True)),
+            ],
+            options={
+                'verbose_name': 'Member Login Index',
+                'verbose_name_plural': 'Member Login Index',
+                'db_table': 'member_login_index',
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2 on 2026-10-17 18:10
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_balances(apps, schema_editor):
+    RewardLedger = apps.get_model('member', 'RewardLedger')
+    RewardBalance = apps.get_model('member', 'RewardBalance')
+    zero = Decimal('0.00')
+
+    rows = (
+        RewardLedger.objects.values('user_id')
+        .annotate(
+            credit=models.Sum('amount', filter=models.Q(transaction_type='credit')),
+            debit=models.Sum('amount', filter=models.Q(transaction_type='debit')),
+            adjustment=models.Sum('amount', filter=models.Q(transaction_type='adjustment')),
+        )
+        .order_by()
+    )
+    RewardBalance.objects.bulk_create(
+        [
+            RewardBalance(
+                user_id=row['user_id'],
+                balance=(row['credit'] or zero) + (row['adjustment'] or zero) - (row['debit'] or zero),
+                total_earned=row['credit'] or zero,
+                total_withdrawn=row['debit'] or zero,
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('member', '0024_memberloginindex'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RewardBalance',
+            fields=[
+                ('user', models.OneToOneField(help_text='The user these reward totals belong to.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reward_balance', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Currently available reward balance.', max_digits=12, verbose_name='Balance')),
+                ('total_earned', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Sum of all credit entries.', max_digits=12, verbose_name='Total Earned')),
+                ('total_withdrawn', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Sum of all debit entries.', max_digits=12, verbose_name='Total Withdrawn')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the balance last changed.', verbose_name='Last Updated')),
+            ],
+            options={
+                'verbose_name': 'Reward Balance',
+                'verbose_name_plural': 'Reward Balances',
+                'db_table': 'reward_balance',
+            },
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
@@ -466,17 +466,20 @@ class News(models.Model):
     def get_unread_count(cls, module=None):
         """
         Return count of unread news articles.
-        Optimized version using aggregation instead of count().
+        Served from the per-module counter in notifications.counters.
         """
-        queryset = cls.objects.filter(is_read=False, is_published=True)
-        if module:
-            queryset = queryset.filter(module__in=[module, "all"])
-        return queryset.count()
+        from notifications.counters import get_news_unread_count
+
+        return get_news_unread_count(module)
 
     @classmethod
     def mark_as_read_bulk(cls, article_ids):
         """Bulk update articles as read (more efficient than updating individually)"""
-        return cls.objects.filter(id__in=article_ids).update(is_read=True)
+        from notifications.counters import forget_news
+
+        updated = cls.objects.filter(id__in=article_ids).update(is_read=True)
+        forget_news()
+        return updated
 
 
 # class News(models.Model):
@@ -800,42 +803,180 @@ class RewardLedger(models.Model):
     @transaction.atomic
     def credit_user(cls, user, amount: Decimal, description="", source_ad=None):
         """Credit a user's account and return the new ledger entry."""
-        current_balance = cls.get_user_balance(user)
-        new_balance = current_balance + amount
+        balance = RewardBalance.lock([user.pk])[user.pk]
+        balance.apply(TransactionType.CREDIT, amount)
         entry = cls.objects.create(
             user=user,
             source_ad=source_ad,
             transaction_type=TransactionType.CREDIT,
             amount=amount,
-            balance_after=new_balance,
+            balance_after=balance.balance,
             description=description or "Ad Reward Credited",
             is_finalized=True,
         )
+        balance.save(update_fields=RewardBalance.TOTAL_FIELDS)
         return entry
 
     @classmethod
     @transaction.atomic
     def debit_user(cls, user, amount: Decimal, description=""):
         """Debit (withdraw) from a user's account safely."""
-        current_balance = cls.get_user_balance(user)
-        if amount > current_balance:
+        balance = RewardBalance.lock([user.pk])[user.pk]
+        if amount > balance.balance:
             raise ValueError("Insufficient balance for withdrawal.")
-        new_balance = current_balance - amount
+        balance.apply(TransactionType.DEBIT, amount)
         entry = cls.objects.create(
             user=user,
             transaction_type=TransactionType.DEBIT,
             amount=amount,
-            balance_after=new_balance,
+            balance_after=balance.balance,
             description=description or "User Withdrawal",
             is_finalized=True,
         )
+        balance.save(update_fields=RewardBalance.TOTAL_FIELDS)
         return entry
 
     @classmethod
     def get_user_balance(cls, user) -> Decimal:
         """Return the user’s latest available balance."""
-        last_entry = cls.objects.filter(user=user).order_by("-created_at").first()
-        return last_entry.balance_after if last_entry else Decimal("0.00")
+        balance = (
+            RewardBalance.objects.filter(user_id=user.pk)
+            .values_list("balance", flat=True)
+            .first()
+        )
+        return balance if balance is not None else Decimal("0.00")
+
+
+class RewardBalance(models.Model):
+    """
+    Running totals of a user's reward ledger, kept in step with every ledger
+    entry under a row lock so balance reads are a single-row lookup. The
+    ledger stays the source of truth; ``RewardService.reconcile_balances``
+    checks these rows against it.
+    """
+
+    TOTAL_FIELDS = ["balance", "total_earned", "total_withdrawn", "updated_at"]
+
+    user = models.OneToOneField(
+        "auth.User",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reward_balance",
+        verbose_name="User",
+        help_text="The user these reward totals belong to.",
+    )
+
+    balance = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Balance",
+        help_text="Currently available reward balance.",
+    )
+
+    total_earned = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Total Earned",
+        help_text="Sum of all credit entries.",
+    )
+
+    total_withdrawn = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Total Withdrawn",
+        help_text="Sum of all debit entries.",
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Last Updated",
+        help_text="When the balance last changed.",
+    )
+
+    class Meta:
+        verbose_name = "Reward Balance"
+        verbose_name_plural = "Reward Balances"
+        db_table = "reward_balance"
+
+    def __str__(self):
+        return f"{self.user_id} | Bal: {self.balance}"
+
+    def apply(self, transaction_type, amount: Decimal):
+        """Apply one ledger entry to the in-memory totals."""
+        if transaction_type == TransactionType.DEBIT:
+            self.balance -= amount
+            self.total_withdrawn += amount
+        else:
+            self.balance += amount
+            if transaction_type == TransactionType.CREDIT:
+                self.total_earned += amount
+
+    @classmethod
+    def ledger_totals(cls, user_ids=None) -> dict:
+        """
+        ``{user_id: {"balance", "total_earned", "total_withdrawn"}}`` summed
+        from the ledger in one grouped query. Adjustments count towards the
+        balance only.
+        """
+        entries = RewardLedger.objects.all()
+        if user_ids is not None:
+            entries = entries.filter(user_id__in=list(user_ids))
+        rows = (
+            entries.values("user_id")
+            .annotate(
+                credit=models.Sum(
+                    "amount", filter=models.Q(transaction_type=TransactionType.CREDIT)
+                ),
+                debit=models.Sum(
+                    "amount", filter=models.Q(transaction_type=TransactionType.DEBIT)
+                ),
+                adjustment=models.Sum(
+                    "amount",
+                    filter=models.Q(transaction_type=TransactionType.ADJUSTMENT),
+                ),
+            )
+            .order_by()
+        )
+        zero = Decimal("0.00")
+        return {
+            row["user_id"]: {
+                "balance": (row["credit"] or zero)
+                + (row["adjustment"] or zero)
+                - (row["debit"] or zero),
+                "total_earned": row["credit"] or zero,
+                "total_withdrawn": row["debit"] or zero,
+            }
+            for row in rows
+        }
+
+    @classmethod
+    def lock(cls, user_ids) -> dict:
+        """
+        Lock the balance rows of ``user_ids`` (``SELECT ... FOR UPDATE``,
+        in user id order so concurrent batches cannot deadlock) and return
+        them by user id. Missing rows are first created from the ledger.
+        Must be called inside ``transaction.atomic``.
+        """
+        user_ids = sorted(set(user_ids))
+        existing = set(
+            cls.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True)
+        )
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        if missing:
+            totals = cls.ledger_totals(missing)
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, **totals.get(user_id, {})) for user_id in missing],
+                ignore_conflicts=True,
+            )
+        return {
+            balance.user_id: balance
+            for balance in cls.objects.select_for_update()
+            .filter(user_id__in=user_ids)
+            .order_by("user_id")
+        }
 
 
 class RewardWithdrawalRequest(models.Model):
@@ -903,3 +1044,198 @@ class RewardWithdrawalRequest(models.Model):
 
     def __str__(self):
         return f"{self.user.username} | ₹{self.amount} | {self.status}"
+
+
+class MemberCollectionRollup(models.Model):
+    """
+    Per-member, per-day, per-shift milk collection totals rolled up from the
+    ERP ``mpp_collection`` table, so member dashboards can be served from the
+    local database instead of aggregating on MSSQL at request time.
+    """
+
+    member_code = models.CharField(
+        max_length=15,
+        verbose_name="Member Code",
+        help_text="ERP member code the collection belongs to.",
+    )
+
+    collection_date = models.DateField(
+        verbose_name="Collection Date",
+        help_text="Calendar day of the collection.",
+    )
+
+    shift_code = models.IntegerField(
+        verbose_name="Shift Code",
+        help_text="ERP shift code (1 = morning, 2 = evening).",
+    )
+
+    qty = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Quantity",
+    )
+
+    amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Amount",
+    )
+
+    qty_fat = models.DecimalField(
+        max_digits=24,
+        decimal_places=4,
+        default=Decimal("0.0000"),
+        verbose_name="Quantity x Fat",
+        help_text="Sum of qty * fat, used for weighted average fat.",
+    )
+
+    qty_snf = models.DecimalField(
+        max_digits=24,
+        decimal_places=4,
+        default=Decimal("0.0000"),
+        verbose_name="Quantity x SNF",
+        help_text="Sum of qty * snf, used for weighted average SNF.",
+    )
+
+    entries = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Entries",
+        help_text="Number of ERP collection rows folded into this bucket.",
+    )
+
+    synced_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Synced At",
+    )
+
+    class Meta:
+        verbose_name = "Member Collection Rollup"
+        verbose_name_plural = "Member Collection Rollups"
+        db_table = "member_collection_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["member_code", "collection_date", "shift_code"],
+                name="uniq_collection_rollup_bucket",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["collection_date"], name="collection_rollup_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.member_code} | {self.collection_date} | {self.shift_code} | {self.qty}"
+
+
+class CollectionRollupState(models.Model):
+    """
+    Sync bookkeeping for a rollup feed: the high-water mark on the ERP
+    ``created_at``/``updated_at`` columns and when the feed last ran.
+    """
+
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name="Feed Name",
+    )
+
+    high_water_mark = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="High-Water Mark",
+        help_text="Latest ERP created_at/updated_at already folded into the rollups.",
+    )
+
+    last_run_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Last Run At",
+    )
+
+    last_run_buckets = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Buckets Rebuilt In Last Run",
+    )
+
+    class Meta:
+        verbose_name = "Collection Rollup State"
+        verbose_name_plural = "Collection Rollup States"
+        db_table = "member_collection_rollup_state"
+
+    def __str__(self):
+        return f"{self.name} | {self.high_water_mark}"
+
+
+class MemberLoginIndex(models.Model):
+    """
+    Login eligibility per mobile number, derived from the local member copy
+    so the OTP endpoints never query the ERP. Rebuilt by
+    ``member.services.login_index.refresh_login_index`` after each member
+    sync.
+    """
+
+    mobile_no = models.CharField(
+        max_length=15,
+        primary_key=True,
+        verbose_name="Mobile Number",
+    )
+
+    member_count = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Members",
+        help_text="All members registered with this mobile number.",
+    )
+
+    eligible_count = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Eligible Members",
+        help_text="Members that are both active and default.",
+    )
+
+    is_active = models.BooleanField(
+        default=False,
+        verbose_name="Any Active",
+    )
+
+    is_default = models.BooleanField(
+        default=False,
+        verbose_name="Any Default",
+    )
+
+    member_code = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+        verbose_name="Member Code",
+        help_text="The eligible member when there is exactly one.",
+    )
+
+    mpp_code = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+        verbose_name="MPP Code",
+    )
+
+    mcc_code = models.CharField(
+        max_length=50,
+        blank=True,
+        null=True,
+        verbose_name="MCC Code",
+    )
+
+    sync_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
+    class Meta:
+        verbose_name = "Member Login Index"
+        verbose_name_plural = "Member Login Index"
+        db_table = "member_login_index"
+
+    def __str__(self):
+        return f"{self.mobile_no} | {self.eligible_count}/{self.member_count}"
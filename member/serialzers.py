@@ -17,7 +17,6 @@ from erp_app.models import (
     Product,
     MppDispatchTxn,
     Mpp,
-    MemberHierarchyView,
     RmrdMilkCollection,
     MppCollection,
 )
@@ -27,6 +26,9 @@ from erp_app.serializers import (
     BrandSerializer,
     MemberHierarchyViewSerializer,
 )
+from erp_app.loaders import active_member_loader
+from erp_app.reference_data import reference_data
+from util.batch_loader import BatchListSerializer, BatchLoadMixin
 from .models import News
 from django.utils.timezone import now
 
@@ -121,23 +123,22 @@ class MemberMasterSerializer(serializers.ModelSerializer):
         ]
 
 
-class LocalSaleSerializer(serializers.ModelSerializer):
+class LocalSaleSerializer(BatchLoadMixin, serializers.ModelSerializer):
+    batch_keys = ((active_member_loader, "module_code"),)
+
     member = serializers.SerializerMethodField()
 
     class Meta:
         model = LocalSale
         fields = "__all__"
+        list_serializer_class = BatchListSerializer
 
     def get_member(self, obj):
         """
         Fetch the member data from MemberMaster using module_code.
         """
-        try:
-            member = MemberHierarchyView.objects.filter(member_code=obj.module_code, is_active=True,
-                                                        is_default=True).first()
-            return MemberHierarchyViewSerializer(member, context=self.context).data
-        except MemberHierarchyView.DoesNotExist:
-            return None
+        member = self.load(active_member_loader, obj.module_code)
+        return MemberHierarchyViewSerializer(member, context=self.context).data
 
 
 class DeductionSerializer(serializers.ModelSerializer):
@@ -180,11 +181,8 @@ class ERProductSerializer(serializers.ModelSerializer):
         """
         Fetch unit details if available.
         """
-        try:
-            unit = Unit.objects.get(unit_code=obj.unit_code)
-            return UnitSerializer(unit).data
-        except Unit.DoesNotExist:
-            return None
+        unit = reference_data.get("unit", obj.unit_code)
+        return UnitSerializer(unit).data if unit else None
 
     def get_informative_price(self, obj):
         """
@@ -216,6 +214,7 @@ class LocalSaleTxnSerializer(serializers.ModelSerializer):
     class Meta:
         model = LocalSaleTxn
         fields = "__all__"
+        list_serializer_class = BatchListSerializer
 
 
 class CdaAggregationDaywiseMilktypeSerializer(serializers.ModelSerializer):
@@ -353,7 +352,9 @@ class MppSerializer(serializers.ModelSerializer):
         ]
 
 
-class BillingMemberDetailSerializer(serializers.ModelSerializer):
+class BillingMemberDetailSerializer(BatchLoadMixin, serializers.ModelSerializer):
+    batch_keys = ((active_member_loader, "member_code"),)
+
     member = serializers.SerializerMethodField()
     total_qty = serializers.SerializerMethodField()
 
@@ -388,14 +389,11 @@ class BillingMemberDetailSerializer(serializers.ModelSerializer):
             "payment_mode",
             "status",
         ]
+        list_serializer_class = BatchListSerializer
 
     def get_member(self, obj):
-        try:
-            member = MemberHierarchyView.objects.filter(member_code=obj.member_code,is_active=True, is_default=True).last()
-            return MemberHierarchyViewSerializer(member, context=self.context).data
-        except MemberHierarchyView.DoesNotExist:
-
-            return None
+        member = self.load(active_member_loader, obj.member_code)
+        return MemberHierarchyViewSerializer(member, context=self.context).data
 
     def get_total_qty(self, obj):
         return str(obj.qty)
@@ -0,0 +1,283 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from erp_app.models import MppCollection
+from ..models import CollectionRollupState, MemberCollectionRollup
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_FEED_NAME = "mpp_collection"
+ROLLUP_STATE_CACHE_KEY = "collection_rollup_fresh"
+
+# MSSQL caps a statement at 2100 parameters; stay well below it.
+MEMBER_CODE_CHUNK = 1000
+
+
+def format_collection_totals(
+    total_qty, total_amount, qty_fat_sum, qty_snf_sum, total_days, total_shift
+):
+    """
+    Shape raw sums into the dashboard totals payload shared by the live
+    MSSQL path and the rollup path.
+    """
+    total_qty = Decimal(total_qty or 0)
+    total_amount = Decimal(total_amount or 0)
+    qty_fat_sum = Decimal(qty_fat_sum or 0)
+    qty_snf_sum = Decimal(qty_snf_sum or 0)
+
+    epsilon = Decimal("0.00001")
+    weighted_fat = float(qty_fat_sum / (total_qty + epsilon)) if total_qty else 0
+    weighted_snf = float(qty_snf_sum / (total_qty + epsilon)) if total_qty else 0
+
+    return {
+        "total_qty": round(float(total_qty), 2),
+        "total_amount": round(float(total_amount), 2),
+        "total_payment": round(float(total_amount), 2),
+        "avg_fat": round(weighted_fat, 2),
+        "avg_snf": round(weighted_snf, 2),
+        "total_days": total_days or 0,
+        "total_shift": total_shift or 0,
+    }
+
+
+def as_date(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date()
+    return parse_date(str(value)[:10])
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+class CollectionRollupService:
+    """
+    Maintains and reads the local per-member collection rollups.
+
+    The ERP ``mpp_collection`` table is polled with a high-water mark on
+    ``created_at``/``updated_at``; every (member, day) bucket touched since the
+    last run is recomputed from source and replaced locally, so edits and
+    deletions inside a bucket are picked up as well as new rows.
+    """
+
+    # ---------------------------
+    # Freshness / fallback
+    # ---------------------------
+    @staticmethod
+    def is_available() -> bool:
+        """
+        True when reads should be served from the rollups: the feature is
+        enabled and the feed has run within the allowed lag.
+        """
+        if not getattr(settings, "COLLECTION_ROLLUP_READS", True):
+            return False
+
+        fresh = cache.get(ROLLUP_STATE_CACHE_KEY)
+        if fresh is None:
+            max_lag = timedelta(
+                minutes=getattr(settings, "COLLECTION_ROLLUP_MAX_LAG_MINUTES", 30)
+            )
+            last_run_at = (
+                CollectionRollupState.objects.filter(name=ROLLUP_FEED_NAME)
+                .values_list("last_run_at", flat=True)
+                .first()
+            )
+            fresh = bool(last_run_at and timezone.now() - last_run_at <= max_lag)
+            cache.set(ROLLUP_STATE_CACHE_KEY, fresh, timeout=60)
+        return fresh
+
+    # ---------------------------
+    # Refresh
+    # ---------------------------
+    @classmethod
+    def refresh(cls, using="sarthak_kashee") -> dict:
+        """
+        Fold new or changed ERP collection rows into the rollups.
+
+        The first run backfills ``COLLECTION_ROLLUP_BACKFILL_DAYS`` whole days;
+        later runs only rebuild the buckets touched since the high-water mark.
+        """
+        state, _ = CollectionRollupState.objects.get_or_create(name=ROLLUP_FEED_NAME)
+        now = timezone.now()
+
+        if state.high_water_mark is None:
+            backfill_days = getattr(settings, "COLLECTION_ROLLUP_BACKFILL_DAYS", 400)
+            start_day = timezone.localdate() - timedelta(days=backfill_days)
+            marks = MppCollection.objects.using(using).aggregate(
+                max_created=Max("created_at"), max_updated=Max("updated_at")
+            )
+            buckets = cls.rebuild_days(
+                cls._days_between(start_day, timezone.localdate()), using=using
+            )
+        else:
+            changed = cls._changed_rows(state.high_water_mark, using=using)
+            marks = changed.aggregate(
+                max_created=Max("created_at"), max_updated=Max("updated_at")
+            )
+            touched = defaultdict(set)
+            for member_code, day in (
+                changed.annotate(day=TruncDate("collection_date"))
+                .values_list("member_code", "day")
+                .distinct()
+                .iterator()
+            ):
+                touched[day].add(member_code)
+            buckets = cls.rebuild_buckets(touched, using=using)
+
+        candidates = [
+            mark
+            for mark in (
+                state.high_water_mark,
+                marks.get("max_created"),
+                marks.get("max_updated"),
+            )
+            if mark is not None
+        ]
+        state.high_water_mark = max(candidates) if candidates else now
+        state.last_run_at = now
+        state.last_run_buckets = buckets
+        state.save(update_fields=["high_water_mark", "last_run_at", "last_run_buckets"])
+        cache.delete(ROLLUP_STATE_CACHE_KEY)
+
+        logger.info(
+            f"Collection rollups refreshed: {buckets} buckets, "
+            f"high-water mark {state.high_water_mark}"
+        )
+        return {"buckets": buckets, "high_water_mark": str(state.high_water_mark)}
+
+    @staticmethod
+    def _changed_rows(high_water_mark, using="sarthak_kashee"):
+        """
+        ERP rows created or updated after the high-water mark.
+
+        A small overlap absorbs rows committed late with an older timestamp,
+        and the ``collection_date`` bound keeps the scan on the date index;
+        rebuilding a bucket is idempotent so re-reading rows is harmless.
+        """
+        overlap = timedelta(
+            minutes=getattr(settings, "COLLECTION_ROLLUP_OVERLAP_MINUTES", 10)
+        )
+        edit_window = timedelta(
+            days=getattr(settings, "COLLECTION_ROLLUP_EDIT_WINDOW_DAYS", 45)
+        )
+        since = high_water_mark - overlap
+        return MppCollection.objects.using(using).filter(
+            Q(created_at__gt=since) | Q(updated_at__gt=since),
+            collection_date__gte=since - edit_window,
+        )
+
+    @staticmethod
+    def _days_between(start_day, end_day):
+        day = start_day
+        while day <= end_day:
+            yield day
+            day += timedelta(days=1)
+
+    @classmethod
+    def rebuild_days(cls, days, using="sarthak_kashee") -> int:
+        """Recompute every member's buckets for whole days."""
+        return cls.rebuild_buckets({day: None for day in days}, using=using)
+
+    @classmethod
+    def rebuild_buckets(cls, touched, using="sarthak_kashee") -> int:
+        """
+        Recompute buckets from source.
+
+        ``touched`` maps a day to the member codes to rebuild for that day, or
+        to ``None`` to rebuild the whole day. Returns the number of rollup rows
+        written.
+        """
+        written = 0
+        for day, member_codes in touched.items():
+            if member_codes is None:
+                written += cls._rebuild_chunk(day, None, using=using)
+                continue
+            member_codes = sorted(member_codes)
+            for i in range(0, len(member_codes), MEMBER_CODE_CHUNK):
+                written += cls._rebuild_chunk(
+                    day, member_codes[i : i + MEMBER_CODE_CHUNK], using=using
+                )
+        return written
+
+    @staticmethod
+    def _rebuild_chunk(day, member_codes, using="sarthak_kashee") -> int:
+        start, end = day_bounds(day)
+        source = MppCollection.objects.using(using).filter(
+            collection_date__gte=start, collection_date__lt=end
+        )
+        if member_codes is not None:
+            source = source.filter(member_code__in=member_codes)
+
+        product = DecimalField(max_digits=24, decimal_places=4)
+        grouped = (
+            source.values("member_code", "shift_code")
+            .annotate(
+                sum_qty=Sum("qty"),
+                sum_amount=Sum("amount"),
+                sum_qty_fat=Sum(ExpressionWrapper(F("qty") * F("fat"), output_field=product)),
+                sum_qty_snf=Sum(ExpressionWrapper(F("qty") * F("snf"), output_field=product)),
+                rows=Count("pk"),
+            )
+            .order_by()
+        )
+        rollups = [
+            MemberCollectionRollup(
+                member_code=row["member_code"],
+                collection_date=day,
+                shift_code=row["shift_code"],
+                qty=row["sum_qty"] or 0,
+                amount=row["sum_amount"] or 0,
+                qty_fat=row["sum_qty_fat"] or 0,
+                qty_snf=row["sum_qty_snf"] or 0,
+                entries=row["rows"],
+            )
+            for row in grouped
+        ]
+
+        # Replace rather than upsert so buckets whose source rows were deleted
+        # disappear too.
+        with transaction.atomic():
+            stale = MemberCollectionRollup.objects.filter(collection_date=day)
+            if member_codes is not None:
+                stale = stale.filter(member_code__in=member_codes)
+            stale.delete()
+            MemberCollectionRollup.objects.bulk_create(rollups, batch_size=1000)
+        return len(rollups)
+
+    # ---------------------------
+    # Reads
+    # ---------------------------
+    @staticmethod
+    def get_member_totals(member_code, start_date=None, end_date=None) -> dict:
+        """
+        Rollup equivalent of ``FastTotalsMixin.calculate_live_totals``.
+        """
+        qs = MemberCollectionRollup.objects.filter(member_code=member_code)
+        if start_date and end_date:
+            qs = qs.filter(
+                collection_date__range=(as_date(start_date), as_date(end_date))
+            )
+        totals = qs.aggregate(
+            total_qty=Sum("qty"),
+            total_amount=Sum("amount"),
+            qty_fat_sum=Sum("qty_fat"),
+            qty_snf_sum=Sum("qty_snf"),
+            total_days=Count("collection_date", distinct=True),
+            total_shift=Count("id"),
+        )
+        return format_collection_totals(**totals)
@@ -0,0 +1,235 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from erp_app.models import MppCollection
+from ..models import MemberCollectionRollup
+from .collection_rollup import CollectionRollupService, as_date, day_bounds
+
+MORNING_SHIFT = 1
+EVENING_SHIFT = 2
+
+WINDOW_DAYS = "days"
+WINDOW_WEEK = "week"
+WINDOW_MONTH = "month"
+WINDOW_FISCAL_YEAR = "fy"
+WINDOWS = (WINDOW_DAYS, WINDOW_WEEK, WINDOW_MONTH, WINDOW_FISCAL_YEAR)
+
+SOURCE_ROLLUP = "rollup"
+SOURCE_LIVE = "live"
+
+
+def resolve_window(window=WINDOW_DAYS, anchor=None, days=5):
+    """
+    Return the inclusive ``(start_day, end_day)`` for a named window ending
+    on (or containing) ``anchor``.
+
+    - ``days``: the last ``days`` days up to the anchor
+    - ``week``: Monday..Sunday of the anchor's week
+    - ``month``: calendar month of the anchor
+    - ``fy``: April..March fiscal year of the anchor
+    """
+    anchor = as_date(anchor) or timezone.localdate()
+    if window == WINDOW_DAYS:
+        return anchor - timedelta(days=max(int(days), 1) - 1), anchor
+    if window == WINDOW_WEEK:
+        start = anchor - timedelta(days=anchor.weekday())
+        return start, start + timedelta(days=6)
+    if window == WINDOW_MONTH:
+        start = anchor.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    if window == WINDOW_FISCAL_YEAR:
+        start_year = anchor.year - 1 if anchor.month < 4 else anchor.year
+        start = anchor.replace(year=start_year, month=4, day=1)
+        return start, start.replace(year=start_year + 1, month=3, day=31)
+    raise ValueError(f"Unknown window '{window}', expected one of {WINDOWS}")
+
+
+def _empty_bucket():
+    return {"shifts": {}, "amount": 0.0}
+
+
+def _format_bucket(day, bucket):
+    shifts = bucket["shifts"]
+    return {
+        "date": str(day),
+        "total_qty": round(sum(shifts.values()), 2),
+        "morning_shift_qty": round(shifts.get(MORNING_SHIFT, 0.0), 2),
+        "evening_shift_qty": round(shifts.get(EVENING_SHIFT, 0.0), 2),
+        "total_amount": round(bucket["amount"], 2),
+    }
+
+
+class CollectionSeriesService:
+    """
+    Collection time series bucketed by day and shift.
+
+    Any window is answered with one grouped, range-bounded query (the raw
+    ``collection_date`` column is compared against datetime bounds so the
+    index stays usable). Each (scope, code, day) bucket is cached on its own,
+    so overlapping windows - today, last 5 days, this month - share work and
+    only the missing span is fetched.
+    """
+
+    CACHE_PREFIX = "collection_series"
+    ERP_DATABASE = "sarthak_kashee"
+
+    @staticmethod
+    def _days(start_day, end_day):
+        return [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+
+    @staticmethod
+    def _ttl(day):
+        # Today's bucket keeps changing during the shift; closed days rarely do.
+        if day >= timezone.localdate():
+            return getattr(settings, "COLLECTION_SERIES_OPEN_DAY_TTL", 300)
+        return getattr(settings, "COLLECTION_SERIES_CLOSED_DAY_TTL", 3600)
+
+    @classmethod
+    def _cache_key(cls, scope, code, day):
+        return f"{cls.CACHE_PREFIX}_{scope}_{code}_{day}"
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    @classmethod
+    def member_series(
+        cls, member_code, start_day, end_day, source=None, use_cache=True
+    ) -> list:
+        """
+        Daily shift totals for one member over ``start_day..end_day``.
+
+        ``source`` forces ``"rollup"`` or ``"live"``; by default the local
+        rollups are used while fresh and the ERP otherwise.
+        """
+        start_day, end_day = as_date(start_day), as_date(end_day)
+        if source is None:
+            source = (
+                SOURCE_ROLLUP if CollectionRollupService.is_available() else SOURCE_LIVE
+            )
+        fetch = cls._fetch_rollup if source == SOURCE_ROLLUP else cls._fetch_member_live
+        buckets = cls._cached_buckets(
+            "member", [member_code], start_day, end_day, fetch, use_cache
+        )
+        return [
+            _format_bucket(day, buckets[(member_code, day)])
+            for day in cls._days(start_day, end_day)
+        ]
+
+    @classmethod
+    def mpp_series(cls, mpp_codes, start_day, end_day, use_cache=True) -> list:
+        """
+        Daily shift totals summed across ``mpp_codes``.
+
+        Buckets are cached per MPP, so facilitators sharing MPPs reuse them.
+        """
+        start_day, end_day = as_date(start_day), as_date(end_day)
+        mpp_codes = sorted(set(mpp_codes))
+        buckets = cls._cached_buckets(
+            "mpp", mpp_codes, start_day, end_day, cls._fetch_mpp_live, use_cache
+        )
+        series = []
+        for day in cls._days(start_day, end_day):
+            merged = _empty_bucket()
+            for code in mpp_codes:
+                bucket = buckets[(code, day)]
+                merged["amount"] += bucket["amount"]
+                for shift, qty in bucket["shifts"].items():
+                    merged["shifts"][shift] = merged["shifts"].get(shift, 0.0) + qty
+            series.append(_format_bucket(day, merged))
+        return series
+
+    # ---------------------------
+    # Cache layer
+    # ---------------------------
+    @classmethod
+    def _cached_buckets(cls, scope, codes, start_day, end_day, fetch, use_cache):
+        days = cls._days(start_day, end_day)
+        keys = {
+            cls._cache_key(scope, code, day): (code, day)
+            for code in codes
+            for day in days
+        }
+        cached = cache.get_many(list(keys)) if use_cache else {}
+        buckets = {keys[key]: value for key, value in cached.items()}
+
+        missing = [pair for pair in keys.values() if pair not in buckets]
+        if not missing:
+            return buckets
+
+        missing_codes = sorted({code for code, _ in missing})
+        missing_days = [day for _, day in missing]
+        fetched = fetch(missing_codes, min(missing_days), max(missing_days))
+
+        to_cache = defaultdict(dict)
+        for code, day in missing:
+            bucket = fetched.get((code, day), _empty_bucket())
+            buckets[(code, day)] = bucket
+            to_cache[cls._ttl(day)][cls._cache_key(scope, code, day)] = bucket
+        if use_cache:
+            for ttl, values in to_cache.items():
+                cache.set_many(values, timeout=ttl)
+        return buckets
+
+    # ---------------------------
+    # Sources
+    # ---------------------------
+    @staticmethod
+    def _fold(rows):
+        buckets = defaultdict(_empty_bucket)
+        for code, day, shift_code, qty, amount in rows:
+            bucket = buckets[(code, as_date(day))]
+            bucket["shifts"][shift_code] = bucket["shifts"].get(shift_code, 0.0) + float(
+                qty or 0
+            )
+            bucket["amount"] += float(amount or 0)
+        return buckets
+
+    @classmethod
+    def _fetch_rollup(cls, member_codes, start_day, end_day):
+        rows = MemberCollectionRollup.objects.filter(
+            member_code__in=member_codes,
+            collection_date__range=(start_day, end_day),
+        ).values_list("member_code", "collection_date", "shift_code", "qty", "amount")
+        return cls._fold(rows)
+
+    @classmethod
+    def _fetch_live(cls, code_field, codes, start_day, end_day):
+        start, _ = day_bounds(start_day)
+        _, end = day_bounds(end_day)
+        rows = (
+            MppCollection.objects.using(cls.ERP_DATABASE)
+            .filter(
+                **{f"{code_field}__in": codes},
+                collection_date__gte=start,
+                collection_date__lt=end,
+            )
+            .annotate(day=TruncDate("collection_date"))
+            .values(code_field, "day", "shift_code")
+            .annotate(sum_qty=Sum("qty"), sum_amount=Sum("amount"))
+            .order_by()
+        )
+        return cls._fold(
+            (
+                row[code_field],
+                row["day"],
+                row["shift_code"],
+                row["sum_qty"],
+                row["sum_amount"],
+            )
+            for row in rows
+        )
+
+    @classmethod
+    def _fetch_member_live(cls, member_codes, start_day, end_day):
+        return cls._fetch_live("member_code", member_codes, start_day, end_day)
+
+    @classmethod
+    def _fetch_mpp_live(cls, mpp_codes, start_day, end_day):
+        return cls._fetch_live("references__mpp_code", mpp_codes, start_day, end_day)
@@ -0,0 +1,123 @@
+import logging
+from itertools import groupby
+
+from django.conf import settings
+from django.core.cache import cache
+
+from erp_app.models import MemberHierarchyView
+from veterinary.models.models import MembersMasterCopy
+from veterinary.utils.sync_model_util import sync_model
+from ..models import MemberLoginIndex
+
+logger = logging.getLogger(__name__)
+
+MEMBER_FIELDS = ("mobile_no", "member_code", "mpp_code", "mcc_code", "is_active", "is_default")
+INDEX_FIELDS = [
+    "member_count",
+    "eligible_count",
+    "is_active",
+    "is_default",
+    "member_code",
+    "mpp_code",
+    "mcc_code",
+]
+
+
+def login_miss_key(mobile_no) -> str:
+    return f"member_login_miss:{mobile_no}"
+
+
+def build_entry(mobile_no, members) -> MemberLoginIndex:
+    """
+    Fold the member rows sharing one mobile number into an index entry.
+    ``members`` are ``MEMBER_FIELDS`` tuples.
+    """
+    members = list(members)
+    eligible = [m for m in members if m[4] and m[5]]
+    chosen = eligible[0] if eligible else members[0]
+    return MemberLoginIndex(
+        mobile_no=mobile_no,
+        member_count=len(members),
+        eligible_count=len(eligible),
+        is_active=any(m[4] for m in members),
+        is_default=any(m[5] for m in members),
+        member_code=chosen[1] if len(eligible) == 1 else None,
+        mpp_code=chosen[2],
+        mcc_code=chosen[3],
+    )
+
+
+def _entries_from_copy():
+    rows = (
+        MembersMasterCopy.objects.exclude(mobile_no__isnull=True)
+        .exclude(mobile_no="")
+        .order_by("mobile_no", "member_code")
+        .values_list(*MEMBER_FIELDS)
+        .iterator(chunk_size=5000)
+    )
+    for mobile_no, members in groupby(rows, key=lambda row: row[0]):
+        yield build_entry(mobile_no, members)
+
+
+def refresh_login_index(batch_size=None):
+    """
+    Rebuild the login index from ``MembersMasterCopy``. Only entries whose
+    content changed are written, and numbers no longer on any member are
+    removed.
+    """
+    batch_size = batch_size or getattr(settings, "MEMBER_LOGIN_INDEX_BATCH_SIZE", 2000)
+    result = sync_model(
+        model=MemberLoginIndex,
+        source_objects=_entries_from_copy(),
+        key_fn=lambda entry: entry.mobile_no,
+        map_fn=lambda entry: entry,
+        update_fields=INDEX_FIELDS,
+        batch_size=batch_size,
+        key_field="mobile_no",
+        hash_field="sync_hash",
+        delete_missing=True,
+    )
+    logger.info(f"Member login index refreshed: {result}")
+    return result
+
+
+def get_login_entry(mobile_no, using="sarthak_kashee"):
+    """
+    Index entry for ``mobile_no``, or None when no member has it.
+
+    Numbers that are not indexed, or indexed without an eligible member,
+    may have changed in the ERP since the last refresh: they are looked up
+    there and re-indexed. A number still unknown or ineligible is not looked
+    up again for a few minutes, so repeated attempts stay off the ERP.
+    """
+    entry = MemberLoginIndex.objects.filter(mobile_no=mobile_no).first()
+    if entry is not None and entry.eligible_count:
+        return entry
+    if not getattr(settings, "MEMBER_LOGIN_INDEX_ERP_FALLBACK", True):
+        return entry
+    if cache.get(login_miss_key(mobile_no)):
+        return entry
+
+    members = list(
+        MemberHierarchyView.objects.using(using)
+        .filter(mobile_no=mobile_no)
+        .order_by("member_code")
+        .values_list(*MEMBER_FIELDS)
+    )
+    if members:
+        entry = build_entry(mobile_no, members)
+        MemberLoginIndex.objects.update_or_create(
+            mobile_no=mobile_no,
+            defaults={field: getattr(entry, field) for field in INDEX_FIELDS},
+        )
+    else:
+        MemberLoginIndex.objects.filter(mobile_no=mobile_no).delete()
+        entry = None
+
+    if entry is None or not entry.eligible_count:
+        cache.set(
+            login_miss_key(mobile_no),
+            1,
+            getattr(settings, "MEMBER_LOGIN_INDEX_MISS_TTL", 300),
+        )
+    return entry
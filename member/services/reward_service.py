@@ -1,17 +1,20 @@
+import logging
 from decimal import Decimal
 from django.db import transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from ..models import (
+    RewardBalance,
     RewardedAdTransaction,
     RewardLedger,
-    models,
     RewardWithdrawalRequest,
     TransactionType,
     WithdrawalStatus,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class RewardService:
     """
@@ -29,17 +32,60 @@ class RewardService:
         if not ad_transaction.is_verified:
             raise ValidationError("Cannot credit unverified ad reward.")
 
-        existing_entry = RewardLedger.objects.filter(source_ad=ad_transaction).first()
-        if existing_entry:
-            return existing_entry  # Already credited safely
+        RewardService.credit_rewards_from_ads([ad_transaction])
+        return RewardLedger.objects.get(source_ad=ad_transaction)
 
-        entry = RewardLedger.credit_user(
-            user=user,
-            amount=ad_transaction.reward_amount,
-            description=f"Ad Reward from {ad_transaction.reward_source}",
-            source_ad=ad_transaction,
+    @staticmethod
+    @transaction.atomic
+    def credit_rewards_from_ads(ad_transactions) -> list:
+        """
+        Credits many verified ad rewards at once: one lock on each affected
+        balance row, one ledger insert and one balance update for the batch.
+        Unverified and already credited ads are skipped. Returns the new
+        ledger entries.
+        """
+        ads = [ad for ad in ad_transactions if ad.is_verified]
+        if not ads:
+            return []
+
+        balances = RewardBalance.lock(ad.user_id for ad in ads)
+        # Checked under the locks, so a concurrent batch that credited the
+        # same ads has already committed.
+        credited = set(
+            RewardLedger.objects.filter(source_ad__in=ads).values_list(
+                "source_ad_id", flat=True
+            )
         )
-        return entry
+
+        entries, changed = [], {}
+        for ad in sorted(ads, key=lambda ad: ad.pk):
+            if ad.pk in credited:
+                continue
+            credited.add(ad.pk)
+            balance = balances[ad.user_id]
+            balance.apply(TransactionType.CREDIT, ad.reward_amount)
+            changed[ad.user_id] = balance
+            entries.append(
+                RewardLedger(
+                    user_id=ad.user_id,
+                    source_ad=ad,
+                    transaction_type=TransactionType.CREDIT,
+                    amount=ad.reward_amount,
+                    balance_after=balance.balance,
+                    description=f"Ad Reward from {ad.reward_source}",
+                    is_finalized=True,
+                )
+            )
+
+        if entries:
+            RewardLedger.objects.bulk_create(entries)
+            now = timezone.now()
+            for balance in changed.values():
+                balance.updated_at = now
+            RewardBalance.objects.bulk_update(
+                changed.values(), RewardBalance.TOTAL_FIELDS
+            )
+        return entries
 
     @staticmethod
     @transaction.atomic
@@ -101,19 +147,67 @@ class RewardService:
         """
         Returns a summary snapshot for user dashboard.
         """
-        total_earned = RewardLedger.objects.filter(
-            user=user, transaction_type=TransactionType.CREDIT
-        ).aggregate(total=models.Sum("amount"))["total"] or Decimal("0.00")
+        totals = (
+            RewardBalance.objects.filter(user_id=user.pk)
+            .values("balance", "total_earned", "total_withdrawn")
+            .first()
+        ) or dict.fromkeys(
+            ("balance", "total_earned", "total_withdrawn"), Decimal("0.00")
+        )
 
-        total_withdrawn = RewardLedger.objects.filter(
-            user=user, transaction_type=TransactionType.DEBIT
-        ).aggregate(total=models.Sum("amount"))["total"] or Decimal("0.00")
+        return {
+            "user": user.username,
+            "total_earned": totals["total_earned"],
+            "total_withdrawn": totals["total_withdrawn"],
+            "balance": totals["balance"],
+        }
+
+    @staticmethod
+    def reconcile_balances(repair: bool = True) -> dict:
+        """
+        Compares every balance row with its ledger sums (one grouped query)
+        and, when ``repair`` is set, rewrites the rows that drifted from the
+        ledger under a row lock.
+        """
+        fields = ("balance", "total_earned", "total_withdrawn")
+        zero = dict.fromkeys(fields, Decimal("0.00"))
+        ledger = RewardBalance.ledger_totals()
+        stored = {
+            row["user_id"]: row
+            for row in RewardBalance.objects.values("user_id", *fields)
+        }
 
-        balance = RewardLedger.get_user_balance(user)
+        user_ids = set(ledger) | set(stored)
+        mismatched = [
+            user_id
+            for user_id in user_ids
+            if any(
+                ledger.get(user_id, zero)[field] != stored.get(user_id, zero)[field]
+                for field in fields
+            )
+        ]
+        for user_id in mismatched:
+            logger.warning(
+                f"Reward balance of user {user_id} does not match its ledger: "
+                f"stored {stored.get(user_id)}, ledger {ledger.get(user_id)}"
+            )
+
+        repaired = 0
+        if repair and mismatched:
+            with transaction.atomic():
+                balances = RewardBalance.lock(mismatched)
+                # Recount under the locks; entries may have been added since.
+                recounted = RewardBalance.ledger_totals(mismatched)
+                for user_id, balance in balances.items():
+                    for field, value in recounted.get(user_id, zero).items():
+                        setattr(balance, field, value)
+                RewardBalance.objects.bulk_update(
+                    balances.values(), list(fields)
+                )
+                repaired = len(balances)
 
         return {
-            "user": user.username,
-            "total_earned": total_earned,
-            "total_withdrawn": total_withdrawn,
-            "balance": balance,
+            "checked": len(user_ids),
+            "mismatched": len(mismatched),
+            "repaired": repaired,
         }
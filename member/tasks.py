@@ -0,0 +1,32 @@
+from celery import shared_task
+import logging
+
+from .services.collection_rollup import CollectionRollupService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, name="member.refresh_collection_rollups")
+def refresh_collection_rollups(self):
+    """
+    Pull new or changed ERP collection rows into the local rollup tables.
+    """
+    try:
+        return CollectionRollupService.refresh()
+    except Exception as exc:
+        logger.error(f"Error refreshing collection rollups: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3, name="member.reconcile_reward_balances")
+def reconcile_reward_balances(self):
+    """
+    Check reward balance rows against ledger sums and repair any drift.
+    """
+    from .services.reward_service import RewardService
+
+    try:
+        return RewardService.reconcile_balances()
+    except Exception as exc:
+        logger.error(f"Error reconciling reward balances: {exc}")
+        raise self.retry(exc=exc, countdown=60)
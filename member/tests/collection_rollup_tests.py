@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from erp_app.models import MppCollection
+from erp_app.testing import ERPTablesMixin
+
+from ..models import CollectionRollupState, MemberCollectionRollup
+from ..services.collection_rollup import CollectionRollupService, format_collection_totals
+
+PRODUCT = DecimalField(max_digits=24, decimal_places=4)
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+
+
+@override_settings(
+    COLLECTION_ROLLUP_BACKFILL_DAYS=3, COLLECTION_ROLLUP_OVERLAP_MINUTES=0
+)
+class CollectionRollupTests(ERPTablesMixin, TestCase):
+    erp_models = (MppCollection,)
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        self.loaded_at = timezone.now() - timedelta(hours=1)
+        self.rows = 0
+        for member_code in ("M001", "M002"):
+            for day in (self.yesterday, self.today):
+                self._collect(member_code, at(day, 6), 1, "10.50", "4.2", "8.5", "420.00")
+                self._collect(member_code, at(day, 18), 2, "8.25", "4.0", "8.4", "330.00")
+        # A second morning entry for one member lands in the same bucket.
+        self._collect("M001", at(self.today, 7), 1, "2.00", "3.8", "8.1", "76.00")
+
+    def _collect(self, member_code, when, shift, qty, fat, snf, amount, created_at=None):
+        self.rows += 1
+        return MppCollection.objects.create(
+            mpp_collection_code=f"C{self.rows:05d}",
+            member_code=member_code,
+            collection_date=when,
+            shift_code_id=shift,
+            qty=Decimal(qty),
+            fat=Decimal(fat),
+            snf=Decimal(snf),
+            amount=Decimal(amount),
+            created_at=created_at or self.loaded_at,
+        )
+
+    def _raw(self, member_code):
+        return MppCollection.objects.using("default").filter(member_code=member_code).aggregate(
+            qty=Sum("qty"),
+            amount=Sum("amount"),
+            qty_fat=Sum(ExpressionWrapper(F("qty") * F("fat"), output_field=PRODUCT)),
+            qty_snf=Sum(ExpressionWrapper(F("qty") * F("snf"), output_field=PRODUCT)),
+        )
+
+    def _rolled(self, member_code):
+        return MemberCollectionRollup.objects.filter(member_code=member_code).aggregate(
+            qty=Sum("qty"),
+            amount=Sum("amount"),
+            qty_fat=Sum("qty_fat"),
+            qty_snf=Sum("qty_snf"),
+        )
+
+    def assertRollupsMatchSource(self):
+        for member_code in ("M001", "M002"):
+            self.assertEqual(self._rolled(member_code), self._raw(member_code))
+
+    def test_rebuild_matches_raw_aggregates(self):
+        written = CollectionRollupService.rebuild_days(
+            [self.yesterday, self.today], using="default"
+        )
+
+        # Two members x two days x two shifts; the extra entry shares a bucket.
+        self.assertEqual(written, 8)
+        self.assertRollupsMatchSource()
+        bucket = MemberCollectionRollup.objects.get(
+            member_code="M001", collection_date=self.today, shift_code=1
+        )
+        self.assertEqual((bucket.qty, bucket.entries), (Decimal("12.50"), 2))
+
+    def test_member_totals_match_live_totals(self):
+        CollectionRollupService.rebuild_days([self.yesterday, self.today], using="default")
+        raw = self._raw("M001")
+
+        totals = CollectionRollupService.get_member_totals("M001")
+
+        self.assertEqual(
+            totals,
+            format_collection_totals(
+                raw["qty"], raw["amount"], raw["qty_fat"], raw["qty_snf"], 2, 4
+            ),
+        )
+
+    def test_incremental_refresh_picks_up_edits_and_new_rows(self):
+        CollectionRollupService.refresh(using="default")
+        self.assertRollupsMatchSource()
+        state = CollectionRollupState.objects.get()
+        self.assertEqual(state.high_water_mark, self.loaded_at)
+
+        edited = MppCollection.objects.get(mpp_collection_code="C00001")
+        edited.qty = Decimal("20.00")
+        edited.updated_at = timezone.now()
+        edited.save()
+        self._collect(
+            "M002", at(self.today, 19), 2, "1.00", "4.1", "8.3", "41.00",
+            created_at=timezone.now(),
+        )
+
+        result = CollectionRollupService.refresh(using="default")
+
+        # Only the two touched (member, day) buckets are rebuilt.
+        self.assertEqual(result["buckets"], 4)
+        self.assertRollupsMatchSource()
+
+    def test_refresh_leaves_untouched_buckets_alone(self):
+        CollectionRollupService.refresh(using="default")
+        untouched = MemberCollectionRollup.objects.get(
+            member_code="M002", collection_date=self.yesterday, shift_code=1
+        )
+
+        result = CollectionRollupService.refresh(using="default")
+
+        self.assertEqual(result["buckets"], 0)
+        self.assertTrue(MemberCollectionRollup.objects.filter(pk=untouched.pk).exists())
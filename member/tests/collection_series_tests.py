@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from erp_app.models import MppCollection, MppCollectionReferences
+from erp_app.testing import ERPTablesMixin
+
+from ..services.collection_rollup import CollectionRollupService
+from ..services.collection_series import (
+    SOURCE_LIVE,
+    SOURCE_ROLLUP,
+    WINDOW_DAYS,
+    WINDOW_FISCAL_YEAR,
+    WINDOW_MONTH,
+    WINDOW_WEEK,
+    CollectionSeriesService,
+    resolve_window,
+)
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class CollectionSeriesTests(ERPTablesMixin, TestCase):
+    erp_models = (MppCollection, MppCollectionReferences)
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(CollectionSeriesService, "ERP_DATABASE", "default")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.today = timezone.localdate()
+        self.days = [self.today - timedelta(days=n) for n in range(3)]
+        rows = 0
+        for mpp_code, members in (("0101", ("M001", "M002")), ("0102", ("M003",))):
+            for day in self.days:
+                for shift, hour, qty in ((1, 6, "10.00"), (2, 18, "6.50")):
+                    reference = MppCollectionReferences.objects.create(
+                        mpp_collection_references_code=f"R{mpp_code}{day:%m%d}{shift}",
+                        mpp_code_id=mpp_code,
+                        collection_date=at(day, hour),
+                        shift_code_id=shift,
+                    )
+                    for member_code in members:
+                        rows += 1
+                        MppCollection.objects.create(
+                            mpp_collection_code=f"C{rows:05d}",
+                            member_code=member_code,
+                            references=reference,
+                            collection_date=at(day, hour),
+                            shift_code_id=shift,
+                            qty=Decimal(qty),
+                            fat=Decimal("4.0"),
+                            snf=Decimal("8.5"),
+                            amount=Decimal(qty) * 40,
+                        )
+
+    def test_resolve_window(self):
+        anchor = date(2026, 1, 14)  # a Wednesday
+
+        self.assertEqual(
+            resolve_window(WINDOW_DAYS, anchor, days=5), (date(2026, 1, 10), anchor)
+        )
+        self.assertEqual(
+            resolve_window(WINDOW_WEEK, anchor), (date(2026, 1, 12), date(2026, 1, 18))
+        )
+        self.assertEqual(
+            resolve_window(WINDOW_MONTH, anchor), (date(2026, 1, 1), date(2026, 1, 31))
+        )
+        self.assertEqual(
+            resolve_window(WINDOW_FISCAL_YEAR, anchor),
+            (date(2025, 4, 1), date(2026, 3, 31)),
+        )
+        with self.assertRaises(ValueError):
+            resolve_window("decade", anchor)
+
+    def test_member_series_buckets_by_day_and_shift(self):
+        series = CollectionSeriesService.member_series(
+            "M001", self.days[-1] - timedelta(days=1), self.today, source=SOURCE_LIVE
+        )
+
+        self.assertEqual(len(series), 4)
+        self.assertEqual(
+            series[0],
+            {
+                "date": str(self.days[-1] - timedelta(days=1)),
+                "total_qty": 0,
+                "morning_shift_qty": 0,
+                "evening_shift_qty": 0,
+                "total_amount": 0.0,
+            },
+        )
+        self.assertEqual(
+            series[-1],
+            {
+                "date": str(self.today),
+                "total_qty": 16.5,
+                "morning_shift_qty": 10.0,
+                "evening_shift_qty": 6.5,
+                "total_amount": 660.0,
+            },
+        )
+
+    def test_rollup_and_live_sources_agree(self):
+        CollectionRollupService.rebuild_days(self.days, using="default")
+
+        for member_code in ("M001", "M003"):
+            live = CollectionSeriesService.member_series(
+                member_code, self.days[-1], self.today, source=SOURCE_LIVE, use_cache=False
+            )
+            rolled = CollectionSeriesService.member_series(
+                member_code, self.days[-1], self.today, source=SOURCE_ROLLUP, use_cache=False
+            )
+            self.assertEqual(live, rolled)
+
+    def test_window_is_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            first = CollectionSeriesService.member_series(
+                "M002", self.days[-1], self.today, source=SOURCE_LIVE
+            )
+        with self.assertNumQueries(0):
+            again = CollectionSeriesService.member_series(
+                "M002", self.days[-1], self.today, source=SOURCE_LIVE
+            )
+        self.assertEqual(first, again)
+
+        # A wider window only fetches the days it is missing.
+        with self.assertNumQueries(1):
+            CollectionSeriesService.member_series(
+                "M002", self.days[-1] - timedelta(days=5), self.today, source=SOURCE_LIVE
+            )
+
+    def test_mpp_series_sums_every_member_of_the_mpps(self):
+        series = CollectionSeriesService.mpp_series(["0101", "0102"], self.today, self.today)
+
+        # Three members, 10 + 6.5 each.
+        self.assertEqual(series[0]["total_qty"], 49.5)
+        self.assertEqual(series[0]["morning_shift_qty"], 30.0)
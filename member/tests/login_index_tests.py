@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from erp_app.models import MemberHierarchyView
+from erp_app.testing import ERPTablesMixin
+
+from ..models import MemberLoginIndex
+from ..services.login_index import get_login_entry
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class LoginIndexTests(ERPTablesMixin, TestCase):
+    erp_models = (MemberHierarchyView,)
+
+    def setUp(self):
+        cache.clear()
+
+    def _member(self, member_code, mobile_no, is_active=True, is_default=True):
+        return MemberHierarchyView.objects.create(
+            member_code=member_code,
+            mobile_no=mobile_no,
+            mpp_code="0101",
+            mcc_code="01",
+            is_active=is_active,
+            is_default=is_default,
+            created_at=timezone.make_aware(datetime(2026, 1, 1)),
+        )
+
+    def _entry(self, mobile_no):
+        return get_login_entry(mobile_no, using="default")
+
+    def test_indexed_eligible_number_stays_off_the_erp(self):
+        MemberLoginIndex.objects.create(
+            mobile_no="9000000001", member_count=1, eligible_count=1, member_code="M001"
+        )
+
+        with self.assertNumQueries(1):
+            entry = self._entry("9000000001")
+        self.assertEqual((entry.eligible_count, entry.member_code), (1, "M001"))
+
+    def test_unknown_number_is_checked_once_then_remembered(self):
+        with self.assertNumQueries(3):
+            self.assertIsNone(self._entry("9000000002"))
+        with self.assertNumQueries(1):
+            self.assertIsNone(self._entry("9000000002"))
+
+        # A number added in the ERP is found once the miss expires.
+        self._member("M002", "9000000002")
+        cache.clear()
+        entry = self._entry("9000000002")
+        self.assertEqual((entry.eligible_count, entry.member_code), (1, "M002"))
+        self.assertTrue(MemberLoginIndex.objects.filter(mobile_no="9000000002").exists())
+
+    def test_stale_ineligible_entry_is_rechecked_in_the_erp(self):
+        MemberLoginIndex.objects.create(
+            mobile_no="9000000003", member_count=1, eligible_count=0, is_active=False
+        )
+        self._member("M003", "9000000003")
+
+        entry = self._entry("9000000003")
+
+        self.assertEqual((entry.eligible_count, entry.member_code), (1, "M003"))
+        self.assertEqual(
+            MemberLoginIndex.objects.get(mobile_no="9000000003").eligible_count, 1
+        )
+
+    def test_ineligible_number_is_rechecked_at_most_once_per_ttl(self):
+        self._member("M004", "9000000004", is_active=False)
+
+        self.assertEqual(self._entry("9000000004").eligible_count, 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(self._entry("9000000004").eligible_count, 0)
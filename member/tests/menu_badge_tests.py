@@ -0,0 +1,90 @@
+"""
+Tests for batched menu badge resolution and its notification-driven
+invalidation.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from notifications import counters
+from notifications.model import Notification, NotificationTemplate
+
+from .. import menu_badges
+
+User = get_user_model()
+
+UNREAD_BADGE = "notifications.counters.unread_notifications_badge"
+calls = []
+
+
+def _pending_badges(user):
+    calls.append(("group", user.pk))
+    return {"tests.pending_a": 2, "tests.pending_b": 0}
+
+
+class MenuBadgeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = NotificationTemplate.objects.create(
+            name="badge_test", category="system", title_template="T", body_template="B"
+        )
+        cls.users = [User.objects.create_user(username=f"badge{i}") for i in range(3)]
+
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+        menu_badges.register_group("tests.pending", _pending_badges)
+        for path in ("tests.pending_a", "tests.pending_b"):
+            menu_badges.register(path, group="tests.pending")(lambda user: 99)
+
+    def tearDown(self):
+        menu_badges._groups.pop("tests.pending", None)
+        for path in ("tests.pending_a", "tests.pending_b"):
+            menu_badges._registry.pop(path, None)
+
+    def _notify(self, user, n=1):
+        Notification.objects.bulk_create(
+            Notification(template=self.template, recipient=user) for _ in range(n)
+        )
+
+    def test_group_computes_all_badges_in_one_call(self):
+        user = self.users[0]
+        paths = ["tests.pending_a", "tests.pending_b", UNREAD_BADGE]
+        self.assertEqual(
+            menu_badges.resolve_for_user(user, paths),
+            {"tests.pending_a": 2, "tests.pending_b": 0, UNREAD_BADGE: 0},
+        )
+        self.assertEqual(calls, [("group", user.pk)])
+
+        with self.assertNumQueries(0):
+            menu_badges.resolve_for_user(user, paths)
+        self.assertEqual(len(calls), 1)
+
+    def test_one_badge_for_many_users_in_one_query(self):
+        self._notify(self.users[0], 2)
+        self._notify(self.users[2], 1)
+        ids = [u.pk for u in self.users]
+
+        with self.assertNumQueries(1):
+            counts = menu_badges.resolve_for_users(UNREAD_BADGE, ids)
+        self.assertEqual(counts, {ids[0]: 2, ids[1]: 0, ids[2]: 1})
+        with self.assertNumQueries(0):
+            menu_badges.resolve_for_users(UNREAD_BADGE, ids)
+
+    def test_new_notification_refreshes_unread_badge(self):
+        user = self.users[1]
+        self.assertEqual(menu_badges.resolve_for_user(user, [UNREAD_BADGE]), {UNREAD_BADGE: 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(template=self.template, recipient=user)
+        self.assertEqual(menu_badges.resolve_for_user(user, [UNREAD_BADGE]), {UNREAD_BADGE: 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            counters.forget_users([user.pk])
+        self.assertIsNone(cache.get(menu_badges.cache_key(UNREAD_BADGE, user.pk)))
+
+    def test_unknown_resolver_is_skipped(self):
+        self.assertEqual(
+            menu_badges.resolve_for_user(self.users[0], ["tests.no_such_badge"]), {}
+        )
@@ -0,0 +1,167 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from .. import menu_compiler
+from ..menu_config import MenuFilterService, UserContext, get_user_menu
+from ..menu_model import MenuItem, Role
+
+FIELDS = ("label", "icon", "path", "is_external", "opens_new_tab")
+
+
+def per_request_menu(user, tenant=None):
+    """The menu as it was built for every request before compilation."""
+    context = UserContext(user, tenant)
+    items = list(MenuFilterService.get_menu_items_queryset(tenant))
+    allowed = {
+        item.id for item in items if MenuFilterService.has_item_access(item, context)[0]
+    }
+
+    def build(item):
+        node = {"id": item.code, **{field: getattr(item, field) for field in FIELDS}}
+        if item.css_class:
+            node["css_class"] = item.css_class
+        children = [build(child) for child in item.get_children() if child.id in allowed]
+        if children:
+            node["children"] = sorted(children, key=lambda child: child["label"])
+        return node
+
+    roots = [
+        build(item) for item in items if item.parent_id is None and item.id in allowed
+    ]
+    roots = [node for node in roots if "children" in node or node.get("path")]
+    return sorted(roots, key=lambda node: node["label"])
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    FEATURE_FLAGS={"beta": False},
+)
+class MenuCompilerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(name="Field staff")
+        cls.role = Role.objects.create(name="Field staff", code="field", group=group)
+        cls.permission = Permission.objects.get(
+            content_type__app_label="member", codename="view_role"
+        )
+
+        cls.dashboard = MenuItem.objects.create(
+            code="dashboard", label="Dashboard", path="/"
+        )
+        field = MenuItem.objects.create(code="field", label="Field")
+        cls.visits = MenuItem.objects.create(
+            code="visits", label="Visits", path="/visits", parent=field
+        )
+        cls.visits.roles.add(cls.role)
+        reports = MenuItem.objects.create(
+            code="reports", label="Reports", path="/reports", parent=field
+        )
+        reports.required_permissions.add(cls.permission)
+        MenuItem.objects.create(
+            code="beta", label="Beta", path="/beta", feature_flag="beta"
+        )
+
+        cls.alice, cls.bob, cls.carol = (
+            User.objects.create_user(username=name) for name in ("alice", "bob", "carol")
+        )
+        for user in (cls.alice, cls.bob):
+            user.groups.add(group)
+        cls.admin = User.objects.create_superuser(username="admin")
+
+    def setUp(self):
+        cache.clear()
+        menu_compiler._local.update(version=None, menus={})
+
+    def _user(self, user):
+        # Fresh instance: Django caches a user's permissions on the object.
+        return User.objects.get(pk=user.pk)
+
+    def _codes(self, menu):
+        return [
+            [node["id"], [child["id"] for child in node.get("children", [])]]
+            for node in menu
+        ]
+
+    def test_users_with_one_signature_share_one_compiled_menu(self):
+        with mock.patch.object(
+            menu_compiler, "compile_menu", wraps=menu_compiler.compile_menu
+        ) as compile_menu, mock.patch.object(
+            menu_compiler, "filter_tree", wraps=menu_compiler.filter_tree
+        ) as filter_tree:
+            alice_menu = get_user_menu(self._user(self.alice))
+            bob_menu = get_user_menu(self._user(self.bob))
+            get_user_menu(self._user(self.carol))
+
+        self.assertEqual(alice_menu, bob_menu)
+        self.assertEqual(
+            self._codes(alice_menu), [["dashboard", []], ["field", ["visits"]]]
+        )
+        self.assertEqual(compile_menu.call_count, 1)
+        # One tree for alice and bob, one for carol.
+        self.assertEqual(filter_tree.call_count, 2)
+        self.assertEqual(
+            menu_compiler.access_signature(UserContext(self._user(self.alice))),
+            menu_compiler.access_signature(UserContext(self._user(self.bob))),
+        )
+
+    def test_menu_edit_bumps_the_version_and_recompiles(self):
+        get_user_menu(self._user(self.alice))
+        version = menu_compiler.current_version()
+
+        self.dashboard.label = "Home"
+        self.dashboard.save()
+
+        self.assertNotEqual(menu_compiler.current_version(), version)
+        with mock.patch.object(
+            menu_compiler, "compile_menu", wraps=menu_compiler.compile_menu
+        ) as compile_menu:
+            menu = get_user_menu(self._user(self.alice))
+        self.assertEqual(compile_menu.call_count, 1)
+        self.assertEqual(menu[0]["label"], "Field")
+        self.assertIn("Home", [node["label"] for node in menu])
+
+    def test_permission_edits_change_the_menu(self):
+        self.assertEqual(
+            self._codes(get_user_menu(self._user(self.alice))),
+            [["dashboard", []], ["field", ["visits"]]],
+        )
+
+        # Granting the user a permission gives them a new signature.
+        self.alice.user_permissions.add(self.permission)
+        self.assertEqual(
+            self._codes(get_user_menu(self._user(self.alice))),
+            [["dashboard", []], ["field", ["reports", "visits"]]],
+        )
+
+        # Requiring it on another item bumps the version for everyone.
+        version = menu_compiler.current_version()
+        self.dashboard.required_permissions.add(self.permission)
+        self.assertNotEqual(menu_compiler.current_version(), version)
+        self.assertEqual(
+            self._codes(get_user_menu(self._user(self.bob))), [["field", ["visits"]]]
+        )
+
+    def test_warm_request_runs_no_queries(self):
+        alice = self._user(self.alice)
+        menu = get_user_menu(alice)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_menu(alice), menu)
+
+        # A new user with a known signature skips compilation too: only
+        # their roles, permissions and preferences are read.
+        with mock.patch.object(menu_compiler, "compile_menu") as compile_menu:
+            get_user_menu(self._user(self.bob))
+        compile_menu.assert_not_called()
+
+    def test_matches_the_per_request_build(self):
+        self.bob.user_permissions.add(self.permission)
+
+        for flags in ({"beta": False}, {"beta": True}):
+            with self.subTest(flags=flags), override_settings(FEATURE_FLAGS=flags):
+                for user in (self.alice, self.bob, self.carol, self.admin):
+                    user = self._user(user)
+                    self.assertEqual(get_user_menu(user), per_request_menu(user))
@@ -0,0 +1,111 @@
+import threading
+from decimal import Decimal
+from unittest import skipIf
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase, TransactionTestCase
+
+from ..admin import RewardLedgerAdmin
+from ..choices import TransactionType
+from ..models import RewardBalance, RewardedAdTransaction, RewardLedger
+from ..services.reward_service import RewardService
+from ..tasks import reconcile_reward_balances
+
+
+def totals(user):
+    balance = RewardBalance.objects.get(user=user)
+    return balance.balance, balance.total_earned, balance.total_withdrawn
+
+
+class RewardBalanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="viewer")
+
+    def test_credit_and_debit_update_the_balance_row(self):
+        RewardLedger.credit_user(self.user, Decimal("25.00"))
+        entry = RewardLedger.debit_user(self.user, Decimal("10.00"))
+
+        self.assertEqual(totals(self.user), (Decimal("15"), Decimal("25"), Decimal("10")))
+        self.assertEqual(entry.balance_after, Decimal("15"))
+        self.assertEqual(RewardLedger.get_user_balance(self.user), Decimal("15"))
+
+    def test_overdraft_is_refused(self):
+        RewardLedger.credit_user(self.user, Decimal("5.00"))
+
+        with self.assertRaises(ValueError):
+            RewardLedger.debit_user(self.user, Decimal("5.01"))
+
+        self.assertEqual(totals(self.user), (Decimal("5"), Decimal("5"), Decimal("0")))
+        self.assertFalse(
+            RewardLedger.objects.filter(transaction_type=TransactionType.DEBIT).exists()
+        )
+
+    def test_an_ad_is_credited_once(self):
+        ad = RewardedAdTransaction.objects.create(
+            user=self.user,
+            ad_unit_id="unit-1",
+            reward_amount=Decimal("2.50"),
+            transaction_token="token-1",
+            is_verified=True,
+        )
+
+        RewardService.credit_reward_from_ad(self.user, ad)
+        RewardService.credit_reward_from_ad(self.user, ad)
+
+        self.assertEqual(RewardLedger.objects.filter(source_ad=ad).count(), 1)
+        self.assertEqual(totals(self.user)[0], Decimal("2.50"))
+
+    def test_reconcile_repairs_a_drifted_row(self):
+        RewardLedger.credit_user(self.user, Decimal("40.00"))
+        RewardLedger.debit_user(self.user, Decimal("15.00"))
+        RewardBalance.objects.filter(user=self.user).update(balance=Decimal("999.00"))
+
+        result = reconcile_reward_balances.apply().get()
+
+        self.assertEqual((result["mismatched"], result["repaired"]), (1, 1))
+        self.assertEqual(totals(self.user), (Decimal("25"), Decimal("40"), Decimal("15")))
+        self.assertEqual(RewardService.reconcile_balances()["mismatched"], 0)
+
+    def test_admin_ledger_entries_are_read_only(self):
+        entry = RewardLedger.credit_user(self.user, Decimal("1.00"))
+        request = RequestFactory().get("/")
+        request.user = User.objects.create_superuser(username="admin")
+        model_admin = RewardLedgerAdmin(RewardLedger, admin.site)
+
+        self.assertFalse(model_admin.has_change_permission(request, entry))
+        self.assertFalse(model_admin.has_delete_permission(request, entry))
+        self.assertTrue(model_admin.has_add_permission(request))
+
+
+@skipIf(connection.vendor == "sqlite", "needs a database with concurrent writers")
+class RewardBalanceConcurrencyTests(TransactionTestCase):
+    def test_concurrent_debits_never_overspend(self):
+        user = User.objects.create_user(username="spender")
+        RewardLedger.credit_user(user, Decimal("100.00"))
+        outcomes, lock = [], threading.Lock()
+
+        def worker():
+            try:
+                RewardLedger.debit_user(user, Decimal("30.00"))
+                ok = True
+            except ValueError:
+                ok = False
+            finally:
+                connection.close()
+            with lock:
+                outcomes.append(ok)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(outcomes.count(True), 3)
+        self.assertEqual(totals(user), (Decimal("10"), Decimal("100"), Decimal("90")))
+        self.assertEqual(
+            RewardLedger.objects.filter(transaction_type=TransactionType.DEBIT).count(), 3
+        )
@@ -132,4 +132,9 @@ urlpatterns = [
         TodayCollectionView.as_view(),
         name="total-collection",
     ),
+    path(
+        "api/collection-series/",
+        CollectionSeriesView.as_view(),
+        name="collection-series",
+    ),
 ]
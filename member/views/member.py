@@ -5,8 +5,11 @@ from rest_framework_simplejwt.token_blacklist.models import (
     OutstandingToken,
 )
 from erp_app.models import Mpp
+from erp_app.reference_data import reference_data
 from facilitator.authentication import ApiKeyAuthentication
 from facilitator.models.user_profile_model import UserProfile
+from notifications import sms
+from ..services.login_index import get_login_entry
 from ..throttle import OTPThrottle
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Q
@@ -14,8 +17,6 @@ from django.utils.translation import gettext_lazy as _
 from django.views import View
 
 
-from decouple import config
-
 logger = logging.getLogger(__name__)
 
 
@@ -65,12 +66,11 @@ class GenerateOTPView(APIView):
                     status=status.HTTP_403_FORBIDDEN,
                 )
 
-            # Check if member exists in ERP (your existing logic)
-            members = MemberHierarchyView.objects.using("sarthak_kashee").filter(
-                mobile_no=phone_number, is_default=True, is_active=True
-            )
+            # Check the member login index (local copy of ERP member data)
+            entry = get_login_entry(phone_number)
+            eligible = entry.eligible_count if entry else 0
 
-            if not members.exists():
+            if not eligible:
                 return Response(
                     {
                         "status": "error",
@@ -79,11 +79,11 @@ class GenerateOTPView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            if members.count() > 1:
+            if eligible > 1:
                 return Response(
                     {
                         "status": "error",
-                        "message": f"{members.count()} members found with this number",
+                        "message": f"{eligible} members found with this number",
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
@@ -107,7 +107,11 @@ class GenerateOTPView(APIView):
                 )
 
             return Response(
-                {"status": "success", "message": "OTP sent successfully."},
+                {
+                    "status": "success",
+                    "message": "OTP sent successfully.",
+                    "sms_id": info["sms_id"],
+                },
                 status=status.HTTP_200_OK,
             )
 
@@ -187,7 +191,11 @@ class GenerateSahayakOTPView(APIView):
             )
 
         return Response(
-            {"status": "success", "message": "OTP sent successfully."},
+            {
+                "status": "success",
+                "message": "OTP sent successfully.",
+                "sms_id": info["sms_id"],
+            },
             status=status.HTTP_200_OK,
         )
 
@@ -396,30 +404,7 @@ class VerifySahayakOTPView(generics.GenericAPIView):
 
 
 def send_sms_api(mobile, otp):
-    url = config("SMS_API_URL")
-    params = {
-        "userid": config("SMS_USERID"),
-        "output": "json",
-        "password": config("SMS_PASSWORD"),
-        "sendMethod": "quick",
-        "mobile": mobile,
-        "msg": f"आपका काशी ई-डेयरी लॉगिन ओटीपी कोड {otp} है। किसी के साथ साझा न करें- काशी डेरी",
-        "senderid": config("SMS_SENDERID"),
-        "msgType": "unicode",
-        "dltEntityId": config("SMS_DLT_ENTITY_ID"),
-        "dltTemplateId": config("SMS_DLT_TEMPLATE_ID"),
-        "duplicatecheck": "true",
-    }
-
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if response.status_code == 200:
-            return True, data
-        return False, data
-    except requests.RequestException as e:
-        return False, str(e)
+    return sms.send_otp(mobile, otp)
 
 
 class VerifySession(APIView):
@@ -598,7 +583,12 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 class LocalSaleViewSet(viewsets.ModelViewSet):
-    queryset = LocalSaleTxn.objects.all()
+    queryset = LocalSaleTxn.objects.select_related(
+        "local_sale_code",
+        "binlocation_code",
+        "product_code__product_category_code",
+        "product_code__brand_code",
+    )
     serializer_class = LocalSaleTxnSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
@@ -609,9 +599,11 @@ class LocalSaleViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
         device = self.request.user.device
-        mpp = Mpp.objects.filter(mpp_ex_code=device.mpp_code).last()
+        mpp = reference_data.get_by("mpp", "ex_code", device.mpp_code)
+        if not mpp:
+            return queryset.none()
         return queryset.filter(
-            local_sale_code__mpp_code=mpp.mpp_code,
+            local_sale_code__mpp_code=mpp["mpp_code"],
             local_sale_code__status__in=["Pending", "Approved"],
         )
 
@@ -692,11 +684,10 @@ class MemberHierarchyViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
         device = self.request.user.device
-        mpp = Mpp.objects.filter(mpp_ex_code=device.mpp_code).last()
-        # mpp = Mpp.objects.filter(mpp_ex_code="1008").last()
+        mpp = reference_data.get_by("mpp", "ex_code", device.mpp_code)
         if not mpp:
             return MemberHierarchyView.objects.none()
-        return queryset.filter(mpp_code=mpp.mpp_code).order_by("member_name")
+        return queryset.filter(mpp_code=mpp["mpp_code"]).order_by("member_name")
 
     def list(self, request, *args, **kwargs):
         from datetime import timedelta, datetime
@@ -954,7 +945,7 @@ class NewsNotReadCountAPIView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, *args, **kwargs):
-        not_read_count = News.objects.filter(is_read=False).count()
+        not_read_count = News.get_unread_count(request.query_params.get("module"))
         return Response({"not_read_count": not_read_count})
 
 
@@ -1180,7 +1171,12 @@ class LocalSaleTxnFilter(FilterSet):
 
 
 class LocalSaleTxnViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = LocalSaleTxn.objects.all()
+    queryset = LocalSaleTxn.objects.select_related(
+        "local_sale_code",
+        "binlocation_code",
+        "product_code__product_category_code",
+        "product_code__brand_code",
+    )
     serializer_class = DeductionTxnSerializer
     filter_backends = [DjangoFilterBackend]
     pagination_class = StandardResultsSetPagination
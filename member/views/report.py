@@ -1,7 +1,6 @@
 from all_imports import *
-from erp_app.models import Mpp
 from facilitator.models.facilitator_model import AssignedMppToFacilitator
-from erp_app.models import BusinessHierarchySnapshot
+from erp_app.reference_data import reference_data
 from collections import defaultdict, Counter
 
 
@@ -46,25 +45,8 @@ class AppInstalledData(APIView):
             )
         )
 
-        # Build Mpp lookup
-        mpp_map = {
-            mpp.mpp_code: {
-                "mpp_code": mpp.mpp_code,
-                "name": mpp.mpp_name,
-                "mpp_ex_code": mpp.mpp_ex_code,
-            }
-            for mpp in Mpp.objects.all()
-        }
-
-        # Build Mcc lookup
-        mcc_map = {
-            mcc.mcc_code: {
-                "mcc_code": mcc.mcc_code,
-                "name": mcc.mcc_name,
-                "mcc_ex_code": mcc.mcc_ex_code,
-            }
-            for mcc in Mcc.objects.all()
-        }
+        mpp_map = reference_data.index("mpp")
+        mcc_map = reference_data.index("mcc")
 
         # Get members based on filters
         members_qs = MemberHierarchyView.objects.filter(is_active=True, is_default=True)
@@ -102,10 +84,10 @@ class AppInstalledData(APIView):
                 continue  # Skip MPP if not found
 
             data = mpp_data_map[mpp_code]
-            data["mpp_name"] = mpp_info["name"]
+            data["mpp_name"] = mpp_info["mpp_name"]
             data["mpp_ex_code"] = mpp_info["mpp_ex_code"]
             data["mcc_code"] = mcc_info["mcc_code"] if mcc_info else ""
-            data["mcc_name"] = mcc_info["name"] if mcc_info else ""
+            data["mcc_name"] = mcc_info["mcc_name"] if mcc_info else ""
             data["mcc_ex_code"] = mcc_info["mcc_ex_code"] if mcc_info else ""
             data["member_codes"].append(m["member_code"])
             data["mobile_numbers"].append(m["mobile_no"])
@@ -287,7 +269,8 @@ class SahayakAppInstalledData(APIView):
     def get(self, request, *args, **kwargs):
         # Build installed flag lookup (Yes/No) for each mpp_code
         # Step 1: Get all sahayak mpp_codes (with or without device)
-        all_mpp_codes = set(Mpp.objects.all().values_list("mpp_ex_code", flat=True))
+        mpp_by_ex_code = reference_data.index("mpp", "ex_code")
+        all_mpp_codes = {mpp["mpp_ex_code"] for mpp in reference_data.all("mpp")}
 
         installed_mpp_codes = set(
             UserDevice.objects.filter(
@@ -303,16 +286,6 @@ class SahayakAppInstalledData(APIView):
         # All relevant mpp_codes with installed devices
         mpp_ex_codes = list(mpp_codes_lookup.keys())
 
-        # Build Mpp lookup
-        mpp_map = {
-            mpp.mpp_ex_code: {
-                "mpp_code": mpp.mpp_code,
-                "name": mpp.mpp_name,
-                "mpp_ex_code": mpp.mpp_ex_code,
-            }
-            for mpp in Mpp.objects.filter(mpp_ex_code__in=mpp_ex_codes)
-        }
-
         # Facilitator name by mpp_code
         facilitator_lookup = {
             row[
@@ -323,36 +296,19 @@ class SahayakAppInstalledData(APIView):
             .values("mpp_code", "sahayak__first_name", "sahayak__last_name")
         }
 
-        # MCC lookup
-        mcc_map = {
-            mcc.mcc_code: {
-                "mcc_code": mcc.mcc_code,
-                "name": mcc.mcc_name,
-                "mcc_ex_code": mcc.mcc_ex_code,
-            }
-            for mcc in Mcc.objects.all()
-        }
-
-        # Map each mpp_code to its mcc_code from active/default members
-        mcc_lookup = {
-            row["mpp_code"]: row["mcc_code"]
-            for row in BusinessHierarchySnapshot.objects.all().values(
-                "mpp_code", "mcc_code"
-            )
-        }
-
         result = []
         for mpp_code in mpp_ex_codes:
-            mpp_data = mpp_map.get(mpp_code, {})
-            mcc_code = mcc_lookup.get(mpp_data.get("mpp_code"))
-            mcc_data = mcc_map.get(mcc_code, {})
+            mpp_data = mpp_by_ex_code.get(mpp_code, {})
+            hierarchy = reference_data.get("hierarchy", mpp_data.get("mpp_code"), {})
+            mcc_code = hierarchy.get("mcc_code")
+            mcc_data = reference_data.get("mcc", mcc_code, {})
             result.append(
                 {
                     "mcc_code": mcc_code or "NA",
-                    "mcc_name": mcc_data.get("name", "NA"),
+                    "mcc_name": mcc_data.get("mcc_name", "NA"),
                     "mcc_ex_code": mcc_data.get("mcc_ex_code", "NA"),
                     "mpp_code": mpp_code,
-                    "mpp_name": mpp_data.get("name", "NA"),
+                    "mpp_name": mpp_data.get("mpp_name", "NA"),
                     "mpp_ex_code": mpp_data.get("mpp_ex_code", "NA"),
                     "fs_name": facilitator_lookup.get(mpp_data.get("mpp_code"), "NA"),
                     "installed": mpp_codes_lookup.get(mpp_code, "No"),
@@ -395,11 +351,11 @@ class FacilitatorAppInstalled(APIView):
         # ---------------------------------------------
         all_mpp_codes = {a["mpp_code"] for a in assignments}
 
+        # The hierarchy snapshot only holds the default row of each MPP.
         hierarchy_map = {
-            h.mpp_code: h
-            for h in BusinessHierarchySnapshot.objects.filter(
-                mpp_code__in=all_mpp_codes, is_default=True
-            )
+            mpp_code: row
+            for mpp_code in all_mpp_codes
+            if (row := reference_data.get("hierarchy", mpp_code))
         }
 
         result = []
@@ -423,11 +379,11 @@ class FacilitatorAppInstalled(APIView):
                 if not h:
                     continue
 
-                mpp_names.append(h.mpp_name)
-                mpp_ex_codes.append(h.mpp_ex_code)
+                mpp_names.append(h["mpp_name"])
+                mpp_ex_codes.append(h["mpp_ex_code"])
 
-                mcc_names.add(h.mcc_name)
-                mcc_ex_codes.add(h.mcc_tr_code)
+                mcc_names.add(h["mcc_name"])
+                mcc_ex_codes.add(h["mcc_tr_code"])
 
             result.append(
                 {
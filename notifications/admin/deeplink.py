@@ -3,6 +3,7 @@
 # ============================================
 from django.contrib import admin
 from django.utils.html import format_html
+from notifications import deeplink_lifecycle
 from notifications.model import DeepLink
 
 
@@ -119,9 +120,7 @@ class DeepLinkAdmin(admin.ModelAdmin):
 
     def revoke_links(self, request, queryset):
         """Bulk revoke selected links."""
-        updated = queryset.filter(status=DeepLink.Status.ACTIVE).update(
-            status=DeepLink.Status.REVOKED
-        )
+        updated = deeplink_lifecycle.revoke_links(queryset)
 
         self.message_user(request, f"{updated} link(s) were revoked.")
 
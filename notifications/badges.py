@@ -0,0 +1,14 @@
+"""
+Menu badges backed by notification counters. Imported at startup by
+``member.menu_badges.autodiscover``.
+"""
+
+from member import menu_badges
+
+from . import counters
+
+menu_badges.register(
+    "notifications.counters.unread_notifications_badge",
+    for_users=counters.get_unread_counts,
+    events=(counters.BADGE_EVENT,),
+)(counters.unread_notifications_badge)
@@ -0,0 +1,312 @@
+import logging
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from erp_app.models import MemberHierarchyView, MppCollection
+from member.services.collection_rollup import day_bounds
+from util.deeplink_utils import make_json_safe
+
+from . import counters
+from .deeplink_service import DeepLinkService
+from .model import (
+    Notification,
+    NotificationStatus,
+    NotificationTemplate,
+    NotificationTrackMppCollection,
+)
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+COLLECTION_TEMPLATE = "mpp_collection_created_hi"
+PIPELINE_LOCK_KEY = "collection_notifications_lock"
+
+COLLECTION_FIELDS = (
+    "member_code",
+    "mpp_collection_code",
+    "qty",
+    "fat",
+    "uuid",
+    "snf",
+    "amount",
+    "collection_date",
+    "shift_code__shift_short_name",
+)
+
+
+class TemplateNotFound(Exception):
+    pass
+
+
+@dataclass
+class CollectionPipelineStats:
+    scanned: int = 0
+    already_tracked: int = 0
+    without_user: int = 0
+    created: int = 0
+    retried: int = 0
+    chunks: int = 0
+
+
+class CollectionNotificationPipeline:
+    """
+    Turns today's ERP milk collections into push notifications.
+
+    Collections are read with a keyset cursor on
+    ``(collection_date, mpp_collection_code)`` in chunks of ``chunk_size``.
+    Each chunk costs a fixed number of queries: tracked codes for the same
+    day, member mobiles, users, device modules, and one bulk insert each for
+    deep links, notifications, and tracking rows. Dedup only reads the
+    current day (plus legacy undated rows) of
+    ``NotificationTrackMppCollection`` for the chunk's codes, so the cost of
+    a run does not grow with the tracking history. Delivery for a chunk is queued
+    once its transaction commits.
+    """
+
+    def __init__(self, template=None, day=None, chunk_size=None):
+        self.template = template
+        self.day = day or timezone.localdate()
+        self.chunk_size = chunk_size or getattr(
+            settings, "COLLECTION_NOTIFICATION_CHUNK_SIZE", 500
+        )
+        self.deeplink_service = DeepLinkService()
+        self.stats = CollectionPipelineStats()
+
+    def run(self) -> CollectionPipelineStats:
+        """
+        Process every untracked collection of the day and re-queue today's
+        failed notifications. Returns ``None`` when another run holds the lock.
+        """
+        if self.template is None:
+            self.template = NotificationTemplate.objects.filter(
+                name=COLLECTION_TEMPLATE
+            ).first()
+            if self.template is None:
+                raise TemplateNotFound(
+                    f"Notification template '{COLLECTION_TEMPLATE}' not found."
+                )
+
+        # Overlapping runs would both pass the tracking check for the same rows.
+        if not cache.add(PIPELINE_LOCK_KEY, True, timeout=15 * 60):
+            logger.warning("Collection notification run already in progress")
+            return None
+
+        try:
+            started_at = timezone.now()
+            self.collection_ct = ContentType.objects.get_for_model(MppCollection)
+            for rows in self.stream_collections():
+                self.stats.chunks += 1
+                self.stats.scanned += len(rows)
+                self.process_chunk(rows)
+            self.retry_failed(before=started_at)
+        finally:
+            cache.delete(PIPELINE_LOCK_KEY)
+
+        logger.info(f"Collection notifications for {self.day}: {self.stats}")
+        return self.stats
+
+    # ---------------------------
+    # Cursor
+    # ---------------------------
+    def stream_collections(self):
+        """Yield the day's collections in keyset-paginated chunks."""
+        start, end = day_bounds(self.day)
+        base = (
+            MppCollection.objects.filter(
+                collection_date__gte=start, collection_date__lt=end
+            )
+            .select_related("shift_code")
+            .order_by("collection_date", "mpp_collection_code")
+            .values(*COLLECTION_FIELDS)
+        )
+        last = None
+        while True:
+            page = base
+            if last is not None:
+                page = page.filter(
+                    Q(collection_date__gt=last[0])
+                    | Q(collection_date=last[0], mpp_collection_code__gt=last[1])
+                )
+            rows = list(page[: self.chunk_size])
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.chunk_size:
+                return
+            last = (rows[-1]["collection_date"], rows[-1]["mpp_collection_code"])
+
+    # ---------------------------
+    # Chunk processing
+    # ---------------------------
+    def process_chunk(self, rows):
+        codes = [row["mpp_collection_code"] for row in rows]
+        # Rows tracked before collection_date existed carry no day; collection
+        # codes are unique across days, so they still count as notified.
+        tracked = set(
+            NotificationTrackMppCollection.objects.filter(
+                Q(collection_date=self.day) | Q(collection_date__isnull=True),
+                collection_code__in=codes,
+            ).values_list("collection_code", flat=True)
+        )
+        rows = [row for row in rows if row["mpp_collection_code"] not in tracked]
+        self.stats.already_tracked += len(codes) - len(rows)
+        if not rows:
+            return
+
+        mobiles = dict(
+            MemberHierarchyView.objects.filter(
+                member_code__in={row["member_code"] for row in rows}
+            ).values_list("member_code", "mobile_no")
+        )
+        users = {
+            user.username: user
+            for user in User.objects.filter(
+                username__in={mobile for mobile in mobiles.values() if mobile}
+            )
+        }
+
+        pending = []
+        for row in rows:
+            user = users.get(mobiles.get(row["member_code"]))
+            if user is None:
+                self.stats.without_user += 1
+                continue
+            pending.append(
+                (
+                    row,
+                    user,
+                    {
+                        "recipient": user,
+                        "collection": row,
+                        "site_name": "Kashee E-Dairy",
+                    },
+                )
+            )
+        if not pending:
+            return
+
+        rendered = self.template.render_many([context for _, _, context in pending])
+        with transaction.atomic():
+            deep_links = self.create_deep_links(pending)
+            notifications = Notification.objects.bulk_create(
+                [
+                    self.build_notification(row, user, content, deep_link)
+                    for (row, user, _), content, deep_link in zip(
+                        pending, rendered, deep_links
+                    )
+                ],
+                batch_size=self.chunk_size,
+            )
+            NotificationTrackMppCollection.objects.bulk_create(
+                [
+                    NotificationTrackMppCollection(
+                        collection_code=row["mpp_collection_code"],
+                        collection_date=self.day,
+                        is_sent=True,
+                    )
+                    for row, _, _ in pending
+                ],
+                batch_size=self.chunk_size,
+                ignore_conflicts=True,
+            )
+            counters.notifications_created(
+                [notification.recipient_id for notification in notifications]
+            )
+            ids = [notification.pk for notification in notifications]
+            transaction.on_commit(lambda: self.queue_delivery(ids))
+        self.stats.created += len(notifications)
+
+    def create_deep_links(self, pending):
+        """One DeepLink per notification, or ``None`` when the template has none."""
+        if not self.template.deeplink_config:
+            return [None] * len(pending)
+
+        links = []
+        for _, user, context in pending:
+            config = self.template.get_deeplink_config(context)
+            links.append(
+                {
+                    "user_id": user.pk,
+                    "clean_route": config.get("deeplink_type") or "",
+                    "context": context,
+                    "fallback_url": config.get("fallback_template"),
+                    "meta": {
+                        **config.get("meta", {}),
+                        "template_name": self.template.name,
+                    },
+                }
+            )
+        return self.deeplink_service.create_notification_deep_links(
+            links, batch_size=self.chunk_size
+        )
+
+    def build_notification(self, row, user, content, deep_link):
+        return Notification(
+            template=self.template,
+            recipient_id=user.pk,
+            delivery_status={"status": NotificationStatus.PENDING},
+            channels=["push"],
+            app_route="/home",
+            deep_link_url=deep_link.deep_link if deep_link else "",
+            title=content.get("title", ""),
+            body=content.get("body", ""),
+            email_subject=content.get("email_subject", ""),
+            email_body=content.get("email_body", ""),
+            context_data=make_json_safe(
+                {
+                    "mpp_collection": {
+                        "collection_code": row["mpp_collection_code"],
+                        "uuid": str(row["uuid"]),
+                        "member_code": row["member_code"],
+                        "qty": row["qty"],
+                        "fat": row["fat"],
+                        "snf": row["snf"],
+                        "amount": row["amount"],
+                        "collection_date": row["collection_date"],
+                        "shift": row.get("shift_code__shift_short_name", ""),
+                    }
+                }
+            ),
+            content_type=self.collection_ct,
+        )
+
+    # ---------------------------
+    # Delivery
+    # ---------------------------
+    @staticmethod
+    def queue_delivery(notification_ids):
+        from .tasks import process_collections_batch
+
+        if notification_ids:
+            process_collections_batch.delay(notification_ids)
+
+    def retry_failed(self, before):
+        """Re-queue today's failed notifications for this template."""
+        start, _ = day_bounds(self.day)
+        failed = (
+            Notification.objects.filter(
+                template=self.template,
+                created_at__gte=start,
+                created_at__lt=before,
+                status=NotificationStatus.FAILED,
+            )
+            .values_list("id", flat=True)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        batch = []
+        for notification_id in failed:
+            batch.append(notification_id)
+            if len(batch) >= self.chunk_size:
+                self.queue_delivery(batch)
+                self.stats.retried += len(batch)
+                batch = []
+        self.queue_delivery(batch)
+        self.stats.retried += len(batch)
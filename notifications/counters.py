@@ -0,0 +1,279 @@
+"""
+Per-user notification counters and per-module unread news counters for
+badge endpoints.
+
+Counts live in the cache (Redis in production) under
+``notif:count:<user_id>:total`` / ``:unread`` and ``news:unread:<module>``.
+A read is a single ``get_many``; on a miss the count is computed from the
+indexed DB query and stored, and if the cache is unreachable the DB count
+is returned directly.
+
+Writers keep the keys current without recounting, once their transaction
+commits:
+
+- ``notification_created`` / ``notifications_created`` after inserts,
+- ``notifications_read`` after single or bulk mark-read,
+- ``forget_users`` after deletes or other bulk changes.
+
+Increments only touch keys that already exist (``incr`` on a missing key
+is skipped), so a counter is never seeded from a partial value. News changes
+rarely and is invalidated per module instead. ``reconcile`` recomputes the
+counters of recently active users to correct any drift.
+"""
+
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def total_key(user_id) -> str:
+    return f"notif:count:{user_id}:total"
+
+
+def unread_key(user_id) -> str:
+    return f"notif:count:{user_id}:unread"
+
+
+def news_key(module) -> str:
+    return f"news:unread:{module or '*'}"
+
+
+# Menu badges depending on these counters listen to this event.
+BADGE_EVENT = "notifications.unread"
+
+
+def _ttl() -> int:
+    return getattr(settings, "NOTIFICATION_COUNTER_TTL", 24 * 3600)
+
+
+# ---------------------------------------------------------
+# Notifications
+# ---------------------------------------------------------
+def _count_from_db(user_id) -> Dict[str, int]:
+    from .model import Notification
+
+    return Notification.objects.filter(recipient_id=user_id).aggregate(
+        total=Count("id"), unread=Count("id", filter=Q(is_read=False))
+    )
+
+
+def get_counts(user_id) -> Dict[str, int]:
+    """``{"total": n, "unread": n}`` for one user."""
+    keys = [total_key(user_id), unread_key(user_id)]
+    try:
+        cached = cache.get_many(keys)
+    except Exception as e:
+        logger.warning(f"Notification counters unavailable, counting in DB: {e}")
+        return _count_from_db(user_id)
+
+    if len(cached) == 2:
+        return {"total": cached[keys[0]], "unread": cached[keys[1]]}
+
+    counts = _count_from_db(user_id)
+    _store(user_id, counts)
+    return counts
+
+
+def get_unread_count(user_id) -> int:
+    return get_counts(user_id)["unread"]
+
+
+def get_unread_counts(user_ids: Iterable[int]) -> Dict[int, int]:
+    """Unread counts for many users: one ``get_many``, one grouped query."""
+    from .model import Notification
+
+    user_ids = list(set(user_ids))
+    try:
+        cached = cache.get_many([unread_key(user_id) for user_id in user_ids])
+    except Exception as e:
+        logger.warning(f"Notification counters unavailable, counting in DB: {e}")
+        cached = {}
+
+    counts = {
+        user_id: cached[unread_key(user_id)]
+        for user_id in user_ids
+        if unread_key(user_id) in cached
+    }
+    missing = [user_id for user_id in user_ids if user_id not in counts]
+    if missing:
+        rows = {
+            row["recipient_id"]: row
+            for row in Notification.objects.filter(recipient_id__in=missing)
+            .values("recipient_id")
+            .annotate(total=Count("id"), unread=Count("id", filter=Q(is_read=False)))
+            .order_by()
+        }
+        for user_id in missing:
+            row = rows.get(user_id, {"total": 0, "unread": 0})
+            counts[user_id] = row["unread"]
+            _store(user_id, row)
+    return counts
+
+
+def _store(user_id, counts) -> None:
+    try:
+        cache.set_many(
+            {total_key(user_id): counts["total"], unread_key(user_id): counts["unread"]},
+            _ttl(),
+        )
+    except Exception as e:
+        logger.warning(f"Could not store notification counters for {user_id}: {e}")
+
+
+def _incr(key, delta) -> None:
+    if not delta:
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Not cached: the next read counts from the DB.
+        pass
+    except Exception as e:
+        logger.warning(f"Could not update counter {key}: {e}")
+        cache.delete(key)
+
+
+def _after_commit(func):
+    transaction.on_commit(func)
+
+
+def _badges_changed(user_ids) -> None:
+    from member import menu_badges
+
+    menu_badges.invalidate(BADGE_EVENT, user_ids)
+
+
+def notification_created(user_id, unread=True) -> None:
+    def apply():
+        _incr(total_key(user_id), 1)
+        if unread:
+            _incr(unread_key(user_id), 1)
+            _badges_changed([user_id])
+
+    _after_commit(apply)
+
+
+def notifications_created(user_ids: Iterable[int]) -> None:
+    """Count a batch of new unread notifications (one entry per row)."""
+    counts = Counter(user_ids)
+
+    def apply():
+        for user_id, n in counts.items():
+            _incr(total_key(user_id), n)
+            _incr(unread_key(user_id), n)
+        _badges_changed(counts)
+
+    _after_commit(apply)
+
+
+def notifications_read(user_id, count=1) -> None:
+    """``count`` notifications of ``user_id`` went from unread to read."""
+
+    def apply():
+        _incr(unread_key(user_id), -count)
+        _badges_changed([user_id])
+
+    _after_commit(apply)
+
+
+def forget_users(user_ids: Iterable[int]) -> None:
+    """Drop counters so the next read recounts from the DB."""
+    user_ids = set(user_ids)
+    keys = []
+    for user_id in user_ids:
+        keys += [total_key(user_id), unread_key(user_id)]
+    try:
+        cache.delete_many(keys)
+    except Exception as e:
+        logger.warning(f"Could not drop notification counters: {e}")
+    _badges_changed(user_ids)
+
+
+def reconcile(since=None) -> int:
+    """
+    Recompute the counters of users who received or read notifications
+    since ``since`` (the reconcile interval by default). Returns the number
+    of users refreshed.
+    """
+    from .model import Notification
+
+    window = getattr(settings, "NOTIFICATION_COUNTER_RECONCILE_MINUTES", 15)
+    since = since or timezone.now() - timedelta(minutes=window)
+    user_ids = (
+        Notification.objects.filter(Q(created_at__gte=since) | Q(read_at__gte=since))
+        .values_list("recipient_id", flat=True)
+        .order_by()
+        .distinct()
+    )
+
+    chunk_size = getattr(settings, "NOTIFICATION_COUNTER_RECONCILE_CHUNK", 1000)
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start : start + chunk_size]
+        rows = {
+            row["recipient_id"]: row
+            for row in Notification.objects.filter(recipient_id__in=chunk)
+            .values("recipient_id")
+            .annotate(total=Count("id"), unread=Count("id", filter=Q(is_read=False)))
+            .order_by()
+        }
+        values = {}
+        for user_id in chunk:
+            row = rows.get(user_id, {"total": 0, "unread": 0})
+            values[total_key(user_id)] = row["total"]
+            values[unread_key(user_id)] = row["unread"]
+        cache.set_many(values, _ttl())
+        _badges_changed(chunk)
+
+    return len(user_ids)
+
+
+def unread_notifications_badge(user):
+    """Menu badge resolver: the user's unread notification count."""
+    return get_unread_count(user.pk)
+
+
+# ---------------------------------------------------------
+# News
+# ---------------------------------------------------------
+def get_news_unread_count(module=None) -> int:
+    """Unread published news for ``module`` (plus "all"), or overall."""
+    from member.models import News
+
+    key = news_key(module)
+    try:
+        count = cache.get(key)
+    except Exception as e:
+        logger.warning(f"News counters unavailable, counting in DB: {e}")
+        count = None
+        key = None
+
+    if count is None:
+        queryset = News.objects.filter(is_read=False, is_published=True)
+        if module:
+            queryset = queryset.filter(module__in=[module, "all"])
+        count = queryset.count()
+        if key:
+            cache.set(key, count, _ttl())
+    return count
+
+
+def forget_news() -> None:
+    """Drop every module's news counter after news is added, edited or read."""
+    from member.models import News
+
+    try:
+        cache.delete_many(
+            [news_key(None)] + [news_key(module) for module, _ in News.MODULE_CHOICES]
+        )
+    except Exception as e:
+        logger.warning(f"Could not drop news counters: {e}")
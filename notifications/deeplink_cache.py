@@ -0,0 +1,265 @@
+"""
+Cache-backed resolution of deep-link tokens for the redirect hot path.
+
+``resolve(token)`` serves a validated snapshot of the link from the cache
+(Redis in production) and records the tap there:
+
+- ``deeplink:link:<token>`` holds the fields the redirect page needs plus
+  ``status``, ``expires_at`` and ``max_uses``. Unknown or unusable tokens are
+  cached as ``INVALID`` for a short while so repeated bad taps stay off the DB.
+- ``deeplink:uses:<token>`` is the link's total use count. It is seeded from
+  the row when the snapshot is loaded and bumped with an atomic ``incr`` per
+  tap, so ``max_uses`` holds under concurrent taps.
+- ``deeplink:seen:<token>`` is the last access time. Like the use count, it
+  only starts to expire once it has been flushed.
+
+A token is appended to a small log (``deeplink:dirty:<n>``) the first time it
+is tapped after a flush, and then flagged (``deeplink:dirty-flag:<token>``,
+holding its log sequence) so later taps skip the log. The entry is written
+before the flag, and the flag expires after ``DEEPLINK_USAGE_FLAG_TTL``, so a
+flag can never keep a token out of the log for good. ``flush_usage`` walks
+the log from its cursor and writes use counts, access times and consumed
+status back with one ``bulk_update`` per batch. Written values are absolute,
+so replaying a log entry is harmless.
+"""
+
+import logging
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone as dt_timezone
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .deeplink_lifecycle import mark_expired, record
+from .model import DeepLink
+
+logger = logging.getLogger(__name__)
+
+INVALID = "invalid"
+SNAPSHOT_FIELDS = (
+    "module",
+    "deep_link",
+    "deep_path",
+    "android_package",
+    "ios_bundle_id",
+    "fallback_url",
+)
+
+
+def link_key(token) -> str:
+    return f"deeplink:link:{token}"
+
+
+def uses_key(token) -> str:
+    return f"deeplink:uses:{token}"
+
+
+def seen_key(token) -> str:
+    return f"deeplink:seen:{token}"
+
+
+def dirty_flag_key(token) -> str:
+    return f"deeplink:dirty-flag:{token}"
+
+
+def dirty_log_key(seq) -> str:
+    return f"deeplink:dirty:{seq}"
+
+
+DIRTY_SEQ_KEY = "deeplink:dirty:seq"
+DIRTY_CURSOR_KEY = "deeplink:dirty:cursor"
+
+
+def _ttl() -> int:
+    return getattr(settings, "DEEPLINK_RESOLVE_CACHE_TTL", 3600)
+
+
+def _flag_ttl() -> int:
+    return getattr(settings, "DEEPLINK_USAGE_FLAG_TTL", 60)
+
+
+def _mark_invalid(token) -> None:
+    cache.set(
+        link_key(token), INVALID, getattr(settings, "DEEPLINK_INVALID_CACHE_TTL", 300)
+    )
+
+
+def _snapshot(dl: DeepLink) -> dict:
+    snapshot = {field: getattr(dl, field) for field in SNAPSHOT_FIELDS}
+    snapshot.update(
+        token=str(dl.token),
+        status=dl.status,
+        max_uses=dl.max_uses,
+        expires_at=dl.expires_at.timestamp() if dl.expires_at else None,
+    )
+    return snapshot
+
+
+def _load(token) -> Optional[dict]:
+    """Read the link once and cache its snapshot, or ``INVALID``."""
+    try:
+        dl = DeepLink.objects.get(token=token)
+    except (DeepLink.DoesNotExist, ValidationError):
+        logger.warning(f"Deep link not found: {token}")
+        _mark_invalid(token)
+        return None
+
+    if not dl.is_valid:
+        if dl.is_expired and dl.status == DeepLink.Status.ACTIVE:
+            mark_expired(dl)
+        _mark_invalid(token)
+        return None
+
+    ttl = _ttl()
+    if dl.expires_at:
+        ttl = max(1, min(ttl, int(dl.expires_at.timestamp() - time.time())))
+    snapshot = _snapshot(dl)
+    cache.set(link_key(token), snapshot, ttl)
+    # Keep a count that is ahead of the row (taps not yet flushed).
+    cache.add(uses_key(token), dl.use_count, timeout=None)
+    return snapshot
+
+
+def _record_use(token) -> int:
+    key = uses_key(token)
+    try:
+        uses = cache.incr(key)
+    except ValueError:
+        # Counter evicted: the row is current up to the last flush.
+        count = (
+            DeepLink.objects.filter(token=token)
+            .values_list("use_count", flat=True)
+            .first()
+            or 0
+        )
+        cache.add(key, count, timeout=None)
+        uses = cache.incr(key)
+
+    cache.set(seen_key(token), time.time(), timeout=None)
+    if cache.get(dirty_flag_key(token)) is None:
+        # Log first: losing the race only costs a duplicate entry.
+        cache.add(DIRTY_SEQ_KEY, 0, timeout=None)
+        seq = cache.incr(DIRTY_SEQ_KEY)
+        cache.set(dirty_log_key(seq), str(token), timeout=None)
+        cache.set(dirty_flag_key(token), seq, _flag_ttl())
+    return uses
+
+
+def resolve(token):
+    """
+    Return the link for ``token`` and count the tap, or None if the link is
+    unknown, inactive, expired or used up. The common case touches only the
+    cache.
+    """
+    token = str(token)
+    snapshot = cache.get(link_key(token))
+    if snapshot == INVALID:
+        return None
+    if snapshot is None:
+        snapshot = _load(token)
+        if snapshot is None:
+            return None
+
+    if snapshot["status"] != DeepLink.Status.ACTIVE:
+        return None
+    if snapshot["expires_at"] and snapshot["expires_at"] < time.time():
+        _mark_invalid(token)
+        return None
+
+    uses = _record_use(token)
+    if snapshot["max_uses"] and uses > snapshot["max_uses"]:
+        logger.warning(f"Deep link {token} exhausted ({uses}/{snapshot['max_uses']})")
+        return None
+
+    return SimpleNamespace(**snapshot, use_count=uses)
+
+
+def invalidate(tokens: Iterable) -> None:
+    """Drop cached snapshots after a status or expiry change in the DB."""
+    cache.delete_many([link_key(token) for token in tokens])
+
+
+def flush_usage(batch_size: Optional[int] = None) -> int:
+    """
+    Write cached use counts and access times to ``DeepLink`` rows. Returns
+    the number of links updated.
+    """
+    batch_size = batch_size or getattr(settings, "DEEPLINK_USAGE_FLUSH_BATCH_SIZE", 1000)
+    head = cache.get(DIRTY_SEQ_KEY) or 0
+    cursor = cache.get(DIRTY_CURSOR_KEY) or 0
+    flushed = 0
+
+    while cursor < head:
+        seqs = range(cursor + 1, min(cursor + batch_size, head) + 1)
+        log_keys = [dirty_log_key(seq) for seq in seqs]
+        tokens = list(dict.fromkeys(cache.get_many(log_keys).values()))
+        # Clear the flags first: a tap after this point re-logs its token.
+        cache.delete_many([dirty_flag_key(token) for token in tokens])
+
+        uses = cache.get_many([uses_key(token) for token in tokens])
+        seen = cache.get_many([seen_key(token) for token in tokens])
+        links = DeepLink.objects.only(
+            "pk", "token", "status", "max_uses", "use_count", "last_accessed_at"
+        ).in_bulk([uuid.UUID(token) for token in tokens], field_name="token")
+
+        changed, consumed = [], []
+        taps, consumed_modules = Counter(), Counter()
+        accessed = defaultdict(Counter)
+        for token in tokens:
+            dl = links.get(uuid.UUID(token))
+            if dl is None:
+                continue
+            count = uses.get(uses_key(token))
+            if count is not None and dl.max_uses:
+                # Refused taps still bump the counter.
+                count = min(count, dl.max_uses)
+            if count is not None and count > dl.use_count:
+                taps[dl.module] += count - dl.use_count
+                dl.use_count = count
+            last_seen = seen.get(seen_key(token))
+            if last_seen is not None:
+                seen_at = datetime.fromtimestamp(last_seen, tz=dt_timezone.utc)
+                day = timezone.localdate(seen_at)
+                last_day = dl.last_accessed_at and timezone.localdate(dl.last_accessed_at)
+                if last_day != day:
+                    # First tap of the day for this link.
+                    accessed[day][dl.module] += 1
+                dl.last_accessed_at = seen_at
+            if dl.is_exhausted and dl.status == DeepLink.Status.ACTIVE:
+                dl.status = DeepLink.Status.CONSUMED
+                consumed.append(token)
+                consumed_modules[dl.module] += 1
+            changed.append(dl)
+
+        with transaction.atomic():
+            DeepLink.objects.bulk_update(
+                changed, ["use_count", "last_accessed_at", "status"], batch_size=batch_size
+            )
+            record("taps", taps)
+            for day, modules in accessed.items():
+                record("accessed", modules, day=day)
+            record("consumed", consumed_modules)
+        invalidate(consumed)
+        # Flushed counters and access times may now expire; a later tap
+        # reseeds the counter from the row and sets a new access time.
+        for token in tokens:
+            cache.touch(uses_key(token), _ttl())
+            cache.touch(seen_key(token), _ttl())
+        # A flag set after the clear above points into this batch and would
+        # keep the token's next taps out of the log.
+        flags = cache.get_many([dirty_flag_key(token) for token in tokens])
+        cache.delete_many([key for key, seq in flags.items() if seq <= seqs[-1]])
+        cache.delete_many(log_keys)
+        cursor = seqs[-1]
+        cache.set(DIRTY_CURSOR_KEY, cursor, timeout=None)
+        flushed += len(changed)
+
+    return flushed
+
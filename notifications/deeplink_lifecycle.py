@@ -0,0 +1,364 @@
+"""
+Lifecycle jobs and counters for ``DeepLink``.
+
+The table gets one row per notification, so the jobs here never scan it:
+
+- ``expire_links`` and ``delete_old_links`` work in batches picked off the
+  ``(expires_at, status)`` and ``created_at`` indexes, and loop until the
+  backlog is empty. Old links are copied to ``deep_links_archive`` before
+  they are deleted.
+- ``DeepLinkDailyStat`` (events per day and module) and
+  ``DeepLinkStatusCount`` (current links per module and status) are
+  incremented by ``record`` wherever a link changes state. Creations are
+  counted by ``refresh_counters`` from an id high-water mark, which covers
+  every creation path, bulk inserts included. A link whose transaction
+  commits after a higher id was counted is behind that mark, so
+  ``reconcile_created`` recounts the last few days and records the
+  difference.
+- ``accessed`` is the number of distinct links tapped that day and ``taps``
+  the number of taps; both are recorded by the usage flush.
+- ``analytics_report`` reads those counters only.
+
+Links are counted as created ``active`` whatever their status when the
+counter job sees them, so a transition recorded first still nets out.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .model import (
+    DeepLink,
+    DeepLinkArchive,
+    DeepLinkCounterState,
+    DeepLinkDailyStat,
+    DeepLinkStatusCount,
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FEED_NAME = "deep_links"
+
+# Event → (status before, status after) in DeepLinkStatusCount.
+EVENT_TRANSITIONS = {
+    "created": (None, DeepLink.Status.ACTIVE),
+    "accessed": (None, None),
+    "taps": (None, None),
+    "expired": (DeepLink.Status.ACTIVE, DeepLink.Status.EXPIRED),
+    "consumed": (DeepLink.Status.ACTIVE, DeepLink.Status.CONSUMED),
+    "revoked": (DeepLink.Status.ACTIVE, DeepLink.Status.REVOKED),
+}
+
+INACTIVE_STATUSES = [
+    DeepLink.Status.EXPIRED,
+    DeepLink.Status.REVOKED,
+    DeepLink.Status.CONSUMED,
+]
+
+
+def _batch_size(batch_size=None) -> int:
+    return batch_size or getattr(settings, "DEEPLINK_LIFECYCLE_BATCH_SIZE", 5000)
+
+
+# ---------------------------------------------------------
+# Counters
+# ---------------------------------------------------------
+def _bump(model, lookup, field, amount):
+    """Add ``amount`` to one counter column, creating the row if needed."""
+    if not amount:
+        return
+    if model.objects.filter(**lookup).update(**{field: F(field) + amount}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{field: amount})
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**{field: F(field) + amount})
+
+
+def record(event, counts, day=None, status=None):
+    """
+    Add ``counts`` ({module: n}) to the ``event`` column for ``day`` (today by
+    default) and move the same numbers between status totals.
+
+    ``status`` is the status the links had when they were deleted and is
+    only used with ``event="deleted"``.
+    """
+    day = day or timezone.localdate()
+    before, after = EVENT_TRANSITIONS.get(event, (status, None))
+    for module, amount in counts.items():
+        if not amount:
+            continue
+        _bump(DeepLinkDailyStat, {"day": day, "module": module}, event, amount)
+        if before:
+            _bump(DeepLinkStatusCount, {"module": module, "status": before}, "count", -amount)
+        if after:
+            _bump(DeepLinkStatusCount, {"module": module, "status": after}, "count", amount)
+
+
+def mark_expired(dl) -> None:
+    """Expire one active link found past its expiry outside the batch job."""
+    if DeepLink.objects.filter(pk=dl.pk, status=DeepLink.Status.ACTIVE).update(
+        status=DeepLink.Status.EXPIRED
+    ):
+        record("expired", {dl.module: 1})
+    dl.status = DeepLink.Status.EXPIRED
+
+
+def revoke_links(links, reason=None) -> int:
+    """
+    Revoke the active links in the ``links`` queryset, count them as
+    ``revoked`` and drop their cached snapshots. ``reason`` is kept in each
+    link's ``meta``. Returns the number of links revoked.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            links.filter(status=DeepLink.Status.ACTIVE)
+            .select_related(None)
+            .select_for_update(of=("self",))
+            .only("pk", "token", "module", "meta")
+        )
+        for dl in batch:
+            dl.status = DeepLink.Status.REVOKED
+            dl.updated_at = now
+            if reason:
+                dl.meta = {**(dl.meta or {}), "revoke_reason": reason}
+        DeepLink.objects.bulk_update(
+            batch, ["status", "meta", "updated_at"], batch_size=_batch_size()
+        )
+        record("revoked", Counter(dl.module for dl in batch))
+    _invalidate([dl.token for dl in batch])
+    return len(batch)
+
+
+def refresh_counters(batch_size=None) -> dict:
+    """
+    Count links inserted since the last run as ``created``. The first run
+    also seeds the status totals and daily ``created`` counts from the
+    table as it stands.
+    """
+    batch_size = _batch_size(batch_size)
+    state, _ = DeepLinkCounterState.objects.get_or_create(name=COUNTER_FEED_NAME)
+    head = DeepLink.objects.aggregate(head=Max("pk"))["head"] or 0
+
+    if state.last_link_id is None:
+        with transaction.atomic():
+            _seed_counters(head)
+    else:
+        cursor = state.last_link_id
+        while cursor < head:
+            upper = min(cursor + batch_size, head)
+            rows = (
+                DeepLink.objects.filter(pk__gt=cursor, pk__lte=upper)
+                .annotate(day=TruncDate("created_at"))
+                .values("day", "module")
+                .annotate(n=Count("pk"))
+                .order_by()
+            )
+            with transaction.atomic():
+                for row in rows:
+                    record("created", {row["module"]: row["n"]}, day=row["day"])
+                DeepLinkCounterState.objects.filter(pk=state.pk).update(
+                    last_link_id=upper
+                )
+            cursor = upper
+
+    state.last_link_id = head
+    state.last_run_at = timezone.now()
+    state.save(update_fields=["last_link_id", "last_run_at"])
+    return {"last_link_id": head}
+
+
+def reconcile_created(days=None) -> int:
+    """
+    Recount links created in the last ``days`` days (up to the counted id
+    mark) and record the ones ``refresh_counters`` skipped. Returns the
+    number of links added.
+    """
+    days = days or getattr(settings, "DEEPLINK_COUNTER_RECONCILE_DAYS", 2)
+    since = timezone.localdate() - timedelta(days=days - 1)
+    added = 0
+
+    with transaction.atomic():
+        # Holds off refresh_counters so the mark and the counts agree.
+        state = (
+            DeepLinkCounterState.objects.select_for_update()
+            .filter(name=COUNTER_FEED_NAME, last_link_id__isnull=False)
+            .first()
+        )
+        if state is None:
+            return 0
+        start = timezone.make_aware(datetime.combine(since, datetime.min.time()))
+        actual = (
+            DeepLink.objects.filter(pk__lte=state.last_link_id, created_at__gte=start)
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "module")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        counted = {
+            (row["day"], row["module"]): row["created"]
+            for row in DeepLinkDailyStat.objects.filter(day__gte=since).values(
+                "day", "module", "created"
+            )
+        }
+        for row in actual:
+            missing = row["n"] - counted.get((row["day"], row["module"]), 0)
+            if missing > 0:
+                record("created", {row["module"]: missing}, day=row["day"])
+                added += missing
+
+    if added:
+        logger.info(f"Counted {added} deep links missed by the id mark")
+    return added
+
+
+def _seed_counters(head):
+    DeepLinkStatusCount.objects.all().delete()
+    DeepLinkStatusCount.objects.bulk_create(
+        DeepLinkStatusCount(module=row["module"], status=row["status"], count=row["n"])
+        for row in DeepLink.objects.filter(pk__lte=head)
+        .values("module", "status")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+    created = (
+        DeepLink.objects.filter(pk__lte=head)
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "module")
+        .annotate(n=Count("pk"))
+        .order_by()
+    )
+    for row in created:
+        DeepLinkDailyStat.objects.update_or_create(
+            day=row["day"], module=row["module"], defaults={"created": row["n"]}
+        )
+
+
+# ---------------------------------------------------------
+# Batched lifecycle jobs
+# ---------------------------------------------------------
+def expire_links(batch_size=None, now=None) -> int:
+    """Mark every active link past its expiry as expired, one batch at a time."""
+    batch_size = _batch_size(batch_size)
+    now = now or timezone.now()
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                DeepLink.objects.select_for_update(skip_locked=True)
+                .filter(status=DeepLink.Status.ACTIVE, expires_at__lt=now)
+                .order_by("expires_at")
+                .values_list("pk", "token", "module")[:batch_size]
+            )
+            if not batch:
+                break
+            DeepLink.objects.filter(pk__in=[pk for pk, _, _ in batch]).update(
+                status=DeepLink.Status.EXPIRED
+            )
+            record("expired", Counter(module for _, _, module in batch))
+        _invalidate([token for _, token, _ in batch])
+        total += len(batch)
+
+    logger.info(f"Marked {total} expired deep links")
+    return total
+
+
+def delete_old_links(days_old=90, batch_size=None, archive=None) -> int:
+    """
+    Delete inactive links created more than ``days_old`` days ago, copying
+    them to the archive table first unless ``archive`` is False.
+    """
+    batch_size = _batch_size(batch_size)
+    if archive is None:
+        archive = getattr(settings, "DEEPLINK_ARCHIVE_OLD_LINKS", True)
+    cutoff = timezone.now() - timedelta(days=days_old)
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                DeepLink.objects.select_for_update(skip_locked=True)
+                .filter(created_at__lt=cutoff, status__in=INACTIVE_STATUSES)
+                .order_by("created_at")[:batch_size]
+            )
+            if not batch:
+                break
+            if archive:
+                DeepLinkArchive.objects.bulk_create(
+                    [_archived(dl) for dl in batch], ignore_conflicts=True
+                )
+            DeepLink.objects.filter(pk__in=[dl.pk for dl in batch]).delete()
+
+            by_status = {}
+            for dl in batch:
+                by_status.setdefault(dl.status, Counter())[dl.module] += 1
+            for status, counts in by_status.items():
+                record("deleted", counts, status=status)
+        total += len(batch)
+
+    logger.info(f"Deleted {total} old deep links (archived: {archive})")
+    return total
+
+
+def _archived(dl) -> DeepLinkArchive:
+    return DeepLinkArchive(
+        token=dl.token,
+        user_id=dl.user_id,
+        module=dl.module,
+        deep_link=dl.deep_link,
+        deep_path=dl.deep_path,
+        fallback_url=dl.fallback_url,
+        status=dl.status,
+        use_count=dl.use_count,
+        meta=dl.meta,
+        created_at=dl.created_at,
+        last_accessed_at=dl.last_accessed_at,
+    )
+
+
+def _invalidate(tokens):
+    from .deeplink_cache import invalidate
+
+    invalidate(tokens)
+
+
+# ---------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------
+def analytics_report(day=None) -> dict:
+    """Counters for ``day`` (yesterday by default) and current totals."""
+    day = day or timezone.localdate() - timedelta(days=1)
+    daily = DeepLinkDailyStat.objects.filter(day=day).aggregate(
+        created=Sum("created"), accessed=Sum("accessed"), taps=Sum("taps")
+    )
+    by_module = list(
+        DeepLinkStatusCount.objects.values("module")
+        .annotate(count=Sum("count"))
+        .order_by("module")
+    )
+    by_status = list(
+        DeepLinkStatusCount.objects.values("status")
+        .annotate(count=Sum("count"))
+        .order_by("status")
+    )
+    statuses = {row["status"]: row["count"] for row in by_status}
+
+    return {
+        "date": day.isoformat(),
+        "total_links": sum(statuses.values()),
+        "active_links": statuses.get(DeepLink.Status.ACTIVE, 0),
+        "created_yesterday": daily["created"] or 0,
+        "accessed_yesterday": daily["accessed"] or 0,
+        "taps_yesterday": daily["taps"] or 0,
+        "by_module": by_module,
+        "by_status": by_status,
+    }
@@ -147,50 +147,93 @@ class DeepLinkService:
         Create and return a Notification DeepLink model instance. Does not return the smart URL —
         it returns the actual DB object so callers can inspect token, fields, etc.
         """
-        context = context or {}
-        meta = meta or {}
         module = self.get_user_module(user_id)
+        dl = self._build_notification_deep_link(
+            user_id=user_id,
+            module=module,
+            clean_route=clean_route,
+            context=context,
+            fallback_url=fallback_url,
+            meta=meta,
+        )
 
+        with transaction.atomic():
+            dl.save()
+        logger.info(
+            "Created DeepLink record %s for user %s module=%s path=%s",
+            dl.token,
+            user_id,
+            module,
+            dl.deep_path,
+        )
+        return dl
+
+    def create_notification_deep_links(
+        self, links: List[Dict[str, Any]], batch_size: int = 500
+    ) -> List[DeepLink]:
+        """
+        Bulk version of ``create_notification_deep_link``.
+
+        ``links`` holds the keyword arguments of ``create_notification_deep_link``
+        for each link. User modules are resolved in one lookup and the rows are
+        inserted with ``bulk_create``; the returned DeepLinks are in the same
+        order as ``links``. Each link is validated like ``DeepLink.save()``
+        would, so an invalid one raises ``ValidationError`` before any insert.
+        """
+        if not links:
+            return []
+
+        modules = self.get_user_modules([link["user_id"] for link in links])
+        deep_links = [
+            self._build_notification_deep_link(module=modules[link["user_id"]], **link)
+            for link in links
+        ]
+        # bulk_create skips DeepLink.save(); run the same validation up front.
+        # The user foreign key and the token's unique index are still checked
+        # by the insert, so skip their per-row lookups.
+        for deep_link in deep_links:
+            deep_link.full_clean(exclude=["user"], validate_unique=False)
+
+        with transaction.atomic():
+            DeepLink.objects.bulk_create(deep_links, batch_size=batch_size)
+        logger.info("Created %s notification DeepLink records", len(deep_links))
+        return deep_links
+
+    def _build_notification_deep_link(
+        self,
+        *,
+        user_id: int,
+        module: str,
+        clean_route: str,
+        context: Optional[Dict[str, Any]] = None,
+        fallback_url: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> DeepLink:
         # Validate module presence in registry
         if not self.registry.exists(module):
             raise InvalidModuleError(f"Module '{module}' not registered")
 
         app_cfg = self.registry.get(module)
-
         final_fallback = fallback_url or app_cfg.default_fallback
 
-        # Create DB record atomically
-        from notifications.model import DeepLink
-
         clean_meta = make_json_safe(
             {
                 **(meta or {}),
-                "context": context,
+                "context": context or {},
             }
         )
-        if not DeepLinkService.SMART_HOST.endswith("/"):
-            link = f"{DeepLinkService.SMART_HOST}/"
-        link = f"{DeepLinkService.SMART_HOST}"
+        link = DeepLinkService.SMART_HOST
 
-        with transaction.atomic():
-            dl = DeepLink.objects.create(
-                user_id=user_id,
-                module=module,
-                deep_link=f"{link}{clean_route.lstrip('/')}",
-                android_package=getattr(app_cfg, "android_package", ""),
-                ios_bundle_id=getattr(app_cfg, "ios_bundle_id", ""),
-                fallback_url=final_fallback or "",
-                deep_path=f"{app_cfg.scheme}://{clean_route.lstrip('/')}",
-                meta=clean_meta,
-            )
-        logger.info(
-            "Created DeepLink record %s for user %s module=%s path=%s",
-            dl.token,
-            user_id,
-            module,
-            dl.deep_path,
+        return DeepLink(
+            user_id=user_id,
+            module=module,
+            deep_link=f"{link}{clean_route.lstrip('/')}",
+            android_package=getattr(app_cfg, "android_package", ""),
+            ios_bundle_id=getattr(app_cfg, "ios_bundle_id", ""),
+            fallback_url=final_fallback or "",
+            deep_path=f"{app_cfg.scheme}://{clean_route.lstrip('/')}",
+            meta=clean_meta,
         )
-        return dl
 
     def create_deep_link_record(
         self,
@@ -376,6 +419,41 @@ class DeepLinkService:
 
         return module
 
+    def get_user_modules(self, user_ids: List[int]) -> Dict[int, str]:
+        """
+        Bulk version of ``get_user_module``: cached modules are read with one
+        ``get_many`` and the rest with a single ``UserDevice`` query.
+        """
+        keys = {f"user_module:{user_id}": user_id for user_id in set(user_ids)}
+        modules = {keys[key]: module for key, module in cache.get_many(list(keys)).items()}
+
+        missing = [user_id for user_id in keys.values() if user_id not in modules]
+        if not missing:
+            return modules
+
+        devices = dict(
+            UserDevice.objects.filter(user_id__in=missing)
+            .order_by("id")
+            .values_list("user_id", "module")
+        )
+        fetched = {}
+        for user_id in missing:
+            module = devices.get(user_id) or "member"
+            if not self.registry.exists(module):
+                logger.warning(
+                    f"Unknown module '{module}' for user {user_id}, "
+                    f"falling back to 'member'"
+                )
+                module = "member"
+            fetched[user_id] = module
+
+        cache.set_many(
+            {f"user_module:{user_id}": module for user_id, module in fetched.items()},
+            self.CACHE_TIMEOUT,
+        )
+        modules.update(fetched)
+        return modules
+
     # ---------------------------------------------------------
     # Route Resolution with Error Handling
     # ---------------------------------------------------------
@@ -545,8 +623,9 @@ class DeepLinkService:
 
                 # Update status if needed
                 if dl.is_expired and dl.status == DeepLink.Status.ACTIVE:
-                    dl.status = DeepLink.Status.EXPIRED
-                    dl.save(update_fields=["status"])
+                    from .deeplink_lifecycle import mark_expired
+
+                    mark_expired(dl)
 
                 return None
 
@@ -575,18 +654,15 @@ class DeepLinkService:
 
     def cleanup_expired_links(self, batch_size: int = 1000) -> int:
         """
-        Mark expired links as EXPIRED status.
+        Mark expired links as EXPIRED status, ``batch_size`` rows per
+        transaction until none are left.
 
         Returns:
             Number of links updated
         """
-        now = timezone.now()
-        updated = DeepLink.objects.filter(
-            expires_at__lt=now, status=DeepLink.Status.ACTIVE
-        )[:batch_size].update(status=DeepLink.Status.EXPIRED)
+        from .deeplink_lifecycle import expire_links
 
-        logger.info(f"Marked {updated} expired deep links")
-        return updated
+        return expire_links(batch_size=batch_size)
 
     # ---------------------------------------------------------
     # Utility Methods
@@ -3,6 +3,7 @@
 Notification delivery service - separated from main service to avoid circular imports
 """
 import logging
+import time
 import requests
 from typing import Dict, Any, Optional, List
 from django.conf import settings
@@ -24,69 +25,144 @@ class NotificationDeliveryService:
     from .model import Notification, NotificationStatus
     from member.models import User
 
+    PUSH_BASE_URL = "http://tech.kasheemilk.com:5566"
+
     def deliver_batch(self, notifications: List[Notification], max_workers: int = 20):
         """
-        Deliver a batch of notifications with parallel channel delivery.
+        Deliver a batch of notifications.
+
+        Device tokens for every recipient are loaded in one query, all push
+        payloads are built up front and sent concurrently through the shared
+        FCM pool, and the other channels run on a bounded pool alongside.
+        Tokens FCM reports as unregistered are deactivated on ``UserDevice``.
         """
         from .model import NotificationStatus
+        from .choices import NotificationChannel
+        from .fcm import FCMBatchSender
 
-        processed_notifs = []
+        started = time.perf_counter()
+        tokens_by_user = self._get_fcm_tokens(
+            {notification.recipient_id for notification in notifications}
+        )
 
+        push_messages = []
+        other_jobs = []
+        delivery_results = {n.pk: {} for n in notifications}
         for notification in notifications:
-            try:
-                notification.status = NotificationStatus.SENDING
-                delivery_results = {}
-                success_count = 0
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = {
-                        executor.submit(
-                            self._deliver_channel_safe, notification, channel
-                        ): channel
-                        for channel in notification.channels
+            notification.status = NotificationStatus.SENDING
+            for channel in notification.channels:
+                if channel != NotificationChannel.PUSH:
+                    other_jobs.append((notification, channel))
+                    continue
+                tokens = tokens_by_user.get(notification.recipient_id)
+                if not tokens:
+                    delivery_results[notification.pk][channel] = {
+                        "status": "skipped",
+                        "reason": "No FCM token found",
+                    }
+                    continue
+                try:
+                    for token in tokens:
+                        push_messages.append(
+                            (
+                                notification.pk,
+                                token,
+                                notification.to_fcm_payload(
+                                    base_url=self.PUSH_BASE_URL, device_token=token
+                                ),
+                            )
+                        )
+                except Exception as exc:
+                    logger.exception(
+                        f"Could not build FCM payload for {notification.uuid}: {exc}"
+                    )
+                    delivery_results[notification.pk][channel] = {
+                        "status": "error",
+                        "error": str(exc),
                     }
 
-                    for future in as_completed(futures):
-                        channel = futures[future]
-                        result = future.result()
-                        delivery_results[channel] = result
-                        if result.get("status") == "success":
-                            success_count += 1
-
-                # Determine final notification status
-                if success_count == len(notification.channels):
-                    notification.status = NotificationStatus.SENT
-                elif success_count == 0:
-                    notification.status = NotificationStatus.FAILED
-                else:
-                    notification.status = NotificationStatus.PARTIALLY_SENT
-
-                notification.delivery_status = delivery_results
-                notification.sent_at = timezone.now()
-                processed_notifs.append(notification)
-
-                logger.info(
-                    f"Notification {notification.uuid} delivered - {success_count}/{len(notification.channels)} channels successful"
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            other_futures = {
+                executor.submit(self._deliver_channel_safe, notification, channel): (
+                    notification,
+                    channel,
                 )
+                for notification, channel in other_jobs
+            }
+            push_result = FCMBatchSender().send_many(push_messages)
+            for future in as_completed(other_futures):
+                notification, channel = other_futures[future]
+                delivery_results[notification.pk][channel] = future.result()
+
+        for notification_pk, sends in push_result.results.items():
+            if push_result.succeeded(notification_pk):
+                result = {"status": "success", "response": sends[0]["response"]}
+            else:
+                result = {"status": "failed", "error": sends[0]["response"]}
+            result["devices"] = len(sends)
+            delivery_results[notification_pk][NotificationChannel.PUSH] = result
 
-            except Exception as exc:
-                logger.exception(
-                    f"Fatal error processing notification {notification.uuid}: {exc}"
-                )
+        sent_at = timezone.now()
+        for notification in notifications:
+            results = delivery_results[notification.pk]
+            success_count = sum(
+                1 for result in results.values() if result.get("status") == "success"
+            )
+            if success_count == len(notification.channels):
+                notification.status = NotificationStatus.SENT
+            elif success_count == 0:
                 notification.status = NotificationStatus.FAILED
-                notification.delivery_status = {"error": str(exc)}
-                processed_notifs.append(notification)
+            else:
+                notification.status = NotificationStatus.PARTIALLY_SENT
+            notification.delivery_status = results
+            notification.sent_at = sent_at
 
         # Bulk update at end of batch
-        if processed_notifs:
+        if notifications:
             from django.db import transaction
             from .model import Notification
 
             with transaction.atomic():
                 Notification.objects.bulk_update(
-                    processed_notifs, ["status", "sent_at", "delivery_status"]
+                    notifications, ["status", "sent_at", "delivery_status"]
                 )
 
-        return len(processed_notifs)
+        if push_result.stale_tokens:
+            self._prune_stale_tokens(push_result.stale_tokens)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Batch delivered: {len(notifications)} notifications, "
+            f"{push_result.sent}/{len(push_messages)} pushes sent, "
+            f"{len(push_result.stale_tokens)} stale tokens, "
+            f"{len(notifications) / elapsed if elapsed else 0:.1f} notifications/s"
+        )
+        return len(notifications)
+
+    def _get_fcm_tokens(self, user_ids) -> Dict[int, List[str]]:
+        """Active device tokens for many users in one query."""
+        from member.models import UserDevice
+
+        devices = (
+            UserDevice.objects.filter(user_id__in=user_ids, is_active=True)
+            .exclude(device__isnull=True)
+            .exclude(device="")
+            .values_list("user_id", "device")
+        )
+        tokens = {}
+        for user_id, token in devices:
+            tokens.setdefault(user_id, []).append(token)
+        return tokens
+
+    def _prune_stale_tokens(self, tokens):
+        """Deactivate devices whose tokens FCM reported as unregistered."""
+        from member.models import UserDevice
+
+        pruned = UserDevice.objects.filter(device__in=tokens, is_active=True).update(
+            is_active=False
+        )
+        logger.info(f"Deactivated {pruned} devices with stale FCM tokens")
+        return pruned
 
     def _deliver_channel_safe(self, notification, channel):
         """
@@ -166,7 +242,7 @@ class NotificationDeliveryService:
 
             sent, info = _send_fcm_message(
                 notification.to_fcm_payload(
-                    base_url="http://tech.kasheemilk.com:5566", device_token=fcm_token
+                    base_url=self.PUSH_BASE_URL, device_token=fcm_token
                 )
             )
 
@@ -11,11 +11,23 @@ customizations. For example, a badge is added to messages that are sent to iOS d
 
 import argparse
 import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import timezone
+
 import requests
 import google.auth.transport.requests
 
 from google.oauth2 import service_account
 from decouple import config
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
 
 SERVICE_ACCOUNT_PATH = config("SERVICE_ACCOUNT_PATH")
 
@@ -25,6 +37,342 @@ FCM_ENDPOINT = "v1/projects/" + PROJECT_ID + "/messages:send"
 FCM_URL = BASE_URL + "/" + FCM_ENDPOINT
 SCOPES = ["https://www.googleapis.com/auth/firebase.messaging"]
 
+TOKEN_CACHE_KEY = "fcm_access_token"
+TOKEN_LOCK_KEY = "fcm_access_token_lock"
+# Refresh this many seconds before Google says the token expires.
+TOKEN_EXPIRY_SKEW = 300
+
+
+class FCMTokenProvider:
+    """
+    OAuth access token for FCM, refreshed shortly before it expires.
+
+    The token is held in-process (shared by all threads) and in the Django
+    cache (shared by all worker processes), so the service-account file is
+    read once per process and Google is only asked for a new token when the
+    shared one is about to expire.
+    """
+
+    def __init__(self, service_account_path=None, scopes=None):
+        self.service_account_path = service_account_path or SERVICE_ACCOUNT_PATH
+        self.scopes = scopes or SCOPES
+        self._credentials = None
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_token(self) -> str:
+        if self._token and time.time() < self._expires_at:
+            return self._token
+
+        with self._lock:
+            if self._token and time.time() < self._expires_at:
+                return self._token
+
+            shared = cache.get(TOKEN_CACHE_KEY)
+            if not shared:
+                # Only one process refreshes; the others briefly wait for it.
+                if not cache.add(TOKEN_LOCK_KEY, os.getpid(), timeout=30):
+                    for _ in range(20):
+                        time.sleep(0.1)
+                        shared = cache.get(TOKEN_CACHE_KEY)
+                        if shared:
+                            break
+                if not shared:
+                    try:
+                        shared = self._fetch_token()
+                        ttl = int(shared["expires_at"] - time.time())
+                        if ttl > 0:
+                            cache.set(TOKEN_CACHE_KEY, shared, timeout=ttl)
+                    finally:
+                        cache.delete(TOKEN_LOCK_KEY)
+
+            self._token = shared["token"]
+            self._expires_at = shared["expires_at"]
+            return self._token
+
+    def invalidate(self):
+        """Drop the cached token everywhere, e.g. after FCM answered 401."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            cache.delete(TOKEN_CACHE_KEY)
+
+    def _fetch_token(self) -> dict:
+        if self._credentials is None:
+            self._credentials = service_account.Credentials.from_service_account_file(
+                self.service_account_path, scopes=self.scopes
+            )
+        self._credentials.refresh(google.auth.transport.requests.Request())
+        if self._credentials.expiry:
+            # google-auth reports expiry as a naive UTC datetime
+            expiry = self._credentials.expiry.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            expiry = time.time() + 3600
+        return {
+            "token": self._credentials.token,
+            "expires_at": expiry - TOKEN_EXPIRY_SKEW,
+        }
+
+
+class FCMMetrics:
+    """
+    In-process counters and a rolling window of per-send latencies.
+    """
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.sent = 0
+        self.failed = 0
+        self.token_refreshes = 0
+
+    def record(self, latency_ms, success):
+        with self._lock:
+            self._latencies.append(latency_ms)
+            if success:
+                self.sent += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            sent, failed = self.sent, self.failed
+
+        def pct(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 2)
+
+        return {
+            "sent": sent,
+            "failed": failed,
+            "token_refreshes": self.token_refreshes,
+            "samples": len(latencies),
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._latencies.clear()
+            self.sent = 0
+            self.failed = 0
+            self.token_refreshes = 0
+
+
+class FCMTransport:
+    """
+    Sends FCM v1 messages over a pooled keep-alive session.
+
+    The session is created lazily per process (and recreated after a fork,
+    so Celery prefork children never share sockets with their parent).
+    """
+
+    def __init__(
+        self,
+        url=None,
+        token_provider=None,
+        pool_size=None,
+        timeout=None,
+        metrics=None,
+    ):
+        self.url = url or getattr(settings, "FCM_URL", FCM_URL)
+        self.token_provider = token_provider or FCMTokenProvider()
+        self.pool_size = pool_size or getattr(settings, "FCM_POOL_SIZE", 50)
+        self.timeout = timeout or getattr(settings, "FCM_TIMEOUT", (3.05, 10))
+        self.metrics = metrics or FCMMetrics()
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.pool_size,
+                        pool_block=True,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def _post(self, fcm_message):
+        headers = {
+            "Authorization": "Bearer " + self.token_provider.get_token(),
+            "Content-Type": "application/json; UTF-8",
+        }
+        return self.session.post(
+            self.url,
+            data=json.dumps(fcm_message),
+            headers=headers,
+            timeout=self.timeout,
+        )
+
+    def send(self, fcm_message):
+        """
+        Send one message. Returns ``(sent, response_text)`` like the legacy
+        ``_send_fcm_message``.
+        """
+        started = time.perf_counter()
+        try:
+            resp = self._post(fcm_message)
+            if resp.status_code == 401:
+                # Token revoked or expired early: refresh once and retry.
+                self.token_provider.invalidate()
+                self.metrics.token_refreshes += 1
+                resp = self._post(fcm_message)
+        except requests.RequestException as exc:
+            self.metrics.record((time.perf_counter() - started) * 1000, False)
+            logger.warning(f"FCM send failed: {exc}")
+            return False, str(exc)
+
+        sent = resp.status_code == 200
+        self.metrics.record((time.perf_counter() - started) * 1000, sent)
+        return sent, resp.text
+
+
+# FCM v1 error codes meaning the registration token will never work again.
+STALE_TOKEN_ERRORS = {"UNREGISTERED", "SENDER_ID_MISMATCH"}
+
+
+def is_stale_token_error(response_text) -> bool:
+    """
+    True when an FCM error response says the device token itself is dead
+    (app uninstalled, token rotated, malformed token), as opposed to a
+    transient or payload error.
+    """
+    try:
+        error = json.loads(response_text).get("error", {})
+    except (TypeError, ValueError, AttributeError):
+        return False
+    codes = {
+        detail.get("errorCode")
+        for detail in error.get("details", [])
+        if isinstance(detail, dict)
+    }
+    if codes & STALE_TOKEN_ERRORS:
+        return True
+    return error.get("status") == "INVALID_ARGUMENT" and "registration token" in (
+        error.get("message") or ""
+    )
+
+
+class FCMBatchResult:
+    """Outcome of ``FCMBatchSender.send_many``."""
+
+    def __init__(self):
+        self.results = {}
+        self.stale_tokens = set()
+        self.sent = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    def add(self, key, token, sent, info):
+        self.results.setdefault(key, []).append(
+            {"token": token, "sent": sent, "response": info}
+        )
+        if sent:
+            self.sent += 1
+        else:
+            self.failed += 1
+            if is_stale_token_error(info):
+                self.stale_tokens.add(token)
+
+    def succeeded(self, key) -> bool:
+        return any(r["sent"] for r in self.results.get(key, []))
+
+    @property
+    def per_second(self) -> float:
+        return round((self.sent + self.failed) / self.elapsed, 2) if self.elapsed else 0.0
+
+
+class FCMBatchSender:
+    """
+    Sends many FCM messages concurrently through a shared, bounded pool.
+
+    The pool is created once per process. At most ``max_in_flight`` sends are
+    queued at a time, so a huge batch never builds an unbounded backlog of
+    futures and payloads in memory.
+    """
+
+    _executor = None
+    _executor_pid = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, transport=None, max_workers=None, max_in_flight=None):
+        self.transport = transport or get_transport()
+        self.max_workers = max_workers or getattr(settings, "FCM_SEND_WORKERS", 32)
+        self.max_in_flight = max_in_flight or self.max_workers * 4
+
+    @classmethod
+    def _get_executor(cls, max_workers):
+        from concurrent.futures import ThreadPoolExecutor
+
+        if cls._executor is None or cls._executor_pid != os.getpid():
+            with cls._executor_lock:
+                if cls._executor is None or cls._executor_pid != os.getpid():
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=max_workers, thread_name_prefix="fcm-send"
+                    )
+                    cls._executor_pid = os.getpid()
+        return cls._executor
+
+    def send_many(self, messages) -> FCMBatchResult:
+        """
+        ``messages`` is an iterable of ``(key, device_token, fcm_message)``.
+        Results are grouped by ``key`` so one notification can fan out to
+        several device tokens.
+        """
+        result = FCMBatchResult()
+        result_lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        executor = self._get_executor(self.max_workers)
+        futures = []
+        started = time.perf_counter()
+
+        def _send(key, token, message):
+            try:
+                sent, info = self.transport.send(message)
+            except Exception as exc:
+                sent, info = False, str(exc)
+            with result_lock:
+                result.add(key, token, sent, info)
+
+        for key, token, message in messages:
+            slots.acquire()
+            future = executor.submit(_send, key, token, message)
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+        for future in futures:
+            future.result()
+
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> FCMTransport:
+    """Process-wide FCM transport."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = FCMTransport()
+    return _transport
+
 
 # [START retrieve_access_token]
 def _get_access_token():
@@ -32,12 +380,7 @@ def _get_access_token():
 
     :return: Access token.
     """
-    credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_PATH, scopes=SCOPES
-    )
-    request = google.auth.transport.requests.Request()
-    credentials.refresh(request)
-    return credentials.token
+    return get_transport().token_provider.get_token()
 
 
 # [END retrieve_access_token]
@@ -49,18 +392,7 @@ def _send_fcm_message(fcm_message):
     Args:
     fcm_message: JSON object that will make up the body of the request.
     """
-    # [START use_access_token]
-    headers = {
-        "Authorization": "Bearer " + _get_access_token(),
-        "Content-Type": "application/json; UTF-8",
-    }
-    # [END use_access_token]
-    resp = requests.post(FCM_URL, data=json.dumps(fcm_message), headers=headers)
-
-    if resp.status_code == 200:
-        return True, resp.text
-    else:
-        return False, resp.text
+    return get_transport().send(fcm_message)
 
 
 def _build_common_message():
@@ -0,0 +1,79 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+from notifications.sms import SMSGateway
+from notifications.tests.sms_stub import StubSMSServer, stub_provider
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare unpooled per-request SMS calls with the pooled SMS gateway "
+        "against a local fake SMS provider"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sends", type=int, default=500, help="Messages per scenario")
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Parallel sending threads"
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=0.02,
+            help="Simulated provider latency in seconds",
+        )
+
+    def handle(self, *args, **options):
+        with StubSMSServer(delay=options["delay"]) as stub:
+            provider = stub_provider(stub)
+            gateway = SMSGateway(providers=[provider])
+
+            def unpooled(i):
+                params = {**provider.params, "mobile": "9000000000", "msg": f"msg {i}"}
+                requests.get(provider.url, params=params).json()
+
+            def pooled(i):
+                gateway.deliver("9000000000", f"msg {i}")
+
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Benchmarking {options['sends']} sends, "
+                    f"concurrency={options['concurrency']}, "
+                    f"provider delay={options['delay'] * 1000:.0f}ms"
+                )
+            )
+            for label, fn in (("unpooled", unpooled), ("pooled", pooled)):
+                stub.requests.clear()
+                samples = []
+
+                def timed(i):
+                    started = time.perf_counter()
+                    fn(i)
+                    samples.append((time.perf_counter() - started) * 1000)
+
+                wall = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                    list(pool.map(timed, range(options["sends"])))
+                wall = time.perf_counter() - wall
+
+                connections = len({r["client"] for r in stub.requests})
+                self.stdout.write(
+                    f"{label:<9} n={len(samples):<5} "
+                    f"p50={statistics.median(samples):8.2f}ms "
+                    f"p95={_percentile(samples, 95):8.2f}ms "
+                    f"max={max(samples):8.2f}ms "
+                    f"throughput={len(samples) / wall:8.1f}/s "
+                    f"connections={connections}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,105 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.utils import timezone
+
+from notifications.model import NotificationTemplate
+from notifications.template_cache import compiled_templates
+
+COLLECTION_TEMPLATE = "mpp_collection_created_hi"
+
+
+def _sample_template():
+    """Stand-in for the collection template when it isn't in the database."""
+    return NotificationTemplate(
+        id=-1,
+        name=COLLECTION_TEMPLATE,
+        title_template="दूध संग्रह: {{ collection.qty }} लीटर",
+        body_template=(
+            "{{ recipient.first_name|default:'सदस्य' }}, {{ collection.collection_date|date:'d M' }} "
+            "{{ collection.shift_code__shift_short_name }} शिफ्ट में {{ collection.qty }} लीटर "
+            "(फैट {{ collection.fat }}, एसएनएफ {{ collection.snf }}) - "
+            "राशि ₹{{ collection.amount|floatformat:2 }}। {{ site_name }}"
+        ),
+        email_subject_template="{{ site_name }} collection {{ collection.mpp_collection_code }}",
+        email_body_template="{% if collection.amount %}Amount: {{ collection.amount }}{% endif %}",
+        updated_at=timezone.now(),
+    )
+
+
+def _contexts(count):
+    now = timezone.now()
+    for i in range(count):
+        yield {
+            "recipient": {"first_name": f"Member {i}"},
+            "collection": {
+                "mpp_collection_code": 100000 + i,
+                "member_code": f"M{i:06d}",
+                "qty": Decimal("7.25") + i % 10,
+                "fat": Decimal("4.1"),
+                "snf": Decimal("8.5"),
+                "amount": Decimal("312.40") + i % 50,
+                "collection_date": now - timedelta(minutes=i),
+                "shift_code__shift_short_name": "M" if i % 2 else "E",
+            },
+            "site_name": "Kashee E-Dairy",
+        }
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark collection notification rendering (uncached vs cached vs batch)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=10000,
+            help="Number of collection notifications to render",
+        )
+
+    def handle(self, *args, **options):
+        template = (
+            NotificationTemplate.objects.filter(name=COLLECTION_TEMPLATE).first()
+            or _sample_template()
+        )
+        contexts = list(_contexts(options["count"]))
+        fields = [
+            getattr(template, attr)
+            for _, attr, _ in NotificationTemplate.RENDERED_FIELDS
+            if getattr(template, attr)
+        ]
+
+        def uncached():
+            # What render_content used to do: compile every field per record.
+            for context in contexts:
+                django_context = Context(context)
+                for source in fields:
+                    Template(source).render(django_context)
+
+        def cached():
+            for context in contexts:
+                template.render_content(context)
+
+        def batch():
+            template.render_many(contexts)
+
+        compiled_templates.clear()
+        self.stdout.write(
+            self.style.WARNING(
+                f"Rendering {len(contexts)} notifications with '{template.name}'"
+            )
+        )
+        for label, fn in (("uncached", uncached), ("cached", cached), ("batch", batch)):
+            started = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:<9} total={elapsed * 1000:9.1f}ms "
+                f"per-record={elapsed / len(contexts) * 1_000_000:7.1f}us "
+                f"rate={len(contexts) / elapsed:9.0f}/s"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-17 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_deeplink_alter_notificationtemplate_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationtrackmppcollection',
+            name='collection_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Collection Date'),
+        ),
+        migrations.AddField(
+            model_name='notificationtrackmppcollection',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationtrackmppcollection',
+            constraint=models.UniqueConstraint(fields=('collection_date', 'collection_code'), name='uniq_notification_track_day_code'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeepLinkArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(unique=True)),
+                ('user_id', models.IntegerField(blank=True, null=True)),
+                ('module', models.CharField(max_length=50)),
+                ('deep_link', models.CharField(max_length=512)),
+                ('deep_path', models.CharField(blank=True, max_length=512)),
+                ('fallback_url', models.URLField(blank=True, max_length=512)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('expired', 'Expired'), ('revoked', 'Revoked'), ('consumed', 'Consumed')], max_length=20)),
+                ('use_count', models.PositiveIntegerField(default=0)),
+                ('meta', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('last_accessed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'deep_links_archive',
+                'indexes': [models.Index(fields=['created_at'], name='deep_links__created_b44263_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DeepLinkCounterState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_link_id', models.BigIntegerField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'deep_link_counter_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='DeepLinkDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('module', models.CharField(choices=[('member', 'Member App'), ('sahayak', 'Sahayak App'), ('pes', 'PES App')], max_length=50)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('accessed', models.PositiveIntegerField(default=0, help_text='Taps')),
+                ('expired', models.PositiveIntegerField(default=0)),
+                ('consumed', models.PositiveIntegerField(default=0)),
+                ('revoked', models.PositiveIntegerField(default=0)),
+                ('deleted', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'deep_link_daily_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='DeepLinkStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('module', models.CharField(choices=[('member', 'Member App'), ('sahayak', 'Sahayak App'), ('pes', 'PES App')], max_length=50)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('expired', 'Expired'), ('revoked', 'Revoked'), ('consumed', 'Consumed')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'deep_link_status_counts',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='deeplinkdailystat',
+            constraint=models.UniqueConstraint(fields=('day', 'module'), name='deep_link_daily_stat_day_module'),
+        ),
+        migrations.AddConstraint(
+            model_name='deeplinkstatuscount',
+            constraint=models.UniqueConstraint(fields=('module', 'status'), name='deep_link_status_count_module_status'),
+        ),
+    ]
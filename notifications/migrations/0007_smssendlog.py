@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-17 17:30
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_deeplink_lifecycle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SmsSendLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('mobile', models.CharField(max_length=15)),
+                ('purpose', models.CharField(default='otp', max_length=30)),
+                ('message', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('provider', models.CharField(blank=True, max_length=50)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('response', models.JSONField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('latency_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'sms_send_log',
+                'indexes': [models.Index(fields=['mobile', 'created_at'], name='sms_send_log_mobile'), models.Index(fields=['status', 'created_at'], name='sms_send_log_status')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_smssendlog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deeplinkdailystat',
+            name='accessed',
+            field=models.PositiveIntegerField(default=0, help_text='Links tapped'),
+        ),
+        migrations.AddField(
+            model_name='deeplinkdailystat',
+            name='taps',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -3,6 +3,7 @@ from typing import Dict, Any
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -10,6 +11,7 @@ import pytz
 from django.template import Template, Context, TemplateSyntaxError
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from .template_cache import compiled_templates
 from .choices import (
     NotificationChannel,
     NotificationPriority,
@@ -407,6 +409,32 @@ class NotificationTemplate(models.Model):
         if errors:
             raise ValidationError(errors)
 
+    # (rendered key, source field, channel); channel None renders for every channel.
+    RENDERED_FIELDS = (
+        ("title", "title_template", None),
+        ("body", "body_template", None),
+        ("email_subject", "email_subject_template", "email"),
+        ("email_body", "email_body_template", "email"),
+        ("sms", "sms_template", "sms"),
+        ("whatsapp", "whatsapp_template", "whatsapp"),
+    )
+
+    def compiled(self, field: str, source: str) -> Template:
+        """Compiled template for ``source``, cached per template version."""
+        return compiled_templates.get(self, field, source)
+
+    def _compiled_fields(self, channel: Optional[str] = None) -> List[tuple]:
+        fields = []
+        for key, attr, field_channel in self.RENDERED_FIELDS:
+            if field_channel and channel and channel != field_channel:
+                continue
+            source = getattr(self, attr)
+            # Title and body are always rendered (used by push, in-app)
+            if field_channel and not source:
+                continue
+            fields.append((key, self.compiled(attr, source)))
+        return fields
+
     def render_content(
         self, context: Dict[str, Any], channel: Optional[str] = None
     ) -> Dict[str, str]:
@@ -421,33 +449,27 @@ class NotificationTemplate(models.Model):
             Dictionary containing rendered content for requested channel(s)
         """
         django_context = Context(context)
-        rendered = {}
-
-        # Always render title and body (used by push, in-app)
-        rendered["title"] = Template(self.title_template).render(django_context)
-        rendered["body"] = Template(self.body_template).render(django_context)
-
-        # Render channel-specific content
-        if not channel or channel == "email":
-            if self.email_subject_template:
-                rendered["email_subject"] = Template(
-                    self.email_subject_template
-                ).render(django_context)
-            if self.email_body_template:
-                rendered["email_body"] = Template(self.email_body_template).render(
-                    django_context
-                )
-
-        if not channel or channel == "sms":
-            if self.sms_template:
-                rendered["sms"] = Template(self.sms_template).render(django_context)
+        return {
+            key: compiled.render(django_context)
+            for key, compiled in self._compiled_fields(channel)
+        }
 
-        if not channel or channel == "whatsapp":
-            if self.whatsapp_template:
-                rendered["whatsapp"] = Template(self.whatsapp_template).render(
-                    django_context
-                )
+    def render_many(
+        self, contexts: List[Dict[str, Any]], channel: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Render this template for many contexts at once.
 
+        Templates are compiled (or fetched from the cache) once for the whole
+        batch; the result list is in the same order as ``contexts``.
+        """
+        fields = self._compiled_fields(channel)
+        rendered = []
+        for context in contexts:
+            django_context = Context(context)
+            rendered.append(
+                {key: compiled.render(django_context) for key, compiled in fields}
+            )
         return rendered
 
     def get_deeplink_config(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -486,19 +508,19 @@ class NotificationTemplate(models.Model):
 
         # Render template strings in config
         if "route_template" in config:
-            config["route_template"] = Template(config["route_template"]).render(
-                django_context
-            )
+            config["route_template"] = self.compiled(
+                "deeplink_config.route_template", config["route_template"]
+            ).render(django_context)
 
         if "fallback_template" in config:
-            config["fallback_template"] = Template(config["fallback_template"]).render(
-                django_context
-            )
+            config["fallback_template"] = self.compiled(
+                "deeplink_config.fallback_template", config["fallback_template"]
+            ).render(django_context)
 
         if "inapp_route" in config:
-            config["inapp_route"] = Template(config["inapp_route"]).render(
-                django_context
-            )
+            config["inapp_route"] = self.compiled(
+                "deeplink_config.inapp_route", config["inapp_route"]
+            ).render(django_context)
 
         # Extract route parameters from context for url_name resolution
         config["route_params"] = {
@@ -784,9 +806,15 @@ class Notification(models.Model):
     def mark_as_read(self):
         """Mark notification as read"""
         if not self.is_read:
+            from .counters import notifications_read
+
             self.is_read = True
             self.read_at = timezone.now()
-            self.save(update_fields=["is_read", "read_at"])
+            # Conditional update so two concurrent reads count once.
+            if Notification.objects.filter(pk=self.pk, is_read=False).update(
+                is_read=True, read_at=self.read_at
+            ):
+                notifications_read(self.recipient_id)
 
     def mark_as_delivered(self, channel: str = None):
         """Mark notification as delivered for specific channel or overall"""
@@ -1390,13 +1418,28 @@ class NotificationAnalytics(models.Model):
 
 
 class NotificationTrackMppCollection(models.Model):
+    """
+    Collections already notified, partitioned by collection day so dedup only
+    ever reads the current day's rows.
+    """
+
     collection_code = models.CharField(
         max_length=200, verbose_name=_("Mpp Collection Code")
     )
+    collection_date = models.DateField(
+        null=True, blank=True, verbose_name=_("Collection Date")
+    )
     is_sent = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, null=True)
 
     class Meta:
         db_table = "tbl_notification_track"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["collection_date", "collection_code"],
+                name="uniq_notification_track_day_code",
+            )
+        ]
 
 
 class DeepLink(models.Model):
@@ -1529,20 +1572,32 @@ class DeepLink(models.Model):
         )
 
     def increment_use(self):
-        """Record a link access."""
-        self.use_count += 1
+        """
+        Record a link access. The counter is bumped in SQL so concurrent taps
+        are not lost; the redirect view counts taps through
+        ``notifications.deeplink_cache`` instead.
+        """
         self.last_accessed_at = timezone.now()
+        DeepLink.objects.filter(pk=self.pk).update(
+            use_count=models.F("use_count") + 1,
+            last_accessed_at=self.last_accessed_at,
+        )
+        self.refresh_from_db(fields=["use_count"])
 
         # Auto-consume if max uses reached
-        if self.is_exhausted:
+        if self.is_exhausted and self.status == self.Status.ACTIVE:
             self.status = self.Status.CONSUMED
-
-        self.save(update_fields=["use_count", "last_accessed_at", "status"])
+            self._leave_active("consumed")
 
     def revoke(self):
         """Manually revoke the link."""
+        from .deeplink_lifecycle import revoke_links
+
+        revoked = revoke_links(DeepLink.objects.filter(pk=self.pk))
         self.status = self.Status.REVOKED
-        self.save(update_fields=["status", "updated_at"])
+        if not revoked:
+            self.save(update_fields=["status", "updated_at"])
+            self._invalidate_cached()
 
     def extend_expiry(self, days: int = 7):
         """Extend expiry by specified days."""
@@ -1551,3 +1606,196 @@ class DeepLink(models.Model):
         else:
             self.expires_at = timezone.now() + timedelta(days=days)
         self.save(update_fields=["expires_at", "updated_at"])
+        self._invalidate_cached()
+
+    def _leave_active(self, event):
+        from .deeplink_lifecycle import record
+
+        if DeepLink.objects.filter(pk=self.pk, status=self.Status.ACTIVE).update(
+            status=self.status
+        ):
+            record(event, {self.module: 1})
+        self._invalidate_cached()
+
+    def _invalidate_cached(self):
+        from .deeplink_cache import invalidate
+
+        invalidate([self.token])
+
+
+class DeepLinkArchive(models.Model):
+    """
+    Old inactive deep links moved out of ``deep_links`` by the lifecycle
+    job, so the hot table only holds links that can still be tapped or
+    reported on.
+    """
+
+    token = models.UUIDField(unique=True)
+    user_id = models.IntegerField(null=True, blank=True)
+    module = models.CharField(max_length=50)
+    deep_link = models.CharField(max_length=512)
+    deep_path = models.CharField(max_length=512, blank=True)
+    fallback_url = models.URLField(blank=True, max_length=512)
+    status = models.CharField(max_length=20, choices=DeepLink.Status.choices)
+    use_count = models.PositiveIntegerField(default=0)
+    meta = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+    last_accessed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "deep_links_archive"
+        indexes = [models.Index(fields=["created_at"])]
+
+    def __str__(self):
+        return f"Archived DeepLink {self.token} [{self.status}]"
+
+
+class DeepLinkDailyStat(models.Model):
+    """
+    Deep-link lifecycle events per day and module, incremented by the code
+    that causes them (see ``notifications.deeplink_lifecycle``).
+    """
+
+    day = models.DateField()
+    module = models.CharField(max_length=50, choices=DeepLink.Module.choices)
+    created = models.PositiveIntegerField(default=0)
+    accessed = models.PositiveIntegerField(default=0, help_text="Links tapped")
+    taps = models.PositiveIntegerField(default=0)
+    expired = models.PositiveIntegerField(default=0)
+    consumed = models.PositiveIntegerField(default=0)
+    revoked = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "deep_link_daily_stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "module"], name="deep_link_daily_stat_day_module"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.module}"
+
+
+class DeepLinkStatusCount(models.Model):
+    """Current number of deep links per module and status."""
+
+    module = models.CharField(max_length=50, choices=DeepLink.Module.choices)
+    status = models.CharField(max_length=20, choices=DeepLink.Status.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "deep_link_status_counts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["module", "status"], name="deep_link_status_count_module_status"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.module}/{self.status}: {self.count}"
+
+
+class DeepLinkCounterState(models.Model):
+    """
+    Bookkeeping for the deep-link counters: the highest ``DeepLink`` id
+    already counted as created, and when the counters were last refreshed.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    last_link_id = models.BigIntegerField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "deep_link_counter_state"
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_link_id}"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notification event recorded in the same transaction as the change that
+    triggers it. ``notifications.outbox.relay`` turns committed events into
+    notifications and queues their delivery in batches.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    template_name = models.CharField(max_length=100)
+    recipient_ids = models.JSONField(default=list)
+    sender = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, null=True, blank=True
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    related_object = GenericForeignKey("content_type", "object_id")
+    # Model instances are stored as references and reloaded by the relay.
+    context = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    options = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "notification_outbox"
+        indexes = [
+            models.Index(fields=["status", "id"], name="notification_outbox_status")
+        ]
+
+    def __str__(self):
+        return f"{self.template_name} → {len(self.recipient_ids)} recipients [{self.status}]"
+
+
+class SmsSendLog(models.Model):
+    """
+    One SMS handed to ``notifications.sms``. The app polls ``status`` by
+    ``uuid``; OTP messages are stored masked.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", _("Queued")
+        SENDING = "sending", _("Sending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    uuid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    mobile = models.CharField(max_length=15)
+    purpose = models.CharField(max_length=30, default="otp")
+    message = models.TextField(blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    provider = models.CharField(max_length=50, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    response = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "sms_send_log"
+        indexes = [
+            models.Index(fields=["mobile", "created_at"], name="sms_send_log_mobile"),
+            models.Index(fields=["status", "created_at"], name="sms_send_log_status"),
+        ]
+
+    def __str__(self):
+        return f"{self.purpose} → {self.mobile} [{self.status}]"
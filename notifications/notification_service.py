@@ -1,7 +1,10 @@
 from django.conf import settings
 from typing import Dict, Any, List, Optional, Union, TYPE_CHECKING
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
+from itertools import islice
 import logging
 from .model import (
     Notification,
@@ -11,6 +14,7 @@ from .model import (
     NotificationStatus,
 )
 from notifications.deeplink_service import DeepLinkService, DeepLink
+from . import counters
 
 import datetime
 import decimal
@@ -89,6 +93,7 @@ class NotificationServices:
         priority: str = "normal",
         scheduled_at: Optional[timezone.datetime] = None,
         expires_at: Optional[timezone.datetime] = None,
+        queue: bool = True,
     ) -> Notification:
         """
         Create a new notification instance
@@ -103,6 +108,7 @@ class NotificationServices:
             priority: Notification priority
             scheduled_at: When to send the notification
             expires_at: When the notification expires
+            queue: Queue delivery when due; False leaves it to the caller
         """
         UserModel = get_user_model()
         # Get template
@@ -191,7 +197,7 @@ class NotificationServices:
         logger.info(f"Created notification {notification.uuid} for {recipient.email}")
 
         # Queue for delivery if not scheduled for future
-        if notification.scheduled_at <= timezone.now():
+        if queue and notification.scheduled_at <= timezone.now():
             self.queue_notification(notification)
 
         return notification
@@ -202,47 +208,227 @@ class NotificationServices:
         recipients: List[Union["User", int, str]],
         context_factory: Optional[callable] = None,
         related_object: Any = None,
-        **kwargs,
+        context: Dict[str, Any] = None,
+        sender: Optional["User"] = None,
+        channels: List[str] = None,
+        priority: str = "normal",
+        scheduled_at: Optional[timezone.datetime] = None,
+        expires_at: Optional[timezone.datetime] = None,
+        queue: bool = True,
+        chunk_size: Optional[int] = None,
     ) -> List[Notification]:
         """
         Create multiple notifications efficiently
 
+        The template, its preferences and the related object's content type
+        are loaded once. Recipients are then handled ``chunk_size`` at a time:
+        loaded in one query, rendered in batch, and inserted with their deep
+        links through ``bulk_create``. Delivery of each chunk is queued as one
+        batch task after commit.
+
         Args:
             template_name: Name of the notification template
             recipients: List of users, IDs, or emails
             context_factory: Function that takes (recipient, index) and returns context dict
-            **kwargs: Additional arguments passed to create_notification
+            context: Context shared by every recipient (when no context_factory)
+            queue: Queue delivery when due; False leaves it to the caller
+            Other arguments as for create_notification
         """
+        chunk_size = chunk_size or getattr(settings, "NOTIFICATION_BULK_CHUNK_SIZE", 1000)
+        try:
+            template = NotificationTemplate.objects.get(
+                name=template_name, is_active=True
+            )
+        except NotificationTemplate.DoesNotExist:
+            logger.error(f"Notification template '{template_name}' not found")
+            raise ValueError(f"Template '{template_name}' not found")
 
+        content_type = (
+            ContentType.objects.get_for_model(related_object) if related_object else None
+        )
         notifications = []
+        index = 0
+        recipients = iter(recipients)
+        while chunk := list(islice(recipients, chunk_size)):
+            notifications.extend(
+                self._create_notification_chunk(
+                    template,
+                    chunk,
+                    index,
+                    context_factory=context_factory,
+                    context=context,
+                    related_object=related_object,
+                    content_type=content_type,
+                    sender=sender,
+                    channels=channels,
+                    priority=priority,
+                    scheduled_at=scheduled_at,
+                    expires_at=expires_at,
+                    queue=queue,
+                )
+            )
+            index += len(chunk)
+
+        logger.info(
+            f"Created {len(notifications)} bulk notifications using template '{template_name}'"
+        )
+        return notifications
+
+    def _resolve_recipients(self, recipients) -> List[Optional["User"]]:
+        """Users for a mix of instances, ids and emails, in two queries at most."""
+        UserModel = get_user_model()
+        ids, emails = set(), set()
+        for recipient in recipients:
+            if isinstance(recipient, str) and "@" in recipient:
+                emails.add(recipient)
+            elif isinstance(recipient, (int, str)):
+                ids.add(int(recipient))
+
+        by_id = UserModel.objects.in_bulk(list(ids)) if ids else {}
+        by_email = (
+            {user.email: user for user in UserModel.objects.filter(email__in=emails)}
+            if emails
+            else {}
+        )
 
-        for i, recipient in enumerate(recipients):
-            context = {}
-            if context_factory:
-                context = context_factory(recipient, i)
-            elif "context" in kwargs:
-                context = kwargs["context"].copy()
+        resolved = []
+        for recipient in recipients:
+            if isinstance(recipient, str) and "@" in recipient:
+                resolved.append(by_email.get(recipient))
+            elif isinstance(recipient, (int, str)):
+                resolved.append(by_id.get(int(recipient)))
+            else:
+                resolved.append(recipient)
+        return resolved
 
+    def _create_notification_chunk(
+        self,
+        template,
+        recipients,
+        offset,
+        *,
+        context_factory,
+        context,
+        related_object,
+        content_type,
+        sender,
+        channels,
+        priority,
+        scheduled_at,
+        expires_at,
+        queue,
+    ) -> List[Notification]:
+        users = self._resolve_recipients(recipients)
+        preferred = (
+            {}
+            if channels
+            else self._get_preferred_channels_many(
+                [user.pk for user in users if user is not None], template
+            )
+        )
+
+        pending = []
+        for i, (recipient, user) in enumerate(zip(recipients, users), start=offset):
+            if user is None:
+                logger.error(f"Failed to create notification for recipient {recipient}: not found")
+                continue
             try:
-                notification = self.create_notification(
-                    template_name=template_name,
-                    recipient=recipient,
-                    context=context,
-                    related_object=related_object,
-                    **{k: v for k, v in kwargs.items() if k != "context"},
+                if context_factory:
+                    item_context = context_factory(recipient, i)
+                else:
+                    item_context = (context or {}).copy()
+                if related_object:
+                    item_context.update(
+                        {
+                            "object": related_object,
+                            "object_id": related_object.pk,
+                            "model_name": related_object._meta.model_name,
+                            "app_label": related_object._meta.app_label,
+                        }
+                    )
+                item_context.update(
+                    {"recipient": user, "sender": sender, "base_url": self.base_url}
                 )
-                notifications.append(notification)
+                config = template.get_deeplink_config(item_context)
             except Exception as e:
-                logger.error(
-                    f"Failed to create notification for recipient {recipient}: {e}"
-                )
+                logger.error(f"Failed to create notification for recipient {recipient}: {e}")
                 continue
+            pending.append((user, item_context, config))
+
+        if not pending:
+            return []
+
+        rendered = template.render_many([item_context for _, item_context, _ in pending])
+        safe_contexts = [
+            self._serialize_context(item_context) for _, item_context, _ in pending
+        ]
+        linked = [i for i, (_, _, config) in enumerate(pending) if config]
+        deep_links = dict(
+            zip(
+                linked,
+                self.deeplink_service.create_notification_deep_links(
+                    [
+                        {
+                            "user_id": pending[i][0].pk,
+                            "clean_route": pending[i][2].get("deeplink_type") or "",
+                            "context": safe_contexts[i],
+                            "fallback_url": pending[i][2].get("fallback_template"),
+                            "meta": {
+                                **pending[i][2].get("meta", {}),
+                                "template_name": template.name,
+                            },
+                        }
+                        for i in linked
+                    ]
+                ),
+            )
+        )
 
-        logger.info(
-            f"Created {len(notifications)} bulk notifications using template '{template_name}'"
+        now = timezone.now()
+        scheduled_at = scheduled_at or now
+        due = queue and scheduled_at <= now
+        notifications = Notification.objects.bulk_create(
+            [
+                Notification(
+                    template=template,
+                    recipient=user,
+                    sender=sender,
+                    title=content.get("title", ""),
+                    body=content.get("body", ""),
+                    email_subject=content.get("email_subject", ""),
+                    email_body=content.get("email_body", ""),
+                    deep_link_url=deep_links[i].deep_link if i in deep_links else "",
+                    app_route=deep_links[i].deep_path if i in deep_links else "",
+                    channels=channels or preferred.get(user.pk) or [NotificationChannel.IN_APP],
+                    priority=priority or template.default_priority,
+                    notification_type=template.notification_type,
+                    context_data=safe_context,
+                    status=NotificationStatus.QUEUED if due else NotificationStatus.PENDING,
+                    scheduled_at=scheduled_at,
+                    expires_at=expires_at,
+                    content_type=content_type,
+                    object_id=related_object.pk if related_object else None,
+                )
+                for i, ((user, _, _), content, safe_context) in enumerate(
+                    zip(pending, rendered, safe_contexts)
+                )
+            ]
         )
+
+        counters.notifications_created(
+            [notification.recipient_id for notification in notifications]
+        )
+        if due:
+            ids = [notification.pk for notification in notifications]
+            transaction.on_commit(lambda: self._queue_batch(ids))
         return notifications
 
+    @staticmethod
+    def _queue_batch(notification_ids):
+        from .tasks import process_collections_batch
+
+        process_collections_batch.delay(notification_ids)
+
     def _create_bulk_via_task(
         self,
         template_name: str,
@@ -326,6 +512,34 @@ class NotificationServices:
                 # Use template defaults
                 return template.enabled_channels or [NotificationChannel.IN_APP]
 
+        return self._channels_from_preferences(prefs, template)
+
+    def _get_preferred_channels_many(
+        self, user_ids: List[int], template: NotificationTemplate
+    ) -> Dict[int, List[str]]:
+        """``_get_preferred_channels`` for many users with one query."""
+        by_template, by_category = {}, {}
+        for prefs in NotificationPreferences.objects.filter(user_id__in=user_ids).filter(
+            Q(template=template) | Q(category=template.category)
+        ):
+            if prefs.template_id == template.pk:
+                by_template[prefs.user_id] = prefs
+            else:
+                by_category[prefs.user_id] = prefs
+
+        default = template.enabled_channels or [NotificationChannel.IN_APP]
+        channels = {}
+        for user_id in user_ids:
+            prefs = by_template.get(user_id) or by_category.get(user_id)
+            channels[user_id] = (
+                self._channels_from_preferences(prefs, template) if prefs else default
+            )
+        return channels
+
+    @staticmethod
+    def _channels_from_preferences(
+        prefs: NotificationPreferences, template: NotificationTemplate
+    ) -> List[str]:
         channels = []
         if (
             prefs.allow_in_app
@@ -341,14 +555,29 @@ class NotificationServices:
 
         return channels or [NotificationChannel.IN_APP]
 
+    def mark_all_read(self, user: "User", category: Optional[str] = None) -> int:
+        """Mark the user's unread notifications (optionally one category) as read"""
+        queryset = Notification.objects.filter(recipient=user, is_read=False)
+        if category:
+            queryset = queryset.filter(template__category__iexact=category)
+
+        count = queryset.update(is_read=True, read_at=timezone.now())
+        counters.notifications_read(user.pk, count)
+        return count
+
     def cleanup_expired(self) -> int:
         """Remove expired notifications"""
 
         now = timezone.now()
-        count = Notification.objects.filter(
+        expired = Notification.objects.filter(
             expires_at__lt=now,
             status__in=[NotificationStatus.SENT, NotificationStatus.DELIVERED],
-        ).delete()[0]
+        )
+        recipient_ids = set(
+            expired.values_list("recipient_id", flat=True).order_by().distinct()
+        )
+        count = expired.delete()[0]
+        counters.forget_users(recipient_ids)
 
         logger.info(f"Cleaned up {count} expired notifications")
         return count
@@ -360,8 +589,8 @@ class NotificationServices:
 
         notification.status = NotificationStatus.QUEUED
         notification.save(update_fields=["status"])
-        # Queue async task for delivery
-        deliver_notification.delay(notification.id)
+        # Queue async task for delivery once the row is visible to workers
+        transaction.on_commit(lambda: deliver_notification.delay(notification.id))
         logger.info(f"Queued notification {notification.uuid} for delivery")
 
     def send_immediate(
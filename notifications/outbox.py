@@ -0,0 +1,236 @@
+"""
+Transactional outbox for notifications.
+
+Domain code records a compact event with ``enqueue_notification`` inside its
+own transaction instead of rendering and inserting notifications inline:
+
+    enqueue_notification(
+        "feedback_update_hi",
+        recipients=[feedback.sender],
+        context={"feedback": feedback},
+        related_object=feedback,
+        channels=["push"],
+    )
+
+Nothing is sent unless that transaction commits. After commit the relay task
+drains pending events in batches: it reloads the referenced objects, creates
+the notifications and deep links, and hands their ids to ``deliver_chunk``
+in a few broker messages. A periodic run picks up anything a lost kick left
+behind, and a daily purge drops handled events after the retention window.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from .model import Notification, NotificationOutbox, NotificationStatus
+
+logger = logging.getLogger(__name__)
+
+REF_KEY = "__ref__"
+
+
+def pack_context(value):
+    """Replace model instances in ``value`` with ``{"__ref__": [label, pk]}``."""
+    if hasattr(value, "_meta") and hasattr(value, "pk"):
+        return {REF_KEY: [value._meta.label_lower, value.pk]}
+    if isinstance(value, dict):
+        return {key: pack_context(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [pack_context(item) for item in value]
+    return value
+
+
+def _collect_refs(value, refs):
+    if isinstance(value, dict):
+        if REF_KEY in value:
+            label, pk = value[REF_KEY]
+            refs[label].add(pk)
+        else:
+            for item in value.values():
+                _collect_refs(item, refs)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_refs(item, refs)
+
+
+def _resolve_refs(value, objects):
+    if isinstance(value, dict):
+        if REF_KEY in value:
+            label, pk = value[REF_KEY]
+            return objects[label].get(pk)
+        return {key: _resolve_refs(item, objects) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_refs(item, objects) for item in value]
+    return value
+
+
+def unpack_context(packed):
+    """Inverse of ``pack_context``: one query per referenced model."""
+    refs = defaultdict(set)
+    _collect_refs(packed, refs)
+    objects = {
+        label: apps.get_model(label).objects.in_bulk(list(pks))
+        for label, pks in refs.items()
+    }
+    return _resolve_refs(packed, objects)
+
+
+def enqueue_notification(
+    template_name,
+    recipients,
+    context=None,
+    related_object=None,
+    sender=None,
+    channels=None,
+    priority="normal",
+    recipient_key=None,
+) -> NotificationOutbox:
+    """
+    Record a notification for ``recipients`` (users or user ids) in the
+    current transaction. ``recipient_key``, when given, names a context entry
+    set to each recipient's id.
+    """
+    event = NotificationOutbox.objects.create(
+        template_name=template_name,
+        recipient_ids=[getattr(r, "pk", r) for r in recipients if r is not None],
+        sender_id=getattr(sender, "pk", sender),
+        content_type=(
+            ContentType.objects.get_for_model(related_object) if related_object else None
+        ),
+        object_id=related_object.pk if related_object else None,
+        context=pack_context(context or {}),
+        options={
+            "channels": channels,
+            "priority": priority,
+            "recipient_key": recipient_key,
+        },
+    )
+    transaction.on_commit(kick_relay)
+    return event
+
+
+def kick_relay():
+    from .tasks import relay_notification_outbox
+
+    try:
+        relay_notification_outbox.delay()
+    except Exception as e:
+        # The periodic relay still picks the event up.
+        logger.warning(f"Could not kick the notification outbox relay: {e}")
+
+
+def relay(batch_size=None, service=None) -> int:
+    """
+    Turn pending events into notifications, ``batch_size`` events per
+    transaction, and queue their delivery once each batch commits. Returns
+    the number of events handled.
+    """
+    from .notification_service import NotificationServices
+
+    batch_size = batch_size or getattr(settings, "NOTIFICATION_OUTBOX_BATCH_SIZE", 100)
+    service = service or NotificationServices()
+    handled = 0
+    cursor = 0
+
+    while True:
+        with transaction.atomic():
+            events = list(
+                # Lock the events only: the nullable joins can't be locked.
+                NotificationOutbox.objects.select_for_update(
+                    skip_locked=True, of=("self",)
+                )
+                .filter(status=NotificationOutbox.Status.PENDING, pk__gt=cursor)
+                .select_related("content_type", "sender")
+                .order_by("pk")[:batch_size]
+            )
+            if not events:
+                break
+            cursor = events[-1].pk
+
+            notification_ids = []
+            for event in events:
+                notification_ids.extend(_dispatch(event, service))
+
+            if notification_ids:
+                Notification.objects.filter(pk__in=notification_ids).update(
+                    status=NotificationStatus.QUEUED
+                )
+                transaction.on_commit(lambda ids=notification_ids: _queue_delivery(ids))
+        handled += len(events)
+
+    return handled
+
+
+def _dispatch(event, service):
+    max_attempts = getattr(settings, "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", 5)
+    event.attempts += 1
+    try:
+        with transaction.atomic():
+            context = unpack_context(event.context)
+            recipient_key = event.options.get("recipient_key")
+
+            def context_factory(recipient, index):
+                if recipient_key:
+                    return {**context, recipient_key: recipient}
+                return dict(context)
+
+            notifications = service.create_bulk_notifications(
+                template_name=event.template_name,
+                recipients=event.recipient_ids,
+                context_factory=context_factory,
+                related_object=event.related_object,
+                sender=event.sender,
+                channels=event.options.get("channels"),
+                priority=event.options.get("priority") or "normal",
+                queue=False,
+            )
+    except Exception as e:
+        logger.error(f"Notification outbox event {event.pk} failed: {e}", exc_info=True)
+        event.last_error = str(e)
+        if event.attempts >= max_attempts:
+            event.status = NotificationOutbox.Status.FAILED
+        event.save(update_fields=["attempts", "last_error", "status"])
+        return []
+
+    event.status = NotificationOutbox.Status.DONE
+    event.processed_at = timezone.now()
+    event.save(update_fields=["attempts", "status", "processed_at"])
+    return [n.pk for n in notifications if n.scheduled_at <= event.processed_at]
+
+
+def purge(days=None, batch_size=None) -> int:
+    """
+    Delete events marked done more than ``days`` days ago, ``batch_size``
+    rows per statement. Failed events are kept for inspection.
+    """
+    days = days or getattr(settings, "NOTIFICATION_OUTBOX_RETENTION_DAYS", 7)
+    batch_size = batch_size or getattr(settings, "NOTIFICATION_OUTBOX_BATCH_SIZE", 100)
+    cutoff = timezone.now() - timedelta(days=days)
+    total = 0
+
+    while True:
+        pks = list(
+            NotificationOutbox.objects.filter(
+                status=NotificationOutbox.Status.DONE, processed_at__lt=cutoff
+            ).values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+        NotificationOutbox.objects.filter(pk__in=pks).delete()
+        total += len(pks)
+
+    logger.info(f"Purged {total} handled notification outbox events")
+    return total
+
+
+def _queue_delivery(notification_ids):
+    from .tasks import process_collections_batch
+
+    process_collections_batch.delay(notification_ids)
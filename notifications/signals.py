@@ -2,7 +2,7 @@ import logging
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
-from django.db.models.signals import post_save, pre_save, m2m_changed
+from django.db.models.signals import post_delete, post_save, pre_save, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 import logging
@@ -11,8 +11,11 @@ from .model import (
     Notification,
     NotificationStatus,
     NotificationGroup,
+    NotificationTemplate,
 )
-from .tasks import deliver_notification
+from member.models import News
+from .template_cache import compiled_templates
+from . import counters
 
 
 @receiver(pre_save, sender=Notification)
@@ -58,11 +61,12 @@ def notification_post_save(sender, instance, created, **kwargs):
     """
     try:
         if created:
+            # Delivery is queued by whoever created the notification, after
+            # commit (NotificationServices.queue_notification, the outbox relay).
             logger.info(
-                f"New notification created: {instance.uuid} for user {instance.recipient.email}"
+                f"New notification created: {instance.uuid} for user {instance.recipient_id}"
             )
-            deliver_notification.delay(instance.id)
-            logger.info(f"Queued notification {instance.uuid} for immediate delivery")
+            counters.notification_created(instance.recipient_id, not instance.is_read)
 
         else:
             logger.debug(f"Notification updated: {instance.uuid}")
@@ -95,3 +99,24 @@ def notification_group_post_save(sender, instance, created, **kwargs):
 
     except Exception as e:
         logger.error(f"Error in notification_group_post_save: {e}")
+
+
+@receiver(post_save, sender=NotificationTemplate)
+@receiver(post_delete, sender=NotificationTemplate)
+def notification_template_changed(sender, instance, **kwargs):
+    """
+    Drop this process's compiled copies of an edited or deleted template.
+    Other processes miss on the new ``updated_at`` once they reload the row.
+    """
+    compiled_templates.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    counters.forget_users([instance.recipient_id])
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def news_changed(sender, instance, **kwargs):
+    counters.forget_news()
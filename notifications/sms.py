@@ -0,0 +1,383 @@
+"""
+SMS transport for OTPs and other transactional texts.
+
+- ``SMSTransport`` sends over a pooled keep-alive session with strict
+  (connect, read) timeouts.
+- ``CircuitBreaker`` stops calling a provider that keeps failing; its state
+  lives in the cache so every worker process sees it.
+- ``SMSGateway`` tries the configured providers in order, skipping open
+  circuits, until one accepts the message.
+
+Every send is recorded in ``SmsSendLog``. In async mode (the default) the
+request only writes the log row and hands its id to Celery once its
+transaction commits; the task rebuilds the text (an OTP from the current
+``member.OTP`` row), so no code passes through the broker. The app polls
+the log's status. If the broker cannot be reached the send happens inline
+instead.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+OTP_MESSAGE = (
+    "आपका काशी ई-डेयरी लॉगिन ओटीपी कोड {otp} है। किसी के साथ साझा न करें- काशी डेरी"
+)
+
+MODE_ASYNC = "async"
+MODE_SYNC = "sync"
+
+
+@dataclass
+class SMSProvider:
+    """One SMS API endpoint; ``params`` are sent with every message."""
+
+    name: str
+    url: str
+    params: dict = field(default_factory=dict)
+    mobile_param: str = "mobile"
+    message_param: str = "msg"
+
+
+@dataclass
+class SMSResult:
+    sent: bool
+    provider: Optional[str] = None
+    response: Optional[object] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+def configured_providers() -> List[SMSProvider]:
+    return [
+        SMSProvider(**provider)
+        for provider in getattr(settings, "SMS_PROVIDERS", [])
+        if provider.get("url")
+    ]
+
+
+class CircuitBreaker:
+    """
+    Opens after ``threshold`` failures within ``window`` seconds and stays
+    open for ``cooldown`` seconds. After the cooldown it is half-open: the
+    caller that claims the probe key is let through and every other caller
+    still sees it open until the probe resolves (or its key expires after
+    ``probe_timeout``). A failed probe opens it again, a success closes it.
+    """
+
+    def __init__(self, name, threshold=None, window=None, cooldown=None):
+        self.name = name
+        self.threshold = threshold or getattr(settings, "SMS_CIRCUIT_THRESHOLD", 5)
+        self.window = window or getattr(settings, "SMS_CIRCUIT_WINDOW", 60)
+        self.cooldown = cooldown or getattr(settings, "SMS_CIRCUIT_COOLDOWN", 30)
+        self.probe_timeout = getattr(settings, "SMS_CIRCUIT_PROBE_TIMEOUT", 10)
+
+    @property
+    def failures_key(self) -> str:
+        return f"sms:circuit:{self.name}:failures"
+
+    @property
+    def open_key(self) -> str:
+        return f"sms:circuit:{self.name}:open"
+
+    @property
+    def half_open_key(self) -> str:
+        return f"sms:circuit:{self.name}:half-open"
+
+    @property
+    def probe_key(self) -> str:
+        return f"sms:circuit:{self.name}:probe"
+
+    def is_open(self) -> bool:
+        """
+        Whether calls to the provider are refused. In the half-open state
+        this claims the probe: only the first caller gets False.
+        """
+        try:
+            state = cache.get_many([self.open_key, self.half_open_key])
+            if state.get(self.open_key):
+                return True
+            if not state.get(self.half_open_key):
+                return False
+            return not cache.add(self.probe_key, 1, self.probe_timeout)
+        except Exception as e:
+            logger.warning(f"SMS circuit state unavailable for {self.name}: {e}")
+            return False
+
+    def record_success(self) -> None:
+        try:
+            cache.delete_many([self.failures_key, self.half_open_key, self.probe_key])
+        except Exception as e:
+            logger.warning(f"Could not reset SMS circuit {self.name}: {e}")
+
+    def record_failure(self) -> None:
+        try:
+            cache.add(self.failures_key, 0, self.window)
+            failures = cache.incr(self.failures_key)
+            if failures >= self.threshold:
+                cache.set(self.open_key, 1, self.cooldown)
+                # Half-open after the cooldown: one more failure re-trips.
+                cache.set_many(
+                    {self.failures_key: self.threshold - 1, self.half_open_key: 1},
+                    self.cooldown + self.window,
+                )
+                cache.delete(self.probe_key)
+                logger.warning(
+                    f"SMS provider {self.name} failed {failures} times, "
+                    f"circuit open for {self.cooldown}s"
+                )
+        except Exception as e:
+            logger.warning(f"Could not record SMS failure for {self.name}: {e}")
+
+
+class SMSTransport:
+    """
+    Sends SMS API requests over a pooled keep-alive session.
+
+    The session is created lazily per process (and recreated after a fork,
+    so Celery prefork children never share sockets with their parent).
+    """
+
+    def __init__(self, pool_size=None, timeout=None):
+        self.pool_size = pool_size or getattr(settings, "SMS_POOL_SIZE", 20)
+        self.timeout = timeout or getattr(settings, "SMS_TIMEOUT", (2, 5))
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=self.pool_size,
+                        pool_block=True,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def send(self, provider: SMSProvider, mobile, message):
+        """Returns ``(sent, response_data_or_error)``."""
+        params = {
+            **provider.params,
+            provider.mobile_param: mobile,
+            provider.message_param: message,
+        }
+        try:
+            response = self.session.get(provider.url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return True, response.json()
+        except requests.HTTPError as e:
+            return False, f"HTTP {e.response.status_code}"
+        except (requests.RequestException, ValueError) as e:
+            # Exception messages can include the URL, and with it the
+            # credentials in the query string: report the type only.
+            return False, type(e).__name__
+
+
+class SMSGateway:
+    def __init__(self, providers=None, transport=None):
+        self.providers = providers if providers is not None else configured_providers()
+        self.transport = transport or SMSTransport()
+        self.breakers = {p.name: CircuitBreaker(p.name) for p in self.providers}
+
+    def deliver(self, mobile, message) -> SMSResult:
+        """Send through the first provider that accepts the message."""
+        result = SMSResult(sent=False)
+        for provider in self.providers:
+            breaker = self.breakers[provider.name]
+            if breaker.is_open():
+                continue
+
+            result.attempts += 1
+            sent, data = self.transport.send(provider, mobile, message)
+            if sent:
+                breaker.record_success()
+                result.sent, result.provider, result.response = True, provider.name, data
+                result.error = None
+                return result
+
+            breaker.record_failure()
+            result.provider, result.error = provider.name, data
+            logger.warning(f"SMS via {provider.name} failed: {data}")
+
+        if not result.attempts:
+            result.error = "No SMS provider available"
+        return result
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> SMSGateway:
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = SMSGateway()
+    return _gateway
+
+
+# ---------------------------------------------------------
+# Logged sends
+# ---------------------------------------------------------
+def message_for(log) -> Optional[str]:
+    """
+    The text to send for ``log``: an OTP text is rebuilt from the number's
+    current ``member.OTP`` row, anything else is the logged message. None
+    when the OTP is gone (already used or replaced and used).
+    """
+    if log.purpose != "otp":
+        return log.message
+
+    from member.models import OTP
+
+    otp = (
+        OTP.objects.filter(phone_number=log.mobile).values_list("otp", flat=True).first()
+    )
+    return OTP_MESSAGE.format(otp=otp) if otp else None
+
+
+def deliver_logged(log_id, message=None, gateway=None):
+    """
+    Send one ``SmsSendLog`` row and record the outcome. ``message`` defaults
+    to ``message_for(log)``. Returns the log, or None if it is already
+    finished.
+    """
+    from .model import SmsSendLog
+
+    updated = SmsSendLog.objects.filter(
+        pk=log_id, status=SmsSendLog.Status.QUEUED
+    ).update(status=SmsSendLog.Status.SENDING)
+    if not updated:
+        return None
+    log = SmsSendLog.objects.get(pk=log_id)
+
+    max_age = getattr(settings, "SMS_MAX_QUEUE_AGE", 300)
+    if (timezone.now() - log.created_at).total_seconds() > max_age:
+        # An OTP that arrives after it expired is useless.
+        log.status = SmsSendLog.Status.FAILED
+        log.last_error = "Expired before it could be sent"
+        log.save(update_fields=["status", "last_error"])
+        return log
+
+    if message is None:
+        message = message_for(log)
+    if message is None:
+        log.status = SmsSendLog.Status.FAILED
+        log.last_error = "OTP no longer exists"
+        log.save(update_fields=["status", "last_error"])
+        return log
+
+    started = time.perf_counter()
+    result = (gateway or get_gateway()).deliver(log.mobile, message)
+    log.attempts += result.attempts
+    log.provider = result.provider or ""
+    log.response = result.response
+    log.last_error = result.error
+    log.latency_ms = int((time.perf_counter() - started) * 1000)
+    if result.sent:
+        log.status = SmsSendLog.Status.SENT
+        log.sent_at = timezone.now()
+    else:
+        # Back to queued so a retry can pick it up; the task marks it failed
+        # once it gives up.
+        log.status = SmsSendLog.Status.QUEUED
+    log.save(
+        update_fields=[
+            "attempts",
+            "provider",
+            "response",
+            "last_error",
+            "latency_ms",
+            "status",
+            "sent_at",
+        ]
+    )
+    return log
+
+
+def mark_failed(log_id, error=None) -> None:
+    from .model import SmsSendLog
+
+    SmsSendLog.objects.filter(
+        pk=log_id, status__in=[SmsSendLog.Status.QUEUED, SmsSendLog.Status.SENDING]
+    ).update(status=SmsSendLog.Status.FAILED, last_error=error)
+
+
+def _hand_off(log_id) -> None:
+    from .tasks import send_sms as send_sms_task
+
+    try:
+        send_sms_task.delay(log_id)
+    except Exception as e:
+        logger.warning(f"SMS queue unavailable, sending {log_id} inline: {e}")
+        log = deliver_logged(log_id)
+        if log is not None and log.status != log.Status.SENT:
+            mark_failed(log_id, log.last_error)
+
+
+def send_sms(mobile, message, purpose="otp", log_message=None, mode=None):
+    """
+    Record and send one SMS. ``log_message`` is what gets stored (e.g. with
+    the OTP masked). Returns the ``SmsSendLog``; in async mode it is still
+    queued when this returns, and the task sends ``message_for(log)``, so a
+    masked ``log_message`` is only possible for OTPs.
+    """
+    from .model import SmsSendLog
+
+    mode = mode or getattr(settings, "SMS_SEND_MODE", MODE_ASYNC)
+    log = SmsSendLog.objects.create(
+        mobile=mobile,
+        purpose=purpose,
+        message=log_message if log_message is not None else message,
+    )
+
+    if mode == MODE_ASYNC:
+        transaction.on_commit(lambda: _hand_off(log.pk))
+        return log
+
+    log = deliver_logged(log.pk, message)
+    if log.status != log.Status.SENT:
+        mark_failed(log.pk, log.last_error)
+        log.status = log.Status.FAILED
+    return log
+
+
+def send_otp(mobile, otp, mode=None):
+    """
+    Send a login OTP. Returns ``(sent, info)`` like the old ``send_sms_api``;
+    ``info`` carries the ``sms_id`` the app can poll.
+    """
+    otp = str(otp)
+    log = send_sms(
+        mobile,
+        OTP_MESSAGE.format(otp=otp),
+        purpose="otp",
+        log_message=OTP_MESSAGE.format(otp="*" * len(otp)),
+        mode=mode,
+    )
+    info = {"sms_id": str(log.uuid), "sms_status": log.status}
+    if log.status == log.Status.FAILED:
+        info["error"] = log.last_error
+        return False, info
+    return True, info
@@ -6,12 +6,10 @@ from .choices import NotificationStatus
 from django.contrib.auth import get_user_model
 import logging
 from django.core.management import call_command
-from datetime import timedelta
-
-from django.db.models import Count, Q
 
 from notifications.model import DeepLink
 from .deeplink_service import DeepLinkService
+from . import deeplink_cache, deeplink_lifecycle
 
 
 CHUNK_SIZE = 500
@@ -146,6 +144,33 @@ def deliver_notification(self, notification_id: str):
         raise self.retry(exc=exc)
 
 
+@shared_task(bind=True, max_retries=3)
+def relay_notification_outbox(self):
+    """
+    Turn committed outbox events into notifications and queue their
+    delivery. Kicked after each commit that records events, and run
+    periodically as a sweep.
+    """
+    from .outbox import relay
+
+    try:
+        return {"relayed": relay()}
+    except Exception as exc:
+        logger.error(f"Notification outbox relay failed: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task
+def purge_notification_outbox():
+    """
+    Periodic task to delete handled outbox events past the retention window
+    Schedule with Celery Beat
+    """
+    from .outbox import purge
+
+    return purge()
+
+
 @shared_task
 def cleanup_expired_notifications():
     """
@@ -192,8 +217,9 @@ def deliver_chunk(self, notification_ids: list[int]):
                 id__in=notification_ids,
                 status__in=[NotificationStatus.PENDING, NotificationStatus.QUEUED],
             )
-            .select_related("recipient")
-            .only("id", "uuid", "recipient_id", "delivery_status", "channels", "status")
+            # to_fcm_payload reads the template and most content fields, so
+            # load them with the chunk instead of one deferred query per row.
+            .select_related("recipient", "template")
         )
 
         if not notifications_qs.exists():
@@ -207,6 +233,9 @@ def deliver_chunk(self, notification_ids: list[int]):
         logger.info(
             f"✅ Chunk delivered: {processed_count}/{len(notification_ids)} notifications processed."
         )
+        from .fcm import get_transport
+
+        logger.info(f"FCM transport metrics: {get_transport().metrics.snapshot()}")
         return {"processed": processed_count}
 
     except Exception as exc:
@@ -252,6 +281,42 @@ def queue_notification_async(self, notification_id):
         raise self.retry(exc=exc, countdown=60 * (2**self.request.retries))
 
 
+@shared_task(bind=True, max_retries=3)
+def reconcile_notification_counters(self):
+    """
+    Recompute unread/total notification counters for recently active users
+    so drift from missed updates does not outlive one interval.
+    """
+    from .counters import reconcile
+
+    try:
+        return {"users": reconcile()}
+    except Exception as exc:
+        logger.error(f"Notification counter reconcile failed: {exc}")
+        raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task(bind=True, max_retries=2, acks_late=True)
+def send_sms(self, log_id: int):
+    """
+    Send one logged SMS through the provider failover chain. The text is
+    rebuilt from the log, so OTPs never sit in the broker. Retried briefly
+    when every provider failed; OTPs expire within minutes, so there is no
+    long backoff.
+    """
+    from . import sms
+
+    log = sms.deliver_logged(log_id)
+    if log is None or log.status != log.Status.QUEUED:
+        return {"sms_id": log_id, "status": log.status if log else "skipped"}
+
+    if self.request.retries < self.max_retries:
+        raise self.retry(countdown=5 * (self.request.retries + 1))
+
+    sms.mark_failed(log_id, log.last_error)
+    return {"sms_id": log_id, "status": "failed"}
+
+
 @shared_task(name="deeplink.cleanup_expired")
 def cleanup_expired_links():
     """
@@ -270,36 +335,39 @@ def cleanup_expired_links():
         return {"status": "error", "error": str(e)}
 
 
+@shared_task(name="deeplink.flush_usage")
+def flush_deeplink_usage():
+    """
+    Write deep-link use counts and access times recorded in the cache by the
+    redirect view back to the database. Run every minute via Celery Beat.
+    """
+    try:
+        flushed = deeplink_cache.flush_usage()
+        return {"status": "success", "flushed": flushed}
+
+    except Exception as e:
+        logger.error(f"Error in flush_deeplink_usage task: {e}", exc_info=True)
+        return {"status": "error", "error": str(e)}
+
+
 @shared_task(name="deeplink.delete_old_links")
 def delete_old_links(days_old: int = 90):
     """
-    Delete old inactive links to keep database clean.
+    Archive and delete old inactive links to keep the table small.
     Run this daily via Celery Beat.
 
     Args:
         days_old: Delete links older than this many days
     """
     try:
-        cutoff_date = timezone.now() - timedelta(days=days_old)
-
-        # Delete old expired/revoked/consumed links
-        deleted_count, _ = DeepLink.objects.filter(
-            Q(
-                status__in=[
-                    DeepLink.Status.EXPIRED,
-                    DeepLink.Status.REVOKED,
-                    DeepLink.Status.CONSUMED,
-                ]
-            ),
-            created_at__lt=cutoff_date,
-        ).delete()
+        deleted_count = deeplink_lifecycle.delete_old_links(days_old=days_old)
 
         logger.info(f"Deleted {deleted_count} old deep links")
 
         return {
             "status": "success",
             "deleted": deleted_count,
-            "cutoff_date": cutoff_date.isoformat(),
+            "days_old": days_old,
         }
 
     except Exception as e:
@@ -307,42 +375,42 @@ def delete_old_links(days_old: int = 90):
         return {"status": "error", "error": str(e)}
 
 
+@shared_task(name="deeplink.refresh_counters")
+def refresh_deeplink_counters():
+    """
+    Count newly created deep links into the daily and status counters.
+    Run this every few minutes via Celery Beat.
+    """
+    try:
+        return {"status": "success", **deeplink_lifecycle.refresh_counters()}
+
+    except Exception as e:
+        logger.error(f"Error in refresh_deeplink_counters task: {e}", exc_info=True)
+        return {"status": "error", "error": str(e)}
+
+
+@shared_task(name="deeplink.reconcile_counters")
+def reconcile_deeplink_counters():
+    """
+    Count deep links the id high-water mark skipped because their
+    transaction committed late. Run this hourly via Celery Beat.
+    """
+    try:
+        return {"status": "success", "added": deeplink_lifecycle.reconcile_created()}
+
+    except Exception as e:
+        logger.error(f"Error in reconcile_deeplink_counters task: {e}", exc_info=True)
+        return {"status": "error", "error": str(e)}
+
+
 @shared_task(name="deeplink.generate_analytics_report")
 def generate_analytics_report():
     """
-    Generate daily analytics report for deep links.
+    Generate daily analytics report for deep links from the lifecycle
+    counters.
     """
     try:
-        today = timezone.now().date()
-        yesterday = today - timedelta(days=1)
-
-        # Get stats
-        total_links = DeepLink.objects.count()
-        active_links = DeepLink.objects.filter(status=DeepLink.Status.ACTIVE).count()
-
-        # Links created yesterday
-        created_yesterday = DeepLink.objects.filter(created_at__date=yesterday).count()
-
-        # Links accessed yesterday
-        accessed_yesterday = DeepLink.objects.filter(
-            last_accessed_at__date=yesterday
-        ).count()
-
-        # Module breakdown
-        module_stats = DeepLink.objects.values("module").annotate(count=Count("id"))
-
-        # Status breakdown
-        status_stats = DeepLink.objects.values("status").annotate(count=Count("id"))
-
-        report = {
-            "date": yesterday.isoformat(),
-            "total_links": total_links,
-            "active_links": active_links,
-            "created_yesterday": created_yesterday,
-            "accessed_yesterday": accessed_yesterday,
-            "by_module": list(module_stats),
-            "by_status": list(status_stats),
-        }
+        report = deeplink_lifecycle.analytics_report()
 
         logger.info(f"Generated analytics report: {report}")
 
@@ -395,11 +463,8 @@ def revoke_user_links(user_id: int, reason: str = "user_request"):
         reason: Reason for revocation
     """
     try:
-        updated = DeepLink.objects.filter(
-            user_id=user_id, status=DeepLink.Status.ACTIVE
-        ).update(
-            status=DeepLink.Status.REVOKED,
-            meta=lambda obj: {**obj, "revoke_reason": reason},
+        updated = deeplink_lifecycle.revoke_links(
+            DeepLink.objects.filter(user_id=user_id), reason=reason
         )
 
         logger.info(
@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+
+from django.template import Template
+
+
+class CompiledTemplateCache:
+    """
+    Process-local cache of compiled ``django.template.Template`` objects.
+
+    Entries are keyed by ``(template id, updated_at)`` so a saved edit, seen
+    by any process once it reloads the row, never hits a stale compile. Each
+    entry maps a field name to ``(source, compiled)``; the source is compared
+    on lookup so unsaved in-memory edits (admin previews, ``clean()``) are
+    recompiled rather than served from the cache.
+    """
+
+    def __init__(self, max_templates=256):
+        self.max_templates = max_templates
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, template, field, source) -> Template:
+        if template.pk is None:
+            return Template(source)
+
+        key = (template.pk, template.updated_at)
+        with self._lock:
+            fields = self._entries.get(key)
+            if fields is not None:
+                self._entries.move_to_end(key)
+                cached = fields.get(field)
+                if cached is not None and cached[0] == source:
+                    return cached[1]
+
+        compiled = Template(source)
+        with self._lock:
+            fields = self._entries.setdefault(key, {})
+            fields[field] = (source, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_templates:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, template_id):
+        """Drop every compiled version of one template."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == template_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+compiled_templates = CompiledTemplateCache()
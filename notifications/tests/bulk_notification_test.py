@@ -0,0 +1,92 @@
+"""
+Tests for set-based bulk notification creation.
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ..model import (
+    Notification,
+    NotificationChannel,
+    NotificationPreferences,
+    NotificationStatus,
+    NotificationTemplate,
+)
+from ..notification_service import NotificationServices
+
+User = get_user_model()
+
+
+class BulkNotificationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = NotificationTemplate.objects.create(
+            name="system_maintenance",
+            category="system",
+            title_template="Maintenance",
+            body_template="Hello {{ recipient.username }}, {{ when }}",
+            enabled_channels=[NotificationChannel.IN_APP, NotificationChannel.SMS],
+        )
+        cls.users = User.objects.bulk_create(
+            User(username=f"member{i}", email=f"member{i}@example.com")
+            for i in range(12)
+        )
+        NotificationPreferences.objects.create(
+            user=cls.users[0],
+            category="system",
+            allow_in_app=False,
+            allow_sms=True,
+        )
+
+    def _create(self, recipients, **kwargs):
+        service = NotificationServices()
+        with mock.patch.object(service, "_queue_batch") as queue:
+            with self.captureOnCommitCallbacks(execute=True):
+                notifications = service.create_bulk_notifications(
+                    "system_maintenance",
+                    recipients,
+                    context={"when": "tonight"},
+                    chunk_size=5,
+                    **kwargs,
+                )
+        return notifications, queue
+
+    def test_creates_one_notification_per_recipient(self):
+        recipients = [self.users[0], self.users[1].pk, "member2@example.com"]
+        recipients += [str(u.pk) for u in self.users[3:]]
+        notifications, queue = self._create(recipients)
+
+        self.assertEqual(len(notifications), 12)
+        self.assertEqual(Notification.objects.count(), 12)
+        first = Notification.objects.get(recipient=self.users[0])
+        self.assertEqual(first.body, "Hello member0, tonight")
+        self.assertEqual(first.channels, [NotificationChannel.SMS])
+        self.assertEqual(first.status, NotificationStatus.QUEUED)
+        other = Notification.objects.get(recipient=self.users[4])
+        self.assertEqual(other.channels, self.template.enabled_channels)
+
+        # One delivery batch per chunk, after commit.
+        self.assertEqual(queue.call_count, 3)
+        self.assertEqual(
+            sorted(pk for call in queue.call_args_list for pk in call.args[0]),
+            sorted(n.pk for n in notifications),
+        )
+
+    def test_unknown_recipients_are_skipped(self):
+        notifications, _ = self._create([self.users[0].pk, 999999, "ghost@example.com"])
+        self.assertEqual([n.recipient_id for n in notifications], [self.users[0].pk])
+
+    def test_missing_template_raises(self):
+        service = NotificationServices()
+        with self.assertRaises(ValueError):
+            service.create_bulk_notifications("missing", self.users)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_queue_false_leaves_notifications_pending(self):
+        notifications, queue = self._create(self.users[:2], queue=False)
+        queue.assert_not_called()
+        self.assertEqual(
+            {n.status for n in notifications}, {NotificationStatus.PENDING}
+        )
@@ -0,0 +1,140 @@
+"""
+Tests for the chunked collection notification pipeline.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from erp_app.models import MemberHierarchyView, MppCollection, Shift
+from erp_app.testing import ERPTablesMixin
+
+from ..collection_notifications import CollectionNotificationPipeline
+from ..deeplink_service import DeepLinkService
+from ..model import (
+    DeepLink,
+    Notification,
+    NotificationTemplate,
+    NotificationTrackMppCollection,
+)
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+@mock.patch.object(DeepLinkService, "SMART_HOST", "kashee-member://open/")
+@mock.patch.object(CollectionNotificationPipeline, "queue_delivery")
+class CollectionPipelineTest(ERPTablesMixin, TestCase):
+    erp_models = (Shift, MemberHierarchyView, MppCollection)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = NotificationTemplate.objects.create(
+            name="mpp_collection_created_hi",
+            category="system",
+            title_template="Milk collected",
+            body_template="{{ collection.qty }} L at {{ collection.fat }} fat",
+            deeplink_config={
+                "deeplink_type": "collections",
+                "fallback_template": "https://kasheemilk.com/collections/",
+            },
+        )
+        Shift.objects.create(shift_code=1, shift_short_name="M")
+        Shift.objects.create(shift_code=2, shift_short_name="E")
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.rows = 0
+
+    def _collect(self, count):
+        """``count`` collections today, each from a new member with an account."""
+        start = timezone.make_aware(datetime.combine(self.today, datetime.min.time()))
+        for _ in range(count):
+            self.rows += 1
+            member_code = f"M{self.rows:04d}"
+            mobile = f"90000{self.rows:05d}"
+            User.objects.create(username=mobile)
+            MemberHierarchyView.objects.create(
+                member_code=member_code,
+                mobile_no=mobile,
+                is_active=True,
+                is_default=True,
+                created_at=start,
+            )
+            MppCollection.objects.create(
+                mpp_collection_code=f"C{self.rows:05d}",
+                member_code=member_code,
+                collection_date=start + timedelta(hours=6, minutes=self.rows),
+                shift_code_id=1,
+                qty=Decimal("10.50"),
+                fat=Decimal("4.2"),
+                snf=Decimal("8.5"),
+                amount=Decimal("420.00"),
+            )
+
+    def _run(self, chunk_size=100):
+        pipeline = CollectionNotificationPipeline(
+            template=self.template, chunk_size=chunk_size
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                stats = pipeline.run()
+        return stats, len(queries)
+
+    def test_query_count_does_not_grow_with_collections(self, queue):
+        self._collect(3)
+        small, small_queries = self._run()
+        self._collect(30)
+        large, large_queries = self._run()
+
+        self.assertEqual((small.created, large.created), (3, 30))
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(DeepLink.objects.count(), 33)
+
+    def test_rerun_sends_nothing_twice(self, queue):
+        self._collect(12)
+
+        first, _ = self._run(chunk_size=5)
+        second, _ = self._run(chunk_size=5)
+
+        self.assertEqual((first.chunks, first.created), (3, 12))
+        self.assertEqual((second.created, second.already_tracked), (0, 12))
+        self.assertEqual(Notification.objects.count(), 12)
+        queued = [pk for call in queue.call_args_list for pk in call.args[0]]
+        self.assertEqual(sorted(queued), sorted(Notification.objects.values_list("pk", flat=True)))
+
+    def test_legacy_undated_tracking_rows_count_as_sent(self, queue):
+        self._collect(4)
+        NotificationTrackMppCollection.objects.create(
+            collection_code="C00002", collection_date=None, is_sent=True
+        )
+
+        stats, _ = self._run()
+
+        self.assertEqual((stats.created, stats.already_tracked), (3, 1))
+        self.assertFalse(
+            Notification.objects.filter(
+                context_data__mpp_collection__collection_code="C00002"
+            ).exists()
+        )
+
+    def test_invalid_deep_links_fail_before_insert(self, queue):
+        self._collect(2)
+
+        with mock.patch.object(DeepLinkService, "SMART_HOST", "https://kasheemilk.com/open/"):
+            with self.assertRaises(ValidationError):
+                self._run()
+
+        self.assertFalse(DeepLink.objects.exists())
+        self.assertFalse(Notification.objects.exists())
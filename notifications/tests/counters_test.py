@@ -0,0 +1,86 @@
+"""
+Tests for the cached notification and news badge counters.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from member.models import News
+from ..model import Notification, NotificationTemplate
+from ..notification_service import NotificationServices
+from .. import counters
+
+User = get_user_model()
+
+
+class NotificationCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = NotificationTemplate.objects.create(
+            name="counter_test", category="system", title_template="T", body_template="B"
+        )
+        cls.user = User.objects.create_user(username="badge")
+
+    def setUp(self):
+        cache.clear()
+
+    def _notify(self, n=1):
+        return [
+            Notification.objects.create(template=self.template, recipient=self.user)
+            for _ in range(n)
+        ]
+
+    def test_counts_are_kept_in_step_without_queries(self):
+        self._notify(2)
+        self.assertEqual(counters.get_counts(self.user.pk), {"total": 2, "unread": 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = self._notify(3)
+            created[0].mark_as_read()
+            created[0].mark_as_read()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                counters.get_counts(self.user.pk), {"total": 5, "unread": 4}
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            marked = NotificationServices().mark_all_read(self.user)
+        self.assertEqual(marked, 4)
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.get_unread_count(self.user.pk), 0)
+
+    def test_rolled_back_changes_are_not_counted(self):
+        counters.get_counts(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self._notify()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(counters.get_unread_count(self.user.pk), 0)
+
+    def test_reconcile_repairs_drift(self):
+        self._notify(3)
+        counters.get_counts(self.user.pk)
+        Notification.objects.filter(recipient=self.user).update(is_read=True)
+
+        self.assertEqual(counters.reconcile(), 1)
+        self.assertEqual(counters.get_counts(self.user.pk), {"total": 3, "unread": 0})
+
+    def _news(self, title, **kwargs):
+        return News.objects.create(
+            title=title,
+            summary="A short summary.",
+            content="x",
+            author="Desk",
+            is_published=True,
+            **kwargs,
+        )
+
+    def test_news_counter_is_dropped_on_change(self):
+        self._news("First story")
+        self.assertEqual(News.get_unread_count("member"), 1)
+
+        self._news("Second story", module="all")
+        with self.assertNumQueries(1):
+            self.assertEqual(News.get_unread_count("member"), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(News.get_unread_count("member"), 2)
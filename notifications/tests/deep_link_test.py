@@ -8,6 +8,8 @@ from unittest.mock import patch, MagicMock
 
 from django.test import TestCase, RequestFactory
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.cache import cache
 from django.utils import timezone
 
 from notifications.model import DeepLink
@@ -19,6 +21,7 @@ from ..deeplink_service import (
     RouteResolutionError,
 )
 from ..views.deep_link_view import DeepLinkRedirectView
+from .. import deeplink_cache
 
 
 class DeepLinkModelTest(TestCase):
@@ -114,6 +117,7 @@ class DeepLinkServiceTest(TestCase):
     """Test DeepLinkService functionality."""
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username="testuser", email="test@example.com"
         )
@@ -229,6 +233,53 @@ class DeepLinkServiceTest(TestCase):
         self.assertEqual(len(links), 5)
         self.assertTrue(all(link is not None for link in links))
 
+    @patch("member.models.UserDevice.objects.filter")
+    def test_get_user_modules_single_lookup(self, mock_filter):
+        """Test bulk module resolution reads devices once and caches them."""
+        other = User.objects.create_user(username="other", email="o@example.com")
+        devices = mock_filter.return_value.order_by.return_value
+        # Rows come oldest first, so the latest device wins.
+        devices.values_list.return_value = [(other.id, "member"), (other.id, "sahayak")]
+
+        modules = self.service.get_user_modules([self.user.id, other.id, other.id])
+
+        self.assertEqual(modules, {self.user.id: "member", other.id: "sahayak"})
+        self.assertEqual(mock_filter.call_count, 1)
+        mock_filter.return_value.order_by.assert_called_once_with("id")
+        self.service.get_user_modules([self.user.id, other.id])
+        self.assertEqual(mock_filter.call_count, 1)
+
+    @patch.object(DeepLinkService, "SMART_HOST", "kashee-member://open/")
+    def test_create_notification_deep_links(self):
+        """Test bulk notification link creation keeps input order."""
+        links = self.service.create_notification_deep_links(
+            [
+                {
+                    "user_id": self.user.id,
+                    "clean_route": f"/collection/{i}",
+                    "context": {"id": i},
+                    "meta": {"template_name": "mpp_collection_created_hi"},
+                }
+                for i in range(5)
+            ]
+        )
+
+        self.assertEqual(DeepLink.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(
+            [dl.deep_path for dl in links],
+            [f"kashee-member://collection/{i}" for i in range(5)],
+        )
+        self.assertEqual(links[3].meta["context"], {"id": 3})
+        self.assertTrue(DeepLink.objects.filter(token=links[0].token).exists())
+
+    def test_create_notification_deep_links_validates_before_insert(self):
+        """Test bulk creation runs the model validation save() would."""
+        with self.assertRaises(ValidationError):
+            self.service.create_notification_deep_links(
+                [{"user_id": self.user.id, "clean_route": "/collection/1"}]
+            )
+        self.assertFalse(DeepLink.objects.exists())
+
     def test_validate_and_get_link(self):
         """Test link validation."""
         dl = DeepLink.objects.create(
@@ -258,6 +309,7 @@ class DeepLinkViewTest(TestCase):
     """Test deep link redirect views."""
 
     def setUp(self):
+        cache.clear()
         self.factory = RequestFactory()
         self.user = User.objects.create_user(
             username="testuser", email="test@example.com"
@@ -315,6 +367,8 @@ class DeepLinkViewTest(TestCase):
         request.META["HTTP_USER_AGENT"] = "Android"
 
         self.view(request)
+        # Taps are counted in the cache and written back in batches.
+        deeplink_cache.flush_usage()
 
         dl.refresh_from_db()
         self.assertEqual(dl.use_count, initial_count + 1)
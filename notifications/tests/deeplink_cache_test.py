@@ -0,0 +1,132 @@
+"""
+Tests for cached deep-link resolution and batched use counting.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications.admin.deeplink import DeepLinkAdmin
+from notifications.model import DeepLink
+from .. import deeplink_cache
+
+
+class DeepLinkCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tapper")
+
+    def _link(self, **kwargs):
+        return DeepLink.objects.create(
+            user=self.user,
+            module="member",
+            deep_link="kashee-member://orders/7",
+            deep_path="orders/7",
+            android_package="com.kasheemilk.kashee",
+            **kwargs,
+        )
+
+    def test_repeat_taps_make_no_queries(self):
+        dl = self._link()
+        self.assertEqual(deeplink_cache.resolve(dl.token).deep_path, "orders/7")
+
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                resolved = deeplink_cache.resolve(dl.token)
+        self.assertEqual(resolved.use_count, 6)
+
+    def test_flush_writes_counts_in_one_batch(self):
+        links = [self._link() for _ in range(3)]
+        for i, dl in enumerate(links):
+            for _ in range(i + 1):
+                deeplink_cache.resolve(dl.token)
+
+        self.assertEqual(deeplink_cache.flush_usage(), 3)
+        counts = dict(
+            DeepLink.objects.filter(pk__in=[dl.pk for dl in links]).values_list(
+                "pk", "use_count"
+            )
+        )
+        self.assertEqual(counts, {dl.pk: i + 1 for i, dl in enumerate(links)})
+        self.assertTrue(
+            DeepLink.objects.get(pk=links[0].pk).last_accessed_at is not None
+        )
+
+        # Nothing new to write; a later tap is picked up by the next flush.
+        self.assertEqual(deeplink_cache.flush_usage(), 0)
+        deeplink_cache.resolve(links[0].token)
+        self.assertEqual(deeplink_cache.flush_usage(), 1)
+        self.assertEqual(DeepLink.objects.get(pk=links[0].pk).use_count, 2)
+
+    @override_settings(DEEPLINK_RESOLVE_CACHE_TTL=120)
+    def test_flushed_keys_start_to_expire(self):
+        dl = self._link()
+        deeplink_cache.resolve(dl.token)
+
+        with mock.patch.object(deeplink_cache.cache, "touch") as touch:
+            deeplink_cache.flush_usage()
+
+        touch.assert_has_calls(
+            [
+                mock.call(deeplink_cache.uses_key(dl.token), 120),
+                mock.call(deeplink_cache.seen_key(dl.token), 120),
+            ]
+        )
+
+    def test_max_uses_enforced_in_cache(self):
+        dl = self._link(max_uses=2)
+        self.assertIsNotNone(deeplink_cache.resolve(dl.token))
+        self.assertIsNotNone(deeplink_cache.resolve(dl.token))
+        self.assertIsNone(deeplink_cache.resolve(dl.token))
+
+        deeplink_cache.flush_usage()
+        dl.refresh_from_db()
+        self.assertEqual(dl.use_count, 2)
+        self.assertEqual(dl.status, DeepLink.Status.CONSUMED)
+
+    def test_unusable_links_are_refused(self):
+        expired = self._link(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertIsNone(deeplink_cache.resolve(expired.token))
+        self.assertIsNone(deeplink_cache.resolve("not-a-token"))
+
+        revoked = self._link()
+        deeplink_cache.resolve(revoked.token)
+        revoked.revoke()
+        self.assertIsNone(deeplink_cache.resolve(revoked.token))
+
+    def test_flag_set_during_flush_does_not_hide_later_taps(self):
+        dl = self._link()
+        deeplink_cache.resolve(dl.token)
+        flag = deeplink_cache.dirty_flag_key(dl.token)
+
+        # A tap that logged its entry but only sets its flag once the flush
+        # has already cleared the flags.
+        record = deeplink_cache.record
+        with mock.patch.object(
+            deeplink_cache,
+            "record",
+            side_effect=lambda *args, **kw: (cache.set(flag, 1), record(*args, **kw)),
+        ):
+            deeplink_cache.flush_usage()
+        self.assertIsNone(cache.get(flag))
+
+        deeplink_cache.resolve(dl.token)
+        self.assertEqual(deeplink_cache.flush_usage(), 1)
+        self.assertEqual(DeepLink.objects.get(pk=dl.pk).use_count, 2)
+
+    def test_admin_revoke_drops_cached_snapshots(self):
+        links = [self._link() for _ in range(2)]
+        for dl in links:
+            deeplink_cache.resolve(dl.token)
+
+        model_admin = DeepLinkAdmin(DeepLink, admin.site)
+        with mock.patch.object(model_admin, "message_user"):
+            model_admin.revoke_links(None, DeepLink.objects.all())
+
+        for dl in links:
+            self.assertIsNone(deeplink_cache.resolve(dl.token))
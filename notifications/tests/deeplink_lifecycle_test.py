@@ -0,0 +1,143 @@
+"""
+Tests for batched deep-link lifecycle jobs and their counters.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from notifications.model import (
+    DeepLink,
+    DeepLinkArchive,
+    DeepLinkCounterState,
+    DeepLinkDailyStat,
+    DeepLinkStatusCount,
+)
+from .. import deeplink_cache, deeplink_lifecycle
+from ..tasks import revoke_user_links
+
+
+class DeepLinkLifecycleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="linker")
+
+    def _links(self, n, module="member", **kwargs):
+        return DeepLink.objects.bulk_create(
+            DeepLink(
+                user=self.user,
+                module=module,
+                deep_link=f"kashee-{module}://orders/{i}",
+                android_package="com.kasheemilk.kashee",
+                **kwargs,
+            )
+            for i in range(n)
+        )
+
+    def _status_counts(self):
+        return {
+            (row.module, row.status): row.count
+            for row in DeepLinkStatusCount.objects.all()
+            if row.count
+        }
+
+    def test_counters_follow_creation_and_expiry(self):
+        self._links(2, module="sahayak")
+        deeplink_lifecycle.refresh_counters()
+        self.assertEqual(self._status_counts(), {("sahayak", "active"): 2})
+
+        past = timezone.now() - timedelta(hours=1)
+        self._links(7, expires_at=past)
+        self._links(3)
+        # Expiry may run before the new rows are counted.
+        self.assertEqual(deeplink_lifecycle.expire_links(batch_size=3), 7)
+        deeplink_lifecycle.refresh_counters(batch_size=4)
+
+        self.assertEqual(
+            self._status_counts(),
+            {
+                ("sahayak", "active"): 2,
+                ("member", "active"): 3,
+                ("member", "expired"): 7,
+            },
+        )
+        stat = DeepLinkDailyStat.objects.get(day=timezone.localdate(), module="member")
+        self.assertEqual((stat.created, stat.expired), (10, 7))
+
+    def test_old_inactive_links_are_archived_in_batches(self):
+        old = self._links(5, status=DeepLink.Status.EXPIRED)
+        fresh = self._links(2, status=DeepLink.Status.EXPIRED)
+        active = self._links(1)
+        deeplink_lifecycle.refresh_counters()
+        DeepLink.objects.filter(pk__in=[dl.pk for dl in old + active]).update(
+            created_at=timezone.now() - timedelta(days=120)
+        )
+
+        self.assertEqual(deeplink_lifecycle.delete_old_links(days_old=90, batch_size=2), 5)
+        self.assertEqual(
+            set(DeepLink.objects.values_list("pk", flat=True)),
+            {dl.pk for dl in fresh + active},
+        )
+        self.assertEqual(DeepLinkArchive.objects.count(), 5)
+        self.assertEqual(
+            self._status_counts(),
+            {("member", "expired"): 2, ("member", "active"): 1},
+        )
+
+    def test_report_reads_counters_only(self):
+        self._links(4)
+        deeplink_lifecycle.refresh_counters()
+        self._links(1)[0].revoke()
+
+        with self.assertNumQueries(3):
+            report = deeplink_lifecycle.analytics_report(day=timezone.localdate())
+        self.assertEqual(report["total_links"], 4)
+        self.assertEqual(report["active_links"], 3)
+        self.assertEqual(report["created_yesterday"], 4)
+
+    def test_reconcile_counts_links_committed_behind_the_mark(self):
+        self._links(2)
+        deeplink_lifecycle.refresh_counters()
+        # A later id was counted before this link's transaction committed.
+        DeepLinkCounterState.objects.update(last_link_id=F("last_link_id") + 10)
+        self._links(1)
+        deeplink_lifecycle.refresh_counters()
+        self.assertEqual(self._status_counts(), {("member", "active"): 2})
+
+        self.assertEqual(deeplink_lifecycle.reconcile_created(), 1)
+        self.assertEqual(deeplink_lifecycle.reconcile_created(), 0)
+        self.assertEqual(self._status_counts(), {("member", "active"): 3})
+        stat = DeepLinkDailyStat.objects.get(day=timezone.localdate(), module="member")
+        self.assertEqual(stat.created, 3)
+
+    def test_bulk_revoke_is_counted_and_uncached(self):
+        links = self._links(3)
+        deeplink_lifecycle.refresh_counters()
+        for dl in links:
+            deeplink_cache.resolve(dl.token)
+
+        revoke_user_links(self.user.pk, reason="lost_phone")
+
+        self.assertEqual(self._status_counts(), {("member", "revoked"): 3})
+        self.assertEqual(
+            DeepLinkDailyStat.objects.get(module="member").revoked, 3
+        )
+        revoked = DeepLink.objects.get(pk=links[0].pk)
+        self.assertEqual(revoked.meta["revoke_reason"], "lost_phone")
+        self.assertIsNone(deeplink_cache.resolve(links[0].token))
+
+    def test_accessed_counts_links_and_taps_count_taps(self):
+        links = self._links(2)
+        for _ in range(3):
+            deeplink_cache.resolve(links[0].token)
+        deeplink_cache.resolve(links[1].token)
+        deeplink_cache.flush_usage()
+        deeplink_cache.resolve(links[0].token)
+        deeplink_cache.flush_usage()
+
+        stat = DeepLinkDailyStat.objects.get(day=timezone.localdate(), module="member")
+        self.assertEqual((stat.accessed, stat.taps), (2, 5))
@@ -0,0 +1,93 @@
+"""
+Local stub of the FCM v1 endpoint for transport and delivery tests.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..fcm import FCMTokenProvider
+
+UNREGISTERED_RESPONSE = {
+    "error": {
+        "code": 404,
+        "message": "Requested entity was not found.",
+        "status": "NOT_FOUND",
+        "details": [
+            {
+                "@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError",
+                "errorCode": "UNREGISTERED",
+            }
+        ],
+    }
+}
+
+
+class StubFCMHandler(BaseHTTPRequestHandler):
+    """Minimal FCM v1 endpoint: keeps connections alive and records calls."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            server.requests.append(
+                {
+                    "auth": self.headers.get("Authorization"),
+                    "body": json.loads(body),
+                    "client": self.client_address,
+                }
+            )
+            status = server.statuses.pop(0) if server.statuses else 200
+
+        response = {"name": "projects/test/messages/1"}
+        if json.loads(body)["message"].get("token") in server.unregistered:
+            status, response = 404, UNREGISTERED_RESPONSE
+        payload = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubFCMServer:
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubFCMHandler)
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = []
+        self.httpd.statuses = []
+        self.httpd.unregistered = set()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.httpd
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def stub_url(stub):
+    host, port = stub.server_address
+    return f"http://{host}:{port}/v1/projects/test/messages:send"
+
+
+class CountingTokenProvider(FCMTokenProvider):
+    """Token provider that mints fake tokens instead of calling Google."""
+
+    def __init__(self, lifetime=3600):
+        super().__init__(service_account_path="unused")
+        self.fetches = 0
+        self.lifetime = lifetime
+
+    def _fetch_token(self):
+        self.fetches += 1
+        return {
+            "token": f"token-{self.fetches}",
+            "expires_at": time.time() + self.lifetime,
+        }
@@ -0,0 +1,103 @@
+"""
+Tests for the pooled FCM transport against a local stub of the FCM endpoint.
+"""
+
+import threading
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..fcm import FCMTransport
+from .fcm_stub import CountingTokenProvider, StubFCMServer, stub_url
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class FCMTransportTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _message(self, i=0):
+        return {"message": {"token": f"device-{i}", "data": {"id": str(i)}}}
+
+    def test_token_fetched_once_for_many_sends(self):
+        provider = CountingTokenProvider()
+        with StubFCMServer() as stub:
+            transport = FCMTransport(url=stub_url(stub), token_provider=provider)
+            for i in range(25):
+                sent, _ = transport.send(self._message(i))
+                self.assertTrue(sent)
+
+        self.assertEqual(provider.fetches, 1)
+        self.assertEqual({r["auth"] for r in stub.requests}, {"Bearer token-1"})
+
+    def test_token_shared_across_providers_via_cache(self):
+        first, second = CountingTokenProvider(), CountingTokenProvider()
+        self.assertEqual(first.get_token(), second.get_token())
+        self.assertEqual(first.fetches + second.fetches, 1)
+
+    def test_expired_token_is_refreshed(self):
+        provider = CountingTokenProvider(lifetime=-1)
+        provider.get_token()
+        provider.get_token()
+        self.assertEqual(provider.fetches, 2)
+
+    def test_connections_are_reused(self):
+        with StubFCMServer() as stub:
+            transport = FCMTransport(
+                url=stub_url(stub), token_provider=CountingTokenProvider()
+            )
+            for i in range(10):
+                transport.send(self._message(i))
+
+        clients = {r["client"] for r in stub.requests}
+        self.assertEqual(len(stub.requests), 10)
+        self.assertEqual(len(clients), 1)
+
+    def test_unauthorized_invalidates_token_and_retries(self):
+        provider = CountingTokenProvider()
+        with StubFCMServer() as stub:
+            stub.statuses = [401]
+            transport = FCMTransport(url=stub_url(stub), token_provider=provider)
+            sent, _ = transport.send(self._message())
+
+        self.assertTrue(sent)
+        self.assertEqual(provider.fetches, 2)
+        self.assertEqual(
+            [r["auth"] for r in stub.requests], ["Bearer token-1", "Bearer token-2"]
+        )
+
+    def test_concurrent_sends_record_metrics(self):
+        with StubFCMServer() as stub:
+            transport = FCMTransport(
+                url=stub_url(stub), token_provider=CountingTokenProvider(), pool_size=8
+            )
+            threads = [
+                threading.Thread(
+                    target=lambda n=n: [transport.send(self._message(n)) for _ in range(10)]
+                )
+                for n in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        snapshot = transport.metrics.snapshot()
+        self.assertEqual(snapshot["sent"], 80)
+        self.assertEqual(snapshot["failed"], 0)
+        self.assertEqual(snapshot["samples"], 80)
+        self.assertGreater(snapshot["p95_ms"], 0)
+        self.assertLessEqual(len({r["client"] for r in stub.requests}), 8)
+
+    def test_failed_send_is_counted(self):
+        with StubFCMServer() as stub:
+            stub.statuses = [500]
+            transport = FCMTransport(
+                url=stub_url(stub), token_provider=CountingTokenProvider()
+            )
+            sent, _ = transport.send(self._message())
+
+        self.assertFalse(sent)
+        self.assertEqual(transport.metrics.snapshot()["failed"], 1)
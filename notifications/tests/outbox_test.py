@@ -0,0 +1,143 @@
+"""
+Tests for the notification outbox: events are recorded in the caller's
+transaction and turned into notifications by the relay after commit.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .. import outbox
+from ..model import Notification, NotificationOutbox, NotificationTemplate
+from ..outbox import (
+    enqueue_notification,
+    pack_context,
+    purge,
+    relay,
+    unpack_context,
+)
+
+User = get_user_model()
+
+
+class NotificationOutboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = User.objects.bulk_create(
+            User(username=f"member{i}") for i in range(3)
+        )
+        NotificationTemplate.objects.create(
+            name="feedback_update_hi",
+            category="system",
+            title_template="Feedback",
+            body_template="Hi {{ recipient.username }} from {{ user.username }}",
+        )
+
+    def test_context_round_trips_model_references(self):
+        packed = pack_context({"user": self.users[0], "rows": [self.users[1]], "n": 1})
+        self.assertEqual(packed["user"], {"__ref__": ["auth.user", self.users[0].pk]})
+
+        with self.assertNumQueries(1):
+            context = unpack_context(packed)
+        self.assertEqual(context["user"], self.users[0])
+        self.assertEqual(context["rows"], [self.users[1]])
+        self.assertEqual(context["n"], 1)
+
+    def test_event_is_one_insert_and_kicks_relay_after_commit(self):
+        with mock.patch.object(outbox, "kick_relay") as kick:
+            with self.captureOnCommitCallbacks(execute=True):
+                enqueue_notification(
+                    "feedback_update_hi",
+                    recipients=self.users,
+                    context={"user": self.users[0]},
+                    related_object=self.users[0],
+                )
+                kick.assert_not_called()
+        kick.assert_called_once()
+
+        event = NotificationOutbox.objects.get()
+        self.assertEqual(event.recipient_ids, [u.pk for u in self.users])
+        self.assertEqual(event.status, NotificationOutbox.Status.PENDING)
+
+    def test_rolled_back_event_is_never_relayed(self):
+        with mock.patch.object(outbox, "kick_relay") as kick:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        enqueue_notification("feedback_update_hi", [self.users[0]])
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        kick.assert_not_called()
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    def test_relay_creates_notifications_and_marks_events(self):
+        with mock.patch.object(outbox, "kick_relay"):
+            done = enqueue_notification(
+                "feedback_update_hi",
+                self.users,
+                context={"user": self.users[0]},
+                recipient_key="recipient_id",
+            )
+            failing = enqueue_notification("missing_template", [self.users[0]])
+
+        with mock.patch.object(outbox, "_queue_delivery") as queue:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(relay(batch_size=1), 2)
+
+        done.refresh_from_db()
+        failing.refresh_from_db()
+        self.assertEqual(done.status, NotificationOutbox.Status.DONE)
+        self.assertEqual(failing.status, NotificationOutbox.Status.PENDING)
+        self.assertEqual(failing.attempts, 1)
+        self.assertIn("missing_template", failing.last_error)
+
+        notifications = Notification.objects.order_by("recipient_id")
+        self.assertEqual(
+            [n.body for n in notifications],
+            [f"Hi {u.username} from {self.users[0].username}" for u in self.users],
+        )
+        queue.assert_called_once_with([n.pk for n in notifications])
+
+    @override_settings(NOTIFICATION_OUTBOX_MAX_ATTEMPTS=2)
+    def test_missing_template_fails_after_max_attempts(self):
+        with mock.patch.object(outbox, "kick_relay"):
+            failing = enqueue_notification("missing_template", [self.users[0]])
+
+        relay()
+        relay()
+        self.assertEqual(relay(), 0)
+
+        failing.refresh_from_db()
+        self.assertEqual(failing.status, NotificationOutbox.Status.FAILED)
+        self.assertEqual(failing.attempts, 2)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_purge_deletes_only_old_done_events(self):
+        now = timezone.now()
+        old, recent, failed, pending = NotificationOutbox.objects.bulk_create(
+            [
+                NotificationOutbox(
+                    template_name="feedback_update_hi",
+                    recipient_ids=[],
+                    status=status,
+                    processed_at=processed_at,
+                )
+                for status, processed_at in (
+                    (NotificationOutbox.Status.DONE, now - timedelta(days=8)),
+                    (NotificationOutbox.Status.DONE, now - timedelta(days=1)),
+                    (NotificationOutbox.Status.FAILED, None),
+                    (NotificationOutbox.Status.PENDING, None),
+                )
+            ]
+        )
+
+        self.assertEqual(purge(days=7, batch_size=1), 1)
+        self.assertEqual(
+            set(NotificationOutbox.objects.values_list("pk", flat=True)),
+            {recent.pk, failed.pk, pending.pk},
+        )
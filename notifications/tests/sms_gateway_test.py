@@ -0,0 +1,158 @@
+"""
+Tests for the SMS gateway (pooling, failover, circuit breaking) and the
+logged OTP send against a local fake SMS provider.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from member.models import OTP
+
+from ..model import SmsSendLog
+from ..sms import CircuitBreaker, SMSGateway, send_otp
+from .sms_stub import StubSMSServer, stub_provider
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM, SMS_CIRCUIT_THRESHOLD=2, SMS_CIRCUIT_COOLDOWN=30)
+class SMSGatewayTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_connections_are_reused(self):
+        with StubSMSServer() as stub:
+            gateway = SMSGateway(providers=[stub_provider(stub)])
+            for i in range(10):
+                self.assertTrue(gateway.deliver("9000000000", f"msg {i}").sent)
+
+        self.assertEqual(len(stub.requests), 10)
+        self.assertEqual(len({r["client"] for r in stub.requests}), 1)
+        self.assertEqual(stub.requests[0]["params"]["msg"], "msg 0")
+
+    def test_fails_over_and_opens_circuit(self):
+        with StubSMSServer(status=500) as down, StubSMSServer() as up:
+            gateway = SMSGateway(
+                providers=[stub_provider(down, "primary"), stub_provider(up, "backup")]
+            )
+            results = [gateway.deliver("9000000000", "hi") for _ in range(4)]
+
+        self.assertTrue(all(r.sent and r.provider == "backup" for r in results))
+        # Two failures open the primary's circuit; later sends skip it.
+        self.assertEqual(len(down.requests), 2)
+        self.assertEqual(len(up.requests), 4)
+        self.assertTrue(CircuitBreaker("primary").is_open())
+
+    def test_half_open_circuit_retrips_on_one_failure(self):
+        breaker = CircuitBreaker("flaky")
+        breaker.record_failure()
+        breaker.record_failure()
+        cache.delete(breaker.open_key)  # cooldown elapsed
+        self.assertFalse(breaker.is_open())
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open())
+
+    def test_half_open_circuit_lets_one_probe_through(self):
+        breaker, other = CircuitBreaker("flaky"), CircuitBreaker("flaky")
+        breaker.record_failure()
+        breaker.record_failure()
+        cache.delete(breaker.open_key)  # cooldown elapsed
+
+        self.assertFalse(breaker.is_open())
+        # Everyone else waits for the probe.
+        self.assertTrue(other.is_open())
+        self.assertTrue(other.is_open())
+
+        breaker.record_success()
+        self.assertFalse(other.is_open())
+        self.assertFalse(breaker.is_open())
+
+    def test_timeout_counts_as_failure(self):
+        with StubSMSServer(delay=0.5) as slow, StubSMSServer() as up:
+            gateway = SMSGateway(
+                providers=[stub_provider(slow, "slow"), stub_provider(up, "backup")]
+            )
+            gateway.transport.timeout = (1, 0.1)
+            result = gateway.deliver("9000000000", "hi")
+
+        self.assertTrue(result.sent)
+        self.assertEqual((result.provider, result.attempts), ("backup", 2))
+
+
+@override_settings(CACHES=LOCMEM)
+class SendOTPTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        OTP.objects.create(phone_number="9000000000", otp="123456")
+
+    def _gateway(self, stub):
+        return mock.patch(
+            "notifications.sms.get_gateway",
+            return_value=SMSGateway(providers=[stub_provider(stub)]),
+        )
+
+    def test_sync_send_is_logged_with_masked_otp(self):
+        with StubSMSServer() as stub, self._gateway(stub):
+            sent, info = send_otp("9000000000", "123456", mode="sync")
+
+        self.assertTrue(sent)
+        log = SmsSendLog.objects.get(uuid=info["sms_id"])
+        self.assertEqual((log.status, log.provider, log.attempts), ("sent", "stub", 1))
+        self.assertNotIn("123456", log.message)
+        self.assertIn("123456", stub.requests[0]["params"]["msg"])
+
+    def test_async_send_is_handed_off_after_commit(self):
+        with StubSMSServer() as stub, self._gateway(stub), mock.patch(
+            "notifications.tasks.send_sms.delay"
+        ) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                sent, info = send_otp("9000000000", "123456", mode="async")
+                self.assertEqual(info["sms_status"], "queued")
+                delay.assert_not_called()
+
+            self.assertTrue(sent)
+            # Only the log id goes to the broker, never the code.
+            (log_id,) = delay.call_args.args
+            self.assertEqual(stub.requests, [])
+
+            from ..tasks import send_sms
+
+            send_sms.apply(args=(log_id,))
+
+        log = SmsSendLog.objects.get(pk=log_id)
+        self.assertEqual(log.status, "sent")
+        self.assertEqual(len(stub.requests), 1)
+        self.assertIn("123456", stub.requests[0]["params"]["msg"])
+
+    def test_queued_otp_that_was_used_is_not_sent(self):
+        with StubSMSServer() as stub, self._gateway(stub), mock.patch(
+            "notifications.tasks.send_sms.delay"
+        ) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                send_otp("9000000000", "123456", mode="async")
+            OTP.objects.all().delete()
+
+            from ..tasks import send_sms
+
+            send_sms.apply(args=delay.call_args.args)
+
+        self.assertEqual(stub.requests, [])
+        self.assertEqual(SmsSendLog.objects.get().status, "failed")
+
+    def test_broker_outage_falls_back_to_inline_send(self):
+        with StubSMSServer() as stub, self._gateway(stub), mock.patch(
+            "notifications.tasks.send_sms.delay", side_effect=ConnectionError
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                _, info = send_otp("9000000000", "123456", mode="async")
+
+        self.assertEqual(SmsSendLog.objects.get(uuid=info["sms_id"]).status, "sent")
+
+    def test_all_providers_down_fails_the_send(self):
+        with StubSMSServer(status=503) as stub, self._gateway(stub):
+            sent, info = send_otp("9000000000", "123456", mode="sync")
+
+        self.assertFalse(sent)
+        self.assertEqual(SmsSendLog.objects.get(uuid=info["sms_id"]).status, "failed")
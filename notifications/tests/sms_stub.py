@@ -0,0 +1,73 @@
+"""
+Local fake SMS provider for transport tests and the SMS benchmark.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ..sms import SMSProvider
+
+
+class StubSMSHandler(BaseHTTPRequestHandler):
+    """Minimal SMS API: keeps connections alive and records calls."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        with server.lock:
+            server.requests.append({"params": params, "client": self.client_address})
+            status = server.statuses.pop(0) if server.statuses else server.status
+        if server.delay:
+            time.sleep(server.delay)
+
+        payload = json.dumps({"status": "success", "transactionId": len(server.requests)})
+        payload = payload.encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (read timeout).
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class StubSMSServer:
+    """``status`` answers every request; ``statuses`` are used first, in order."""
+
+    def __init__(self, status=200, delay=0.0):
+        self.status = status
+        self.delay = delay
+
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubSMSHandler)
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests = []
+        self.httpd.statuses = []
+        self.httpd.status = self.status
+        self.httpd.delay = self.delay
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.httpd
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def stub_provider(stub, name="stub"):
+    host, port = stub.server_address
+    return SMSProvider(
+        name=name,
+        url=f"http://{host}:{port}/SMSApi/send",
+        params={"userid": "test", "password": "test"},
+    )
@@ -0,0 +1,74 @@
+"""
+Tests for compiled-template caching in NotificationTemplate rendering.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from ..model import NotificationTemplate
+from ..template_cache import compiled_templates
+from .. import template_cache
+
+
+class CompiledTemplateCacheTest(SimpleTestCase):
+    def setUp(self):
+        compiled_templates.clear()
+
+    def _template(self, **kwargs):
+        fields = {
+            "id": 1,
+            "name": "mpp_collection_created_hi",
+            "title_template": "Collection {{ collection.qty }}",
+            "body_template": "Hello {{ name }}",
+            "sms_template": "SMS {{ name }}",
+            "updated_at": timezone.now(),
+        }
+        fields.update(kwargs)
+        return NotificationTemplate(**fields)
+
+    def _count_compiles(self):
+        return mock.patch.object(
+            template_cache, "Template", wraps=template_cache.Template
+        )
+
+    def test_templates_compiled_once_per_version(self):
+        template = self._template()
+        with self._count_compiles() as compile_:
+            for i in range(50):
+                rendered = template.render_content(
+                    {"collection": {"qty": i}, "name": "Ram"}
+                )
+        self.assertEqual(rendered["title"], "Collection 49")
+        self.assertEqual(rendered["sms"], "SMS Ram")
+        self.assertEqual(compile_.call_count, 3)
+
+    def test_new_updated_at_recompiles(self):
+        template = self._template()
+        template.render_content({})
+        template.updated_at = timezone.now() + timedelta(seconds=1)
+        template.title_template = "Changed {{ name }}"
+        self.assertEqual(template.render_content({"name": "A"})["title"], "Changed A")
+
+    def test_unsaved_edit_is_not_served_stale(self):
+        template = self._template()
+        template.render_content({})
+        template.body_template = "Edited {{ name }}"
+        self.assertEqual(template.render_content({"name": "B"})["body"], "Edited B")
+
+    def test_invalidate_drops_entries(self):
+        self._template().render_content({})
+        self.assertEqual(len(compiled_templates), 1)
+        compiled_templates.invalidate(1)
+        self.assertEqual(len(compiled_templates), 0)
+
+    def test_render_many_matches_render_content(self):
+        template = self._template()
+        contexts = [{"collection": {"qty": i}, "name": f"M{i}"} for i in range(20)]
+        with self._count_compiles() as compile_:
+            batch = template.render_many(contexts, channel="push")
+        self.assertEqual(compile_.call_count, 2)
+        self.assertEqual(batch, [template.render_content(c, "push") for c in contexts])
+        self.assertNotIn("sms", batch[0])
@@ -12,6 +12,7 @@ from ..views.notification_view import (
     NotificationPreferencesView,
     NotificationPreferencesUpdateView,
 )
+from ..views.sms_view import SmsStatusView
 
 app_name = "notification"
 
@@ -43,4 +44,5 @@ urlpatterns = [
         NotificationPreferencesUpdateView.as_view(),
         name="preferences_update",
     ),
+    path("sms/<uuid:uuid>/status/", SmsStatusView.as_view(), name="sms_status"),
 ]
@@ -10,6 +10,7 @@ from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
 from notifications.model import DeepLink
 from ..deeplink_service import DeepLinkService
+from .. import deeplink_cache
 from django.views import View
 from types import SimpleNamespace
 
@@ -32,18 +33,14 @@ class DeepLinkRedirectView(View):
 
         # Handle deep link token or simple route
         token = token or request.GET.get("token")
-        service = DeepLinkService()
 
         if token:
-            deep_link = service.validate_and_get_link(token)
+            # Served from the cache; taps are counted there and flushed to
+            # the DB by the flush_deeplink_usage task.
+            deep_link = deeplink_cache.resolve(token)
             if not deep_link:
                 return HttpResponseRedirect(app_cfg.default_fallback)
 
-            try:
-                deep_link.increment_use()
-            except Exception:
-                logger.exception("Failed to increment deep link usage")
-
         else:
             deep_link = SimpleNamespace(
                 module=module,
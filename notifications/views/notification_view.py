@@ -11,6 +11,7 @@ from ..serializers import (
     NotificationPreferencesSerializer,
 )
 from ..notification_service import NotificationServices
+from .. import counters
 from util.response import (
     custom_response,
     StandardResultsSetPagination,
@@ -25,8 +26,7 @@ class UnreadNotificationCountView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        user = request.user
-        count = Notification.objects.filter(recipient=user, is_read=False).count()
+        count = counters.get_unread_count(request.user.pk)
         return custom_response(
             status_text="success",
             data={"unread_count": count},
@@ -216,8 +216,8 @@ def archive_notification(request, uuid):
 def notification_stats(request):
     """Get notification statistics for the user"""
     user = request.user
-    total = Notification.objects.filter(recipient=user).count()
-    unread = Notification.objects.filter(recipient=user, is_read=False).count()
+    counts = counters.get_counts(user.pk)
+    total, unread = counts["total"], counts["unread"]
 
     categories = (
         Notification.objects.filter(recipient=user)
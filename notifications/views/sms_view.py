@@ -0,0 +1,24 @@
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from ..model import SmsSendLog
+from util.response import custom_response
+
+
+class SmsStatusView(APIView):
+    """Delivery status of an SMS, polled by the app with the ``sms_id`` it got."""
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, uuid, *args, **kwargs):
+        log = get_object_or_404(
+            SmsSendLog.objects.only("uuid", "status", "sent_at"), uuid=uuid
+        )
+        return custom_response(
+            status_text="success",
+            data={"sms_id": str(log.uuid), "status": log.status, "sent_at": log.sent_at},
+            message=_("SMS status retrieved successfully."),
+        )
@@ -0,0 +1,147 @@
+"""
+Request-scoped batch loading for serializers (DataLoader style).
+
+A serializer lists the lookups it needs in ``batch_keys`` as
+``(loader_factory, "attribute.path")`` pairs and reads them through
+``self.load(loader_factory, key)``. When a page is serialized with
+``BatchListSerializer``, the keys of every row, including those of nested
+``BatchLoadMixin`` serializers, are collected first, so each loader resolves
+the whole page with one ``IN`` query. Loaded rows are memoized on the request
+for the rest of its lifetime; without a request they live in the serializer
+context.
+"""
+
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+
+LOADERS_ATTR = "_batch_loaders"
+
+# SQL Server rejects statements with more than 2100 parameters.
+MAX_KEYS_PER_QUERY = 2000
+
+
+class BatchLoader:
+    """
+    Memoizing ``key -> object`` lookup over ``queryset`` by ``key_field``.
+
+    Keys are queued with ``prime`` and fetched together on the first
+    ``load`` that misses. When several rows share a key the last one wins,
+    matching the ``filter(...).last()`` lookups this replaces: by the
+    queryset's ordering, or by primary key when it has none. Missing keys
+    resolve to ``None``.
+    """
+
+    def __init__(self, queryset, key_field):
+        self.queryset = queryset
+        self.key_field = key_field
+        self._cache = {}
+        self._pending = set()
+
+    def prime(self, keys):
+        self._pending.update(
+            key for key in keys if key is not None and key not in self._cache
+        )
+
+    def load(self, key):
+        if key is None:
+            return None
+        if key not in self._cache:
+            self._pending.add(key)
+            self._dispatch()
+        return self._cache.get(key)
+
+    def load_many(self, keys):
+        keys = list(keys)
+        self.prime(keys)
+        self._dispatch()
+        return [self._cache.get(key) for key in keys]
+
+    def _dispatch(self):
+        pending = list(self._pending)
+        self._pending.clear()
+        queryset = self.queryset if self.queryset.ordered else self.queryset.order_by("pk")
+        for start in range(0, len(pending), MAX_KEYS_PER_QUERY):
+            chunk = pending[start : start + MAX_KEYS_PER_QUERY]
+            self._cache.update(dict.fromkeys(chunk))
+            for obj in queryset.filter(**{f"{self.key_field}__in": chunk}):
+                self._cache[getattr(obj, self.key_field)] = obj
+
+
+def get_loader(context, factory):
+    """The loader built by ``factory`` for this request (or serializer context)."""
+    request = context.get("request")
+    # DRF wraps the HttpRequest; keep loaders on the inner one so every
+    # serializer touching the same request shares them.
+    holder = getattr(request, "_request", request)
+    if holder is not None:
+        loaders = holder.__dict__.setdefault(LOADERS_ATTR, {})
+    else:
+        loaders = context.setdefault(LOADERS_ATTR, {})
+    if factory not in loaders:
+        loaders[factory] = factory()
+    return loaders[factory]
+
+
+def resolve_key(instance, path):
+    for attr in path.split("."):
+        if instance is None:
+            return None
+        instance = getattr(instance, attr, None)
+    return instance
+
+
+def prime_serializer(serializer, instances):
+    """
+    Queue the ``batch_keys`` of ``serializer`` and of its nested batch-loading
+    serializers for ``instances``.
+    """
+    instances = [instance for instance in instances if instance is not None]
+    if not instances:
+        return
+
+    for factory, path in getattr(serializer, "batch_keys", ()):
+        get_loader(serializer.context, factory).prime(
+            resolve_key(instance, path) for instance in instances
+        )
+
+    for field in serializer.fields.values():
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, serializers.BaseSerializer) or not _batches(nested):
+            continue
+        related = []
+        for instance in instances:
+            try:
+                value = field.get_attribute(instance)
+            except (AttributeError, KeyError, ObjectDoesNotExist, SkipField):
+                continue
+            if many:
+                related.extend(value.all() if hasattr(value, "all") else value or ())
+            else:
+                related.append(value)
+        prime_serializer(nested, related)
+
+
+def _batches(serializer):
+    return isinstance(serializer, BatchLoadMixin) or getattr(
+        getattr(serializer, "Meta", None), "list_serializer_class", None
+    ) is BatchListSerializer
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """Primes every loader the rows need before serializing them one by one."""
+
+    def to_representation(self, data):
+        rows = list(data.all() if hasattr(data, "all") else data)
+        prime_serializer(self.child, rows)
+        return super().to_representation(rows)
+
+
+class BatchLoadMixin:
+    """Serializer mixin giving ``batch_keys`` declarations and ``self.load``."""
+
+    batch_keys = ()
+
+    def load(self, factory, key):
+        return get_loader(self.context, factory).load(key)
@@ -35,6 +35,7 @@ from .models.stock_models import (
 )
 
 from .resources.cattle_resources import CombinedCattleResource
+from .utils.export_util import StreamingExportMixin
 from django.utils.html import format_html
 from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
@@ -282,7 +283,7 @@ class AnimalTreatmentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Cattle)
-class CattleAdmin(ImportExportModelAdmin):
+class CattleAdmin(StreamingExportMixin, ImportExportModelAdmin):
     resource_class = CombinedCattleResource
     list_display = (
         "name",
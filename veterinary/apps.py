@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class VeterinaryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'veterinary'
+
+    def ready(self):
+        from .services.recommendation_index import connect_index_signals
+
+        connect_index_signals()
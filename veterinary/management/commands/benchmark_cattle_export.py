@@ -0,0 +1,141 @@
+# management/commands/benchmark_cattle_export.py
+
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ...models.models import Cattle, CattleStatusLog, CattleTagging
+from ...resources.cattle_resources import CombinedCattleResource
+from ...utils.export_util import EXPORT_FORMATS, stream_export
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_related(obj):
+    """The previous dehydrate_* lookups: six queries per exported row."""
+    values = []
+    for attr in ("tag_number", "virtual_tag_no", "tag_method", "tag_location"):
+        tag = CattleTagging.objects.filter(cattle=obj, is_active=True).first()
+        values.append(getattr(tag, attr) if tag else None)
+    for attr in ("pregnancy_status", "milk_production_lpd"):
+        status = CattleStatusLog.objects.filter(cattle=obj, is_current=True).first()
+        values.append(getattr(status, attr) if status else None)
+    return values
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark CombinedCattleResource export on synthetic cattle: per-row "
+        "dehydrate lookups vs the chunked, streamed export. Runs in a rolled "
+        "back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count", type=int, default=100_000, help="Synthetic cattle to export"
+        )
+        parser.add_argument(
+            "--legacy-sample",
+            type=int,
+            default=2_000,
+            help="Rows exported the old way; the full run is extrapolated",
+        )
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="xlsx")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._seed(options["count"])
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic data rolled back")
+
+    def _seed(self, count):
+        started = time.perf_counter()
+        cattle = Cattle.objects.bulk_create(
+            (Cattle(cattle_code=f"BENCH-{i:07d}", age=24 + i % 60) for i in range(count)),
+            batch_size=5000,
+        )
+        CattleTagging.objects.bulk_create(
+            (
+                CattleTagging(
+                    cattle=obj, tag_number=f"T{i:07d}", virtual_tag_no=f"BENCH-V{i:07d}"
+                )
+                for i, obj in enumerate(cattle)
+                if i % 10
+            ),
+            batch_size=5000,
+        )
+        CattleStatusLog.objects.bulk_create(
+            (
+                CattleStatusLog(
+                    cattle=obj,
+                    from_date=date.today(),
+                    is_current=True,
+                    pregnancy_status=bool(i % 3),
+                    milk_production_lpd=Decimal(i % 20),
+                )
+                for i, obj in enumerate(cattle)
+                if i % 4
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(
+            self.style.WARNING(
+                f"Seeded {count} cattle in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def _queryset(self):
+        return Cattle.objects.filter(cattle_code__startswith="BENCH-").order_by("pk")
+
+    def _run(self, options):
+        count = options["count"]
+        sample = min(options["legacy_sample"], count)
+
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            for obj in self._queryset()[:sample]:
+                legacy_related(obj)
+            legacy = time.perf_counter() - started
+        self.stdout.write(
+            f"legacy   {sample} rows in {legacy:7.2f}s "
+            f"queries={len(captured)} "
+            f"(~{legacy * count / sample:7.1f}s for {count})"
+        )
+
+        handle, path = tempfile.mkstemp(suffix=f".{options['format']}")
+        os.close(handle)
+        try:
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                with open(path, "wb") as fileobj:
+                    rows = stream_export(
+                        CombinedCattleResource(),
+                        self._queryset(),
+                        fileobj,
+                        file_format=options["format"],
+                    )
+                streamed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(
+                f"streamed {rows} rows in {streamed:7.2f}s "
+                f"queries={len(captured)} peak={peak / 2**20:6.1f}MiB "
+                f"file={os.path.getsize(path) / 2**20:6.1f}MiB"
+            )
+        finally:
+            os.remove(path)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,107 @@
+# management/commands/benchmark_recommendations.py
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...models.stock_models import Disease, Symptoms
+from ...services.recommendation_index import SEVERITY_WEIGHT, RecommendationIndex
+
+
+def scan_recommendations(symptom_ids):
+    """The previous implementation: score every disease, one query per disease."""
+    diseases = Disease.objects.prefetch_related("symptoms", "medicines").all()
+    results = []
+    for disease in diseases:
+        disease_symptoms = set(disease.symptoms.values_list("id", flat=True))
+        matched = disease_symptoms.intersection(symptom_ids)
+        match_score = len(matched) / len(disease_symptoms) if disease_symptoms else 0
+        composite_score = match_score * SEVERITY_WEIGHT.get(disease.severity, 1)
+        if match_score > 0:
+            results.append(
+                {
+                    "disease": {"id": disease.id, "composite_score": round(composite_score, 2)},
+                    "medicines": [med.id for med in disease.medicines.all()],
+                }
+            )
+    results.sort(key=lambda x: x["disease"]["composite_score"], reverse=True)
+    return results
+
+
+class Command(BaseCommand):
+    help = "Benchmark symptom recommendations: full catalogue scan vs inverted index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queries", type=int, default=200, help="Number of symptom sets to rank"
+        )
+        parser.add_argument(
+            "--symptoms", type=int, default=3, help="Symptoms per query"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=10, help="Top-k taken from the index"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        symptom_ids = list(Symptoms.objects.values_list("id", flat=True))
+        if not symptom_ids:
+            self.stdout.write(self.style.ERROR("No symptoms in the database."))
+            return
+
+        rng = random.Random(options["seed"])
+        size = min(options["symptoms"], len(symptom_ids))
+        queries = [rng.sample(symptom_ids, size) for _ in range(options["queries"])]
+
+        started = time.perf_counter()
+        index = RecommendationIndex.build()
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            self.style.WARNING(
+                f"{len(index.diseases)} diseases, {len(index.postings)} symptoms; "
+                f"index built in {build_ms:.1f}ms"
+            )
+        )
+
+        mismatches = 0
+        for query in queries[:20]:
+            expected = scan_recommendations(query)
+            actual = index.rank(query)
+            # Equal scores may come back in a different order, so compare the
+            # matched set and the score sequence rather than the id order.
+            if {r["disease"]["id"] for r in expected} != {
+                r["disease"]["id"] for r in actual
+            } or [r["disease"]["composite_score"] for r in expected] != [
+                r["disease"]["composite_score"] for r in actual
+            ]:
+                mismatches += 1
+
+        limit = options["limit"]
+        for label, fn in (
+            ("scan", scan_recommendations),
+            ("index", lambda query: index.rank(query, limit=limit)),
+        ):
+            timings = []
+            with CaptureQueriesContext(connection) as captured:
+                for query in queries:
+                    started = time.perf_counter()
+                    fn(query)
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f"{label:<6} p50={statistics.median(timings):8.3f}ms "
+                f"p95={timings[int(len(timings) * 0.95) - 1]:8.3f}ms "
+                f"max={timings[-1]:8.3f}ms "
+                f"queries/call={len(captured) / len(queries):6.1f}"
+            )
+
+        if mismatches:
+            self.stdout.write(
+                self.style.ERROR(f"{mismatches} of the sampled rankings differ")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Benchmark complete; rankings match"))
@@ -3,6 +3,7 @@ from erp_app.models import MemberHierarchyView
 from veterinary.models.models import MembersMasterCopy
 from django.contrib.auth import get_user_model
 from ...utils.sync_model_util import sync_model
+from member.services.login_index import refresh_login_index
 from notifications.choices import (
     NotificationChannel,
     NotificationPriority,
@@ -15,17 +16,35 @@ User = get_user_model()
 class Command(BaseCommand):
     help = "Syncs member data from MSSQL (MemberHierarchyView) to PostgreSQL (MembersMasterCopy)"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Members read and written per batch",
+        )
+        parser.add_argument(
+            "--delete-missing",
+            action="store_true",
+            help="Delete copies of members that no longer exist in the ERP",
+        )
+
     def handle(self, *args, **options):
-        self.stdout.write("Fetching records from MSSQL...")
-        source_members = MemberHierarchyView.objects.using("sarthak_kashee").all()
-
-        self.stdout.write("Indexing users by username (mobile_no)...")
-        user_lookup = {
-            user.username: user
-            for user in User.objects.filter(username__isnull=False).only(
-                "id", "username"
+        self.stdout.write("Streaming records from MSSQL...")
+        source_members = MemberHierarchyView.objects.using("sarthak_kashee").order_by()
+
+        # Users for the current chunk only, keyed by username (mobile_no).
+        user_lookup = {}
+
+        def load_users(members):
+            user_lookup.clear()
+            user_lookup.update(
+                User.objects.filter(
+                    username__in={m.mobile_no for m in members if m.mobile_no}
+                )
+                .only("id", "username")
+                .in_bulk(field_name="username")
             )
-        }
 
         def key_fn(member):
             return member.member_code
@@ -92,20 +111,27 @@ class Command(BaseCommand):
             "user",
         ]
 
-        created, updated = sync_model(
+        result = sync_model(
             model=MembersMasterCopy,
             source_objects=source_members,
             key_fn=key_fn,
             map_fn=map_fn,
             update_fields=update_fields,
-            batch_size=500,
+            batch_size=options["batch_size"],
             key_field="member_code",
+            hash_field="sync_hash",
+            delete_missing=options["delete_missing"],
+            prepare_chunk=load_users,
         )
 
         self.stdout.write(
-            self.style.SUCCESS(
-                f"✅ Sync completed successfully: Created={created}, Updated={updated}"
-            )
+            self.style.SUCCESS(f"✅ Sync completed successfully: {result}")
+        )
+
+        # Login eligibility for the OTP endpoints is derived from the copy.
+        index_result = refresh_login_index()
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Member login index refreshed: {index_result}")
         )
         # --- Notification Section ---
         self.stdout.write("Creating notifications for superusers...")
@@ -116,8 +142,10 @@ class Command(BaseCommand):
 
         for user in superusers:
             context_data = {
-                "created": created,
-                "updated": updated,
+                "created": result.created,
+                "updated": result.updated,
+                "unchanged": result.unchanged,
+                "deleted": result.deleted,
                 "timestamp": timezone.now(),
             }
             render_context = {
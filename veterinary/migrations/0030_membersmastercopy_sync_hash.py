@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('veterinary', '0029_remove_casepaymentsummary_case_entry_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membersmastercopy',
+            name='sync_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Content hash of the synced ERP fields; unchanged rows are skipped.', max_length=40, null=True, verbose_name='Sync Hash'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('veterinary', '0030_membersmastercopy_sync_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exceluploadsession',
+            name='processed_rows',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Rows imported so far; compared with total rows for progress', verbose_name='Processed rows'),
+        ),
+    ]
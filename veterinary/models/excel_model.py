@@ -1,4 +1,5 @@
 import uuid
+from django.core.cache import cache
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -71,6 +72,12 @@ class ExcelUploadSession(models.Model):
         editable=False,
         verbose_name=_("Total rows")
     )
+    processed_rows = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Processed rows"),
+        help_text=_("Rows imported so far; compared with total rows for progress"),
+    )
     error_message = models.TextField(
         null=True,
         blank=True,
@@ -112,5 +119,40 @@ class ExcelUploadSession(models.Model):
         self.processed_at = now()
         self.save(update_fields=["status", "processed", "total_rows", "error_message", "processed_at"])
 
+    @property
+    def progress_cache_key(self):
+        return f"excel_upload_progress_{self.pk}"
+
+    def update_progress(self, processed_rows, total_rows):
+        """
+        Record import progress. Sheets are imported inside a transaction, so
+        the row update only becomes visible on commit; the cached copy lets
+        the status endpoint report progress while the import is running.
+        """
+        self.processed_rows = processed_rows
+        self.total_rows = total_rows
+        cache.set(
+            self.progress_cache_key,
+            {"processed_rows": processed_rows, "total_rows": total_rows},
+            timeout=60 * 60,
+        )
+        ExcelUploadSession.objects.filter(pk=self.pk).update(
+            processed_rows=processed_rows, total_rows=total_rows
+        )
+
+    @property
+    def progress(self):
+        """Processed and total rows, with the percentage complete."""
+        live = cache.get(self.progress_cache_key) or {
+            "processed_rows": self.processed_rows,
+            "total_rows": self.total_rows,
+        }
+        total = live["total_rows"]
+        if self.status == self.Status.SUCCESS:
+            percent = 100.0
+        else:
+            percent = round(live["processed_rows"] * 100 / total, 1) if total else 0.0
+        return {**live, "percent": percent}
+
     def __str__(self):
         return f"{self.filename} ({self.get_status_display()})"
@@ -450,28 +450,29 @@ class MedicineStockManager(models.Manager):
             wasted_quantity=F('available_qty')
         ).order_by('-expiry_date')
     
-    def bulk_reserve_stock(self, reservations):
+    def bulk_reserve_stock(self, reservations, user=None):
         """
         Bulk reserve stock for multiple items
         reservations: list of dicts with 'stock_id' and 'quantity' keys
+
+        Applied as one batch of conditional updates, see
+        ``veterinary.services.stock_movement``.
         """
-        successful_reservations = []
-        failed_reservations = []
-        
-        for reservation in reservations:
-            try:
-                stock = self.get(id=reservation['stock_id'])
-                stock.reserve_stock(reservation['quantity'])
-                successful_reservations.append(reservation['stock_id'])
-            except (self.model.DoesNotExist, ValueError) as e:
-                failed_reservations.append({
-                    'stock_id': reservation['stock_id'],
-                    'error': str(e)
-                })
-        
+        from ...services.stock_movement import RESERVE, StockMovement, apply_movements
+
+        batch = apply_movements(
+            (
+                StockMovement(RESERVE, reservation['stock_id'], reservation['quantity'])
+                for reservation in reservations
+            ),
+            user=user,
+        )
         return {
-            'successful': successful_reservations,
-            'failed': failed_reservations
+            'successful': [r.movement.stock_id for r in batch.successful],
+            'failed': [
+                {'stock_id': r.movement.stock_id, 'error': r.error}
+                for r in batch.failed
+            ]
         }
     
     def get_transfer_candidates(self, medicine_id, target_location_id, required_quantity):
@@ -733,17 +734,23 @@ class UserMedicineStockManager(models.Manager):
         """
         Bulk update used quantities
         usage_data: list of dicts with 'id' and 'used_quantity' keys
+
+        Rows are loaded in one query; usage above the allocation is skipped
+        instead of failing the whole batch on the database constraint.
         """
+        usage = {int(data['id']): data['used_quantity'] for data in usage_data}
+        stocks = self.select_related(None).only(
+            'id', 'allocated_quantity', 'used_quantity', 'sync_status'
+        ).in_bulk(usage.keys())
+
         stocks_to_update = []
-        
-        for data in usage_data:
-            try:
-                stock = self.get(id=data['id'])
-                stock.used_quantity = data['used_quantity']
-                stock.sync_status = 'PENDING'  # Mark for sync
-                stocks_to_update.append(stock)
-            except self.model.DoesNotExist:
+        for stock_id, used_quantity in usage.items():
+            stock = stocks.get(stock_id)
+            if stock is None or Decimal(str(used_quantity)) > stock.allocated_quantity:
                 continue
+            stock.used_quantity = used_quantity
+            stock.sync_status = 'PENDING'  # Mark for sync
+            stocks_to_update.append(stock)
         
         if stocks_to_update:
             self.bulk_update(
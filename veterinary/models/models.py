@@ -198,6 +198,14 @@ class MembersMasterCopy(models.Model):
         verbose_name="Linked User",
         help_text="Reference to Django user if mapped.",
     )
+    sync_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Sync Hash",
+        help_text="Content hash of the synced ERP fields; unchanged rows are skipped.",
+    )
 
     class Meta:
         db_table = "member_master_copy"
@@ -516,6 +524,15 @@ class Cattle(BaseModel):
 
     def _generate_deterministic_code(self):
         """Generate cattle code based on Member Code + Age + Age_Year + Gender."""
+        base_code = self.base_cattle_code()
+
+        # Check for collision (another cattle with same base_code)
+        if Cattle.objects.filter(cattle_code=base_code).exclude(pk=self.pk).exists():
+            base_code = self.disambiguated_cattle_code(base_code)
+
+        return base_code
+
+    def base_cattle_code(self):
         member_part = (
             self.owner.member_code[-4:]
             if self.owner and self.owner.member_code
@@ -526,18 +543,15 @@ class Cattle(BaseModel):
         age_year_part = f"Y{self.age_year or 0}"
         gender_part = self.gender[0].upper() if self.gender else "U"
 
-        base_code = f"CTL-{member_part}-{age_part}{age_year_part}-{gender_part}"
-
-        # Check for collision (another cattle with same base_code)
-        if Cattle.objects.filter(cattle_code=base_code).exclude(pk=self.pk).exists():
-            # Add short deterministic hash from owner + age to disambiguate
-            raw_string = (
-                f"{self.owner.member_code or 0}{self.age}{self.age_year}{self.gender}"
-            )
-            hash_suffix = hashlib.sha1(raw_string.encode()).hexdigest()[:4].upper()
-            base_code = f"{base_code}-{hash_suffix}"
+        return f"CTL-{member_part}-{age_part}{age_year_part}-{gender_part}"
 
-        return base_code
+    def disambiguated_cattle_code(self, base_code):
+        # Add short deterministic hash from owner + age to disambiguate
+        raw_string = (
+            f"{self.owner.member_code or 0}{self.age}{self.age_year}{self.gender}"
+        )
+        hash_suffix = hashlib.sha1(raw_string.encode()).hexdigest()[:4].upper()
+        return f"{base_code}-{hash_suffix}"
 
     def transfer_ownership(self, new_owner, *, updated_by=None, reason=None, save=True):
         """Enhanced ownership transfer with history tracking"""
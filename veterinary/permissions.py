@@ -43,6 +43,10 @@ class IsOwnerOrStaff(permissions.BasePermission):
 
 
 from rest_framework import permissions
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from facilitator.models.user_profile_model import ReportingClosure
 
 
 class HierarchyPermissionMixin:
@@ -98,16 +102,9 @@ class HierarchyPermissionMixin:
     
     def _check_reporting_hierarchy(self, supervisor, subordinate_profile, max_levels):
         """Check direct and multi-level reporting relationships."""
-        current_profile = subordinate_profile
-        levels_checked = 0
-        
-        while current_profile and current_profile.reports_to and levels_checked < max_levels:
-            if current_profile.reports_to.user == supervisor:
-                return True
-            current_profile = current_profile.reports_to
-            levels_checked += 1
-        
-        return False
+        return ReportingClosure.objects.is_ancestor(
+            supervisor.pk, subordinate_profile.user_id, max_depth=max_levels
+        )
     
     def _check_department_permissions(self, supervisor, subordinate_profile):
         """Check department-based management permissions for staff members."""
@@ -131,6 +128,29 @@ class HierarchyPermissionMixin:
         
         return False
     
+    def manageable_users_filter(self, supervisor, max_levels=5):
+        """
+        ``Q`` on the User model matching everyone ``is_supervisor_of`` would
+        accept: the supervisor, reportees down to ``max_levels`` and, for
+        staff, the departments they manage.
+        """
+        condition = Q(pk=supervisor.pk) | Q(
+            pk__in=ReportingClosure.objects.descendant_ids(
+                supervisor.pk, max_depth=max_levels
+            )
+        )
+
+        supervisor_profile = getattr(supervisor, 'profile', None)
+        if supervisor.is_staff and supervisor_profile:
+            department = supervisor_profile.department
+            if department is None:
+                condition |= Q(profile__isnull=False, profile__department__isnull=True)
+            else:
+                departments = [department, *self.MANAGEMENT_HIERARCHY.get(department, [])]
+                condition |= Q(profile__department__in=departments)
+
+        return condition
+
     def can_user_access_object(self, user, target_user, method='GET'):
         """
         Check if user can access objects belonging to target_user.
@@ -274,33 +294,52 @@ class UserHierarchyChecker(HierarchyPermissionMixin):
     def get_subordinates(self, supervisor, max_levels=None):
         """
         Get all subordinates of a supervisor up to max_levels.
-        This could be useful for filtering querysets.
+        Returns a User queryset, usable for filtering other querysets.
         """
         if max_levels is None:
             max_levels = self.max_hierarchy_levels
-        
-        # This would need to be implemented based on your User/Profile model structure
-        # Example implementation:
-        subordinates = []
-        # Implementation would go here...
-        return subordinates
+
+        User = get_user_model()
+        return User.objects.filter(
+            pk__in=ReportingClosure.objects.descendant_ids(
+                supervisor.pk, max_depth=max_levels
+            )
+        )
     
     def get_accessible_users(self, user):
         """
         Get all users that the given user can access (themselves + subordinates).
         Useful for filtering data in views.
         """
-        accessible_users = [user]  # User can always access themselves
-        
+        User = get_user_model()
         if user.is_superuser:
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
             return User.objects.all()
-        
-        # Add subordinates
-        accessible_users.extend(self.get_subordinates(user))
-        return accessible_users
 
+        return User.objects.filter(
+            Q(pk=user.pk)
+            | Q(
+                pk__in=ReportingClosure.objects.descendant_ids(
+                    user.pk, max_depth=self.max_hierarchy_levels
+                )
+            )
+        )
+
+    def get_manageable_user_ids(self, user):
+        """
+        Ids of users this user can manage (including themselves), as a
+        values queryset that filters like ``user__id__in=...`` use as a
+        single subquery.
+        """
+        User = get_user_model()
+        if user.is_superuser:
+            return User.objects.values_list("id", flat=True)
+
+        return User.objects.filter(
+            self.manageable_users_filter(user, self.max_hierarchy_levels)
+        ).values_list("id", flat=True)
+
+    def can_manage_user_id(self, user, user_id):
+        return self.get_manageable_user_ids(user).filter(pk=user_id).exists()
 
 
 class CanManageUserStock(permissions.BasePermission):
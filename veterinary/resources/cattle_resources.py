@@ -1,6 +1,8 @@
 from import_export.widgets import ForeignKeyWidget, ManyToManyWidget, DateWidget, BooleanWidget, Widget
 from import_export.results import RowResult
 from django.db import IntegrityError
+from django.db.models import QuerySet
+from itertools import islice
 from datetime import timezone
 from ..models.models import (
     Cattle,
@@ -442,17 +444,23 @@ class CombinedCattleResource(resources.ModelResource):
 
     class Meta:
         model = Cattle
+        # Declared fields outside this whitelist are dropped by import-export 4.
         fields = (
             'cattle_code', 'name', 'owner', 'breed', 'gender', 'age', 'age_year',
             'no_of_calving', 'is_active', 'is_alive', 'current_status',
+            'tag_number', 'virtual_tag_number', 'tag_method', 'tag_location',
+            'pregnancy_status', 'milk_production_lpd',
         )
         import_id_fields = ['cattle_code']
         skip_unchanged = True
         report_skipped = True
+        chunk_size = 2000
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._import_errors = []
+        self._active_tags = {}
+        self._current_statuses = {}
 
     def before_import_row(self, row, **kwargs):
         """Simple validation before importing each row"""
@@ -608,49 +616,78 @@ class CombinedCattleResource(resources.ModelResource):
 
         return super().skip_row(instance, original, row, import_validation_errors)
 
-    # Export methods for related data
+    # ---------------- Export ----------------
+    def iter_queryset(self, queryset):
+        """
+        Stream cattle in chunks of ``Meta.chunk_size``. Active tags and
+        current status logs are loaded once per chunk, so the dehydrate
+        methods below are dictionary reads and memory stays bounded by the
+        chunk.
+        """
+        if isinstance(queryset, QuerySet):
+            rows = queryset.select_related("owner", "breed", "current_status").iterator(
+                chunk_size=self.get_chunk_size()
+            )
+        else:
+            rows = iter(queryset)
+
+        while chunk := list(islice(rows, self.get_chunk_size())):
+            self.preload_related(chunk)
+            yield from chunk
+
+    def preload_related(self, cattle):
+        """Replace the tag/status lookups with those of ``cattle`` (two queries)."""
+        ids = [obj.pk for obj in cattle]
+        self._active_tags = dict.fromkeys(ids)
+        for tag in CattleTagging.objects.filter(cattle_id__in=ids, is_active=True).only(
+            "cattle_id", "tag_number", "virtual_tag_no", "tag_method", "tag_location"
+        ):
+            # Default ordering first, matching the previous ``.first()``.
+            self._active_tags[tag.cattle_id] = self._active_tags[tag.cattle_id] or tag
+
+        self._current_statuses = dict.fromkeys(ids)
+        for status in CattleStatusLog.objects.filter(
+            cattle_id__in=ids, is_current=True
+        ).only("cattle_id", "pregnancy_status", "milk_production_lpd"):
+            self._current_statuses[status.cattle_id] = (
+                self._current_statuses[status.cattle_id] or status
+            )
+
+    def _active_tag(self, obj):
+        if obj.pk not in self._active_tags:
+            self.preload_related([obj])
+        return self._active_tags[obj.pk]
+
+    def _current_status(self, obj):
+        if obj.pk not in self._current_statuses:
+            self.preload_related([obj])
+        return self._current_statuses[obj.pk]
+
     def dehydrate_tag_number(self, obj):
-        try:
-            active_tag = CattleTagging.objects.filter(cattle=obj, is_active=True).first()
-            return active_tag.tag_number if active_tag else None
-        except:
-            return None
+        active_tag = self._active_tag(obj)
+        return active_tag.tag_number if active_tag else None
 
     def dehydrate_virtual_tag_number(self, obj):
-        try:
-            active_tag = CattleTagging.objects.filter(cattle=obj, is_active=True).first()
-            return active_tag.virtual_tag_no if active_tag else None
-        except:
-            return None
+        active_tag = self._active_tag(obj)
+        return active_tag.virtual_tag_no if active_tag else None
 
     def dehydrate_tag_method(self, obj):
-        try:
-            active_tag = CattleTagging.objects.filter(cattle=obj, is_active=True).first()
-            return active_tag.tag_method if active_tag else None
-        except:
-            return None
+        active_tag = self._active_tag(obj)
+        return active_tag.tag_method if active_tag else None
 
     def dehydrate_tag_location(self, obj):
-        try:
-            active_tag = CattleTagging.objects.filter(cattle=obj, is_active=True).first()
-            return active_tag.tag_location if active_tag else None
-        except:
-            return None
+        active_tag = self._active_tag(obj)
+        return active_tag.tag_location if active_tag else None
 
     def dehydrate_pregnancy_status(self, obj):
-        try:
-            current_status = CattleStatusLog.objects.filter(cattle=obj, is_current=True).first()
-            return current_status.pregnancy_status if current_status else False
-        except:
-            return False
+        current_status = self._current_status(obj)
+        return current_status.pregnancy_status if current_status else False
 
     def dehydrate_milk_production_lpd(self, obj):
-        try:
-            current_status = CattleStatusLog.objects.filter(cattle=obj, is_current=True).first()
-            return float(
-                current_status.milk_production_lpd) if current_status and current_status.milk_production_lpd else 0
-        except:
-            return 0
+        current_status = self._current_status(obj)
+        if current_status and current_status.milk_production_lpd:
+            return float(current_status.milk_production_lpd)
+        return 0
 
     def get_import_errors(self):
         """Get accumulated import errors"""
@@ -11,7 +11,8 @@ from ..models.common_models import (
     VehicleKiloMeterLog,
     PaymentMethod,
 )
-from erp_app.models import Mcc, Mpp
+from erp_app.models import Mcc
+from erp_app.reference_data import reference_data
 from ..models.models import MembersMasterCopy
 
 
@@ -125,12 +126,12 @@ class MembersMasterListSerializer(serializers.ModelSerializer):
         ]
 
     def get_mcc_name(self, obj):
-        mcc = Mcc.objects.get(mcc_code=obj.mcc_code)
-        return f"{mcc.mcc_name} ({mcc.mcc_ex_code})"
+        mcc = reference_data.get("mcc", obj.mcc_code)
+        return f"{mcc['mcc_name']} ({mcc['mcc_ex_code']})" if mcc else None
 
     def get_mpp_name(self, obj):
-        mpp = Mpp.objects.get(mpp_code=obj.mpp_code)
-        return f"{mpp.mpp_name} ({mpp.mpp_ex_code})"
+        mpp = reference_data.get("mpp", obj.mpp_code)
+        return f"{mpp['mpp_name']} ({mpp['mpp_ex_code']})" if mpp else None
 
 
 class MembersMasterDetailSerializer(serializers.ModelSerializer):
@@ -173,12 +174,12 @@ class MembersMasterDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_mcc_name(self, obj):
-        mcc = Mcc.objects.get(mcc_code=obj.mcc_code)
-        return f"{mcc.mcc_name} ({mcc.mcc_ex_code})"
+        mcc = reference_data.get("mcc", obj.mcc_code)
+        return f"{mcc['mcc_name']} ({mcc['mcc_ex_code']})" if mcc else None
 
     def get_mpp_name(self, obj):
-        mpp = Mpp.objects.get(mpp_code=obj.mpp_code)
-        return f"{mpp.mpp_name} ({mpp.mpp_ex_code})"
+        mpp = reference_data.get("mpp", obj.mpp_code)
+        return f"{mpp['mpp_name']} ({mpp['mpp_ex_code']})" if mpp else None
 
 
 class MccSerializer(serializers.ModelSerializer):
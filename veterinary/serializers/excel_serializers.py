@@ -29,6 +29,7 @@ class ExcelUploadSessionListSerializer(serializers.ModelSerializer):
             "processed_at",
             "processed",
             "total_rows",
+            "processed_rows",
             "error_message",
         ]
         read_only_fields = fields
@@ -53,6 +54,7 @@ class ExcelUploadSessionDetailSerializer(serializers.ModelSerializer):
             "processed_at",
             "processed",
             "total_rows",
+            "processed_rows",
             "error_message",
             "sheets_data",  # heavy, keep only in detail
             "metadata",  # heavy, keep only in detail
@@ -67,6 +69,7 @@ class ExcelUploadSessionDetailSerializer(serializers.ModelSerializer):
             "processed_at",
             "processed",
             "total_rows",
+            "processed_rows",
             "error_message",
             "sheets_data",
         ]
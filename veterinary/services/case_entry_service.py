@@ -1,6 +1,6 @@
-from django.db.transaction import on_commit
+from django.db import transaction
 from ..models.case_models import CaseReceiverLog
-from notifications.notification_service import NotificationServices
+from notifications.outbox import enqueue_notification
 from facilitator.models.user_profile_model import UserLocation
 
 
@@ -12,9 +12,12 @@ class CaseEntryService:
         Handles:
         - CaseReceiverLog creation
         - MCC → notification fanout
+
+        Notifications are recorded in the notification outbox in the same
+        transaction as the receiver log and sent by the relay after commit.
         """
 
-        def _after_commit():
+        with transaction.atomic():
 
             # -----------------------------------------
             # 1) Create CaseReceiverLog
@@ -45,25 +48,24 @@ class CaseEntryService:
             # -----------------------------------------
             # 3) Find all users in that MCC
             # -----------------------------------------
-            users_in_same_mcc = (
+            users_in_same_mcc = list(
                 UserLocation.objects.filter(mcc_code=mcc_code)
-                .select_related("user")
                 .values_list("user", flat=True)
+                .order_by()
+                .distinct()
             )
+            if not users_in_same_mcc:
+                return
 
             # -----------------------------------------
-            # 4) Send notifications
+            # 4) Record one outbox event for the whole fanout
             # -----------------------------------------
-            NotificationServices().create_bulk_notifications(
-                template_name="case_entry_update_en",
+            enqueue_notification(
+                "case_entry_update_en",
                 recipients=users_in_same_mcc,
-                app_host="pes",
-                context_factory=lambda recipient, index: {
+                context={
                     "case": case_entry,
                     "site_name": "Kashee Pasu Sewa",
-                    "recipient_id": recipient,
                 },
+                recipient_key="recipient_id",
             )
-
-        # Ensure logic runs only after transaction commits
-        on_commit(_after_commit)
@@ -0,0 +1,516 @@
+# services/cattle_import_service.py
+"""
+High-throughput import of cattle sheets laid out like ``CombinedCattleResource``.
+
+The sheet is cleaned and validated column by column in pandas, every foreign
+key is resolved with one ``IN`` lookup per referenced model, and cattle, tags
+and current status logs are written with ``bulk_create``/``bulk_update`` per
+chunk. As with the resource's dry run, nothing is written when any row fails
+validation, and errors are reported per row as ``"Row <n>: <message>"``.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+import pandas as pd
+from django.db.models import Count
+from django.utils import timezone
+
+from ..models.models import (
+    Cattle,
+    CattleStatusLog,
+    CattleStatusType,
+    CattleTagging,
+    MembersMasterCopy,
+    SpeciesBreed,
+    TagActionChoices,
+    TagLocationChoices,
+    TagMethodChoices,
+)
+
+# Sheet column -> cleaned column.
+COLUMNS = {
+    "Cattle Code": "cattle_code",
+    "Cattle Name": "name",
+    "Member Code": "owner",
+    "Breed": "breed",
+    "Gender": "gender",
+    "Age (Month)": "age",
+    "Age (Year)": "age_year",
+    "Animal Status": "current_status",
+    "Lactation Count": "no_of_calving",
+    "Is Active": "is_active",
+    "Is Alive": "is_alive",
+    "Animal Tag No": "tag_number",
+    "Virtual Tag No": "virtual_tag_no",
+    "TAG Method": "tag_method",
+    "TAG Location": "tag_location",
+    "Pregnant": "pregnancy_status",
+    "Milk Production (LPD)": "milk_production_lpd",
+}
+
+CATTLE_FIELDS = (
+    "name", "owner", "breed", "gender", "age", "age_year",
+    "no_of_calving", "is_active", "is_alive", "current_status",
+)
+TEXT_COLUMNS = (
+    "cattle_code", "name", "owner", "breed", "gender", "current_status",
+    "tag_number", "virtual_tag_no", "tag_method", "tag_location",
+)
+INTEGER_COLUMNS = ("age", "age_year", "no_of_calving")
+
+# SmartBooleanWidget for the cattle flags; _handle_status for "Pregnant".
+TRUE_VALUES = {"yes", "y", "1", "true", "t", "on", "active"}
+PREGNANT_VALUES = {"yes", "y", "1", "true", "t", "on"}
+
+# Keeps IN lookups well under the database parameter limits.
+LOOKUP_CHUNK = 5000
+
+
+def _as_text(value):
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() or None
+
+
+def clean_text(series: pd.Series) -> pd.Series:
+    """Strip strings, keep codes read as numbers without a trailing ``.0``."""
+    return series.astype(object).map(_as_text)
+
+
+def clean_boolean(series: pd.Series, true_values=TRUE_VALUES) -> pd.Series:
+    numbers = pd.to_numeric(series, errors="coerce")
+    words = series.astype("string").str.strip().str.lower()
+    return (words.isin(true_values) | (numbers.notna() & (numbers != 0))).astype(bool)
+
+
+def _chunks(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def lookup(model, field, values, queryset=None):
+    """
+    ``value -> instance`` for ``model.<field>``. Values matching several rows
+    map to ``None`` (the widget's ``get`` would fail on them too).
+    """
+    queryset = model.objects.all() if queryset is None else queryset
+    found = {}
+    for chunk in _chunks({v for v in values if v is not None}, LOOKUP_CHUNK):
+        for obj in queryset.filter(**{f"{field}__in": chunk}):
+            key = getattr(obj, field)
+            found[key] = None if key in found else obj
+    return found
+
+
+class CattleBulkImporter:
+    """Validate a cattle sheet as a whole, then write it in chunks."""
+
+    batch_size = 1000
+
+    def __init__(self, batch_size=None, on_progress=None):
+        self.batch_size = batch_size or self.batch_size
+        self.on_progress = on_progress
+        self.errors = defaultdict(list)
+        self.present = set()
+        self.status_types = {}
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def run(self, df: pd.DataFrame) -> dict:
+        df = self.clean(df)
+        self.resolve(df)
+
+        if self.errors:
+            return self._result(df, errors=self.error_messages())
+
+        created = updated = skipped = 0
+        for start in range(0, len(df), self.batch_size):
+            counts = self.write(df.iloc[start:start + self.batch_size])
+            created += counts["new"]
+            updated += counts["update"]
+            skipped += counts["skip"]
+            if self.on_progress:
+                self.on_progress(min(start + self.batch_size, len(df)))
+
+        return self._result(
+            df, created=created, updated=updated, skipped=skipped, success=True
+        )
+
+    def error_messages(self):
+        return [
+            f"Row {row_number}: {message}"
+            for row_number in sorted(self.errors)
+            for message in self.errors[row_number]
+        ]
+
+    # ---------------------------
+    # Cleaning and validation
+    # ---------------------------
+    def _flag(self, df, mask, message):
+        for i, row_number in df.loc[mask, "row_number"].items():
+            self.errors[row_number].append(message(i) if callable(message) else message)
+
+    def clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.rename(columns=lambda c: COLUMNS.get(str(c).strip(), c))
+        df = df.reset_index(drop=True)
+        df["row_number"] = df.index + 1
+        self.present = {column for column in COLUMNS.values() if column in df.columns}
+        for column in COLUMNS.values():
+            if column not in df.columns:
+                df[column] = None
+
+        for column in TEXT_COLUMNS:
+            df[column] = clean_text(df[column])
+
+        self._flag(df, df["owner"].isna(), "Member Code is required")
+
+        raw = {column: df[column] for column in INTEGER_COLUMNS}
+        for column in INTEGER_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+        self._flag(df, raw["age"].isna(), "Age is required")
+        self._flag(df, raw["age"].notna() & df["age"].isna(), "Invalid age value")
+        self._flag(df, df["age"] < 0, "Age cannot be negative")
+        for column, label in (("age_year", "Age (Year)"), ("no_of_calving", "Lactation Count")):
+            invalid = raw[column].notna() & (df[column].isna() | (df[column] < 0))
+            self._flag(
+                df, invalid, lambda i, c=column, l=label: f"Invalid {l}: {raw[c][i]}"
+            )
+
+        for column in ("is_active", "is_alive"):
+            df[column] = clean_boolean(df[column])
+        df["pregnancy_status"] = clean_boolean(df["pregnancy_status"], PREGNANT_VALUES)
+        df["milk_production_lpd"] = pd.to_numeric(
+            df["milk_production_lpd"], errors="coerce"
+        ).fillna(0)
+
+        df["tag_method"] = df["tag_method"].fillna(TagMethodChoices.MANUAL)
+        df["tag_location"] = df["tag_location"].fillna(TagLocationChoices.LEFT_EAR)
+
+        coded = df["cattle_code"].notna()
+        self._flag(
+            df,
+            coded & df["cattle_code"].duplicated(keep=False),
+            lambda i: f"Cattle Code {df.at[i, 'cattle_code']} appears more than once",
+        )
+        tagged = df["tag_number"].notna()
+        self._flag(
+            df,
+            tagged & df["tag_number"].duplicated(keep=False),
+            lambda i: f"Animal Tag No {df.at[i, 'tag_number']} appears more than once",
+        )
+        return df
+
+    def resolve(self, df: pd.DataFrame):
+        """Attach model instances for every reference, one lookup per model."""
+        for column, model, field in (
+            ("owner", MembersMasterCopy, "member_tr_code"),
+            ("breed", SpeciesBreed, "breed"),
+            ("current_status", CattleStatusType, "code"),
+        ):
+            found = lookup(model, field, df[column])
+            df[f"{column}_obj"] = df[column].map(lambda v, f=found: f.get(v))
+            self._flag(
+                df,
+                df[column].notna() & df[f"{column}_obj"].isna(),
+                lambda i, c=column, m=model: f"Invalid {m.__name__}: {df.at[i, c]}",
+            )
+
+        codes = {
+            code.strip()
+            for value in df["current_status"].dropna()
+            for code in value.split("|")
+            if code.strip()
+        }
+        self.status_types = lookup(CattleStatusType, "code", codes)
+
+        existing = lookup(
+            Cattle,
+            "cattle_code",
+            df["cattle_code"],
+            queryset=Cattle.objects.select_related("owner"),
+        )
+        df["cattle_obj"] = df["cattle_code"].map(existing.get)
+        self._assign_codes(df)
+        self._check_tags(df)
+
+    def _assign_codes(self, df):
+        """
+        Give new cattle without a code the one ``Cattle.save`` would generate,
+        checking collisions against the database and earlier rows at once.
+        """
+        pending = df.index[df["cattle_code"].isna() & df["owner_obj"].notna()]
+        candidates = {}
+        for i in pending:
+            cattle = self._new_cattle(df.loc[i])
+            base = cattle.base_cattle_code()
+            candidates[i] = (base, cattle.disambiguated_cattle_code(base))
+
+        taken = set(df["cattle_code"].dropna())
+        taken.update(
+            lookup(Cattle, "cattle_code", {c for pair in candidates.values() for c in pair})
+        )
+        for i, (base, fallback) in candidates.items():
+            code = base if base not in taken else fallback
+            if code in taken:
+                self.errors[df.at[i, "row_number"]].append(
+                    f"Cattle code {code} already exists"
+                )
+                continue
+            taken.add(code)
+            df.at[i, "cattle_code"] = code
+
+    def _check_tags(self, df):
+        tag_numbers = set(df["tag_number"].dropna())
+        active = {
+            tag.tag_number: tag.cattle.cattle_code
+            for chunk in _chunks(tag_numbers, LOOKUP_CHUNK)
+            for tag in CattleTagging.objects.filter(
+                tag_number__in=chunk, is_active=True
+            ).select_related("cattle").only("tag_number", "cattle__cattle_code")
+        }
+        self._flag(
+            df,
+            df["tag_number"].map(active).notna()
+            & (df["tag_number"].map(active) != df["cattle_code"]),
+            lambda i: f"Animal Tag No {df.at[i, 'tag_number']} is already active on another cattle",
+        )
+
+        virtual = lookup(CattleTagging, "virtual_tag_no", df["virtual_tag_no"])
+        owners = df["virtual_tag_no"].map(
+            {k: v.cattle_id if v else None for k, v in virtual.items()}
+        )
+        own = df["cattle_obj"].map(lambda c: c.pk if c else None)
+        self._flag(
+            df,
+            df["virtual_tag_no"].isin(virtual.keys()) & (owners != own),
+            lambda i: f"Virtual Tag No {df.at[i, 'virtual_tag_no']} is already in use",
+        )
+
+    # ---------------------------
+    # Writing
+    # ---------------------------
+    def _new_cattle(self, row):
+        cattle = Cattle(cattle_code=row["cattle_code"])
+        # Columns missing from the sheet keep the model defaults.
+        self._apply(cattle, row, [f for f in CATTLE_FIELDS if f in self.present])
+        if not cattle.name:
+            owner_name = cattle.owner.member_name if cattle.owner else "Unknown"
+            cattle.name = f"{owner_name} cattle"
+        return cattle
+
+    def _apply(self, cattle, row, fields):
+        changed = []
+        for field in fields:
+            if field in ("owner", "breed", "current_status"):
+                value = row[f"{field}_obj"]
+                current = getattr(cattle, f"{field}_id")
+                new = value.pk if value is not None else None
+            else:
+                value = row[field]
+                if field in INTEGER_COLUMNS:
+                    value = None if pd.isna(value) else int(value)
+                elif field == "gender" and value is None:
+                    value = cattle.gender
+                current, new = getattr(cattle, field), value
+            if current != new:
+                setattr(cattle, field, value)
+                changed.append(field)
+        return changed
+
+    def write(self, chunk: pd.DataFrame) -> dict:
+        counts = {"new": 0, "update": 0, "skip": 0}
+        now = timezone.now()
+        created, updated, saved = [], [], []
+        update_fields = set()
+
+        for _, row in chunk.iterrows():
+            cattle = row["cattle_obj"]
+            if cattle is None:
+                cattle = self._new_cattle(row)
+                created.append(cattle)
+            else:
+                # skip_row: sold or dead cattle are left alone.
+                if cattle.is_sold or not cattle.is_alive:
+                    counts["skip"] += 1
+                    continue
+                changed = self._apply(
+                    cattle, row, [f for f in CATTLE_FIELDS if f in self.present]
+                )
+                if not changed:
+                    counts["skip"] += 1
+                    continue
+                cattle.updated_at = now
+                update_fields.update(changed)
+                updated.append(cattle)
+            saved.append((cattle, row))
+
+        Cattle.objects.bulk_create(created, batch_size=self.batch_size)
+        if updated:
+            Cattle.objects.bulk_update(
+                updated, [*update_fields, "updated_at"], batch_size=self.batch_size
+            )
+        counts["new"], counts["update"] = len(created), len(updated)
+
+        self._write_tags(saved, now)
+        self._write_statuses(saved, now)
+        return counts
+
+    def _write_tags(self, saved, now):
+        rows = [
+            (cattle, row)
+            for cattle, row in saved
+            if row["tag_number"] is not None or row["virtual_tag_no"] is not None
+        ]
+        if not rows:
+            return
+        active = {
+            tag.cattle_id: tag
+            for tag in CattleTagging.objects.filter(
+                cattle_id__in=[cattle.pk for cattle, _ in rows], is_active=True
+            )
+        }
+
+        changed, created = [], []
+        for cattle, row in rows:
+            tag = active.get(cattle.pk)
+            if tag is None:
+                created.append(
+                    CattleTagging(
+                        cattle=cattle,
+                        tag_number=row["tag_number"] or f"AUTO-{cattle.cattle_code}",
+                        virtual_tag_no=row["virtual_tag_no"],
+                        tag_method=row["tag_method"],
+                        tag_location=row["tag_location"],
+                        tag_action=TagActionChoices.CREATED,
+                        is_active=True,
+                    )
+                )
+                continue
+            dirty = False
+            for field in ("tag_number", "virtual_tag_no", "tag_method", "tag_location"):
+                if row[field] is not None and getattr(tag, field) != row[field]:
+                    setattr(tag, field, row[field])
+                    dirty = True
+            if dirty:
+                tag.updated_at = now
+                changed.append(tag)
+
+        self._assign_virtual_tags([tag for tag in created if not tag.virtual_tag_no])
+        CattleTagging.objects.bulk_create(created, batch_size=self.batch_size)
+        if changed:
+            CattleTagging.objects.bulk_update(
+                changed,
+                ["tag_number", "virtual_tag_no", "tag_method", "tag_location", "updated_at"],
+                batch_size=self.batch_size,
+            )
+
+    def _assign_virtual_tags(self, tags):
+        """``CattleTagging._generate_virtual_tag_no`` for a batch of new tags."""
+        if not tags:
+            return
+        # Every imported cattle has an owner (Member Code is required).
+        sequence = dict(
+            CattleTagging.objects.filter(
+                cattle__owner_id__in={tag.cattle.owner_id for tag in tags}
+            )
+            .values("cattle__owner_id")
+            .annotate(total=Count("pk"))
+            .values_list("cattle__owner_id", "total")
+        )
+
+        def candidate(tag):
+            owner = tag.cattle.owner
+            sequence[owner.pk] = sequence.get(owner.pk, 0) + 1
+            cattle_code = tag.cattle.cattle_code.split("-")[-1]
+            return f"{owner.member_tr_code}-{cattle_code}-{sequence[owner.pk]:03d}"
+
+        pending = tags
+        while pending:
+            for tag in pending:
+                tag.virtual_tag_no = candidate(tag)
+            taken = set(
+                lookup(CattleTagging, "virtual_tag_no", [t.virtual_tag_no for t in pending])
+            )
+            seen, clashes = set(), []
+            for tag in pending:
+                if tag.virtual_tag_no in taken or tag.virtual_tag_no in seen:
+                    clashes.append(tag)
+                seen.add(tag.virtual_tag_no)
+            pending = clashes
+
+    def _write_statuses(self, saved, now):
+        if not saved:
+            return
+        today = now.date()
+        current = {}
+        for log in CattleStatusLog.objects.filter(
+            cattle_id__in=[cattle.pk for cattle, _ in saved], is_current=True
+        ):
+            current.setdefault(log.cattle_id, log)
+
+        changed, created, with_codes = [], [], []
+        for cattle, row in saved:
+            pregnant = bool(row["pregnancy_status"])
+            milk = Decimal(str(row["milk_production_lpd"]))
+            log = current.get(cattle.pk)
+            if log is None:
+                log = CattleStatusLog(
+                    cattle=cattle,
+                    is_current=True,
+                    from_date=today,
+                    pregnancy_status=pregnant,
+                    milk_production_lpd=milk,
+                    notes=f"Imported on {today}",
+                )
+                created.append(log)
+            else:
+                log.pregnancy_status = pregnant
+                log.milk_production_lpd = milk
+                log.updated_at = now
+                changed.append(log)
+
+            codes = [
+                self.status_types.get(code.strip())
+                for code in (row["current_status"] or "").split("|")
+                if code.strip()
+            ]
+            if codes:
+                with_codes.append((log, [s for s in codes if s is not None]))
+
+        CattleStatusLog.objects.bulk_create(created, batch_size=self.batch_size)
+        if changed:
+            CattleStatusLog.objects.bulk_update(
+                changed,
+                ["pregnancy_status", "milk_production_lpd", "updated_at"],
+                batch_size=self.batch_size,
+            )
+
+        if with_codes:
+            through = CattleStatusLog.statuses.through
+            through.objects.filter(
+                cattlestatuslog_id__in=[log.pk for log, _ in with_codes]
+            ).delete()
+            through.objects.bulk_create(
+                [
+                    through(cattlestatuslog_id=log.pk, cattlestatustype_id=status.pk)
+                    for log, statuses in with_codes
+                    for status in {s.pk: s for s in statuses}.values()
+                ],
+                batch_size=self.batch_size,
+            )
+
+    def _result(self, df, created=0, updated=0, skipped=0, errors=(), success=False):
+        return {
+            "created": created,
+            "updated": updated,
+            "skipped": skipped,
+            "deleted": 0,
+            "errors": list(errors),
+            "total_rows": len(df),
+            "success": success,
+            "totals": {"new": created, "update": updated, "skip": skipped},
+        }
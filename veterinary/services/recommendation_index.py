@@ -0,0 +1,219 @@
+import heapq
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from ..choices.choices import DiseaseSeverity
+from ..models.stock_models import Disease, Medicine, MedicineCategory, Symptoms
+
+VERSION_CACHE_KEY = "veterinary:recommendation_index:version"
+
+SEVERITY_WEIGHT = {
+    DiseaseSeverity.MILD: 1,
+    DiseaseSeverity.MODERATE: 2,
+    DiseaseSeverity.SEVERE: 3,
+    DiseaseSeverity.CRITICAL: 4,
+}
+
+
+@dataclass(frozen=True)
+class IndexedDisease:
+    position: int
+    symptom_count: int
+    severity_weight: int
+    disease: dict
+    medicines: tuple
+
+
+class RecommendationIndex:
+    """
+    Immutable snapshot of the symptom -> disease mapping.
+
+    ``postings`` maps a symptom id to the ids of every disease showing it, and
+    each ``IndexedDisease`` carries its symptom-set size and the serialized
+    disease and medicine payloads, so ranking is pure dictionary work.
+    """
+
+    def __init__(self, diseases, postings):
+        self.diseases = diseases
+        self.postings = postings
+
+    @classmethod
+    def build(cls):
+        """Load the catalogue in four queries, independent of its size."""
+        disease_symptoms = defaultdict(set)
+        postings = defaultdict(list)
+        for disease_id, symptom_id in Disease.symptoms.through.objects.values_list(
+            "disease_id", "symptoms_id"
+        ):
+            disease_symptoms[disease_id].add(symptom_id)
+            postings[symptom_id].append(disease_id)
+
+        medicine_rows = {
+            row["id"]: {
+                "id": row["id"],
+                "name": row["medicine"],
+                "strength": row["strength"],
+                "category": row["category__category"],
+                "packaging": row["packaging"],
+                "expiry_date": row["expiry_date"],
+            }
+            for row in Medicine.objects.order_by("id").values(
+                "id",
+                "medicine",
+                "strength",
+                "category__category",
+                "packaging",
+                "expiry_date",
+            )
+        }
+        disease_medicines = defaultdict(list)
+        for disease_id, medicine_id in Medicine.diseases.through.objects.order_by(
+            "medicine_id"
+        ).values_list("disease_id", "medicine_id"):
+            disease_medicines[disease_id].append(medicine_rows[medicine_id])
+
+        diseases = {}
+        for position, row in enumerate(
+            Disease.objects.values(
+                "id", "disease", "description", "treatment", "severity"
+            )
+        ):
+            diseases[row["id"]] = IndexedDisease(
+                position=position,
+                symptom_count=len(disease_symptoms[row["id"]]),
+                severity_weight=SEVERITY_WEIGHT.get(row["severity"], 1),
+                disease={
+                    "id": row["id"],
+                    "name": row["disease"],
+                    "description": row["description"],
+                    "treatment": row["treatment"],
+                    "severity": row["severity"],
+                },
+                medicines=tuple(disease_medicines[row["id"]]),
+            )
+
+        return cls(
+            diseases,
+            {symptom_id: tuple(ids) for symptom_id, ids in postings.items()},
+        )
+
+    def rank(self, symptom_ids, limit=None):
+        """
+        Diseases sharing at least one of ``symptom_ids``, best first.
+
+        Score is ``matched / symptom_count * severity weight``; ties keep the
+        catalogue's name order. Only the postings of the requested symptoms
+        are touched, and ``limit`` selects the top-k with a heap.
+        """
+        matched = defaultdict(int)
+        for symptom_id in set(symptom_ids):
+            for disease_id in self.postings.get(symptom_id, ()):
+                matched[disease_id] += 1
+
+        scored = []
+        for disease_id, hits in matched.items():
+            entry = self.diseases.get(disease_id)
+            if entry is None:
+                continue
+            match_score = hits / entry.symptom_count
+            scored.append(
+                (match_score * entry.severity_weight, -entry.position, match_score, entry)
+            )
+
+        if limit is None:
+            scored.sort(key=lambda item: item[:2], reverse=True)
+        else:
+            scored = heapq.nlargest(limit, scored, key=lambda item: item[:2])
+
+        return [
+            {
+                "disease": {
+                    **entry.disease,
+                    "match_score": round(match_score, 2),
+                    "composite_score": round(composite_score, 2),
+                },
+                "medicines": [dict(medicine) for medicine in entry.medicines],
+            }
+            for composite_score, _, match_score, entry in scored
+        ]
+
+
+class RecommendationIndexCache:
+    """
+    Process-local holder of the current ``RecommendationIndex``.
+
+    Writes to the catalogue bump a version counter in the shared cache once
+    their transaction commits. Each process compares its snapshot with that
+    counter at most every ``RECOMMENDATION_INDEX_CHECK_SECONDS``, so the hot
+    path is a clock read and a dictionary walk; the database is only read
+    when a rebuild is due.
+    """
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> RecommendationIndex:
+        now = time.monotonic()
+        interval = getattr(settings, "RECOMMENDATION_INDEX_CHECK_SECONDS", 5)
+        if self._index is not None and now - self._checked_at < interval:
+            return self._index
+
+        with self._lock:
+            version = cache.get(VERSION_CACHE_KEY, 0)
+            if self._index is None or version != self._version:
+                self._index = RecommendationIndex.build()
+                self._version = version
+            self._checked_at = now
+            return self._index
+
+    def invalidate(self):
+        """Drop the local snapshot and tell other processes to rebuild theirs."""
+        with self._lock:
+            self._index = None
+        try:
+            cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+
+
+recommendation_index = RecommendationIndexCache()
+
+
+def _invalidate_on_commit(**kwargs):
+    # Rebuilding before commit would snapshot the old rows under the new version.
+    transaction.on_commit(recommendation_index.invalidate)
+
+
+def _invalidate_on_m2m_change(action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidate_on_commit()
+
+
+def connect_index_signals():
+    for model in (Disease, Symptoms, Medicine, MedicineCategory):
+        post_save.connect(
+            _invalidate_on_commit,
+            sender=model,
+            dispatch_uid=f"recommendation_index_save_{model.__name__}",
+        )
+        post_delete.connect(
+            _invalidate_on_commit,
+            sender=model,
+            dispatch_uid=f"recommendation_index_delete_{model.__name__}",
+        )
+    for through in (Disease.symptoms.through, Medicine.diseases.through):
+        m2m_changed.connect(
+            _invalidate_on_m2m_change,
+            sender=through,
+            dispatch_uid=f"recommendation_index_m2m_{through.__name__}",
+        )
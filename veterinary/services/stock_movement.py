@@ -0,0 +1,285 @@
+"""
+Batched stock movements against ``MedicineStock``.
+
+Each movement is applied as one conditional UPDATE (e.g. ``reserved_quantity
++ qty`` only ``WHERE total_quantity - reserved_quantity >= qty``), so the
+check and the write happen in the same statement and concurrent batches can
+never over-reserve or over-consume a batch. A movement that does not match
+its condition simply fails; the others in the batch still apply.
+
+A batch runs in one transaction:
+
+1. one query loads the stocks the batch touches;
+2. transfer targets are resolved, and missing target rows created, before
+   any row is locked;
+3. one ``SELECT ... FOR UPDATE`` locks every source and target row in id
+   order, so two batches always lock rows in the same order;
+4. debits are applied, then transfer credits; targets created in step 2
+   that received no credit are deleted again;
+5. one ``bulk_create`` writes a ``MedicineStockAudit`` row per applied
+   movement.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from ..choices.choices import TransactionTypeChoices
+from ..models.stock_models import Medicine, MedicineStock, MedicineStockAudit
+
+logger = logging.getLogger(__name__)
+
+RESERVE = "reserve"
+CONSUME = "consume"
+RELEASE = "release"
+TRANSFER = "transfer"
+KINDS = (RESERVE, CONSUME, RELEASE, TRANSFER)
+
+# kind -> (condition on the row, field updates, error when it does not match)
+DEBITS = {
+    RESERVE: (
+        lambda qty: {"total_quantity__gte": F("reserved_quantity") + qty},
+        lambda qty: {"reserved_quantity": F("reserved_quantity") + qty},
+        "Not enough available stock to reserve.",
+    ),
+    RELEASE: (
+        lambda qty: {"reserved_quantity__gte": qty},
+        lambda qty: {"reserved_quantity": F("reserved_quantity") - qty},
+        "Cannot release more than reserved quantity.",
+    ),
+    CONSUME: (
+        lambda qty: {"reserved_quantity__gte": qty},
+        lambda qty: {
+            "total_quantity": F("total_quantity") - qty,
+            "reserved_quantity": F("reserved_quantity") - qty,
+        },
+        "Cannot consume more than reserved quantity.",
+    ),
+    TRANSFER: (
+        lambda qty: {"total_quantity__gte": F("reserved_quantity") + qty},
+        lambda qty: {"total_quantity": F("total_quantity") - qty},
+        "Not enough available stock to transfer.",
+    ),
+}
+
+
+@dataclass
+class StockMovement:
+    kind: str
+    stock_id: int
+    quantity: Decimal
+    target_location_id: Optional[int] = None
+    description: str = ""
+
+
+@dataclass
+class MovementResult:
+    movement: StockMovement
+    success: bool = False
+    error: Optional[str] = None
+    target_stock_id: Optional[int] = None
+
+
+@dataclass
+class MovementBatch:
+    results: List[MovementResult] = field(default_factory=list)
+
+    @property
+    def successful(self) -> List[MovementResult]:
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[MovementResult]:
+        return [r for r in self.results if not r.success]
+
+
+def _validate(movement: StockMovement) -> Optional[str]:
+    if movement.kind not in KINDS:
+        return f"Unknown stock movement '{movement.kind}'."
+    try:
+        movement.stock_id = int(movement.stock_id)
+        movement.quantity = Decimal(str(movement.quantity))
+    except (InvalidOperation, TypeError, ValueError):
+        return "Stock id and amount must be numbers."
+    if movement.quantity <= 0:
+        return "Amount must be positive."
+    if movement.kind == TRANSFER:
+        try:
+            movement.target_location_id = int(movement.target_location_id)
+        except (TypeError, ValueError):
+            return "Transfer needs a target location."
+    return None
+
+
+def _target_key(source, movement) -> tuple:
+    return (source.medicine_id, source.batch_number, movement.target_location_id)
+
+
+def _target_stocks(stocks, transfers) -> Tuple[Dict[tuple, int], Set[int]]:
+    """
+    Stock ids of the transfer targets, keyed by (medicine, batch, location),
+    and the ids of the target rows created empty here. Rows are created in
+    key order so concurrent batches wait on each other's inserts in the same
+    order.
+    """
+    sources = {}
+    for result in transfers:
+        source = stocks[result.movement.stock_id]
+        sources.setdefault(_target_key(source, result.movement), source)
+
+    targets, created = {}, set()
+    for key in sorted(sources, key=lambda k: (k[0], k[1] or "", k[2])):
+        target, was_created = MedicineStock.objects.get_or_create(
+            medicine_id=key[0],
+            batch_number=key[1],
+            location_id=key[2],
+            defaults={
+                "expiry_date": sources[key].expiry_date,
+                "total_quantity": Decimal("0.00"),
+            },
+        )
+        targets[key] = target.pk
+        if was_created:
+            created.add(target.pk)
+    return targets, created
+
+
+def _lock(stock_ids) -> None:
+    """Lock the given stock rows in id order, in one query."""
+    list(
+        MedicineStock.objects.select_for_update()
+        .filter(pk__in=stock_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _audit_balances(medicine_ids) -> Dict[int, float]:
+    """Last audited balance per medicine, in one query."""
+    latest = MedicineStockAudit.objects.filter(medicine=OuterRef("pk")).order_by(
+        "-created_at", "-pk"
+    )
+    return {
+        medicine_id: balance or 0
+        for medicine_id, balance in Medicine.objects.filter(pk__in=medicine_ids)
+        .annotate(balance=Subquery(latest.values("balance_after")[:1]))
+        .values_list("pk", "balance")
+    }
+
+
+def _describe(movement: StockMovement, stock) -> str:
+    if movement.description:
+        return movement.description
+    batch = stock.batch_number or "N/A"
+    if movement.kind == TRANSFER:
+        return (
+            f"Transferred {movement.quantity} from location {stock.location_id} "
+            f"to location {movement.target_location_id} - Batch: {batch}"
+        )
+    return f"{movement.kind.capitalize()}d {movement.quantity} - Batch: {batch}"
+
+
+def _audits(stocks, applied, user) -> List[MedicineStockAudit]:
+    """
+    One audit row per applied movement. Only consumption changes a
+    medicine's overall stock; reservations, releases and transfers are
+    recorded as adjustments at the unchanged balance.
+    """
+    balances = _audit_balances({stocks[r.movement.stock_id].medicine_id for r in applied})
+    audits = []
+    for result in applied:
+        movement = result.movement
+        stock = stocks[movement.stock_id]
+        balance = balances.get(stock.medicine_id, 0)
+        if movement.kind == CONSUME:
+            balance -= float(movement.quantity)
+            transaction_type = TransactionTypeChoices.OUT
+        else:
+            transaction_type = TransactionTypeChoices.ADJUST
+        balances[stock.medicine_id] = balance
+        audits.append(
+            MedicineStockAudit(
+                medicine_id=stock.medicine_id,
+                transaction_type=transaction_type,
+                quantity=float(movement.quantity),
+                balance_after=balance,
+                description=_describe(movement, stock),
+                created_by=user,
+            )
+        )
+    return audits
+
+
+def apply_movements(movements: Iterable[StockMovement], user=None, audit=True) -> MovementBatch:
+    """
+    Apply a batch of reserve / consume / release / transfer movements and
+    report the outcome of each one, in submission order.
+    """
+    batch = MovementBatch(results=[MovementResult(movement=m) for m in movements])
+    for result in batch.results:
+        result.error = _validate(result.movement)
+    pending = [r for r in batch.results if r.error is None]
+    if not pending:
+        return batch
+
+    now = timezone.now()
+    with transaction.atomic():
+        stocks = MedicineStock.objects.only(
+            "id", "medicine_id", "location_id", "batch_number", "expiry_date"
+        ).in_bulk({r.movement.stock_id for r in pending})
+        for result in pending:
+            movement = result.movement
+            source = stocks.get(movement.stock_id)
+            if source is None:
+                result.error = "MedicineStock matching query does not exist."
+            elif movement.kind == TRANSFER and source.location_id == movement.target_location_id:
+                result.error = "Cannot transfer stock to its own location."
+
+        debits = sorted(
+            (r for r in pending if r.error is None), key=lambda r: r.movement.stock_id
+        )
+        transfers = [r for r in debits if r.movement.kind == TRANSFER]
+        targets, created = _target_stocks(stocks, transfers)
+        for result in transfers:
+            source = stocks[result.movement.stock_id]
+            result.target_stock_id = targets[_target_key(source, result.movement)]
+        _lock({r.movement.stock_id for r in debits} | set(targets.values()))
+
+        for result in debits:
+            movement = result.movement
+            condition, changes, error = DEBITS[movement.kind]
+            updated = MedicineStock.objects.filter(
+                pk=movement.stock_id, **condition(movement.quantity)
+            ).update(last_updated=now, updated_at=now, **changes(movement.quantity))
+            if updated:
+                result.success = True
+            else:
+                result.error = error
+
+        credits = [r for r in transfers if r.success]
+        for result in credits:
+            MedicineStock.objects.filter(pk=result.target_stock_id).update(
+                total_quantity=F("total_quantity") + result.movement.quantity,
+                last_updated=now,
+                updated_at=now,
+            )
+        for result in transfers:
+            if not result.success:
+                result.target_stock_id = None
+        unused = created - {r.target_stock_id for r in credits}
+        if unused:
+            MedicineStock.objects.filter(pk__in=unused).delete()
+
+        applied = [r for r in debits if r.success]
+        if audit and applied:
+            MedicineStockAudit.objects.bulk_create(_audits(stocks, applied, user))
+
+    logger.info(
+        f"Stock movements applied: {len(batch.successful)} ok, {len(batch.failed)} failed"
+    )
+    return batch
@@ -91,13 +91,15 @@ def check_expiring_medicines():
 
 
 @shared_task()
-def process_excel_import(session_id, temp_file_path, selected_sheets, target_model):
+def process_excel_import(session_id, temp_file_path, selected_sheets, target_model, bulk=True):
     session = None
     try:
         session = ExcelUploadSession.objects.get(id=session_id)
         session.status = ExcelUploadSession.Status.PROCESSING
         session.save(update_fields=["status"])
-        results = process_import_enhanced(temp_file_path, selected_sheets, target_model)
+        results = process_import_enhanced(
+            temp_file_path, selected_sheets, target_model, session=session, bulk=bulk
+        )
         has_errors = any(
             sheet_result.get("errors") for sheet_result in results.values()
         )
@@ -0,0 +1,129 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.admin import site
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from import_export.formats.base_formats import CSV
+from openpyxl import load_workbook
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..admin import CattleAdmin
+from ..models.models import Cattle, CattleStatusLog, CattleTagging
+from ..resources.cattle_resources import CombinedCattleResource
+from ..utils.export_util import stream_export
+from ..views.excel_import_view import ExcelExportView
+
+
+class CattleExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cattle = Cattle.objects.bulk_create(
+            Cattle(cattle_code=f"EXP-{i:03d}", age=30) for i in range(30)
+        )
+        CattleTagging.objects.bulk_create(
+            CattleTagging(cattle=obj, tag_number=f"T{i:03d}")
+            for i, obj in enumerate(cls.cattle)
+            if i % 2 == 0
+        )
+        CattleStatusLog.objects.bulk_create(
+            CattleStatusLog(
+                cattle=obj,
+                from_date=date.today(),
+                is_current=True,
+                pregnancy_status=True,
+                milk_production_lpd=Decimal("7.50"),
+            )
+            for obj in cls.cattle[:5]
+        )
+
+    def _export(self, chunk_size=None):
+        resource = CombinedCattleResource()
+        if chunk_size:
+            resource._meta.chunk_size = chunk_size
+            self.addCleanup(setattr, resource._meta, "chunk_size", 2000)
+        fileobj = io.BytesIO()
+        rows = stream_export(
+            resource, Cattle.objects.order_by("cattle_code"), fileobj, "csv"
+        )
+        fileobj.seek(0)
+        reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding="utf-8-sig"))
+        return rows, list(reader)
+
+    def test_related_values_are_exported(self):
+        rows, exported = self._export()
+
+        self.assertEqual(rows, 30)
+        self.assertEqual(exported[0]["Animal Tag No"], "T000")
+        self.assertEqual(exported[0]["Milk Production (LPD)"], "7.5")
+        self.assertEqual(exported[1]["Animal Tag No"], "")
+        self.assertEqual(exported[6]["Milk Production (LPD)"], "0")
+
+    def test_query_count_is_constant_per_chunk(self):
+        # One query for the cattle, then tags and status logs per chunk.
+        with self.assertNumQueries(1 + 2 * 3):
+            self._export(chunk_size=10)
+
+    def test_single_object_loads_lazily(self):
+        resource = CombinedCattleResource()
+        with self.assertNumQueries(2):
+            self.assertEqual(resource.dehydrate_tag_number(self.cattle[2]), "T002")
+            self.assertTrue(resource.dehydrate_pregnancy_status(self.cattle[2]))
+
+
+class CattleExportEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Cattle.objects.bulk_create(
+            Cattle(cattle_code=f"EXP-{i:03d}", age=30) for i in range(12)
+        )
+        cls.admin_user = get_user_model().objects.create_superuser(
+            username="exporter", password="secret", email="exporter@example.com"
+        )
+
+    def _read_csv(self, response):
+        body = b"".join(response.streaming_content)
+        return list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+
+    def test_admin_export_streams_csv(self):
+        request = RequestFactory().post("/")
+        request.user = self.admin_user
+        model_admin = CattleAdmin(Cattle, site)
+
+        with mock.patch.object(CombinedCattleResource, "export") as export:
+            response = model_admin._do_file_export(
+                CSV(), request, Cattle.objects.order_by("cattle_code")
+            )
+            rows = self._read_csv(response)
+
+        export.assert_not_called()
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[0]["Cattle Code"], "EXP-000")
+        self.assertIn(".csv", response["Content-Disposition"])
+
+    def test_export_view_writes_one_sheet_per_model(self):
+        request = APIRequestFactory().post(
+            "/",
+            {"config": {"filename": "cattle", "sheets": [{"model": "veterinary.Animal"}]}},
+            format="json",
+        )
+        force_authenticate(request, user=self.admin_user)
+
+        response = ExcelExportView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        sheet = workbook["veterinary.Animal"]
+        self.assertEqual(sheet.max_row, 13)
+        self.assertEqual(sheet["A2"].value, "EXP-000")
+
+    def test_export_view_rejects_unknown_models(self):
+        request = APIRequestFactory().post(
+            "/", {"config": {"sheets": [{"model": "auth.Group"}]}}, format="json"
+        )
+        force_authenticate(request, user=self.admin_user)
+
+        self.assertEqual(ExcelExportView.as_view()(request).status_code, 400)
@@ -1,8 +1,11 @@
 # tests.py - Unit tests
 from django.test import TestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from ..models.excel_model import ExcelUploadSession
+from ..models.models import Cattle, CattleStatusLog, CattleTagging, MembersMasterCopy
+from ..services.cattle_import_service import CattleBulkImporter
 from ..utils.exce_util import ExcelDataProcessor
 import pandas as pd
 import io
@@ -52,3 +55,53 @@ class ExcelUploadAPITests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.json()['success'])
         self.assertIn('sheets', response.json())
+
+
+class CattleBulkImporterTests(TestCase):
+    def setUp(self):
+        self.owner = MembersMasterCopy.objects.create(
+            member_code="0101000123", member_tr_code="123", member_name="Ram",
+            created_at=timezone.now(),
+        )
+
+    def _frame(self, rows):
+        columns = ['Member Code', 'Age (Month)', 'Animal Tag No', 'Pregnant',
+                   'Milk Production (LPD)']
+        return pd.DataFrame(rows, columns=columns)
+
+    def test_rows_are_written_in_bulk(self):
+        progress = []
+        importer = CattleBulkImporter(batch_size=2, on_progress=progress.append)
+        result = importer.run(self._frame([
+            [123.0, 24, 'T-1', 'yes', 6.5],
+            ['123', 30, None, 'no', None],
+            ['123', 36, 'T-3', None, 4],
+        ]))
+
+        self.assertTrue(result['success'], result['errors'])
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(Cattle.objects.filter(owner=self.owner).count(), 3)
+        self.assertEqual(
+            set(CattleTagging.objects.values_list('tag_number', flat=True)),
+            {'T-1', 'T-3'},
+        )
+        self.assertEqual(CattleStatusLog.objects.filter(is_current=True).count(), 3)
+        self.assertTrue(
+            CattleStatusLog.objects.get(cattle__cattle_tagged__tag_number='T-1').pregnancy_status
+        )
+
+    def test_invalid_rows_are_reported_and_nothing_is_written(self):
+        result = CattleBulkImporter().run(self._frame([
+            ['123', 24, 'T-1', None, None],
+            [None, 'abc', 'T-1', None, None],
+            ['999', -1, None, None, None],
+        ]))
+
+        self.assertFalse(result['success'])
+        self.assertIn('Row 2: Member Code is required', result['errors'])
+        self.assertIn('Row 2: Invalid age value', result['errors'])
+        self.assertIn('Row 1: Animal Tag No T-1 appears more than once', result['errors'])
+        self.assertIn('Row 3: Invalid MembersMasterCopy: 999', result['errors'])
+        self.assertIn('Row 3: Age cannot be negative', result['errors'])
+        self.assertFalse(Cattle.objects.exists())
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from facilitator.models.user_profile_model import UserProfile
+from ..permissions import UserHierarchyChecker
+
+User = get_user_model()
+
+
+class ManageableUsersTests(TestCase):
+    def setUp(self):
+        self.checker = UserHierarchyChecker()
+        self.head = User.objects.create_user(username="head")
+        parent = self.head
+        self.chain = []
+        for i in range(7):
+            user = User.objects.create_user(username=f"level-{i + 1}")
+            user.profile.reports_to = parent.profile
+            user.profile.save()
+            self.chain.append(user)
+            parent = user
+        for i in range(20):
+            User.objects.create_user(username=f"outsider-{i}")
+
+    def test_reportees_within_max_levels(self):
+        ids = set(self.checker.get_manageable_user_ids(self.head))
+
+        self.assertEqual(ids, {self.head.pk, *(u.pk for u in self.chain[:5])})
+
+    def test_query_count_does_not_grow_with_users(self):
+        head = User.objects.select_related("profile").get(pk=self.head.pk)
+        with self.assertNumQueries(1):
+            list(self.checker.get_manageable_user_ids(head))
+
+        for i in range(30):
+            User.objects.create_user(username=f"late-{i}")
+        with self.assertNumQueries(1):
+            list(self.checker.get_manageable_user_ids(head))
+
+    def test_staff_department_rules(self):
+        self.head.is_staff = True
+        self.head.save()
+        self.head.profile.department = UserProfile.Department.DOCTOR
+        self.head.profile.save()
+        vet = User.objects.create_user(username="vet")
+        vet.profile.department = UserProfile.Department.VETERINARIAN
+        vet.profile.save()
+
+        head = User.objects.select_related("profile").get(pk=self.head.pk)
+        self.assertTrue(self.checker.can_manage_user_id(head, vet.pk))
+        self.assertTrue(self.checker.is_supervisor_of(head, vet))
+        self.assertFalse(
+            self.checker.can_manage_user_id(
+                head, User.objects.get(username="outsider-0").pk
+            )
+        )
@@ -0,0 +1,64 @@
+from django.test import TestCase
+
+from ..choices.choices import DiseaseSeverity
+from ..models.stock_models import Disease, Medicine, Symptoms
+from ..services.recommendation import get_ranked_recommendations
+from ..services.recommendation_index import recommendation_index
+
+
+class RecommendationIndexTests(TestCase):
+    def setUp(self):
+        self.fever, self.cough, self.swelling, self.limp = (
+            Symptoms.objects.create(symptom=name)
+            for name in ("Fever", "Coughing", "Udder swelling", "Limping")
+        )
+        self.mastitis = Disease.objects.create(
+            disease="Mastitis", severity=DiseaseSeverity.SEVERE
+        )
+        self.mastitis.symptoms.set([self.fever, self.swelling])
+        self.cold = Disease.objects.create(disease="Cold", severity=DiseaseSeverity.MILD)
+        self.cold.symptoms.set([self.fever, self.cough])
+        self.fmd = Disease.objects.create(
+            disease="FMD", severity=DiseaseSeverity.CRITICAL
+        )
+        self.fmd.symptoms.set([self.fever, self.cough, self.swelling, self.limp])
+        self.oxy = Medicine.objects.create(medicine="Oxytetracycline", strength="200mg")
+        self.oxy.diseases.set([self.mastitis])
+        recommendation_index.invalidate()
+
+    def _ids(self, results):
+        return [r["disease"]["id"] for r in results]
+
+    def test_ranked_by_composite_score(self):
+        results = get_ranked_recommendations([self.fever.id, self.swelling.id])
+
+        # Mastitis 2/2 * 3, FMD 2/4 * 4, Cold 1/2 * 1.
+        self.assertEqual(
+            self._ids(results), [self.mastitis.id, self.fmd.id, self.cold.id]
+        )
+        self.assertEqual(results[0]["disease"]["match_score"], 1.0)
+        self.assertEqual(results[1]["disease"]["composite_score"], 2.0)
+        self.assertEqual(results[0]["medicines"][0]["name"], "Oxytetracycline")
+
+    def test_limit_returns_top_k(self):
+        # Mastitis 1/2 * 3 beats FMD 1/4 * 4 and Cold 1/2 * 1.
+        results = get_ranked_recommendations([self.fever.id], limit=1)
+        self.assertEqual(self._ids(results), [self.mastitis.id])
+
+    def test_unknown_symptoms_match_nothing(self):
+        self.assertEqual(get_ranked_recommendations([]), [])
+        self.assertEqual(get_ranked_recommendations([999999]), [])
+
+    def test_hot_path_skips_database(self):
+        get_ranked_recommendations([self.fever.id])
+        with self.assertNumQueries(0):
+            get_ranked_recommendations([self.cough.id, self.limp.id])
+
+    def test_catalogue_change_rebuilds_index(self):
+        get_ranked_recommendations([self.limp.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cold.symptoms.add(self.limp)
+
+        results = get_ranked_recommendations([self.limp.id])
+        self.assertEqual(self._ids(results), [self.fmd.id, self.cold.id])
@@ -0,0 +1,206 @@
+import threading
+from decimal import Decimal
+from unittest import skipIf
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from ..choices.choices import TransactionTypeChoices
+from ..models.stock_models import (
+    Location,
+    Medicine,
+    MedicineStock,
+    MedicineStockAudit,
+)
+from ..services.stock_movement import (
+    CONSUME,
+    RELEASE,
+    RESERVE,
+    TRANSFER,
+    StockMovement,
+    apply_movements,
+)
+
+
+def make_stock(total="100.00", reserved="0.00", batch="B001", code="STORE"):
+    location, _ = Location.objects.get_or_create(code=code, defaults={"name": code})
+    medicine, _ = Medicine.objects.get_or_create(medicine="Oxytetracycline", strength="200mg")
+    return MedicineStock.objects.create(
+        medicine=medicine,
+        location=location,
+        batch_number=batch,
+        total_quantity=Decimal(total),
+        reserved_quantity=Decimal(reserved),
+    )
+
+
+class StockMovementTests(TestCase):
+    def setUp(self):
+        self.stock = make_stock()
+
+    def _quantities(self, stock):
+        stock.refresh_from_db()
+        return stock.total_quantity, stock.reserved_quantity
+
+    def test_each_movement_reports_its_outcome(self):
+        batch = apply_movements(
+            [
+                StockMovement(RESERVE, self.stock.pk, 60),
+                StockMovement(RESERVE, self.stock.pk, 60),
+                StockMovement(RESERVE, 999999, 1),
+                StockMovement(RESERVE, self.stock.pk, -1),
+                StockMovement(CONSUME, self.stock.pk, 10),
+            ]
+        )
+
+        self.assertEqual([r.success for r in batch.results], [True, False, False, False, True])
+        self.assertEqual(batch.results[1].error, "Not enough available stock to reserve.")
+        self.assertEqual(batch.results[3].error, "Amount must be positive.")
+        self.assertEqual(self._quantities(self.stock), (Decimal("90"), Decimal("50")))
+
+    def test_release_and_consume_need_reserved_stock(self):
+        batch = apply_movements(
+            [
+                StockMovement(RELEASE, self.stock.pk, 1),
+                StockMovement(CONSUME, self.stock.pk, 1),
+                StockMovement(RESERVE, self.stock.pk, 5),
+                StockMovement(RELEASE, self.stock.pk, 2),
+            ]
+        )
+
+        self.assertEqual([r.success for r in batch.results], [False, False, True, True])
+        self.assertEqual(self._quantities(self.stock), (Decimal("100"), Decimal("3")))
+
+    def test_transfer_moves_available_stock_only(self):
+        apply_movements([StockMovement(RESERVE, self.stock.pk, 70)])
+        clinic = Location.objects.create(name="Clinic", code="CLINIC")
+
+        batch = apply_movements(
+            [
+                StockMovement(TRANSFER, self.stock.pk, 40, target_location_id=clinic.pk),
+                StockMovement(TRANSFER, self.stock.pk, 20, target_location_id=clinic.pk),
+            ]
+        )
+
+        self.assertEqual([r.success for r in batch.results], [False, True])
+        target = MedicineStock.objects.get(pk=batch.results[1].target_stock_id)
+        self.assertEqual((target.location_id, target.batch_number), (clinic.pk, "B001"))
+        self.assertEqual(target.total_quantity, Decimal("20"))
+        self.assertEqual(self._quantities(self.stock), (Decimal("80"), Decimal("70")))
+
+    def test_failed_transfer_leaves_no_empty_target(self):
+        clinic = Location.objects.create(name="Clinic", code="CLINIC")
+
+        batch = apply_movements(
+            [StockMovement(TRANSFER, self.stock.pk, 500, target_location_id=clinic.pk)]
+        )
+
+        self.assertEqual(batch.results[0].error, "Not enough available stock to transfer.")
+        self.assertIsNone(batch.results[0].target_stock_id)
+        self.assertFalse(MedicineStock.objects.filter(location=clinic).exists())
+
+    def test_audits_are_written_in_one_query(self):
+        other = make_stock(batch="B002")
+        movements = [
+            StockMovement(RESERVE, self.stock.pk, 10),
+            StockMovement(RESERVE, other.pk, 10),
+            StockMovement(CONSUME, self.stock.pk, 4),
+        ]
+
+        # Savepoint, stock lookup, row locks, three updates, balance lookup,
+        # bulk insert.
+        with self.assertNumQueries(9):
+            apply_movements(movements)
+
+        audits = list(MedicineStockAudit.objects.order_by("pk"))
+        self.assertEqual(
+            [a.transaction_type for a in audits],
+            [TransactionTypeChoices.ADJUST, TransactionTypeChoices.OUT, TransactionTypeChoices.ADJUST],
+        )
+        self.assertEqual(audits[1].balance_after, -4)
+
+    def test_bulk_reserve_stock_keeps_its_result_shape(self):
+        result = MedicineStock.objects.bulk_reserve_stock(
+            [
+                {"stock_id": self.stock.pk, "quantity": 30},
+                {"stock_id": self.stock.pk, "quantity": 80},
+            ]
+        )
+
+        self.assertEqual(result["successful"], [self.stock.pk])
+        self.assertEqual(
+            result["failed"],
+            [{"stock_id": self.stock.pk, "error": "Not enough available stock to reserve."}],
+        )
+
+
+@skipIf(connection.vendor == "sqlite", "needs a database with concurrent writers")
+class StockMovementConcurrencyTests(TransactionTestCase):
+    def test_concurrent_reservations_never_oversell(self):
+        stocks = [make_stock(total="50.00", batch=f"B{i}") for i in range(4)]
+        ids = [stock.pk for stock in stocks]
+        outcomes, lock = [], threading.Lock()
+
+        def worker(n):
+            try:
+                for _ in range(10):
+                    # Each worker touches the stocks in a different order.
+                    order = ids[n % 4:] + ids[: n % 4]
+                    batch = apply_movements(StockMovement(RESERVE, pk, 2) for pk in order)
+                    with lock:
+                        outcomes.extend(
+                            (r.movement.stock_id, r.success) for r in batch.results
+                        )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 8 workers * 10 batches * 2 units = 160 asked per stock, 50 available.
+        for stock in MedicineStock.objects.filter(pk__in=ids):
+            granted = sum(1 for pk, ok in outcomes if pk == stock.pk and ok)
+            self.assertEqual(granted, 25)
+            self.assertEqual(stock.reserved_quantity, Decimal("50"))
+        self.assertEqual(MedicineStockAudit.objects.count(), 100)
+
+    def test_crossing_transfers_do_not_deadlock(self):
+        store = make_stock(code="STORE")
+        clinic = make_stock(code="CLINIC")
+        errors, outcomes, lock = [], [], threading.Lock()
+
+        def worker(n):
+            # Half the workers move stock one way, half the other way.
+            source, target = (store, clinic) if n % 2 else (clinic, store)
+            try:
+                for _ in range(10):
+                    batch = apply_movements(
+                        [
+                            StockMovement(
+                                TRANSFER, source.pk, 1, target_location_id=target.location_id
+                            )
+                        ]
+                    )
+                    with lock:
+                        outcomes.extend(r.success for r in batch.results)
+            except Exception as exc:
+                with lock:
+                    errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(outcomes, [True] * 80)
+        for stock in (store, clinic):
+            stock.refresh_from_db()
+            self.assertEqual(stock.total_quantity, Decimal("100"))
+        self.assertEqual(MedicineStock.objects.count(), 2)
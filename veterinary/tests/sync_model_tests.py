@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models.models import MembersMasterCopy
+from ..utils.sync_model_util import sync_model
+
+
+class SyncModelTests(TestCase):
+    update_fields = ["member_name", "mobile_no", "is_active"]
+
+    def _source(self, count, name="Member"):
+        return [
+            SimpleNamespace(
+                member_code=f"M{i:04d}",
+                member_name=f"{name} {i}",
+                mobile_no=f"90000{i:05d}",
+                is_active=True,
+            )
+            for i in range(count)
+        ]
+
+    def _sync(self, source, **kwargs):
+        now = timezone.now()
+        return sync_model(
+            model=MembersMasterCopy,
+            source_objects=source,
+            key_fn=lambda m: m.member_code,
+            map_fn=lambda m: MembersMasterCopy(
+                member_code=m.member_code,
+                member_name=m.member_name,
+                mobile_no=m.mobile_no,
+                is_active=m.is_active,
+                created_at=now,
+            ),
+            update_fields=self.update_fields,
+            batch_size=10,
+            key_field="member_code",
+            hash_field="sync_hash",
+            **kwargs,
+        )
+
+    def test_initial_sync_creates_rows_with_hashes(self):
+        result = self._sync(self._source(25))
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (25, 0, 0))
+        self.assertFalse(MembersMasterCopy.objects.filter(sync_hash__isnull=True).exists())
+
+    def test_unchanged_rows_are_not_written(self):
+        source = self._source(25)
+        self._sync(source)
+
+        # Per 10-row chunk: one key/hash lookup and no writes.
+        with self.assertNumQueries(3):
+            result = self._sync(source)
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 0, 25))
+
+    def test_changed_rows_are_updated(self):
+        source = self._source(25)
+        self._sync(source)
+        source[3].member_name = "Renamed"
+        source[17].is_active = False
+
+        result = self._sync(source)
+
+        self.assertEqual((result.updated, result.unchanged), (2, 23))
+        self.assertEqual(
+            MembersMasterCopy.objects.get(member_code="M0003").member_name, "Renamed"
+        )
+
+    def test_delete_missing(self):
+        self._sync(self._source(25))
+
+        result = self._sync(self._source(20), delete_missing=True)
+
+        self.assertEqual(result.deleted, 5)
+        self.assertEqual(MembersMasterCopy.objects.count(), 20)
+
+    def test_empty_source_never_deletes(self):
+        self._sync(self._source(5))
+
+        result = self._sync([], delete_missing=True)
+
+        self.assertEqual(result.deleted, 0)
+        self.assertEqual(MembersMasterCopy.objects.count(), 5)
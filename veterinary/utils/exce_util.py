@@ -8,6 +8,7 @@ from datetime import datetime, date
 import re
 
 from veterinary.resources.cattle_resources import CombinedCattleResource
+from veterinary.services.cattle_import_service import CattleBulkImporter
 from member.resources import UserDeviceResource,SahayakIncentivesResource,UserResource
 
 RESOURCE_REGISTRY = {
@@ -17,6 +18,11 @@ RESOURCE_REGISTRY = {
     "member.SahayakIncentives":SahayakIncentivesResource
 }
 
+# Models with a vectorized bulk path; others go through the resource row by row.
+BULK_IMPORTERS = {
+    "veterinary.Animal": CattleBulkImporter,
+}
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,8 +166,14 @@ def detect_column_types(resource_class) -> Dict:
     return column_types
 
 
-def process_import_enhanced(file_path, selected_sheets, target_model) -> Dict:
-    """Enhanced import with proper type detection and preservation"""
+def process_import_enhanced(file_path, selected_sheets, target_model, session=None, bulk=True) -> Dict:
+    """
+    Enhanced import with proper type detection and preservation.
+
+    Models listed in ``BULK_IMPORTERS`` are imported with their bulk importer
+    unless ``bulk`` is False. When a ``session`` is given, its progress is
+    updated as rows are imported.
+    """
     results = {}
 
     # Get resource class
@@ -171,7 +183,10 @@ def process_import_enhanced(file_path, selected_sheets, target_model) -> Dict:
 
     resource = resource_class()
     column_types = detect_column_types(resource_class)
+    importer_class = BULK_IMPORTERS.get(target_model) if bulk else None
 
+    # Read every sheet first so progress can be reported against the total.
+    frames = {}
     for sheet_name in selected_sheets:
         try:
             # Read with proper dtype detection
@@ -182,23 +197,46 @@ def process_import_enhanced(file_path, selected_sheets, target_model) -> Dict:
             )
 
             # Remove empty rows
-            df = df.dropna(how='all')
-
-            if df.empty:
-                results[sheet_name] = {
-                    'created': 0,
-                    'updated': 0,
-                    'errors': ['Sheet is empty'],
-                    'total_rows': 0,
-                    'success': False
-                }
-                continue
+            frames[sheet_name] = df.dropna(how='all')
+
+        except Exception as e:
+            logger.error(f"Error reading sheet {sheet_name}: {e}", exc_info=True)
+            results[sheet_name] = {
+                'created': 0,
+                'updated': 0,
+                'errors': [f'Sheet processing failed: {str(e)}'],
+                'total_rows': 0,
+                'success': False
+            }
 
+    total_rows = sum(len(df) for df in frames.values())
+    done = 0
+
+    def report(processed):
+        if session is not None:
+            session.update_progress(done + processed, total_rows)
+
+    report(0)
+    for sheet_name, df in frames.items():
+        if df.empty:
+            results[sheet_name] = {
+                'created': 0,
+                'updated': 0,
+                'errors': ['Sheet is empty'],
+                'total_rows': 0,
+                'success': False
+            }
+            continue
+
+        try:
             # Process with transaction for atomicity
             with transaction.atomic():
-                result = _import_data_with_validation(
-                    df, resource, column_types
-                )
+                if importer_class is not None:
+                    result = importer_class(on_progress=report).run(df)
+                else:
+                    result = _import_data_with_validation(
+                        df, resource, column_types
+                    )
                 results[sheet_name] = result
 
         except Exception as e:
@@ -211,6 +249,9 @@ def process_import_enhanced(file_path, selected_sheets, target_model) -> Dict:
                 'success': False
             }
 
+        done += len(df)
+        report(0)
+
     return results
 
 
@@ -1,11 +1,41 @@
-from django.db import transaction
-
+import hashlib
+import json
 import logging
-from typing import Callable, Iterable, Tuple, Type, Any, Optional
-from django.db import models, transaction
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Type, Any, Optional
+
+from django.db import connections, models, transaction
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class SyncResult:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+    def __str__(self):
+        return (
+            f"Created={self.created}, Updated={self.updated}, "
+            f"Unchanged={self.unchanged}, Deleted={self.deleted}"
+        )
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def row_hash(values) -> str:
+    """Stable content hash of a sequence of field values."""
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
 def sync_model(
     model: Type[models.Model],
     source_objects: Iterable[Any],
@@ -15,69 +45,172 @@ def sync_model(
     batch_size: int = 1000,
     using: Optional[str] = None,
     key_field: str = "id",
-) -> Tuple[int, int]:
+    hash_field: Optional[str] = None,
+    delete_missing: bool = False,
+    source_key_field: Optional[str] = None,
+    prepare_chunk: Optional[Callable[[list], None]] = None,
+) -> SyncResult:
     """
-    Synchronize source data into a Django model with insert/update behavior.
+    Stream source data into a Django model, writing only rows that changed.
+
+    The source is consumed in chunks of ``batch_size`` (QuerySets through a
+    server-side ``iterator()``), so memory stays bounded by the chunk size.
+    For each chunk the target's keys and content hashes are read in one query;
+    new and changed rows are upserted in one batch and unchanged rows are
+    skipped entirely.
 
     Args:
         model (Type[models.Model]): Target Django model.
-        source_objects (Iterable[Any]): Source objects to sync.
+        source_objects (Iterable[Any]): Source objects or QuerySet to sync.
         key_fn (Callable[[Any], Any]): Function that returns a unique key per source object.
         map_fn (Callable[[Any], models.Model]): Function that maps source object to model instance.
-        update_fields (list[str], optional): Fields to update on existing records. Default is None (all updatable fields).
-        batch_size (int): Batch size for bulk operations.
+        update_fields (list[str], optional): Fields compared and written on existing records.
+            Default is None (insert-only).
+        batch_size (int): Source chunk and bulk write size.
         using (str, optional): Database alias if syncing to a non-default database.
-        key_field (str): Field name used to identify uniqueness in the target model.
+        key_field (str): Unique field identifying a record in the target model.
+        hash_field (str, optional): Target field storing the content hash of
+            ``update_fields``. Without it the current values are read and hashed
+            on the fly.
+        delete_missing (bool): Delete target rows whose key no longer exists in the source.
+        source_key_field (str, optional): Source field holding the key, used to
+            check deletions against a source QuerySet chunk by chunk instead of
+            keeping every seen key in memory. Defaults to ``key_field``.
+        prepare_chunk (Callable[[list], None], optional): Called with each source
+            chunk before mapping, e.g. to bulk-load lookups ``map_fn`` needs.
 
     Returns:
-        Tuple[int, int]: Number of records created and updated.
+        SyncResult: Created, updated, unchanged and deleted counts.
     """
+    db = using or "default"
+    update_fields = list(update_fields or [])
+    attnames = [model._meta.get_field(name).attname for name in update_fields]
+    written_fields = update_fields + ([hash_field] if hash_field else [])
+    result = SyncResult()
+
+    if isinstance(source_objects, models.QuerySet):
+        source_iter = source_objects.iterator(chunk_size=batch_size)
+        check_source = source_objects
+    else:
+        source_iter = source_objects
+        check_source = None
+    seen_keys = set() if delete_missing and check_source is None else None
+    streamed = 0
+
+    for chunk in _chunks(source_iter, batch_size):
+        streamed += len(chunk)
+        if prepare_chunk:
+            prepare_chunk(chunk)
+
+        incoming = {}
+        for source in chunk:
+            key = key_fn(source)
+            if key is not None:
+                incoming[key] = source
+        if seen_keys is not None:
+            seen_keys.update(incoming)
+
+        existing = {
+            row[0]: row[1:]
+            for row in model.objects.using(db)
+            .filter(**{f"{key_field}__in": list(incoming)})
+            .values_list(key_field, "pk", *([hash_field] if hash_field else attnames))
+        }
+
+        to_create, to_update = [], []
+        for key, source in incoming.items():
+            instance = map_fn(source)
+            digest = row_hash(getattr(instance, attname) for attname in attnames)
+            if hash_field:
+                setattr(instance, hash_field, digest)
+
+            if key not in existing:
+                to_create.append(instance)
+                continue
+
+            pk, *current = existing[key]
+            current_digest = current[0] if hash_field else row_hash(current)
+            if not update_fields or current_digest == digest:
+                result.unchanged += 1
+                continue
+            instance.pk = pk
+            to_update.append(instance)
 
-    if not source_objects:
-        logger.info(f"No source objects found for model {model.__name__}")
-        return 0, 0
-
-    db = using or 'default'
-    created_count = 0
-    updated_count = 0
-
-    # Create a map of source objects using their unique key
-    source_map = {}
-    for obj in source_objects:
-        key = key_fn(obj)
-        if key is not None:
-            source_map[key] = obj
+        _write(model, db, to_create, to_update, key_field, written_fields, batch_size)
+        result.created += len(to_create)
+        result.updated += len(to_update)
 
-    keys = list(source_map.keys())
+    if delete_missing:
+        if streamed == 0:
+            # An empty source is far more likely an outage than a real wipe.
+            logger.warning(
+                f"{model.__name__} sync: source was empty, skipping deletions"
+            )
+        else:
+            result.deleted = _delete_missing(
+                model,
+                db,
+                key_field,
+                batch_size,
+                seen_keys=seen_keys,
+                source=check_source,
+                source_key_field=source_key_field or key_field,
+            )
 
-    # Fetch all existing records corresponding to the keys
-    existing_objects = list(model.objects.using(db).filter(**{f"{key_field}__in": keys}))
-    key_to_existing = {getattr(obj, key_field): obj for obj in existing_objects}
+    logger.info(f"{model.__name__} Sync Complete: {result}")
+    return result
 
-    to_create = []
-    to_update = []
 
-    for key, source in source_map.items():
-        if key in key_to_existing:
-            instance = key_to_existing[key]
-            new_instance = map_fn(source)
-            new_instance.pk = instance.pk
-
-            if update_fields:
-                for field in update_fields:
-                    setattr(instance, field, getattr(new_instance, field))
-            to_update.append(instance)
-        else:
-            to_create.append(map_fn(source))
+def _write(model, db, to_create, to_update, key_field, written_fields, batch_size):
+    if not to_create and not to_update:
+        return
 
+    manager = model.objects.using(db)
     with transaction.atomic(using=db):
+        if to_update and connections[db].features.supports_update_conflicts_with_target:
+            # One INSERT .. ON CONFLICT DO UPDATE for the whole chunk.
+            manager.bulk_create(
+                to_create + to_update,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=[key_field],
+                update_fields=written_fields,
+            )
+            return
+
         if to_create:
-            model.objects.using(db).bulk_create(to_create, batch_size=batch_size)
-            created_count = len(to_create)
+            manager.bulk_create(to_create, batch_size=batch_size)
+        if to_update:
+            manager.bulk_update(to_update, written_fields, batch_size=batch_size)
 
-        if to_update and update_fields:
-            model.objects.using(db).bulk_update(to_update, update_fields, batch_size=batch_size)
-            updated_count = len(to_update)
 
-    logger.info(f"{model.__name__} Sync Complete: Created={created_count}, Updated={updated_count}")
-    return created_count, updated_count
+def _delete_missing(model, db, key_field, batch_size, seen_keys, source, source_key_field):
+    """
+    Delete target rows absent from the source, walking target keys in order
+    so only one chunk of keys is held at a time.
+    """
+    deleted = 0
+    target = model.objects.using(db).order_by(key_field).values_list(key_field, flat=True)
+    last = None
+    while True:
+        page = target if last is None else target.filter(**{f"{key_field}__gt": last})
+        keys = list(page[:batch_size])
+        if not keys:
+            break
+        last = keys[-1]
+
+        if seen_keys is not None:
+            present = seen_keys.intersection(keys)
+        else:
+            present = set(
+                source.filter(**{f"{source_key_field}__in": keys})
+                .order_by()
+                .values_list(source_key_field, flat=True)
+            )
+        missing = [key for key in keys if key not in present]
+        if missing:
+            _, per_model = (
+                model.objects.using(db).filter(**{f"{key_field}__in": missing}).delete()
+            )
+            deleted += per_model.get(model._meta.label, 0)
+    return deleted
@@ -11,6 +11,7 @@ from ..serializers.cattle_entry_serializers import (
     CattleDetailSerializer,
 )
 from facilitator.models.user_profile_model import UserProfile
+from ..permissions import UserHierarchyChecker
 from rest_framework.decorators import action
 from ..utils.compute_tag_stats import get_period_range
 from django_filters.rest_framework import DjangoFilterBackend
@@ -230,6 +231,10 @@ class CattleTaggingViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
     lookup_field = "pk"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hierarchy_checker = UserHierarchyChecker()
+
     def get_serializer_class(self):
         if self.action == "list":
             return CattleTaggingListSerializer
@@ -257,13 +262,10 @@ class CattleTaggingViewSet(viewsets.ModelViewSet):
         ]:
             return base_qs.filter(updated_by=user)
 
-        # Supervisor: own + reportees' records
-        reportee_ids = profile.reportees.values_list("user_id", flat=True)
-        if reportee_ids.exists():
-            return base_qs.filter(updated_by__in=[user.id, *reportee_ids])
-
-        # Default fallback: only own records
-        return base_qs.filter(updated_by=user)
+        # Supervisor: own + reportees' records (just own when nobody reports in)
+        return base_qs.filter(
+            updated_by__in=self.hierarchy_checker.get_accessible_users(user).values("pk")
+        )
 
     @action(detail=False, methods=["get"], url_path="stats")
     def stats(self, request):
@@ -307,8 +309,12 @@ class CattleTaggingViewSet(viewsets.ModelViewSet):
                 ]:
                     return qs.filter(owner=user)
                 else:
-                    reportee_ids = profile.reportees.values_list("user_id", flat=True)
-                    return qs.filter(owner__in=[user.id, *reportee_ids])
+                    # owner is a MembersMasterCopy; match through its linked user.
+                    return qs.filter(
+                        owner__user__in=self.hierarchy_checker.get_accessible_users(
+                            user
+                        ).values("pk")
+                    )
             return qs.none()
 
         def pct_change(curr, prev):
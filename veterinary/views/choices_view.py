@@ -185,29 +185,8 @@ class BaseModelViewSet(viewsets.ModelViewSet):
         )
 
     def get_manageable_users(self, user):
-        """Get list of user IDs that this user can manage (including themselves)."""
-        from django.contrib.auth import get_user_model
-
-        User = get_user_model()
-
-        manageable_ids = [user.id]
-
-        try:
-            if user.is_superuser:
-                return list(User.objects.values_list("id", flat=True))
-
-            # Check hierarchy for all other users
-            all_users = User.objects.select_related("profile").exclude(id=user.id)
-
-            for potential_subordinate in all_users:
-                if self.hierarchy_checker.is_supervisor_of(user, potential_subordinate):
-                    manageable_ids.append(potential_subordinate.id)
-
-        except Exception:
-            # Fallback to just the user themselves
-            pass
-
-        return manageable_ids
+        """Get user IDs that this user can manage (including themselves), as a subquery."""
+        return self.hierarchy_checker.get_manageable_user_ids(user)
 
 
 class SpeciesViewSet(BaseModelViewSet):
@@ -21,6 +21,12 @@ from datetime import datetime
 
 from ..tasks import process_excel_import
 from ..utils.exce_util import RESOURCE_REGISTRY
+from ..utils.export_util import (
+    EXPORT_FORMATS,
+    export_response,
+    stream_export,
+    stream_export_sheets,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -56,44 +62,47 @@ def _store_temp_file(uploaded_file):
 
 
 class ExcelExportView(APIView):
-    """Handle Excel export with multiple sheets"""
+    """
+    Export registered models, one worksheet per entry of ``config.sheets``
+    (``{"model": "<app.Model>", "name": "<sheet>"}``). With ``config.format``
+    set to ``csv`` only the first sheet is exported.
+    """
 
     def post(self, request):
-        try:
-            export_config = request.data.get("config", {})
-            sheets_config = export_config.get("sheets", [])
-            filename = export_config.get("filename", "export")
-
-            # Create workbook
-            from openpyxl import Workbook
-
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
-
-            for sheet_config in sheets_config:
-                model_name = sheet_config.get("model")
-                sheet_name = sheet_config.get("name", model_name)
-                queryset = sheet_config.get("queryset")  # You'd pass this or build it
-
-                # Create worksheet
-                ws = wb.create_sheet(title=sheet_name)
-
-                # Add headers and data
-                # This would use your django-import-export resources
-                # Mock implementation here
-                ws.append(["Column 1", "Column 2", "Column 3"])
-                ws.append(["Data 1", "Data 2", "Data 3"])
-
-            # Prepare response
-            response = HttpResponse(
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        export_config = request.data.get("config", {})
+        sheets_config = export_config.get("sheets", [])
+        filename = export_config.get("filename", "export")
+        file_format = export_config.get("format", "xlsx")
+
+        if file_format not in EXPORT_FORMATS:
+            return JsonResponse({"error": f"Unsupported format: {file_format}"}, status=400)
+        if not sheets_config:
+            return JsonResponse({"error": "At least one sheet is required"}, status=400)
+
+        sheets = []
+        for sheet_config in sheets_config:
+            model_name = sheet_config.get("model")
+            resource_class = RESOURCE_REGISTRY.get(model_name)
+            if resource_class is None:
+                return JsonResponse({"error": f"Invalid model: {model_name}"}, status=400)
+            resource = resource_class()
+            sheets.append(
+                (
+                    sheet_config.get("name", model_name)[:31],
+                    resource,
+                    resource.get_queryset().order_by("pk"),
+                )
             )
-            response["Content-Disposition"] = f'attachment; filename="{filename}.xlsx"'
-
-            wb.save(response)
-            return response
 
+        try:
+            if file_format == "csv":
+                _, resource, queryset = sheets[0]
+                write = lambda fileobj: stream_export(resource, queryset, fileobj, "csv")
+            else:
+                write = lambda fileobj: stream_export_sheets(sheets, fileobj)
+            return export_response(write, f"{filename}.{file_format}", file_format)
         except Exception as e:
+            logger.error(f"Export failed: {e}", exc_info=True)
             return JsonResponse({"error": f"Export failed: {str(e)}"}, status=500)
 
 
@@ -242,6 +251,7 @@ class ExcelImportConfirmView(APIView):
         session_id = request.data.get("session_id")
         selected_sheets = request.data.get("selected_sheets", [])
         target_model = request.data.get("target_model")
+        bulk = str(request.data.get("bulk", "true")).lower() != "false"
 
         # Validation
         if not session_id or not target_model:
@@ -268,6 +278,7 @@ class ExcelImportConfirmView(APIView):
             temp_file_path,
             selected_sheets,
             target_model,
+            bulk=bulk,
         )
 
         # Store task_id for tracking
@@ -289,12 +300,13 @@ class ExcelImportConfirmView(APIView):
 class ExcelImportStatusView(APIView):
     def get(self, request, session_id):
         session = get_object_or_404(
-            ExcelUploadSession, id=session_id, user=self.request.user
+            ExcelUploadSession, id=session_id, uploaded_by=self.request.user
         )
         return JsonResponse(
             {
                 "status": session.status,
                 "processed": session.processed,
+                "progress": session.progress,
                 "results": getattr(session, "results", None),
                 "error": getattr(session, "error_message", None),
             }
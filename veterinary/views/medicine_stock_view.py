@@ -383,28 +383,8 @@ class UserMedicineStockViewSet(ExceptionHandlerMixin, viewsets.ModelViewSet):
         return queryset.filter(user__id__in=manageable_user_ids)
 
     def _get_manageable_users(self, user):
-        """Get list of user IDs that this user can manage (including themselves)."""
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-
-        manageable_ids = [user.id]  # Always include self
-
-        try:
-            if user.is_superuser:
-                return list(User.objects.values_list('id', flat=True))
-
-            # Check hierarchy for all other users
-            all_users = User.objects.select_related('profile').exclude(id=user.id)
-
-            for potential_subordinate in all_users:
-                if self.hierarchy_checker.is_supervisor_of(user, potential_subordinate):
-                    manageable_ids.append(potential_subordinate.id)
-
-        except Exception:
-            # Fallback to just the user themselves
-            pass
-
-        return manageable_ids
+        """Get user IDs that this user can manage (including themselves), as a subquery."""
+        return self.hierarchy_checker.get_manageable_user_ids(user)
 
     def perform_create(self, serializer):
         """
@@ -801,8 +781,9 @@ class UserMedicineStockViewSet(ExceptionHandlerMixin, viewsets.ModelViewSet):
                 )
 
             # Check if the requested user is manageable
-            manageable_user_ids = self._get_manageable_users(request.user)
-            if int(user_id) not in manageable_user_ids:
+            if not self.hierarchy_checker.can_manage_user_id(
+                request.user, int(user_id)
+            ):
                 return custom_response(
                     status_text="error",
                     message="You don't have permission to view this user's stock",
@@ -63,29 +63,10 @@ class UserMedicineTransactionViewSet(viewsets.ModelViewSet):
 
     def _get_manageable_users(self, user):
         """
-        Get list of user IDs that this user can manage.
+        Get user IDs that this user can manage, as a subquery.
         Uses the centralized UserHierarchyChecker for consistent logic.
         """
-        manageable_ids = [user.id]
-
-        try:
-            # For superusers, return all users
-            if user.is_superuser:
-                return list(User.objects.values_list('id', flat=True))
-
-            # Get all users by checking hierarchy for each user
-            all_users = User.objects.select_related('profile').exclude(id=user.id)
-
-            for potential_subordinate in all_users:
-                if self.hierarchy_checker.is_supervisor_of(user, potential_subordinate):
-                    manageable_ids.append(potential_subordinate.id)
-
-        except Exception as e:
-            # Log the exception if you have logging setup
-            # logger.error(f"Error getting manageable users for {user}: {e}")
-            pass
-
-        return manageable_ids
+        return self.hierarchy_checker.get_manageable_user_ids(user)
 
     def perform_create(self, serializer):
         """
@@ -303,8 +284,9 @@ class UserMedicineTransactionViewSet(viewsets.ModelViewSet):
                 )
 
             # Check if the requested user is manageable
-            manageable_user_ids = self._get_manageable_users(request.user)
-            if int(user_id) not in manageable_user_ids:
+            if not self.hierarchy_checker.can_manage_user_id(
+                request.user, int(user_id)
+            ):
                 return custom_response(
                     status_text="error",
                     message="You don't have permission to view this user's transactions",
@@ -5,7 +5,7 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from ..serializers.recommendation import DiseaseWithMedicineSerializer
-from ..services.recommendation import get_medicine_recommendations_from_symptoms
+from ..services.recommendation import get_ranked_recommendations
 
 class MedicineRecommendationView(APIView):
     """
@@ -21,7 +21,7 @@ class MedicineRecommendationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        recommendations = get_medicine_recommendations_from_symptoms(symptom_ids)
+        recommendations = get_ranked_recommendations(symptom_ids)
         return Response(recommendations, status=status.HTTP_200_OK)
 
 